@@ -26,6 +26,7 @@ from __future__ import division
 
 import abc
 import matplotlib as mp
+from wholecell.io import readcache
 from wholecell.utils import memory_debug
 
 
@@ -37,6 +38,11 @@ class AnalysisPlot(object):
 	Call main() to run an analysis plot for a Firetask.
 
 	Use the environment variable 'DEBUG_GC' to enable memory leak debugging.
+
+	The plots run in a process share a wholecell.io.readcache cache of table
+	columns and pickles. Use the environment variables
+	'WC_ANALYSIS_CACHE_BYTES' and 'WC_ANALYSIS_CACHE_DIR' to set its memory
+	budget and spill directory.
 	"""
 	__metaclass__ = abc.ABCMeta
 
@@ -49,10 +55,17 @@ class AnalysisPlot(object):
 	def plot(self, inputDir, plotOutDir, plotOutFileName, simDataFile,
 			validationDataFile, metadata):
 		"""Public method to set up, make a plot, and cleanup."""
-		with memory_debug.detect_leaks(), mp.rc_context():
+		with memory_debug.detect_leaks(), mp.rc_context(), readcache.enabled():
 			self.do_plot(inputDir, plotOutDir, plotOutFileName, simDataFile,
 				validationDataFile, metadata)
 
+	def read_pickle_file(self, pickle_path):
+		"""Load a pickle file such as sim_data or validation_data, sharing
+		the loaded object with the other plots run in this process. The
+		object must not be modified.
+		"""
+		return readcache.sharedCache().loadPickle(pickle_path)
+
 	@classmethod
 	def main(cls, inputDir, plotOutDir, plotOutFileName, simDataFile,
 			validationDataFile=None, metadata=None):
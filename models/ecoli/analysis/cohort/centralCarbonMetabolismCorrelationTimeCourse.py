@@ -7,7 +7,6 @@
 from __future__ import absolute_import, division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -37,8 +36,8 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		# Get all cells in each seed
 		ap = AnalysisPaths(variantDir, cohort_plot = True)
 
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
+		sim_data = self.read_pickle_file(simDataFile)
 
 		cellDensity = sim_data.constants.cellDensity
 
@@ -8,7 +8,6 @@ Central carbon metabolism comparison to Toya et al
 from __future__ import absolute_import
 
 import os
-import cPickle
 import re
 
 import numpy as np
@@ -37,14 +36,14 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		ap = AnalysisPaths(variantDir, cohort_plot = True)
 		allDir = ap.get_cells()
 
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
 		toyaReactions = validation_data.reactionFlux.toya2010fluxes["reactionID"]
 		toyaFluxes = validation_data.reactionFlux.toya2010fluxes["reactionFlux"]
 		toyaStdev = validation_data.reactionFlux.toya2010fluxes["reactionFluxStdev"]
 		toyaFluxesDict = dict(zip(toyaReactions, toyaFluxes))
 		toyaStdevDict = dict(zip(toyaReactions, toyaStdev))
 
-		sim_data = cPickle.load(open(simDataFile))
+		sim_data = self.read_pickle_file(simDataFile)
 		cellDensity = sim_data.constants.cellDensity
 
 		modelFluxes = {}
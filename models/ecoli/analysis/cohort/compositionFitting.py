@@ -9,7 +9,6 @@ import matplotlib.gridspec as gridspec
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
 from wholecell.io.tablereader import TableReader
 from wholecell.utils import units
-import cPickle
 
 from wholecell.analysis.analysis_tools import exportFigure
 from reconstruction.ecoli.knowledge_base_raw import KnowledgeBaseEcoli
@@ -50,7 +49,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		proteinFractionViolin_axis = plt.subplot(gs[2, 1:])
 
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		expectedProtein, expectedRna, expectedDryMassInit = getExpectedComposition(sim_data.doubling_time)
 
 		maxTime = getMaxTime(allCells)
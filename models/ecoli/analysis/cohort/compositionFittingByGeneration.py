@@ -9,7 +9,6 @@ import matplotlib.gridspec as gridspec
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
 from wholecell.io.tablereader import TableReader
 from wholecell.utils import units
-import cPickle
 
 from wholecell.analysis.analysis_tools import exportFigure
 from reconstruction.ecoli.knowledge_base_raw import KnowledgeBaseEcoli
@@ -41,7 +40,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		fig.set_size_inches(10 * n_gen,12)
 		outer_grid = gridspec.GridSpec(1, n_gen)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		expectedProtein, expectedRna, expectedDryMassInit = getExpectedComposition(sim_data.doubling_time)
 
 		for gen in range(n_gen):
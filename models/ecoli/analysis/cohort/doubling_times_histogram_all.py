@@ -15,7 +15,6 @@ standardize the output across sets of simulations.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -60,7 +59,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			generation = range(FIRST_GENERATION, n_gens)
 			)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		doubling_times_minutes = []
 
@@ -15,7 +15,6 @@ standardize the output across sets of simulations.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 from matplotlib import pyplot as plt
 
@@ -55,7 +54,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		sim_dirs = analysis_paths.get_cells(
 			generation = range(FIRST_GENERATION, n_gens), seed = range(8))
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		doubling_times_minutes = []
 
@@ -32,7 +32,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		# Check if basal sim
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		if sim_data.condition != "basal":
 			print "Skipping - plot only runs for basal sim."
 			return
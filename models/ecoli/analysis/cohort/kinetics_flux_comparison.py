@@ -9,7 +9,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 import csv
 
 import numpy as np
@@ -41,7 +40,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		ap = AnalysisPaths(variantDir, cohort_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		constraintIsKcatOnly = sim_data.process.metabolism.constraintIsKcatOnly
 
@@ -10,7 +10,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -53,7 +52,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			sim_dirs_grouped_by_gen.append(ap.get_cells(generation = [gen_idx]))
 
 		# Load simDataFile
-		sim_data = cPickle.load(open(simDataFile))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		# Get IDs for complex of proteins and constituent protein monomers,
 		# and IDs for only the complexed proteins
@@ -35,7 +35,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		# Get all ids reqiured
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		ids_complexation = sim_data.process.complexation.moleculeNames # Complexe of proteins, and protein monomers
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes # Only complexes
 		ids_equilibrium = sim_data.process.equilibrium.moleculeNames # Complexes of proteins + small molecules, small molecules, protein monomers
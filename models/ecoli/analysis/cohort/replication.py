@@ -1,7 +1,6 @@
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -24,7 +23,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		oriC = sim_data.constants.oriCCenter.asNumber()
 		terC = sim_data.constants.terCCenter.asNumber()
 		genomeLength = len(sim_data.process.replication.genome_sequence)
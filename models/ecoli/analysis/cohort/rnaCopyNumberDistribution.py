@@ -10,7 +10,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -53,7 +52,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			sim_dirs_grouped_by_gen.append(ap.get_cells(generation = [gen_idx]))
 
 		# Load simDataFile
-		simData = cPickle.load(open(simDataFile))
+		simData = self.read_pickle_file(simDataFile)
 
 		# Get IDs for RNA from simData
 		ids_rna = simData.process.transcription.rnaData["id"]
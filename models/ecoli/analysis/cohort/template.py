@@ -8,7 +8,6 @@ Template for cohort analysis plots
 from __future__ import absolute_import
 from __future__ import division
 
-import cPickle
 from matplotlib import pyplot as plt
 import numpy as np
 import os
@@ -27,10 +26,8 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 
 		filepath.makedirs(plotOutDir)
 
-		with open(simDataFile, 'rb') as f:
-			sim_data = cPickle.load(f)
-		with open(validationDataFile, 'rb') as f:
-			validation_data = cPickle.load(f)
+		sim_data = self.read_pickle_file(simDataFile)
+		validation_data = self.read_pickle_file(validationDataFile)
 
 		ap = AnalysisPaths(variantDir, cohort_plot=True)
 
@@ -9,13 +9,12 @@ Plots fraction of mRNAs transcribed (out of all genes to be transcribed) for all
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import cohortAnalysisPlot
 
@@ -31,7 +30,7 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		# Get IDs of mRNAs
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rnaIds = sim_data.process.transcription.rnaData["id"]
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		basalExpression = sim_data.process.transcription.rnaExpression["basal"]
@@ -50,22 +49,15 @@ class Plot(cohortAnalysisPlot.CohortAnalysisPlot):
 		all_cells = ap.get_cells()
 
 		# Get number of mRNAs transcribed
-		transcribedFreq = []
-		for simDir in all_cells:
-			simOutDir = os.path.join(simDir, "simOut")
-
-			bulkMolecules = TableReader(os.path.join(simOutDir, "BulkMolecules"))
-			moleculeIds = bulkMolecules.readAttribute("objectNames")
-			mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNamesSorted])
-			moleculeCounts = bulkMolecules.readColumn("counts")[:, mRnaIndexes]
-			bulkMolecules.close()
-
-			moleculeCountsSumOverTime = moleculeCounts.sum(axis = 0)
-			mRnasTranscribed = np.array([x != 0 for x in moleculeCountsSumOverTime])
-
-			transcribedFreq.append(mRnasTranscribed)
-
-		transcribedFreq = np.array(transcribedFreq)
+		simOutDir = os.path.join(all_cells[0], "simOut")
+		moleculeIds = multicell.tableReader(os.path.join(simOutDir, "BulkMolecules")).readAttribute("objectNames")
+		mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNamesSorted])
+
+		moleculeCounts, boundaries = multicell.readColumn(all_cells, "BulkMolecules", "counts", mRnaIndexes)
+		transcribedFreq = np.array([
+			cellCounts.sum(axis = 0) != 0
+			for cellCounts in np.split(moleculeCounts, boundaries[1:-1])
+			])
 		transcribedFreqSumOverSeeds = transcribedFreq.sum(axis = 0)
 
 		# Plot
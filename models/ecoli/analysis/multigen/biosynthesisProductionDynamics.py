@@ -14,7 +14,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
@@ -35,7 +34,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDirs = ap.get_cells()
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		tfs = [
 			"putA", "aldA", "gdhA", "carA", "carB", "argD",
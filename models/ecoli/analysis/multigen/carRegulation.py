@@ -13,7 +13,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from wholecell.utils import units
@@ -35,7 +34,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDirs = ap.get_cells()
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		nAvogadro = sim_data.constants.nAvogadro
 		cellDensity = sim_data.constants.cellDensity
 
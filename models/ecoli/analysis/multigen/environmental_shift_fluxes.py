@@ -8,7 +8,6 @@ Plot fluxes for metabolic map figure during a shift
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -41,7 +40,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rxnStoich = sim_data.process.metabolism.reactionStoich
 
 		reactants = [
@@ -1,7 +1,6 @@
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -34,7 +33,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		for gen_idx in range(ap.n_generation):
 			firstCellLineage.append(ap.get_cells(generation = [gen_idx])[0])
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		max_elongationRate = 21. # TODO: Fix this
 		elongationRate = float(sim_data.growthRateParameters.ribosomeElongationRate.asNumber(units.aa / units.s))
 
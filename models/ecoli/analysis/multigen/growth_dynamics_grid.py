@@ -6,7 +6,6 @@ import os
 import numpy as np
 from matplotlib import pyplot as plt
 import matplotlib.patches as patches
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from wholecell.utils import units
@@ -57,7 +56,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		###################
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		nAvogadro = sim_data.constants.nAvogadro
 		cellDensity = sim_data.constants.cellDensity
 		oriC = sim_data.constants.oriCCenter.asNumber()
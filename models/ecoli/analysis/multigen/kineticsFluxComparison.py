@@ -10,7 +10,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 import csv
 import re
 
@@ -47,7 +46,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDir = ap.get_cells()
 		# allDir = ap.get_cells(generation = [0, 1, 2])
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		targetFluxList = []
 		actualFluxList = []
@@ -9,7 +9,6 @@ Plots limited enzyme fluxes, protein counts, and transcription initiation events
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -47,7 +46,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		if allDir.tolist() == []:
 			return
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rnaIds = sim_data.process.transcription.rnaData["id"]
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		mRnaIndexes = np.where(isMRna)[0]
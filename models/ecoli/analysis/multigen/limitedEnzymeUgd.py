@@ -9,7 +9,6 @@ Plots limited enzyme fluxes, protein counts, and transcription initiation events
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -33,7 +32,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		enzymeComplexId = "CPLX0-8098[c]"
 		enzymeMonomerId = "UGD-MONOMER[c]"
 		enzymeRnaId = "G7091_RNA[c]"
@@ -41,7 +40,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		transcriptionFreq = 0.64
 		metaboliteId = "UDP-GLUCURONATE[c]"
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rnaIds = sim_data.process.transcription.rnaData["id"]
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		mRnaIndexes = np.where(isMRna)[0]
@@ -9,7 +9,6 @@ Produces histograms of frequency that production of a metabolite is limited (at
 from __future__ import absolute_import, division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -34,7 +33,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		metaboliteNames = np.array(sorted(sim_data.process.metabolism.concDict.keys()))
 		nMetabolites = len(metaboliteNames)
 
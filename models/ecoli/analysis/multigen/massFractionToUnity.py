@@ -6,7 +6,7 @@ import numpy as np
 from matplotlib import pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
 
@@ -48,15 +48,15 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 
 		fig, axesList = plt.subplots(len(massNames), sharex = True)
 
-		for simDir in firstCellLineage:
-			simOutDir = os.path.join(simDir, "simOut")
-			time = TableReader(os.path.join(simOutDir, "Main")).readColumn("time")
-			mass = TableReader(os.path.join(simOutDir, "Mass"))
+		allTime, boundaries = multicell.readColumn(firstCellLineage, "Main", "time")
+		allMassData = np.array([
+			multicell.readColumn(firstCellLineage, "Mass", massName)[0]
+			for massName in massNames
+			])
 
-			massData = np.zeros((len(massNames),time.size))
-
-			for idx, massType in enumerate(massNames):
-				massData[idx,:] = mass.readColumn(massNames[idx])
+		for start, end in zip(boundaries[:-1], boundaries[1:]):
+			time = allTime[start:end]
+			massData = allMassData[:, start:end]
 
 			massData = massData / massData.sum(axis = 0)
 
@@ -7,13 +7,12 @@
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
 
@@ -28,7 +27,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		T_ADD_AA = None
 		T_CUT_AA = None
@@ -55,13 +54,17 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		axesList = [ax2, ax3, ax4, ax5]
 		colors = ["blue", "green", "red", "cyan"]
 
-		for gen, simDir in enumerate(allDir):
-			simOutDir = os.path.join(simDir, "simOut")
-			time = TableReader(os.path.join(simOutDir, "Main")).readColumn("time")
-			mass = TableReader(os.path.join(simOutDir, "Mass"))
+		allTime, boundaries = multicell.readColumn(allDir, "Main", "time")
+		allMasses = [
+			multicell.readColumn(allDir, "Mass", massName)[0]
+			for massName in massNames
+			]
+
+		for gen in xrange(nCells):
+			time = allTime[boundaries[gen]:boundaries[gen + 1]]
 
 			for idx, massType in enumerate(massNames):
-				massToPlot = mass.readColumn(massNames[idx])
+				massToPlot = allMasses[idx][boundaries[gen]:boundaries[gen + 1]]
 				ax1.semilogy(time / 60. / 60., (2. ** gen) * massToPlot, linewidth = 2, color = colors[idx])
 				dMassToPlot = (np.log10((2. ** gen) * massToPlot[1:]) - np.log10((2. ** gen) * massToPlot[:-1]))
 				axesList[idx].semilogy(time[1 + NUM_SKIP_TIMESTEPS_AT_GEN_CHANGE:-NUM_SKIP_TIMESTEPS_AT_GEN_CHANGE] / 60. / 60., dMassToPlot[NUM_SKIP_TIMESTEPS_AT_GEN_CHANGE:-NUM_SKIP_TIMESTEPS_AT_GEN_CHANGE], color = colors[idx])
@@ -9,7 +9,6 @@ genes, used in Figure 4 of the paper.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -50,7 +49,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		cellDensity = sim_data.constants.cellDensity
 		rna_ids = sim_data.process.transcription.rnaData["id"]
 
@@ -12,7 +12,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 from scipy.stats import pearsonr
 
 from wholecell.io.tablereader import TableReader
@@ -32,8 +31,8 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
+		validation_data = self.read_pickle_file(validationDataFile)
 
 		ids_complexation = sim_data.process.complexation.moleculeNames
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes
@@ -9,7 +9,6 @@ Plot normalized mass fractions of proteome for each protein monomer
 from __future__ import absolute_import, division
 
 import os
-import cPickle
 import sys
 
 import numpy as np
@@ -36,7 +35,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDirs = ap.get_cells()
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		nAvogadro = sim_data.constants.nAvogadro
 
 		ids_complexation = sim_data.process.complexation.moleculeNames
@@ -9,7 +9,6 @@ Plot usage statistics of ribosomes
 from __future__ import absolute_import, division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -40,7 +39,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 			firstCellLineage.append(ap.get_cells(generation = [gen_idx])[0])
 
 		# Get sim data from cPickle file
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		# Create new figure and set size
 		fig = plt.figure()
@@ -22,7 +22,6 @@ from __future__ import absolute_import
 import os
 
 import numpy as np
-import cPickle
 from matplotlib import pyplot as plt
 
 from wholecell.io.tablereader import TableReader
@@ -40,7 +39,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		allRnaIds = sim_data.process.transcription.rnaData["id"].tolist()
 
 		rnaIds = [
@@ -9,7 +9,6 @@ Generates plots related to the subgenerational transcription of genes.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -47,8 +46,8 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 			print "Skipping - this plot only runs for multigen sims"
 			return
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
+		validation_data = self.read_pickle_file(validationDataFile)
 
 		# Get mRNA data
 		rnaIds = sim_data.process.transcription.rnaData["id"]
@@ -12,7 +12,7 @@ import os
 from matplotlib import pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
 
@@ -33,12 +33,14 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 
 		plt.figure(figsize = (8.5, 11))
 
-		for simDir in allDir:
+		allTimeSteps, boundaries = multicell.readColumn(allDir, "Main", "timeStepSec")
+		allTimes, _ = multicell.readColumn(allDir, "Main", "time")
+
+		for i, simDir in enumerate(allDir):
 			simOutDir = os.path.join(simDir, "simOut")
-			#initialTime = TableReader(os.path.join(simOutDir, "Main")).readAttribute("initialTime")
-			timeSteps = TableReader(os.path.join(simOutDir, "Main")).readColumn("timeStepSec")
-			initialTime = TableReader(os.path.join(simOutDir, "Main")).readAttribute("initialTime")
-			absoluteTime = TableReader(os.path.join(simOutDir, "Main")).readColumn("time")
+			timeSteps = allTimeSteps[boundaries[i]:boundaries[i + 1]]
+			initialTime = multicell.tableReader(os.path.join(simOutDir, "Main")).readAttribute("initialTime")
+			absoluteTime = allTimes[boundaries[i]:boundaries[i + 1]]
 			relativeTime = absoluteTime - initialTime
 
 			plt.subplot(3,1,1)
@@ -9,7 +9,6 @@ Plots frequency of observing at least 1 transcript during a cell's life.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -18,7 +17,7 @@ from bokeh.models import HoverTool
 import bokeh.io
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
 
@@ -36,7 +35,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDir = ap.get_cells()
 
 		# Get mRNA data
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rnaIds = sim_data.process.transcription.rnaData["id"]
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		synthProb = sim_data.process.transcription.rnaSynthProb["basal"]
@@ -46,30 +45,21 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		mRnaNames = np.array([rnaIds[x] for x in mRnaIds])
 
 		# Get whether or not mRNAs were transcribed
-		transcribedBool = []
-		simulatedSynthProbs = []
-		for simDir in allDir:
-			simOutDir = os.path.join(simDir, "simOut")
-
-			rnaSynthProb = TableReader(os.path.join(simOutDir, "RnaSynthProb"))
-			simulatedSynthProb = np.mean(rnaSynthProb.readColumn("rnaSynthProb")[:, mRnaIds], axis = 0)
-			rnaSynthProb.close()
-			simulatedSynthProbs.append(simulatedSynthProb)
-
-			bulkMolecules = TableReader(os.path.join(simOutDir, "BulkMolecules"))
-			moleculeIds = bulkMolecules.readAttribute("objectNames")
-			mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNames])
-			moleculeCounts = bulkMolecules.readColumn("counts")[:, mRnaIndexes]
-			bulkMolecules.close()
-
-			moleculeCountsSumOverTime = moleculeCounts.sum(axis = 0)
-			mRnasTranscribed = np.array([x != 0 for x in moleculeCountsSumOverTime])
-
-			mRnasTranscribedNames = [mRnaNames[x] for x in np.arange(mRnaNames.shape[0]) if mRnasTranscribed[x]]
-			transcribedBool.append(mRnasTranscribed)
-
-		transcribedBool = np.array(transcribedBool)
-		simulatedSynthProbs = np.array(simulatedSynthProbs)
+		simOutDir = os.path.join(allDir[0], "simOut")
+		moleculeIds = multicell.tableReader(os.path.join(simOutDir, "BulkMolecules")).readAttribute("objectNames")
+		mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNames])
+
+		synthProbs, boundaries = multicell.readColumn(allDir, "RnaSynthProb", "rnaSynthProb", mRnaIds)
+		simulatedSynthProbs = np.array([
+			np.mean(cellSynthProbs, axis = 0)
+			for cellSynthProbs in np.split(synthProbs, boundaries[1:-1])
+			])
+
+		moleculeCounts, boundaries = multicell.readColumn(allDir, "BulkMolecules", "counts", mRnaIndexes)
+		transcribedBool = np.array([
+			cellCounts.sum(axis = 0) != 0
+			for cellCounts in np.split(moleculeCounts, boundaries[1:-1])
+			])
 
 		# Plot frequency vs. synthesis prob
 		fig = plt.figure(figsize = (12, 12))
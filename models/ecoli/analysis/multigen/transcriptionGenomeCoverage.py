@@ -9,13 +9,12 @@ Plots fraction of mRNAs transcribed (out of all genes to be transcribed) for all
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.utils import units
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
@@ -36,7 +35,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		allDir = ap.get_cells()
 
 		# Get IDs of mRNAs
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		rnaIds = sim_data.process.transcription.rnaData["id"]
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		degRate = sim_data.process.transcription.rnaData["degRate"]
@@ -65,24 +64,15 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 						}
 
 		# Get bool of mRNAs transcribed
-		transcribedBool = []
-
-		for simDir in allDir:
-			simOutDir = os.path.join(simDir, "simOut")
-
-			bulkMolecules = TableReader(os.path.join(simOutDir, "BulkMolecules"))
-			moleculeIds = bulkMolecules.readAttribute("objectNames")
-			mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNamesSorted])
-			moleculeCounts = bulkMolecules.readColumn("counts")[:, mRnaIndexes]
-			bulkMolecules.close()
-
-			moleculeCountsSumOverTime = moleculeCounts.sum(axis = 0)
-			mRnasTranscribed = np.array([x != 0 for x in moleculeCountsSumOverTime])
-
-			mRnasTranscribedNames = [mRnaNames[x] for x in np.arange(mRnaNames.shape[0]) if mRnasTranscribed[x]]
-			transcribedBool.append(mRnasTranscribed)
-
-		transcribedBool = np.array(transcribedBool)
+		simOutDir = os.path.join(allDir[0], "simOut")
+		moleculeIds = multicell.tableReader(os.path.join(simOutDir, "BulkMolecules")).readAttribute("objectNames")
+		mRnaIndexes = np.array([moleculeIds.index(x) for x in mRnaNamesSorted])
+
+		moleculeCounts, boundaries = multicell.readColumn(allDir, "BulkMolecules", "counts", mRnaIndexes)
+		transcribedBool = np.array([
+			cellCounts.sum(axis = 0) != 0
+			for cellCounts in np.split(moleculeCounts, boundaries[1:-1])
+			])
 
 		# Plot
 		numGens = allDir.shape[0]
@@ -9,13 +9,12 @@ Plots frequency of observing at least 1 protein.
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 import matplotlib.pyplot as plt
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
-from wholecell.io.tablereader import TableReader
+from wholecell.io import multicell
 from wholecell.containers.bulk_objects_container import BulkObjectsContainer
 from wholecell.analysis.analysis_tools import exportFigure
 from models.ecoli.analysis import multigenAnalysisPlot
@@ -33,7 +32,7 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
 		allDir = ap.get_cells()
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		tcsComplexToMonomers = sim_data.process.two_component_system.complexToMonomer
 		ids_complexation = sim_data.process.complexation.moleculeNames
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes
@@ -53,25 +52,22 @@ class Plot(multigenAnalysisPlot.MultigenAnalysisPlot):
 		view_twoComponent_complexes = bulkContainer.countsView(ids_twoComponent_complexes)
 		view_translation = bulkContainer.countsView(ids_translation)
 
-		proteinPresence = []
-		for simDir in allDir:
-			simOutDir = os.path.join(simDir, "simOut")
-			bulkMolecules = TableReader(os.path.join(simOutDir, "BulkMolecules"))
-			moleculeIds = bulkMolecules.readAttribute("objectNames")
-			proteinIndexes = np.array([moleculeIds.index(moleculeId) for moleculeId in ids_protein], np.int)
-			proteinCountsBulk = bulkMolecules.readColumn("counts")[:, proteinIndexes]
-			bulkMolecules.close()
+		simOutDir = os.path.join(allDir[0], "simOut")
+		moleculeIds = multicell.tableReader(os.path.join(simOutDir, "BulkMolecules")).readAttribute("objectNames")
+		proteinIndexes = np.array([moleculeIds.index(moleculeId) for moleculeId in ids_protein], np.int)
+		uniqueMoleculeIds = multicell.tableReader(os.path.join(simOutDir, "UniqueMoleculeCounts")).readAttribute("uniqueMoleculeIds")
+		uniqueIndexes = np.array([uniqueMoleculeIds.index("activeRibosome"), uniqueMoleculeIds.index("activeRnaPoly")])
+
+		proteinCountsBulk, boundaries = multicell.readColumn(allDir, "BulkMolecules", "counts", proteinIndexes)
+		uniqueCounts, _ = multicell.readColumn(allDir, "UniqueMoleculeCounts", "uniqueMoleculeCounts", uniqueIndexes)
 
+		proteinPresence = []
+		for start, end in zip(boundaries[:-1], boundaries[1:]):
 			# Account for monomers
-			bulkContainer.countsIs(proteinCountsBulk.mean(axis = 0))
+			bulkContainer.countsIs(proteinCountsBulk[start:end].mean(axis = 0))
 
 			# Account for unique molecules
-			uniqueMoleculeCounts = TableReader(os.path.join(simOutDir, "UniqueMoleculeCounts"))
-			ribosomeIndex = uniqueMoleculeCounts.readAttribute("uniqueMoleculeIds").index("activeRibosome")
-			rnaPolyIndex = uniqueMoleculeCounts.readAttribute("uniqueMoleculeIds").index("activeRnaPoly")
-			nActiveRibosome = uniqueMoleculeCounts.readColumn("uniqueMoleculeCounts")[:, ribosomeIndex]
-			nActiveRnaPoly = uniqueMoleculeCounts.readColumn("uniqueMoleculeCounts")[:, rnaPolyIndex]
-			uniqueMoleculeCounts.close()
+			nActiveRibosome, nActiveRnaPoly = uniqueCounts[start:end].T
 			bulkContainer.countsInc(nActiveRibosome.mean(), [sim_data.moleculeIds.s30_fullComplex, sim_data.moleculeIds.s50_fullComplex])
 			bulkContainer.countsInc(nActiveRnaPoly.mean(), [sim_data.moleculeIds.rnapFull])
 
@@ -7,7 +7,6 @@
 from __future__ import absolute_import, division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -36,7 +35,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 			raise Exception, "simOutDir does not currently exist as a directory"
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
@@ -60,7 +59,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 
 			width = 1
 
-			sim_data = cPickle.load(open(simDataFile, "rb"))
+			sim_data = self.read_pickle_file(simDataFile)
 
 			LossKm = sim_data.process.rna_decay.StatsFit['LossKm']
 			LossKmOpt = sim_data.process.rna_decay.StatsFit['LossKmOpt']
@@ -9,7 +9,6 @@ Plot amino acid counts
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -31,7 +30,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 
 		moleculeIds = bulkMolecules.readAttribute("objectNames")
 
-		sim_data = cPickle.load(open(simDataFile))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		aaIDs = sim_data.moleculeGroups.aaIDs
 		aaIndexes = np.array([moleculeIds.index(aaId) for aaId in aaIDs], np.int)
@@ -7,7 +7,6 @@
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -38,7 +37,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		time = TableReader(os.path.join(simOutDir, "Main")).readColumn("time")
 		fbaResults = TableReader(os.path.join(simOutDir, "FBAResults"))
@@ -8,7 +8,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 import re
 
 import numpy as np
@@ -39,8 +38,8 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
+		sim_data = self.read_pickle_file(simDataFile)
 
 		cellDensity = sim_data.constants.cellDensity
 
@@ -12,7 +12,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from wholecell.utils import units
@@ -31,7 +30,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		# Load data from KB
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		stoichMatrix = sim_data.process.equilibrium.stoichMatrix().astype(np.int64)
 		ratesFwd = sim_data.process.equilibrium.ratesFwd
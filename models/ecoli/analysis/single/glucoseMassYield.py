@@ -8,7 +8,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -33,7 +32,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		fbaResults = TableReader(os.path.join(simOutDir, "FBAResults"))
 		externalExchangeFluxes = fbaResults.readColumn("externalExchangeFluxes")
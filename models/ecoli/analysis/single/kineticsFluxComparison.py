@@ -10,7 +10,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import cPickle
 import csv
 import re
 
@@ -41,7 +40,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		constraintIsKcatOnly = sim_data.process.metabolism.constraintIsKcatOnly
 
@@ -13,7 +13,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from wholecell.analysis.analysis_tools import exportFigure
@@ -33,7 +32,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 
 		# Get the names of rnas from the KB
 
-		sim_data = cPickle.load(open(simDataFile))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		isMRna = sim_data.process.transcription.rnaData["isMRna"]
 		rnaIds = sim_data.process.transcription.rnaData["id"][isMRna]
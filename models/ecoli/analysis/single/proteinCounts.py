@@ -14,7 +14,6 @@ import os
 import numpy as np
 from scipy.stats import pearsonr
 from matplotlib import pyplot as plt
-import cPickle
 
 from wholecell.io.tablereader import TableReader
 from wholecell.utils.fitting import normalize
@@ -36,7 +35,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 
 		# Get the names of proteins from the KB
 
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 
 		ids_complexation = sim_data.process.complexation.moleculeNames
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes
@@ -9,7 +9,6 @@ Plot tRNA counts
 from __future__ import absolute_import
 
 import os
-import cPickle
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -30,7 +29,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		time = TableReader(os.path.join(simOutDir, "Main")).readColumn("time")
 
 		# Get tRNA IDs and counts
-		sim_data = cPickle.load(open(simDataFile, "rb"))
+		sim_data = self.read_pickle_file(simDataFile)
 		isTRna = sim_data.process.transcription.rnaData["isTRna"]
 		rnaIds = sim_data.process.transcription.rnaData["id"][isTRna]
 		bulkMolecules = TableReader(os.path.join(simOutDir, "BulkMolecules"))
@@ -9,7 +9,6 @@ Plot enzymatic capacity of tryptophan synthase vs amount of tryptophan needed by
 from __future__ import absolute_import
 
 import os
-import cPickle
 
 from matplotlib import pyplot as plt
 
@@ -28,7 +27,7 @@ class Plot(singleAnalysisPlot.SingleAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		sim_data = cPickle.load(open(simDataFile, "r"))
+		sim_data = self.read_pickle_file(simDataFile)
 		trpIdx = sim_data.moleculeGroups.aaIDs.index("TRP[c]")
 
 		growthLimits = TableReader(os.path.join(simOutDir, "GrowthLimits"))
@@ -8,7 +8,6 @@ conditions, to compare with experimental data in Wallden et al.
 
 from __future__ import absolute_import, print_function, division
 
-import cPickle
 from matplotlib import pyplot as plt
 import numpy as np
 import os
@@ -40,8 +39,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		added_volumes = []
 
 		for variant in variants:
-			with open(ap.get_variant_kb(variant), 'rb') as f:
-				sim_data = cPickle.load(f)
+			sim_data = self.read_pickle_file(ap.get_variant_kb(variant))
 
 			cell_density = sim_data.constants.cellDensity
 
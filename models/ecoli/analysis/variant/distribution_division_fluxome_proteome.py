@@ -26,11 +26,11 @@ FONT_SIZE=9
 trim = 0.05
 
 
-def getPCCProteome((variant, ap, monomerIds, schmidtCounts)):
+def getPCCProteome((plot, variant, ap, monomerIds, schmidtCounts)):
 	try:
 		simDir = ap.get_cells(variant = [variant])[0]
 
-		sim_data = cPickle.load(open(ap.get_variant_kb(variant), "rb"))
+		sim_data = plot.read_pickle_file(ap.get_variant_kb(variant))
 
 		ids_complexation = sim_data.process.complexation.moleculeNames
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes
@@ -86,12 +86,12 @@ def getPCCProteome((variant, ap, monomerIds, schmidtCounts)):
 		return np.nan, np.nan
 
 
-def getPCCFluxome((variant, ap, toyaReactions, toyaFluxesDict, toyaStdevDict)):
+def getPCCFluxome((plot, variant, ap, toyaReactions, toyaFluxesDict, toyaStdevDict)):
 
 	try:
 		simDir = ap.get_cells(variant = [variant])[0]
 
-		sim_data = cPickle.load(open(ap.get_variant_kb(variant), "rb"))
+		sim_data = plot.read_pickle_file(ap.get_variant_kb(variant))
 		cellDensity = sim_data.constants.cellDensity
 
 		simOutDir = os.path.join(simDir, "simOut")
@@ -197,7 +197,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 			os.mkdir(plotOutDir)
 
 		print "Loading validation data"
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
 
 		schmidtCounts = validation_data.protein.schmidt2015Data["glucoseCounts"]
 
@@ -242,7 +242,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 
 		# Get fluxome correlation
 		start = time.time()
-		args = zip(range(ap.n_variant), [ap] * ap.n_variant, [toyaReactions] * ap.n_variant, [toyaFluxesDict] * ap.n_variant, [toyaStdevDict] * ap.n_variant)
+		args = zip([self] * ap.n_variant, range(ap.n_variant), [ap] * ap.n_variant, [toyaReactions] * ap.n_variant, [toyaFluxesDict] * ap.n_variant, [toyaStdevDict] * ap.n_variant)
 		fluxomeResult = pool.map(getPCCFluxome, args)
 		stop = time.time()
 		cPickle.dump(fluxomeResult, open(os.path.join(plotOutDir, plotOutFileName + "_fluxome.cPickle"), "w"))
@@ -250,7 +250,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 
 		# Get proteome correlation
 		start = time.time()
-		args = zip(range(ap.n_variant), [ap] * ap.n_variant, [validation_data.protein.schmidt2015Data["monomerId"].tolist()] * ap.n_variant, [schmidtCounts] * ap.n_variant)
+		args = zip([self] * ap.n_variant, range(ap.n_variant), [ap] * ap.n_variant, [validation_data.protein.schmidt2015Data["monomerId"].tolist()] * ap.n_variant, [schmidtCounts] * ap.n_variant)
 		proteomeResult = pool.map(getPCCProteome, args)
 		stop = time.time()
 		cPickle.dump(proteomeResult, open(os.path.join(plotOutDir, plotOutFileName + "_proteome.cPickle"), "w"))
@@ -27,12 +27,12 @@ FONT_SIZE=9
 trim = 0.05
 
 
-def getPCC((variant, ap, toyaReactions, toyaFluxesDict, toyaStdevDict)):
+def getPCC((plot, variant, ap, toyaReactions, toyaFluxesDict, toyaStdevDict)):
 	try:
 
 		simDir = ap.get_cells(variant = [variant])[0]
 
-		sim_data = cPickle.load(open(ap.get_variant_kb(variant), "rb"))
+		sim_data = plot.read_pickle_file(ap.get_variant_kb(variant))
 		cellDensity = sim_data.constants.cellDensity
 
 		simOutDir = os.path.join(simDir, "simOut")
@@ -98,7 +98,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
 		toyaReactions = validation_data.reactionFlux.toya2010fluxes["reactionID"]
 		toyaFluxes = validation_data.reactionFlux.toya2010fluxes["reactionFlux"]
 		toyaStdev = validation_data.reactionFlux.toya2010fluxes["reactionFluxStdev"]
@@ -108,12 +108,12 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		ap = AnalysisPaths(inputDir, variant_plot = True)
 
 		pool = Pool(processes=parallelization.plotter_cpus())
-		args = zip(range(ap.n_variant), [ap] * ap.n_variant, [toyaReactions] * ap.n_variant, [toyaFluxesDict] * ap.n_variant, [toyaStdevDict] * ap.n_variant)
+		args = zip([self] * ap.n_variant, range(ap.n_variant), [ap] * ap.n_variant, [toyaReactions] * ap.n_variant, [toyaFluxesDict] * ap.n_variant, [toyaStdevDict] * ap.n_variant)
 		result = pool.map(getPCC, args)
 		cPickle.dump(result, open("pcc_results_fluxome.cPickle", "w"), cPickle.HIGHEST_PROTOCOL)
 		pool.close()
 		pool.join()
-		result = cPickle.load(open("pcc_results_fluxome.cPickle", "r"))
+		result = self.read_pickle_file("pcc_results_fluxome.cPickle")
 		controlPcc, controlPvalue = result[0]
 		pccs, pvals = zip(*result[1:])
 		pccs = np.array(pccs)
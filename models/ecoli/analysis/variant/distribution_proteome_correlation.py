@@ -25,11 +25,11 @@ FONT_SIZE=9
 trim = 0.05
 
 
-def getPCC((variant, ap, monomerIds, schmidtCounts)):
+def getPCC((plot, variant, ap, monomerIds, schmidtCounts)):
 	try:
 		simDir = ap.get_cells(variant = [variant])[0]
 
-		sim_data = cPickle.load(open(ap.get_variant_kb(variant), "rb"))
+		sim_data = plot.read_pickle_file(ap.get_variant_kb(variant))
 
 		ids_complexation = sim_data.process.complexation.moleculeNames
 		ids_complexation_complexes = sim_data.process.complexation.ids_complexes
@@ -98,14 +98,14 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		if not os.path.exists(plotOutDir):
 			os.mkdir(plotOutDir)
 
-		validation_data = cPickle.load(open(validationDataFile, "rb"))
+		validation_data = self.read_pickle_file(validationDataFile)
 		schmidtCounts = validation_data.protein.schmidt2015Data["glucoseCounts"]
 
 		ap = AnalysisPaths(inputDir, variant_plot = True)
 
 
 		pool = Pool(processes=parallelization.plotter_cpus())
-		args = zip(range(ap.n_variant), [ap] * ap.n_variant, [validation_data.protein.schmidt2015Data["monomerId"].tolist()] * ap.n_variant, [schmidtCounts] * ap.n_variant)
+		args = zip([self] * ap.n_variant, range(ap.n_variant), [ap] * ap.n_variant, [validation_data.protein.schmidt2015Data["monomerId"].tolist()] * ap.n_variant, [schmidtCounts] * ap.n_variant)
 		result = pool.map(getPCC, args)
 		# cPickle.dump(result, open("pcc_results.cPickle", "w"), cPickle.HIGHEST_PROTOCOL)
 		pool.close()
@@ -7,7 +7,6 @@ Glucose mass yield distributions.
 
 from __future__ import absolute_import, division, print_function
 
-import cPickle
 import os
 
 from matplotlib import pyplot as plt
@@ -62,8 +61,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 			print('Not enough variants to analyze')
 			return
 
-		with open(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME), 'rb') as f:
-			sim_data = cPickle.load(f)
+		sim_data = self.read_pickle_file(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME))
 
 		all_yields = []
 		for variant in variants:
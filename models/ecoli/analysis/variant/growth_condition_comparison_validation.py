@@ -2,7 +2,6 @@ from __future__ import absolute_import
 
 
 import os
-import cPickle
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -78,7 +77,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 			print("Total cells: {}".format(len(all_cells)))
 
 			try:
-				sim_data = cPickle.load(open(ap.get_variant_kb(variant)))
+				sim_data = self.read_pickle_file(ap.get_variant_kb(variant))
 			except Exception as e:
 				print "Couldn't load sim_data object. Exiting.", e
 				return
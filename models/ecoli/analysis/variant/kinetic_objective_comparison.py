@@ -6,7 +6,6 @@ Violin plots to compare predicted k_cats of the new list of disabled constraints
 
 from __future__ import absolute_import, division, print_function
 
-import cPickle
 import os
 
 from matplotlib import pyplot as plt
@@ -121,8 +120,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		compared_variants = [old_variant, new_variant]
 
 		# Load sim_data
-		with open(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME), 'rb') as f:
-			sim_data = cPickle.load(f)
+		sim_data = self.read_pickle_file(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME))
 
 		# get reactions from sim_data
 		reactionCatalysts = sim_data.process.metabolism.reactionCatalysts
@@ -7,7 +7,6 @@ variant kinetic_constraints_factorial_experiments.
 
 from __future__ import absolute_import, division, print_function
 
-import cPickle
 import os
 
 import matplotlib.pyplot as plt
@@ -59,13 +58,11 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		n_variants = len(variants)
 
 		# Load sim_data
-		with open(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME), 'rb') as f:
-			sim_data = cPickle.load(f)
+		sim_data = self.read_pickle_file(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME))
 		cell_density = sim_data.constants.cellDensity.asNumber(MASS_UNITS / VOLUME_UNITS)
 
 		# Load validation_data
-		with open(validationDataFile, "rb") as f:
-			validation_data = cPickle.load(f)
+		validation_data = self.read_pickle_file(validationDataFile)
 		toyaReactions = validation_data.reactionFlux.toya2010fluxes["reactionID"]
 		toyaFluxes = validation_data.reactionFlux.toya2010fluxes["reactionFlux"]
 		toyaStdev = validation_data.reactionFlux.toya2010fluxes["reactionFluxStdev"]
@@ -14,7 +14,6 @@ import re
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 from multiprocessing import Pool
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
@@ -38,11 +37,12 @@ OUTLIER_REACTIONS = [
 	]
 
 
-def analyze_variant((variant, ap, toya_reactions, toya_fluxes, outlier_filter)):
+def analyze_variant((plot, variant, ap, toya_reactions, toya_fluxes, outlier_filter)):
 	'''
 	Function to analyze the data for each variant in parallel
 
 	Inputs:
+		plot (Plot object) - the plot, to load sim_data with
 		variant (int) - variant number to analyze
 		ap (AnalysisPaths object)
 		toya_reactions (list of str) - toya reaction IDs
@@ -53,7 +53,7 @@ def analyze_variant((variant, ap, toya_reactions, toya_fluxes, outlier_filter)):
 	n_sims = 0
 
 	# Load sim_data attributes for the given variant
-	sim_data = cPickle.load(open(ap.get_variant_kb(variant), 'rb'))
+	sim_data = plot.read_pickle_file(ap.get_variant_kb(variant))
 	cell_density = sim_data.constants.cellDensity
 	n_avogadro = sim_data.constants.nAvogadro
 	lambdas = sim_data.process.metabolism.kinetic_objective_weight
@@ -211,7 +211,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		filepath.makedirs(plotOutDir)
 
 		# Load validation data
-		validation_data = cPickle.load(open(validationDataFile, 'rb'))
+		validation_data = self.read_pickle_file(validationDataFile)
 		toya_reactions = validation_data.reactionFlux.toya2010fluxes['reactionID']
 		toya_fluxes = np.array([x.asNumber(DCW_FLUX_UNITS) for x in validation_data.reactionFlux.toya2010fluxes['reactionFlux']])
 		outlier_filter = [False if rxn in OUTLIER_REACTIONS else True for rxn in toya_reactions]
@@ -236,6 +236,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		# Pull information from sim data and listeners in parallel
 		pool = Pool(processes=parallelization.plotter_cpus())
 		args = zip(
+			[self] * n_variants,
 			variants,
 			[ap] * n_variants,
 			[toya_reactions] * n_variants,
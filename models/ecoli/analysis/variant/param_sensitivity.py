@@ -12,7 +12,6 @@ from __future__ import absolute_import
 from __future__ import division
 from future_builtins import zip
 
-import cPickle
 import csv
 from multiprocessing import Pool
 import operator
@@ -176,10 +175,8 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 		# Load one instance of sim_data to get number of parameters and ids
 		global sim_data
 		global validation_data
-		with open(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME), 'rb') as f:
-			sim_data = cPickle.load(f)
-		with open(validationDataFile, 'rb') as f:
-			validation_data = cPickle.load(f)
+		sim_data = self.read_pickle_file(os.path.join(inputDir, 'kb', constants.SERIALIZED_FIT1_FILENAME))
+		validation_data = self.read_pickle_file(validationDataFile)
 
 		# sim_data information
 		total_params = np.sum(number_params(sim_data))
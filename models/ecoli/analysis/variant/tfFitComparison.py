@@ -5,7 +5,6 @@ import os
 
 import numpy as np
 from matplotlib import pyplot as plt
-import cPickle
 import scipy.stats
 
 from models.ecoli.analysis.AnalysisPaths import AnalysisPaths
@@ -46,7 +45,7 @@ class Plot(variantAnalysisPlot.VariantAnalysisPlot):
 
 		for variant, simDir in zip(variants, all_cells):
 
-			sim_data = cPickle.load(open(ap.get_variant_kb(variant), "rb"))
+			sim_data = self.read_pickle_file(ap.get_variant_kb(variant))
 			tfList = ["basal (no TF)"] + sorted(sim_data.tfToActiveInactiveConds)
 			simOutDir = os.path.join(simDir, "simOut")
 			tf = tfList[(variant + 1) // 2]
@@ -77,6 +77,10 @@ class FBAResults(wholecell.listeners.listener.Listener):
 		self.succinate_flux_sensitivity = np.zeros(self.n_rxns_sensitivity)
 		self.isocitrate_flux_sensitivity = np.zeros(self.n_rxns_sensitivity)
 
+		# Simplex iterations of this time step's solve, if not skipped
+		self.solverIterations = 0
+		self.solveSkipped = False
+
 
 	def tableCreate(self, tableWriter):
 		tableWriter.writeAttributes(
@@ -105,4 +109,6 @@ class FBAResults(wholecell.listeners.listener.Listener):
 			targetConcentrations = self.targetConcentrations,
 			succinate_flux_sensitivity = self.succinate_flux_sensitivity,
 			isocitrate_flux_sensitivity = self.isocitrate_flux_sensitivity,
+			solverIterations = self.solverIterations,
+			solveSkipped = self.solveSkipped,
 			)
@@ -11,7 +11,7 @@ from __future__ import division
 import numpy as np
 
 import wholecell.processes.process
-from wholecell.utils.polymerize import (buildSequences, polymerize,
+from wholecell.utils.polymerize import (SequenceCache, polymerize,
 	computeMassIncrease)
 from wholecell.utils import units
 
@@ -45,6 +45,11 @@ class ChromosomeReplication(wholecell.processes.process.Process):
 
 		# Create bulk molecule views for polymerization reaction
 		self.dntps = self.bulkMoleculesView(sim_data.moleculeGroups.dNtpIds)
+
+		# Sequences built in calculateRequest, reused in evolveState while the
+		# active replication forks are unchanged
+		self.sequenceCache = SequenceCache(
+			self.sequences, len(sim_data.moleculeGroups.dNtpIds))
 		self.ppi = self.bulkMoleculeView('PPI[c]')
 		self.partialChromosomes = self.bulkMoleculesView(
 			sim_data.moleculeGroups.partialChromosome)
@@ -77,16 +82,12 @@ class ChromosomeReplication(wholecell.processes.process.Process):
 			)
 
 		rates = np.rint(self.elongation_rates * self.timeStepSec()).astype(np.int64)
-		sequences = buildSequences(
-			self.sequences,
+		# Count number of each dNTP in sequences for the next timestep
+		_, sequenceComposition = self.sequenceCache.build(
 			sequenceIdx,
 			sequenceLength,
 			rates)
 
-		# Count number of each dNTP in sequences for the next timestep
-		sequenceComposition = np.bincount(
-			sequences[sequences != polymerize.PAD_VALUE], minlength=4)
-
 		# If one dNTP is limiting then limit the request for the other three by the same ratio
 		dNtpsTotal = self.dntps.total()
 		maxFractionalReactionLimit = (np.fmin(1, dNtpsTotal / sequenceComposition)).min()
@@ -195,8 +196,7 @@ class ChromosomeReplication(wholecell.processes.process.Process):
 			)
 
 		rates = np.rint(self.elongation_rates * self.timeStepSec()).astype(np.int64)
-		sequences = buildSequences(
-			self.sequences,
+		sequences, _ = self.sequenceCache.build(
 			sequenceIdx,
 			sequenceLengths,
 			rates)
@@ -68,17 +68,55 @@ class Equilibrium(wholecell.processes.process.Process):
 		rxnFluxes = self.rxnFluxes.copy()
 		insufficientMetaboliteIdxs = np.where(self.req > moleculeCounts)[0]
 		for insufficientMetaboliteIdx in insufficientMetaboliteIdxs:
-			rxnPosIdxs = np.where(np.logical_and(self.stoichMatrix[insufficientMetaboliteIdx, :] != 0, rxnFluxes > 0))[0]
-			rxnNegIdxs = np.where(np.logical_and(self.stoichMatrix[insufficientMetaboliteIdx, :] != 0, rxnFluxes < 0))[0]
-			while(np.dot(self.stoichMatrix, rxnFluxes)[insufficientMetaboliteIdx] + moleculeCounts[insufficientMetaboliteIdx] < 0):
-				rxnFluxes[rxnPosIdxs] -= 1
-				rxnFluxes[rxnNegIdxs] += 1
-				rxnFluxes[rxnPosIdxs] = np.fmax(0, rxnFluxes[rxnPosIdxs])
-				rxnFluxes[rxnNegIdxs] = np.fmin(0, rxnFluxes[rxnNegIdxs])
+			self._reduceFluxes(rxnFluxes, moleculeCounts, insufficientMetaboliteIdx)
 
 		assert(np.all(moleculeCounts + np.dot(self.stoichMatrix, rxnFluxes) >= 0))
 
 		# Increment changes in molecule counts
 		self.molecules.countsInc(
 			np.dot(self.stoichMatrix, rxnFluxes)
-			)
\ No newline at end of file
+			)
+
+
+	def _reduceFluxes(self, rxnFluxes, moleculeCounts, moleculeIdx):
+		"""
+		Moves the fluxes of the reactions of a molecule toward zero, in
+		place, by the fewest steps of one unit that leave a nonnegative count
+		of the molecule.
+
+		The count is piecewise linear in the number of steps, changing slope
+		where a reaction's flux reaches zero, so the number of steps is found
+		directly in the first segment where the count becomes nonnegative.
+		"""
+		rxnIdxs = np.where((self.stoichMatrix[moleculeIdx, :] != 0) & (rxnFluxes != 0))[0]
+		if rxnIdxs.size == 0:
+			return
+
+		stoich = self.stoichMatrix[moleculeIdx, rxnIdxs]
+		fluxes = rxnFluxes[rxnIdxs]
+		directions = np.sign(fluxes)
+
+		# Count of the molecule at each step where a flux reaches zero
+		steps = np.unique(np.r_[0, np.abs(fluxes)])
+		remainingFluxes = directions * np.fmax(0, np.abs(fluxes) - steps[:, np.newaxis])
+		counts = (
+			moleculeCounts[moleculeIdx]
+			+ np.dot(self.stoichMatrix[moleculeIdx, :], rxnFluxes)
+			+ np.dot(remainingFluxes - fluxes, stoich)
+			)
+
+		# Change in the count per step after each of these steps
+		slopes = -np.dot(remainingFluxes != 0, stoich * directions)
+
+		with np.errstate(divide = "ignore", invalid = "ignore"):
+			stepsNeeded = np.where(
+				counts >= 0,
+				steps,
+				steps + np.ceil(-counts / np.where(slopes > 0, slopes, np.nan))
+				)
+			reachable = np.where(stepsNeeded <= np.r_[steps[1:], np.inf])[0]
+
+		# Reduce all the way to zero if the count can't become nonnegative
+		nSteps = stepsNeeded[reachable[0]] if reachable.size else steps[-1]
+
+		rxnFluxes[rxnIdxs] = directions * np.fmax(0, np.abs(fluxes) - nSteps)
@@ -16,6 +16,8 @@ TODO:
 
 from __future__ import division
 
+import multiprocessing
+
 import numpy as np
 from scipy.sparse import csr_matrix
 
@@ -35,6 +37,10 @@ TIME_UNITS = units.s
 USE_KINETICS = True
 KINETICS_BURN_IN_PERIOD = 0
 
+# Relative changes to FBA bounds and targets smaller than this don't trigger
+# a new solve
+FBA_CHANGE_TOLERANCE = 1e-9
+
 class Metabolism(wholecell.processes.process.Process):
 	""" Metabolism """
 
@@ -159,6 +165,7 @@ class Metabolism(wholecell.processes.process.Process):
 			"solver" : solver,
 			"maintenanceCostGAM" : energyCostPerWetMass.asNumber(COUNTS_UNITS / MASS_UNITS),
 			"maintenanceReaction" : sim_data.process.metabolism.maintenanceReaction,
+			"changeTolerance" : FBA_CHANGE_TOLERANCE,
 		}
 		if not self.use_kinetics:
 			self.fbaObjectOptions["objectiveType"] = "homeostatic"
@@ -207,6 +214,14 @@ class Metabolism(wholecell.processes.process.Process):
 
 		self.run_flux_sensitivity = getattr(sim_data.process.metabolism, 'run_flux_sensitivity', False)
 
+		# Start the processes for flux_sensitivity() once rather than every
+		# time step
+		self.fluxSensitivityProcesses = sim._fluxSensitivityProcesses
+		self.fluxSensitivityPool = None
+		if self.run_flux_sensitivity and self.fluxSensitivityProcesses > 1:
+			self.fluxSensitivityPool = multiprocessing.Pool(
+				self.fluxSensitivityProcesses)
+
 	def calculateRequest(self):
 		self.metabolites.requestAll()
 		self.catalysts.requestAll()
@@ -241,13 +256,20 @@ class Metabolism(wholecell.processes.process.Process):
 
 		updatedObjective = False
 		if newObjective != None and newObjective != self.homeostaticObjective:
-			# Build new fba instance with new objective
+			# Build new fba instance with new objective, warm started from the
+			# basis of the old one
+			basis = self.fba.getBasis()
 			self.fbaObjectOptions["objective"] = newObjective
 			self.fba = FluxBalanceAnalysis(**self.fbaObjectOptions)
+			if basis is not None:
+				self.fba.setBasis(basis)
 			self.internalExchangeIdxs = np.array([self.metaboliteNamesFromNutrients.index(x) for x in self.fba.getOutputMoleculeIDs()])
 			self.homeostaticObjective = newObjective
 			updatedObjective = True
 
+		iterationCountInit = self.fba.getIterationCount()
+		solveCountInit = self.fba.getSolveCount()
+
 		# After completing the burn-in, enable kinetic rates
 		if self.use_kinetics and (not self.burnInComplete) and (self._sim.time() > KINETICS_BURN_IN_PERIOD):
 			self.burnInComplete = True
@@ -338,7 +360,7 @@ class Metabolism(wholecell.processes.process.Process):
 		# Runs sensitivity if option is set
 		# Needs to be after all FBA problem setup but will not affect simulation
 		if self.run_flux_sensitivity:
-			self.flux_sensitivity(metaboliteConcentrations, externalMoleculeLevels, catalyzedReactionBounds, targets, coefficient)
+			self.flux_sensitivity(targets, coefficient)
 
 		# Solve FBA problem and update metabolite counts
 		deltaMetabolites = (1 / countsToMolar) * (COUNTS_UNITS / VOLUME_UNITS * self.fba.getOutputMoleculeLevelsChange())
@@ -363,6 +385,8 @@ class Metabolism(wholecell.processes.process.Process):
 		self.writeToListener("FBAResults", "targetConcentrations", [self.homeostaticObjective[mol] for mol in self.fba.getHomeostaticTargetMolecules()])
 		self.writeToListener("FBAResults", "homeostaticObjectiveValues", self.fba.getHomeostaticObjectiveValues())
 		self.writeToListener("FBAResults", "kineticObjectiveValues", self.fba.getKineticObjectiveValues())
+		self.writeToListener("FBAResults", "solverIterations", self.fba.getIterationCount() - iterationCountInit)
+		self.writeToListener("FBAResults", "solveSkipped", self.fba.getSolveCount() == solveCountInit)
 
 		self.writeToListener("EnzymeKinetics", "metaboliteCountsInit", metaboliteCountsInit)
 		self.writeToListener("EnzymeKinetics", "metaboliteCountsFinal", metaboliteCountsFinal)
@@ -374,18 +398,30 @@ class Metabolism(wholecell.processes.process.Process):
 		self.writeToListener("EnzymeKinetics", "targetFluxes", targets / self.timeStepSec())
 		self.writeToListener("EnzymeKinetics", "reactionConstraint", reactionConstraint[self.active_constraints_mask])
 
-	def flux_sensitivity(self, metaboliteConcentrations, externalMoleculeLevels, catalyzedReactionBounds, targets, coefficient):
+	def finalize(self):
+		if self.fluxSensitivityPool is not None:
+			self.fluxSensitivityPool.close()
+			self.fluxSensitivityPool.join()
+			self.fluxSensitivityPool = None
+
+	def terminate(self):
+		if self.fluxSensitivityPool is not None:
+			self.fluxSensitivityPool.terminate()
+			self.fluxSensitivityPool.join()
+			self.fluxSensitivityPool = None
+
+	def flux_sensitivity(self, targets, coefficient):
 		"""
 		Sensitivity performed with flux_sensitivity variant simulations.  Disables
 		kinetic constraints one by one to determine impact on certain fluxes.
 
+		Each disabled constraint is a scenario solved on a copy of this time
+		step's FBA problem (which already has this time step's metabolite
+		levels and catalyst bounds), warm started from its solution.  They're
+		solved in the fluxSensitivityProcesses simulation option's number of
+		processes, sequentially by default.
+
 		Args:
-			metaboliteConcentrations (ndarray[float] with mol/volume units):
-				concentrations for all metabolites
-			externalMoleculeLevels (ndarray[float]): limits for external
-				molecule exchanges
-			catalyzedReactionBounds (ndarray[float]): max limit for each
-				enzyme catalyzed reaction
 			targets (ndarray[float]): flux target for each reaction with a
 				kinetic constraint
 			coefficient (float with mass-time/volume units): conversion factor
@@ -395,31 +431,31 @@ class Metabolism(wholecell.processes.process.Process):
 		succ_rxn = 'SUCCINATE-DEHYDROGENASE-UBIQUINONE-RXN-SUC/UBIQUINONE-8//FUM/CPD-9956.31.'
 		iso_rxn = 'ISOCITDEH-RXN'
 
-		succ_flux = []
-		iso_flux = []
-		for rxn in self.kineticsConstrainedReactions:
-			fba = FluxBalanceAnalysis(**self.fbaObjectOptions)
-			fba.enableKineticTargets()
-			fba.setInternalMoleculeLevels(metaboliteConcentrations.asNumber(COUNTS_UNITS / VOLUME_UNITS))
-			self._setExternalMoleculeLevels(fba, externalMoleculeLevels, metaboliteConcentrations)
-			flux = (self.ngam * coefficient).asNumber(COUNTS_UNITS / VOLUME_UNITS)
-			fba.setReactionFluxBounds(fba._reactionID_NGAM, lowerBounds=flux, upperBounds=flux)
-			flux = self.currentPolypeptideElongationEnergy.asNumber(COUNTS_UNITS / VOLUME_UNITS)
-			fba.setReactionFluxBounds(self.fba._reactionID_polypeptideElongationEnergy, lowerBounds=flux, upperBounds=flux)
-			fba.setReactionFluxBounds(self.reactionsWithCatalystsList, upperBounds=catalyzedReactionBounds, raiseForReversible=False)
-			fba.setKineticTarget(self.kineticsConstrainedReactions, targets, raiseForReversible = False)
-			fba.disableKineticTargets(rxn)
-
-			# Fluxes of interest for each disabled constraint
-			succ_flux += [((COUNTS_UNITS / VOLUME_UNITS) * fba.getReactionFluxes(succ_rxn)[0] / coefficient).asNumber(units.mmol / units.g / units.h)]
-			iso_flux += [((COUNTS_UNITS / VOLUME_UNITS) * fba.getReactionFluxes(iso_rxn)[0] / coefficient).asNumber(units.mmol / units.g / units.h)]
+		# Changes from the current problem shared by all scenarios
+		ngam = (self.ngam * coefficient).asNumber(COUNTS_UNITS / VOLUME_UNITS)
+		polypeptideElongationEnergy = self.currentPolypeptideElongationEnergy.asNumber(COUNTS_UNITS / VOLUME_UNITS)
+		setup = [
+			("enableKineticTargets", (self.kineticsConstrainedReactions,)),
+			("setReactionFluxBounds", (self.fba._reactionID_NGAM, ngam, ngam)),
+			("setReactionFluxBounds", (self.fba._reactionID_polypeptideElongationEnergy,
+				polypeptideElongationEnergy, polypeptideElongationEnergy)),
+			("setKineticTarget", (self.kineticsConstrainedReactions, targets, False)),
+			]
+		scenarios = [
+			setup + [("disableKineticTargets", (rxn,))]
+			for rxn in self.kineticsConstrainedReactions
+			]
+
+		fluxes = self.fba.solveScenarios(scenarios, [succ_rxn, iso_rxn],
+			processes=self.fluxSensitivityProcesses,
+			pool=self.fluxSensitivityPool)
 
 		# Fluxes of interest for the original simulation
-		succ_flux += [((COUNTS_UNITS / VOLUME_UNITS) * self.fba.getReactionFluxes(succ_rxn)[0] / coefficient).asNumber(units.mmol / units.g / units.h)]
-		iso_flux += [((COUNTS_UNITS / VOLUME_UNITS) * self.fba.getReactionFluxes(iso_rxn)[0] / coefficient).asNumber(units.mmol / units.g / units.h)]
+		fluxes = np.vstack((fluxes, self.fba.getReactionFluxes([succ_rxn, iso_rxn])))
+		fluxes = ((COUNTS_UNITS / VOLUME_UNITS) * fluxes / coefficient).asNumber(units.mmol / units.g / units.h)
 
-		self.writeToListener('FBAResults', 'succinate_flux_sensitivity', np.array(succ_flux))
-		self.writeToListener('FBAResults', 'isocitrate_flux_sensitivity', np.array(iso_flux))
+		self.writeToListener('FBAResults', 'succinate_flux_sensitivity', fluxes[:, 0])
+		self.writeToListener('FBAResults', 'isocitrate_flux_sensitivity', fluxes[:, 1])
 
 	# limit amino acid uptake to what is needed to meet concentration objective to prevent use as carbon source
 	def _setExternalMoleculeLevels(self, fba, externalMoleculeLevels, metaboliteConcentrations):
@@ -22,7 +22,7 @@ import copy
 import re
 
 import wholecell.processes.process
-from wholecell.utils.polymerize import buildSequences, polymerize, computeMassIncrease
+from wholecell.utils.polymerize import SequenceCache, polymerize, computeMassIncrease
 from wholecell.utils.random import stochasticRound
 from wholecell.utils import units
 
@@ -72,6 +72,11 @@ class PolypeptideElongation(wholecell.processes.process.Process):
 
 		# Create views onto all polymerization reaction small molecules
 		self.aas = self.bulkMoleculesView(sim_data.moleculeGroups.aaIDs)
+
+		# Sequences built in calculateRequest, reused in evolveState while the
+		# active ribosomes are unchanged
+		self.sequenceCache = SequenceCache(
+			self.proteinSequences, len(sim_data.moleculeGroups.aaIDs))
 		self.h2o = self.bulkMoleculeView('WATER[c]')
 		self.gtp = self.bulkMoleculeView("GTP[c]")
 		self.gdp = self.bulkMoleculeView("GDP[c]")
@@ -127,15 +132,11 @@ class PolypeptideElongation(wholecell.processes.process.Process):
 			'proteinIndex',
 			'peptideLength')
 
-		sequences = buildSequences(
-			self.proteinSequences,
+		_, aasInSequences = self.sequenceCache.build(
 			proteinIndexes,
 			peptideLengths,
 			self.elongation_rates)
 
-		sequenceHasAA = (sequences != polymerize.PAD_VALUE)
-		aasInSequences = np.bincount(sequences[sequenceHasAA], minlength=21)
-
 		if self.translationSupply:
 			translationSupplyRate = self.translation_aa_supply[current_nutrients] * self.elngRateFactor
 
@@ -187,17 +188,13 @@ class PolypeptideElongation(wholecell.processes.process.Process):
 			'proteinIndex', 'peptideLength', 'massDiff_protein'
 			)
 
-		sequences = buildSequences(
-			self.proteinSequences,
+		sequences, aaCountInSequence = self.sequenceCache.build(
 			proteinIndexes,
 			peptideLengths,
 			self.elongation_rates)
 
 		if sequences.size == 0:
 			return
-
-		# Calculate elongation resource capacity
-		aaCountInSequence = np.bincount(sequences[(sequences != polymerize.PAD_VALUE)])
 		aaCounts = self.aas.counts()
 
 		# Using polymerization algorithm elongate each ribosome up to the limits
@@ -299,30 +296,33 @@ class PolypeptideElongation(wholecell.processes.process.Process):
 		Assumes GTP is the readout for failed translation with respect to the timestep.
 		"""
 
+		return inputTimeStep <= self.maxTimeStep(timeStepSafetyFraction)
+
+	def maxTimeStep(self, timeStepSafetyFraction):
+		"""
+		Returns the longest timestep for which the expected GTP usage (with a
+		safety margin) stays within the GTP available.
+		"""
+
 		# Until more padding values are added to the protein sequence matrix, limit the maximum timestep length to 1 second
 		# Since the current upper limit on a.a's elongated by ribosomes during a single timestep is set to 22, timesteps
 		# longer than 1.0s do not lead to errors, but does slow down the ribosome elongation rate of the resulting simulation.
 		# Must be modified if timesteps longer than 1.0s are desired.
-		if inputTimeStep > 1.0:
-			return False
+		maxTimeStep = 1.0
 
 		activeRibosomes = float(self.activeRibosomes.total()[0])
 		self.gtpAvailable = float(self.gtp.total()[0])
 
 		# Without an estimate on ribosome counts, require a short timestep until estimates available
 		if activeRibosomes == 0:
-			if inputTimeStep <= .2:
-				return True
-			else:
-				return False
+			return .2
 
-		dt = inputTimeStep * timeStepSafetyFraction
-		gtpExpectedUsage = activeRibosomes * self.ribosomeElongationRate * self.gtpPerElongation * dt
+		gtpUsageRate = activeRibosomes * self.ribosomeElongationRate * self.gtpPerElongation * timeStepSafetyFraction
 
-		if gtpExpectedUsage < self.gtpAvailable:
-			return True
-		else:
-			return False
+		if gtpUsageRate > 0:
+			maxTimeStep = min(maxTimeStep, self.gtpAvailable / gtpUsageRate)
+
+		return maxTimeStep
 
 	def wasTimeStepShortEnough(self):
 		"""
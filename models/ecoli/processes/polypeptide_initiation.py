@@ -163,8 +163,8 @@ class PolypeptideInitiation(wholecell.processes.process.Process):
 		return activationProb
 
 	def isTimeStepShortEnough(self, inputTimeStep, timeStepSafetyFraction):
-		# Return false if timestep is longer than 1.7s. Timesteps longer than 1.8s will lower the fraction of activated ribosomes
-		if inputTimeStep > 1.7:
-			return False
-		else:
-			return True
+		return inputTimeStep <= self.maxTimeStep(timeStepSafetyFraction)
+
+	def maxTimeStep(self, timeStepSafetyFraction):
+		# Timesteps longer than 1.8s will lower the fraction of activated ribosomes
+		return 1.7
@@ -45,6 +45,7 @@ import random
 
 import wholecell.processes.process
 from wholecell.utils.constants import REQUEST_PRIORITY_DEGRADATION
+from wholecell.utils.random import multinomialCapped
 from wholecell.utils import units
 
 class RnaDegradation(wholecell.processes.process.Process):
@@ -62,28 +63,19 @@ class RnaDegradation(wholecell.processes.process.Process):
 
 		rnaIds = sim_data.process.transcription.rnaData['id']
 
-		# Load constants
-		self.nAvogadro = sim_data.constants.nAvogadro
-		self.cellDensity = sim_data.constants.cellDensity
+		# Load constants. Quantities are stored without units, in mol, L, fg,
+		# and s, to keep unit arithmetic out of each time step.
+		self.nAvogadro = sim_data.constants.nAvogadro.asNumber(1 / units.mol)
+		self.cellDensity = sim_data.constants.cellDensity.asNumber(units.fg / units.L)
 
 		# Load RNase kinetic data
 		endoRnaseIds = sim_data.process.rna_decay.endoRnaseIds
 		exoRnaseIds = sim_data.moleculeGroups.exoRnaseIds
-		self.KcatExoRNase = sim_data.constants.KcatExoRNase
-		self.KcatEndoRNases = sim_data.process.rna_decay.kcats
-
-		# Load RNase specificity
-		self.TargetEndoRNasesFullMRNA_indexes = sim_data.process.rna_decay.TargetEndoRNasesFullMRNA
-		self.TargetEndoRNasesFullTRNA_indexes = sim_data.process.rna_decay.TargetEndoRNasesFullTRNA
-		self.TargetEndoRNasesFullRRNA_indexes = sim_data.process.rna_decay.TargetEndoRNasesFullRRNA
-
-		self.mrna_index = sim_data.process.rna_decay.mrna_index
-		self.trna_index = sim_data.process.rna_decay.trna_index
-		self.rrna_index = sim_data.process.rna_decay.rrna_index
-		self.rtrna_index = sim_data.process.rna_decay.rtrna_index
+		self.KcatExoRNase = sim_data.constants.KcatExoRNase.asNumber(1 / units.s)
+		self.KcatEndoRNases = sim_data.process.rna_decay.kcats.asNumber(1 / units.s)
 
 		# Load first-order RNA degradation rates (estimated by mRNA half-life data)
-		self.rnaDegRates = sim_data.process.transcription.rnaData['degRate']
+		self.rnaDegRates = sim_data.process.transcription.rnaData['degRate'].asNumber(1 / units.s)
 
 		shuffleIdxs = None
 		if hasattr(sim_data.process.transcription, "rnaDegRateShuffleIdxs") and sim_data.process.transcription.rnaDegRateShuffleIdxs is not None:
@@ -131,7 +123,7 @@ class RnaDegradation(wholecell.processes.process.Process):
 		self.bulkMoleculesRequestPriorityIs(REQUEST_PRIORITY_DEGRADATION)
 
 		# Load Michaelis-Menten constants fitted to recapitulate first-order RNA decay model
-		self.Km = sim_data.process.transcription.rnaData["KmEndoRNase"]
+		self.Km = sim_data.process.transcription.rnaData["KmEndoRNase"].asNumber(units.mol / units.L)
 
 		self.EndoRNaseCoop = sim_data.constants.EndoRNaseCooperation
 		self.EndoRNaseFunc = sim_data.constants.EndoRNaseFunction
@@ -139,9 +131,9 @@ class RnaDegradation(wholecell.processes.process.Process):
 
 	def calculateRequest(self):
 
-		# Compute factor that convert counts into concentration, and viceversa 
-		cellMass = (self.readFromListener("Mass", "cellMass") * units.fg)
-		cellVolume = cellMass / self.cellDensity
+		# Compute factor that convert counts into concentration (mol/L), and viceversa
+		cellMass = self.readFromListener("Mass", "cellMass") # fg
+		cellVolume = cellMass / self.cellDensity # L
 		countsToMolar = 1 / (self.nAvogadro * cellVolume)
 
 		# View RNAs
@@ -150,106 +142,56 @@ class RnaDegradation(wholecell.processes.process.Process):
 		rnasTotal[[self.rrlaIdx, self.rrfaIdx]] += self.ribosome50S.total()
 		rnasTotal[[self.rrlaIdx, self.rrfaIdx, self.rrsaIdx]] += self.activeRibosomes.total()
 
+		rnaConcentrations = countsToMolar * rnasTotal
 
 		# Calculate endoRNase active fraction based on Michaelis-Menten kinetics
 		if not self.EndoRNaseCoop:
-			fracEndoRnaseSaturated = countsToMolar * rnasTotal / (self.Km + (countsToMolar * rnasTotal))
+			fracEndoRnaseSaturated = rnaConcentrations / (self.Km + rnaConcentrations)
 
 		# Calculate endoRNase active fraction based on generalized Michaelis-Menten kinetics
 		if self.EndoRNaseCoop:
-			fracEndoRnaseSaturated = (countsToMolar * rnasTotal) / self.Km / (1 + units.sum((countsToMolar * rnasTotal) / self.Km))
-		
-		Kd = self.rnaDegRates
-		Kcat = self.KcatEndoRNases
-		EndoR = sum(self.endoRnases.total())
-		RNA = rnasTotal
-		FractDiffRNAdecay = units.sum(units.abs(Kd * RNA - units.sum(self.KcatEndoRNases * self.endoRnases.total()) * fracEndoRnaseSaturated))
-		FractEndoRRnaCounts = EndoR.astype(float) / sum(RNA.astype(float))
-
-		# Calculate total counts of RNAs to degrade according to
-		# the total counts of active endoRNases and their cleavage activity
-		nRNAsTotalToDegrade = np.round((units.sum(self.KcatEndoRNases * self.endoRnases.total()) * fracEndoRnaseSaturated * (units.s * self.timeStepSec())).asNumber().sum())
-
-		# Dissect RNAse specificity into mRNA, tRNA, and rRNA
-		MrnaSpec = units.sum(fracEndoRnaseSaturated * self.isMRna)
-		TrnaSpec = units.sum(fracEndoRnaseSaturated * self.isTRna)
-		RrnaSpec = units.sum(fracEndoRnaseSaturated * self.isRRna)
-
-		TargetEndoRNasesFullMRNA = np.zeros_like(self.TargetEndoRNasesFullMRNA_indexes)
-		TargetEndoRNasesFullMRNA[self.TargetEndoRNasesFullMRNA_indexes == self.mrna_index] = MrnaSpec
-		TargetEndoRNasesFullMRNA[self.TargetEndoRNasesFullMRNA_indexes == 0] = 0
-		TargetEndoRNasesFullMRNA[self.TargetEndoRNasesFullMRNA_indexes == 1] = 1
-
-		TargetEndoRNasesFullTRNA = np.zeros_like(self.TargetEndoRNasesFullTRNA_indexes)
-		TargetEndoRNasesFullTRNA[self.TargetEndoRNasesFullTRNA_indexes == self.trna_index] = TrnaSpec
-		TargetEndoRNasesFullTRNA[self.TargetEndoRNasesFullTRNA_indexes == 0] = 0
-		TargetEndoRNasesFullTRNA[self.TargetEndoRNasesFullTRNA_indexes == 1] = 1
-
-		TargetEndoRNasesFullRRNA = np.zeros_like(self.TargetEndoRNasesFullRRNA_indexes)
-		TargetEndoRNasesFullRRNA[self.TargetEndoRNasesFullRRNA_indexes == self.rrna_index] = RrnaSpec
-		TargetEndoRNasesFullRRNA[self.TargetEndoRNasesFullRRNA_indexes == self.rtrna_index] = RrnaSpec + TrnaSpec
-		TargetEndoRNasesFullRRNA[self.TargetEndoRNasesFullRRNA_indexes == 0] = 0
-		TargetEndoRNasesFullRRNA[self.TargetEndoRNasesFullRRNA_indexes == 1] = 1
-
-
-		# Dissect total counts of RNA degraded into mRNA, tRNA, and rRNA 
-		TargetEndoRNasesFullMRNA = MrnaSpec
-		TargetEndoRNasesFullTRNA = TrnaSpec
-		TargetEndoRNasesFullRRNA = RrnaSpec
-
-		nMRNAsTotalToDegrade = np.round(sum(TargetEndoRNasesFullMRNA *
-				self.endoRnases.total() * 
-				self.KcatEndoRNases * (units.s * self.timeStepSec())).asNumber()
-			)
-		nTRNAsTotalToDegrade = np.round(sum(TargetEndoRNasesFullTRNA *
-				self.endoRnases.total() * 
-				self.KcatEndoRNases * (units.s * self.timeStepSec())).asNumber()
-			)
-		nRRNAsTotalToDegrade = np.round(sum(TargetEndoRNasesFullRRNA *
-				self.endoRnases.total() * 
-				self.KcatEndoRNases * (units.s * self.timeStepSec())).asNumber()
-			)
-		if nRNAsTotalToDegrade != nMRNAsTotalToDegrade + nTRNAsTotalToDegrade + nRRNAsTotalToDegrade:
-			nRNAsTotalToDegrade = nMRNAsTotalToDegrade + nTRNAsTotalToDegrade + nRRNAsTotalToDegrade
+			fracEndoRnaseSaturated = rnaConcentrations / self.Km / (1 + (rnaConcentrations / self.Km).sum())
 
-		# Compute RNAse specificity
-		RNAspecificity = (fracEndoRnaseSaturated / units.sum(fracEndoRnaseSaturated)).asNumber()
+		# Total cleavage capacity of the endoRNases (1/s)
+		endoRnaseCounts = self.endoRnases.total()
+		endoCapacity = (self.KcatEndoRNases * endoRnaseCounts).sum()
 
-		nRNAsToDegrade = np.zeros(len(RNAspecificity))
-		nMRNAsToDegrade = np.zeros(len(RNAspecificity))
-		nTRNAsToDegrade = np.zeros(len(RNAspecificity))
-		nRRNAsToDegrade = np.zeros(len(RNAspecificity))
-		
-		# Boolean variable (nRNAs) that tracks availability of RNAs for a given gene
-		nRNAs = rnasTotal.astype(np.bool)
+		FractDiffRNAdecay = np.abs(self.rnaDegRates * rnasTotal - endoCapacity * fracEndoRnaseSaturated).sum()
+		FractEndoRRnaCounts = endoRnaseCounts.sum() / float(rnasTotal.sum())
 
+		# Dissect RNAse specificity into mRNA, tRNA, and rRNA
+		MrnaSpec = fracEndoRnaseSaturated[self.isMRna].sum()
+		TrnaSpec = fracEndoRnaseSaturated[self.isTRna].sum()
+		RrnaSpec = fracEndoRnaseSaturated[self.isRRna].sum()
 
-		# Determine mRNAs to be degraded according to RNA specificities and total counts of mRNAs degraded
-		while nMRNAsToDegrade.sum() < nMRNAsTotalToDegrade and (rnasTotal * self.isMRna).sum() != 0:
-			nMRNAsToDegrade += np.fmin(
-					self.randomState.multinomial(nMRNAsTotalToDegrade - nMRNAsToDegrade.sum(), 1. / sum(RNAspecificity * self.isMRna * nRNAs) * RNAspecificity * self.isMRna * nRNAs),
-					rnasTotal * self.isMRna
-				)
+		# Dissect total counts of RNA degraded into mRNA, tRNA, and rRNA
+		# according to the total counts of active endoRNases and their
+		# cleavage activity
+		nMRNAsTotalToDegrade = np.round(MrnaSpec * endoCapacity * self.timeStepSec())
+		nTRNAsTotalToDegrade = np.round(TrnaSpec * endoCapacity * self.timeStepSec())
+		nRRNAsTotalToDegrade = np.round(RrnaSpec * endoCapacity * self.timeStepSec())
 
-		# Determine tRNAs and rRNAs to be degraded (with equal specificity) depending on total counts degraded, respectively 
-		while nTRNAsToDegrade.sum() < nTRNAsTotalToDegrade and (rnasTotal * self.isTRna).sum() != 0:
-			nTRNAsToDegrade += np.fmin(
-					self.randomState.multinomial(nTRNAsTotalToDegrade - nTRNAsToDegrade.sum(), 1. / sum(self.isTRna * nRNAs) * self.isTRna * nRNAs),
-					rnasTotal * self.isTRna
-				)
-		while nRRNAsToDegrade.sum() < nRRNAsTotalToDegrade and (rnasTotal * self.isRRna).sum() != 0:
-			nRRNAsToDegrade += np.fmin(
-					self.randomState.multinomial(nRRNAsTotalToDegrade - nRRNAsToDegrade.sum(),  1. / sum(self.isRRna * nRNAs) * self.isRRna * nRNAs),
-					rnasTotal * self.isRRna
-				)
-
-		nRNAsToDegrade = nMRNAsToDegrade + nTRNAsToDegrade + nRRNAsToDegrade
+		# Compute RNAse specificity
+		RNAspecificity = fracEndoRnaseSaturated / fracEndoRnaseSaturated.sum()
+
+		# Determine mRNAs to be degraded according to RNA specificities and
+		# total counts of mRNAs degraded, and tRNAs and rRNAs (with equal
+		# specificity) depending on total counts degraded, respectively, never
+		# degrading more of an RNA than there is
+		nRNAsToDegrade = (
+			multinomialCapped(self.randomState, nMRNAsTotalToDegrade,
+				RNAspecificity * self.isMRna, rnasTotal * self.isMRna)
+			+ multinomialCapped(self.randomState, nTRNAsTotalToDegrade,
+				self.isTRna, rnasTotal * self.isTRna)
+			+ multinomialCapped(self.randomState, nRRNAsTotalToDegrade,
+				self.isRRna, rnasTotal * self.isRRna)
+			)
 
 		# First order decay with non-functional EndoRNase activity 
 		# Determine mRNAs to be degraded by sampling a Poisson distribution (Kdeg * RNA)
 		if not self.EndoRNaseFunc:
 			nRNAsToDegrade = np.fmin(
-				self.randomState.poisson( (self.rnaDegRates * rnasTotal).asNumber() ),
+				self.randomState.poisson(self.rnaDegRates * rnasTotal),
 				self.rnas.total()
 				)
 
@@ -265,8 +207,8 @@ class RnaDegradation(wholecell.processes.process.Process):
 		waterForLeftOverFragments = self.fragmentBases.total().sum()
 		self.h2o.requestIs(waterForNewRnas + waterForLeftOverFragments)
 
-		self.writeToListener("RnaDegradationListener", "FractionActiveEndoRNases", sum(fracEndoRnaseSaturated))
-		self.writeToListener("RnaDegradationListener", "DiffRelativeFirstOrderDecay", FractDiffRNAdecay.asNumber())
+		self.writeToListener("RnaDegradationListener", "FractionActiveEndoRNases", fracEndoRnaseSaturated.sum())
+		self.writeToListener("RnaDegradationListener", "DiffRelativeFirstOrderDecay", FractDiffRNAdecay)
 		self.writeToListener("RnaDegradationListener", "FractEndoRRnaCounts", FractEndoRRnaCounts)
 
 	def evolveState(self):
@@ -309,7 +251,7 @@ class RnaDegradation(wholecell.processes.process.Process):
 		# Note: Lack of -OH on 3' end of chain
 
 		nExoRNases = self.exoRnases.counts()
-		exoCapacity = nExoRNases.sum() * self.KcatExoRNase * (units.s * self.timeStepSec())
+		exoCapacity = nExoRNases.sum() * self.KcatExoRNase * self.timeStepSec()
 		NucleotideRecycling = self.fragmentBases.counts().sum()
 
 		if exoCapacity >= self.fragmentBases.counts().sum():
@@ -19,7 +19,7 @@ from __future__ import division
 import numpy as np
 
 import wholecell.processes.process
-from wholecell.utils.polymerize import buildSequences, polymerize, computeMassIncrease
+from wholecell.utils.polymerize import SequenceCache, polymerize, computeMassIncrease
 from wholecell.utils import units
 from wholecell.utils.random import stochasticRound
 
@@ -48,6 +48,10 @@ class TranscriptElongation(wholecell.processes.process.Process):
 		self.activeRnaPolys = self.uniqueMoleculesView('activeRnaPoly')
 		self.bulkRnas = self.bulkMoleculesView(self.rnaIds)
 		self.ntps = self.bulkMoleculesView(["ATP[c]", "CTP[c]", "GTP[c]", "UTP[c]"])
+
+		# Sequences built in calculateRequest, reused in evolveState while the
+		# active RNA polymerases are unchanged
+		self.sequenceCache = SequenceCache(self.rnaSequences, 4)
 		self.ppi = self.bulkMoleculeView('PPI[c]')
 		self.inactiveRnaPolys = self.bulkMoleculeView("APORNAP-CPLX[c]")
 		self.flat_elongation = not sim._variable_elongation_transcription
@@ -72,14 +76,11 @@ class TranscriptElongation(wholecell.processes.process.Process):
 
 		# Determine total possible sequences of nucleotides that can be transcribed in this time step for each polymerase
 		rnaIndexes, transcriptLengths = activeRnaPolys.attrs('rnaIndex', 'transcriptLength')
-		sequences = buildSequences(
-			self.rnaSequences,
+		_, sequenceComposition = self.sequenceCache.build(
 			rnaIndexes,
 			transcriptLengths,
 			self.elongation_rates)
 
-		sequenceComposition = np.bincount(sequences[sequences != polymerize.PAD_VALUE], minlength = 4)
-
 		# Calculate if any nucleotides are limited and request up to the number in the sequences or number available
 		ntpsTotal = self.ntps.total()
 		maxFractionalReactionLimit = np.fmin(1, ntpsTotal / sequenceComposition)
@@ -98,14 +99,11 @@ class TranscriptElongation(wholecell.processes.process.Process):
 
 		# Determine sequences that can be elongated
 		rnaIndexes, transcriptLengths, massDiffRna = activeRnaPolys.attrs('rnaIndex', 'transcriptLength', 'massDiff_mRNA')
-		sequences = buildSequences(
-			self.rnaSequences,
+		sequences, ntpCountInSequence = self.sequenceCache.build(
 			rnaIndexes,
 			transcriptLengths,
 			self.elongation_rates)
 
-		ntpCountInSequence = np.bincount(sequences[sequences != polymerize.PAD_VALUE], minlength = 4)
-
 		# Polymerize transcripts based on sequences and available nucleotides
 		reactionLimit = ntpCounts.sum()
 		active_elongation_rates = self.elongation_rates[rnaIndexes]
@@ -426,6 +426,15 @@ def setDaughterInitialConditions(sim, sim_data):
 		sim.processes["PolypeptideElongation"].setElngRate = elngRate
 		sim.processes["PolypeptideElongation"].elngRateFactor = elng_rate_factor
 
+	# Warm start metabolism from the mother cell's FBA basis (missing for
+	# mother cells simulated before it was saved)
+	fba_basis_path = os.path.join(sim._inheritedStatePath, "FBABasis.cPickle")
+	if os.path.exists(fba_basis_path):
+		with open(fba_basis_path, "rb") as f:
+			fba_basis = cPickle.load(f)
+		if fba_basis is not None:
+			sim.processes["Metabolism"].fba.setBasis(fba_basis)
+
 	bulk_table_reader = TableReader(os.path.join(sim._inheritedStatePath, "BulkMolecules"))
 	sim.internal_states["BulkMolecules"].tableLoad(bulk_table_reader, 0)
 
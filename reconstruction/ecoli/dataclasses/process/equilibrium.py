@@ -2,10 +2,6 @@
 Equilibrium.
 
 TODOs:
-_populateDerivativeAndJacobian()
-	Decide if this caching is worthwhile
-	Assumes a directory structure
-
 fluxesAndMoleculesToSS()
 	Consider relocating (since it's useful for both the fitter and simulation)
 """
@@ -13,13 +9,9 @@ fluxesAndMoleculesToSS()
 from __future__ import absolute_import
 
 import numpy as np
-import os
-import cPickle
-import wholecell
-from wholecell.utils import filepath
 from wholecell.utils import units
-from wholecell.utils.write_ode_file import writeOdeFileWithRates
-import sympy as sp
+from wholecell.utils.code_cache import CachedFunction
+from wholecell.utils.write_ode_file import massActionOdeSource
 
 class EquilibriumError(Exception):
 	pass
@@ -142,9 +134,8 @@ class Equilibrium(object):
 		self._makeMatrices()
 		self._populateDerivativeAndJacobian()
 		self._complexIdxs = np.where(np.any(self.stoichMatrix() > 0, axis=1))[0]
-		self._monomerIdxs = [np.where(x < 0)[0] for x in self.stoichMatrix().T]
-		self._rxnNonZeroIdxs = [np.where(x != 0)[0] for x in self.stoichMatrix().T]
 		self._stoichMatrix = self.stoichMatrix()
+		self._stoichMatrixNonZeroIdxs = np.nonzero(self._stoichMatrix)
 		self._stoichMatrixMonomers = self.stoichMatrixMonomers()
 
 	def stoichMatrix(self):
@@ -215,58 +206,12 @@ class Equilibrium(object):
 
 	def _populateDerivativeAndJacobian(self):
 		'''
-		Creates callable functions for computing the derivative and the Jacobian.
+		Creates callable functions for computing the derivative and the Jacobian,
+		loaded from the code cache.
 		'''
-		fixturesDir = filepath.makedirs(
-			os.path.dirname(os.path.dirname(wholecell.__file__)),
-			"fixtures",
-			"equilibrium"
-			)
-		odeFile = os.path.join(
-			os.path.dirname(os.path.dirname(wholecell.__file__)),
-			"reconstruction", "ecoli", "dataclasses", "process", "equilibrium_odes.py"
-			)
-
-		needToCreate = False
-
-		if not os.path.exists(odeFile):
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "S.cPickle")):
-			S = cPickle.load(open(os.path.join(fixturesDir, "S.cPickle"), "rb"))
-			if not np.all(S == self.stoichMatrix()):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "ratesFwd.cPickle")):
-			ratesFwd =  cPickle.load(open(os.path.join(fixturesDir, "ratesFwd.cPickle"), "rb"))
-			if not np.all(ratesFwd == self.ratesFwd):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "ratesRev.cPickle")):
-			ratesRev =  cPickle.load(open(os.path.join(fixturesDir, "ratesRev.cPickle"), "rb"))
-			if not np.all(ratesRev == self.ratesRev):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if needToCreate:
-			self._makeMatrices()
-			self._makeDerivative()
-			writeOdeFileWithRates(odeFile, self.derivativesSymbolic, self.derivativesJacobianSymbolic)
-			import reconstruction.ecoli.dataclasses.process.equilibrium_odes
-			self.derivatives = reconstruction.ecoli.dataclasses.process.equilibrium_odes.derivatives
-			self.derivativesJacobian = reconstruction.ecoli.dataclasses.process.equilibrium_odes.derivativesJacobian
-			cPickle.dump(self.stoichMatrix(), open(os.path.join(fixturesDir, "S.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-			cPickle.dump(self.ratesFwd, open(os.path.join(fixturesDir, "ratesFwd.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-			cPickle.dump(self.ratesRev, open(os.path.join(fixturesDir, "ratesRev.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-		else:
-			import reconstruction.ecoli.dataclasses.process.equilibrium_odes
-			self.derivatives = reconstruction.ecoli.dataclasses.process.equilibrium_odes.derivatives
-			self.derivativesJacobian = reconstruction.ecoli.dataclasses.process.equilibrium_odes.derivativesJacobian
+		source = massActionOdeSource(self.stoichMatrix())
+		self.derivatives = CachedFunction(source, "derivatives")
+		self.derivativesJacobian = CachedFunction(source, "derivativesJacobian")
 
 	def _makeMatrices(self):
 		'''
@@ -293,67 +238,26 @@ class Equilibrium(object):
 
 		self.metsToRxnFluxes = metsToRxnFluxes.T
 
-	def _makeDerivative(self):
-		'''
-		Creates symbolic representation of the ordinary differential equations and the Jacobian.
-		Used during simulations.
-		'''
-		S = self.stoichMatrix()
-
-		yStrings = ["y[%d]" % x for x in xrange(S.shape[0])]
-		ratesFwdStrings = ["kf[%d]" % x for x in xrange(S.shape[0])]
-		ratesRevStrings = ["kr[%d]" % x for x in xrange(S.shape[0])]
-		y = sp.symbols(yStrings)
-		ratesFwd = sp.symbols(ratesFwdStrings)
-		ratesRev = sp.symbols(ratesRevStrings)
-		dy = [sp.symbol.S.Zero] * S.shape[0]
-
-		for colIdx in xrange(S.shape[1]):
-			negIdxs = np.where(S[:, colIdx] < 0)[0]
-			posIdxs = np.where(S[:, colIdx] > 0)[0]
-
-			reactantFlux = self.ratesFwd[colIdx]
-			reactantFlux = ratesFwd[colIdx]
-			for negIdx in negIdxs:
-				reactantFlux *= (y[negIdx] ** (-1 * S[negIdx, colIdx]))
-
-			productFlux = self.ratesRev[colIdx]
-			productFlux = ratesRev[colIdx]
-			for posIdx in posIdxs:
-				productFlux *=  (y[posIdx] ** ( 1 * S[posIdx, colIdx]))
-
-			fluxForNegIdxs = (-1. * reactantFlux) + (1. * productFlux)
-			fluxForPosIdxs = ( 1. * reactantFlux) - (1. * productFlux)
-
-			for thisIdx in negIdxs:
-				dy[thisIdx] += fluxForNegIdxs
-			for thisIdx in posIdxs:
-				dy[thisIdx] += fluxForPosIdxs
-
-		dy = sp.Matrix(dy)
-		J = dy.jacobian(y)
-
-		self.derivativesJacobianSymbolic = J
-		self.derivativesSymbolic = dy
-
 	def fluxesAndMoleculesToSS(self, moleculeCounts, cellVolume, nAvogadro):
 		'''
 		Calculate change in molecule counts and flux through reactions until steady state.
 		'''
-		rxnFluxes = np.zeros(self._stoichMatrix.shape[1])
-		yMoleculesFinal = np.zeros_like(moleculeCounts)
 		dYMolecules = np.zeros_like(moleculeCounts)
 		monomersTotal = moleculeCounts + np.dot(self._stoichMatrixMonomers, -1. * moleculeCounts[self._complexIdxs])
 		countsToMolarLog = -1. * (np.log10(cellVolume) + np.log10(nAvogadro))
-		for colIdx in xrange(self._stoichMatrix.shape[1]):
-			dYMolecules[self._rxnNonZeroIdxs[colIdx]] = (self._solveSS(
-				monomersTotal,
-				self._stoichMatrix[:, colIdx],
-				np.log10(self.ratesRev[colIdx]) - np.log10(self.ratesFwd[colIdx]),
-				countsToMolarLog,
-				self._monomerIdxs[colIdx],
-				self._rxnNonZeroIdxs[colIdx],
-				) - moleculeCounts[self._rxnNonZeroIdxs[colIdx]])
+		kdLog = np.log10(self.ratesRev) - np.log10(self.ratesFwd)
+
+		# Each reaction is brought to steady state from the total counts of
+		# its monomers, independently of the others. Molecules in more than
+		# one reaction are not used to find fluxes (see metsToRxnFluxes), so
+		# their (overwritten) changes don't matter.
+		ssFluxes = self._solveSS(monomersTotal, kdLog, countsToMolarLog)
+		rowIdxs, colIdxs = self._stoichMatrixNonZeroIdxs
+		dYMolecules[rowIdxs] = (
+			monomersTotal[rowIdxs]
+			+ ssFluxes[colIdxs] * self._stoichMatrix[rowIdxs, colIdxs]
+			- moleculeCounts[rowIdxs]
+			)
 
 		rxnFluxes = np.round(np.dot(self.metsToRxnFluxes, dYMolecules))
 		rxnFluxesN = -1. * (rxnFluxes < 0) * rxnFluxes
@@ -362,19 +266,62 @@ class Equilibrium(object):
 		return rxnFluxes, moleculesNeeded
 
 
-	def _solveSS(self, x, S, kdLog, countsToMolarLog, monomerIdxs, nonZeroIdxs):
-		def error(x, S, kdLog, countsToMolarLog):
-			return np.abs(np.dot(-S, countsToMolarLog + np.log10(x)) - kdLog)
-
-		rxnFlux = 0.
-		maxIters = int(np.ceil(np.min(-x[monomerIdxs] / S[monomerIdxs])))
-
-		if maxIters > 0:
-			allAttempts = (np.arange(1, maxIters + 1).reshape(1, -1) * S[nonZeroIdxs].reshape(-1, 1) + np.ones(maxIters).reshape(1, -1) * x[nonZeroIdxs].reshape(-1, 1))
-			h = np.argmin(np.abs(np.sum(-1 * np.ones(maxIters).reshape(1, -1) * S[nonZeroIdxs].reshape(-1, 1) * (countsToMolarLog + np.log10(allAttempts)), axis = 0) - kdLog))
-			rxnFlux = (h + 1)
-
-		return x[nonZeroIdxs] + rxnFlux * S[nonZeroIdxs]
+	def _solveSS(self, x, kdLog, countsToMolarLog):
+		'''
+		Finds the integer flux, from 1 up to the flux that uses up a monomer,
+		that brings each reaction closest to equilibrium given the total
+		counts of the molecules x. Returns the fluxes of all reactions.
+
+		The error of a reaction at flux f is |g(f)|, where
+			g(f) = sum(-S * (countsToMolarLog + log10(x + f * S))) - kdLog
+		decreases with f, so the best flux is found by bisecting for the
+		largest flux with g(f) >= 0, for all reactions at once.
+		'''
+		rowIdxs, colIdxs = self._stoichMatrixNonZeroIdxs
+		coeffs = self._stoichMatrix[rowIdxs, colIdxs]
+		nRxns = self._stoichMatrix.shape[1]
+
+		# Fluxes that use up a monomer have infinite errors, and those past
+		# it NaN errors
+		def g(fluxes):
+			with np.errstate(divide = "ignore", invalid = "ignore"):
+				terms = -coeffs * (countsToMolarLog + np.log10(x[rowIdxs] + fluxes[colIdxs] * coeffs))
+			return np.bincount(colIdxs, terms, minlength = nRxns) - kdLog
+
+		monomers = coeffs < 0
+		maxFluxes = np.full(nRxns, np.inf)
+		np.minimum.at(maxFluxes, colIdxs[monomers], x[rowIdxs[monomers]] / -coeffs[monomers])
+		maxFluxes = np.ceil(maxFluxes)
+
+		# When a monomer's count isn't a multiple of its coefficient, the
+		# largest flux overshoots it; the error there is NaN, which has always
+		# been chosen as the minimum
+		overshoots = np.bincount(
+			colIdxs,
+			x[rowIdxs] + maxFluxes[colIdxs] * coeffs < 0,
+			minlength = nRxns
+			) > 0
+
+		solve = (maxFluxes > 0) & ~overshoots
+		lower = np.ones(nRxns)
+		upper = np.where(solve, maxFluxes, 1)
+
+		with np.errstate(invalid = "ignore"):
+			while np.any(lower < upper):
+				middle = np.ceil((lower + upper) / 2.)
+				nonnegative = g(middle) >= 0
+				lower = np.where(nonnegative, middle, lower)
+				upper = np.where(nonnegative, upper, middle - 1)
+
+			# The error is least at the flux found or the next one
+			fluxes = lower
+			useNext = (lower + 1 <= maxFluxes) & (np.abs(g(lower + 1)) < np.abs(g(lower)))
+			fluxes[useNext] += 1
+
+		fluxes[overshoots] = maxFluxes[overshoots]
+		fluxes[maxFluxes <= 0] = 0
+
+		return fluxes
 
 	def getMonomers(self, cplxId):
 		'''
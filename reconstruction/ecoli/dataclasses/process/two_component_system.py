@@ -4,10 +4,6 @@ Two component systems.
 Note: Ligand binding to histidine kinases is modeled by equilibrium.
 
 TODOs:
-_populateDerivativeAndJacobian()
-	Decide if this caching is worthwhile
-	Assumes a directory structure
-
 moleculesToNextTimeStep()
 	Consider relocating (since it's useful for both the fitter and simulation)
 
@@ -16,15 +12,11 @@ moleculesToNextTimeStep()
 from __future__ import absolute_import
 
 import numpy as np
-import os
-import cPickle
-import wholecell
-from wholecell.utils import filepath
 from wholecell.utils import units
-from wholecell.utils.write_ode_file import writeOdeFile
+from wholecell.utils.code_cache import CachedFunction
+from wholecell.utils.write_ode_file import massActionOdeSource
 import scipy
 import re
-import sympy as sp
 
 class TwoComponentSystem(object):
 	def __init__(self, raw_data, sim_data):
@@ -264,154 +256,23 @@ class TwoComponentSystem(object):
 
 	def _populateDerivativeAndJacobian(self):
 		'''
-		Creates callable functions for computing the derivative and the Jacobian.
-		'''
-		fixturesDir = filepath.makedirs(
-			os.path.dirname(os.path.dirname(wholecell.__file__)),
-			"fixtures",
-			"twoComponentSystem"
-			)
-		odeFile = os.path.join(
-			os.path.dirname(os.path.dirname(wholecell.__file__)),
-			"reconstruction", "ecoli", "dataclasses", "process", "two_component_system_odes.py"
-			)
-		odeFitterFile = os.path.join(
-			os.path.dirname(os.path.dirname(wholecell.__file__)),
-			"reconstruction", "ecoli", "dataclasses", "process", "two_component_system_odes_fitter.py"
-			)
-
-		needToCreate = False
-
-		if not os.path.exists(odeFile):
-			needToCreate = True
-
-		if not os.path.exists(odeFitterFile):
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "S.cPickle")):
-			S = cPickle.load(open(os.path.join(fixturesDir, "S.cPickle"), "rb"))
-			if not np.all(S == self.stoichMatrix()):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "ratesFwd.cPickle")):
-			ratesFwd =  cPickle.load(open(os.path.join(fixturesDir, "ratesFwd.cPickle"), "rb"))
-			if not np.all(ratesFwd == self.ratesFwd):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if os.path.exists(os.path.join(fixturesDir, "ratesRev.cPickle")):
-			ratesRev =  cPickle.load(open(os.path.join(fixturesDir, "ratesRev.cPickle"), "rb"))
-			if not np.all(ratesRev == self.ratesRev):
-				needToCreate = True
-		else:
-			needToCreate = True
-
-		if needToCreate:
-			self._makeDerivative()
-			self._makeDerivativeFitter()
-			writeOdeFile(odeFile, self.derivativesSymbolic, self.derivativesJacobianSymbolic)
-			writeOdeFile(odeFitterFile, self.derivativesFitterSymbolic, self.derivativesFitterJacobianSymbolic)
-			import reconstruction.ecoli.dataclasses.process.two_component_system_odes
-			import reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter
-			self.derivatives = reconstruction.ecoli.dataclasses.process.two_component_system_odes.derivatives
-			self.derivativesJacobian = reconstruction.ecoli.dataclasses.process.two_component_system_odes.derivativesJacobian
-			self.derivativesFitter = reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter.derivatives
-			self.derivativesFitterJacobian = reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter.derivativesJacobian
-			cPickle.dump(self.stoichMatrix(), open(os.path.join(fixturesDir, "S.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-			cPickle.dump(self.ratesFwd, open(os.path.join(fixturesDir, "ratesFwd.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-			cPickle.dump(self.ratesRev, open(os.path.join(fixturesDir, "ratesRev.cPickle"), "wb"), protocol = cPickle.HIGHEST_PROTOCOL)
-		else:
-			import reconstruction.ecoli.dataclasses.process.two_component_system_odes
-			import reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter
-			self.derivatives = reconstruction.ecoli.dataclasses.process.two_component_system_odes.derivatives
-			self.derivativesJacobian = reconstruction.ecoli.dataclasses.process.two_component_system_odes.derivativesJacobian
-			self.derivativesFitter = reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter.derivatives
-			self.derivativesFitterJacobian = reconstruction.ecoli.dataclasses.process.two_component_system_odes_fitter.derivativesJacobian
-
-	def _makeDerivative(self):
-		'''
-		Creates symbolic representation of the ordinary differential equations and the Jacobian.
-		Used during simulations.
-		'''
-		S = self.stoichMatrix()
-
-		yStrings = ["y[%d]" % x for x in xrange(S.shape[0])]
-		y = sp.symbols(yStrings)
-		dy = [sp.symbol.S.Zero] * S.shape[0]
-
-		for colIdx in xrange(S.shape[1]):
-			negIdxs = np.where(S[:, colIdx] < 0)[0]
-			posIdxs = np.where(S[:, colIdx] > 0)[0]
-
-			reactantFlux = self.ratesFwd[colIdx]
-			for negIdx in negIdxs:
-				reactantFlux *= (y[negIdx] ** (-1 * S[negIdx, colIdx]))
-
-			productFlux = self.ratesRev[colIdx]
-			for posIdx in posIdxs:
-				productFlux *=  (y[posIdx] ** ( 1 * S[posIdx, colIdx]))
-
-			fluxForNegIdxs = (-1. * reactantFlux) + (1. * productFlux)
-			fluxForPosIdxs = ( 1. * reactantFlux) - (1. * productFlux)
-
-			for thisIdx in negIdxs:
-				dy[thisIdx] += fluxForNegIdxs
-			for thisIdx in posIdxs:
-				dy[thisIdx] += fluxForPosIdxs
-
-		dy = sp.Matrix(dy)
-		J = dy.jacobian(y)
-
-		self.derivativesJacobianSymbolic = J
-		self.derivativesSymbolic = dy
-
-	def _makeDerivativeFitter(self):
-		'''
-		Creates symbolic representation of the ordinary differential equations and the Jacobian
-		assuming ATP, ADP, Pi, water and protons are at steady state.
-		Used in the fitter.
+		Creates callable functions for computing the derivative and the Jacobian,
+		loaded from the code cache.
 		'''
-		S = self.stoichMatrix()
-
-		yStrings = ["y[%d]" % x for x in xrange(S.shape[0])]
-		y = sp.symbols(yStrings)
-		dy = [sp.symbol.S.Zero] * S.shape[0]
-
-		for colIdx in xrange(S.shape[1]):
-			negIdxs = np.where(S[:, colIdx] < 0)[0]
-			posIdxs = np.where(S[:, colIdx] > 0)[0]
-
-			reactantFlux = self.ratesFwd[colIdx]
-			for negIdx in negIdxs:
-				reactantFlux *= (y[negIdx] ** (-1 * S[negIdx, colIdx]))
-
-			productFlux = self.ratesRev[colIdx]
-			for posIdx in posIdxs:
-				productFlux *=  (y[posIdx] ** ( 1 * S[posIdx, colIdx]))
-
-			fluxForNegIdxs = (-1. * reactantFlux) + (1. * productFlux)
-			fluxForPosIdxs = ( 1. * reactantFlux) - (1. * productFlux)
-
-			for thisIdx in negIdxs:
-				dy[thisIdx] += fluxForNegIdxs
-			for thisIdx in posIdxs:
-				dy[thisIdx] += fluxForPosIdxs
-
-		# Metabolism will keep these molecules at steady state
+		# The fitter assumes metabolism keeps these molecules at steady state
 		constantMolecules = ["ATP[c]", "ADP[c]", "PI[c]", "WATER[c]", "PROTON[c]"]
-		for molecule in constantMolecules:
-			moleculeIdx = np.where(self.moleculeNames == molecule)[0][0]
-			dy[moleculeIdx] = sp.symbol.S.Zero
-
-		dy = sp.Matrix(dy)
-		J = dy.jacobian(y)
-
-		self.derivativesFitterJacobianSymbolic = J
-		self.derivativesFitterSymbolic = dy
-
+		constantIdxs = [
+			np.where(self.moleculeNames == molecule)[0][0]
+			for molecule in constantMolecules
+			]
+
+		source = massActionOdeSource(self.stoichMatrix(), self.ratesFwd, self.ratesRev)
+		self.derivatives = CachedFunction(source, "derivatives")
+		self.derivativesJacobian = CachedFunction(source, "derivativesJacobian")
+
+		source = massActionOdeSource(self.stoichMatrix(), self.ratesFwd, self.ratesRev, constantIdxs)
+		self.derivativesFitter = CachedFunction(source, "derivatives")
+		self.derivativesFitterJacobian = CachedFunction(source, "derivativesJacobian")
 
 	def moleculesToNextTimeStep(self, moleculeCounts, cellVolume, nAvogadro, timeStepSec):
 		'''
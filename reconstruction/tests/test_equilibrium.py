@@ -0,0 +1,106 @@
+"""
+Test the Equilibrium steady-state solver against a direct search over fluxes.
+
+	cd wcEcoli
+	nosetests reconstruction/tests/test_equilibrium.py
+"""
+
+from __future__ import division
+
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from reconstruction.ecoli.dataclasses.process.equilibrium import Equilibrium
+
+N_AVOGADRO = 6.022e23
+
+
+def solve_ss_reference(x, S, kdLog, countsToMolarLog, monomerIdxs, nonZeroIdxs):
+	"""Try every flux through one reaction, returning the molecule counts at
+	the flux with the least error."""
+	rxnFlux = 0.
+	maxIters = int(np.ceil(np.min(-x[monomerIdxs] / S[monomerIdxs])))
+
+	if maxIters > 0:
+		allAttempts = (np.arange(1, maxIters + 1).reshape(1, -1) * S[nonZeroIdxs].reshape(-1, 1) + np.ones(maxIters).reshape(1, -1) * x[nonZeroIdxs].reshape(-1, 1))
+		with np.errstate(divide = "ignore", invalid = "ignore"):
+			h = np.argmin(np.abs(np.sum(-1 * np.ones(maxIters).reshape(1, -1) * S[nonZeroIdxs].reshape(-1, 1) * (countsToMolarLog + np.log10(allAttempts)), axis = 0) - kdLog))
+		rxnFlux = (h + 1)
+
+	return x[nonZeroIdxs] + rxnFlux * S[nonZeroIdxs]
+
+
+def fluxes_reference(equilibrium, moleculeCounts, cellVolume):
+	"""fluxesAndMoleculesToSS, one reaction at a time."""
+	S = equilibrium._stoichMatrix
+	dYMolecules = np.zeros_like(moleculeCounts)
+	monomersTotal = moleculeCounts + np.dot(equilibrium._stoichMatrixMonomers, -1. * moleculeCounts[equilibrium._complexIdxs])
+	countsToMolarLog = -1. * (np.log10(cellVolume) + np.log10(N_AVOGADRO))
+	for colIdx in xrange(S.shape[1]):
+		nonZeroIdxs = np.where(S[:, colIdx] != 0)[0]
+		dYMolecules[nonZeroIdxs] = solve_ss_reference(
+			monomersTotal,
+			S[:, colIdx],
+			np.log10(equilibrium.ratesRev[colIdx]) - np.log10(equilibrium.ratesFwd[colIdx]),
+			countsToMolarLog,
+			np.where(S[:, colIdx] < 0)[0],
+			nonZeroIdxs,
+			) - moleculeCounts[nonZeroIdxs]
+
+	return np.round(np.dot(equilibrium.metsToRxnFluxes, dYMolecules))
+
+
+def make_equilibrium():
+	"""An Equilibrium with ligand binding reactions, some sharing a ligand.
+
+	Molecules: 0-3 proteins, 4-5 ligands, 6-9 complexes
+	Reactions: 0 + 4 -> 6, 1 + 4 -> 7, 2 + 2*5 -> 8, 2*3 + 5 -> 9
+	"""
+	equilibrium = Equilibrium.__new__(Equilibrium)
+
+	S = np.zeros((10, 4))
+	S[[0, 4, 6], 0] = [-1, -1, 1]
+	S[[1, 4, 7], 1] = [-1, -1, 1]
+	S[[2, 5, 8], 2] = [-1, -2, 1]
+	S[[3, 5, 9], 3] = [-2, -1, 1]
+
+	equilibrium._stoichMatrixI, equilibrium._stoichMatrixJ = np.nonzero(S)
+	equilibrium._stoichMatrixV = S[np.nonzero(S)]
+	equilibrium._makeMatrices()
+
+	equilibrium._stoichMatrix = S
+	equilibrium._stoichMatrixNonZeroIdxs = np.nonzero(S)
+	equilibrium._complexIdxs = np.arange(6, 10)
+	equilibrium._stoichMatrixMonomers = S[:, :4]
+
+	return equilibrium
+
+
+class Test_Equilibrium(unittest.TestCase):
+
+	@noseAttrib.attr('smalltest')
+	def test_fluxesAndMoleculesToSS(self):
+		equilibrium = make_equilibrium()
+		randomState = np.random.RandomState(0)
+		cellVolume = 1e-15
+
+		for _ in xrange(200):
+			equilibrium.ratesFwd = 10 ** randomState.uniform(-2, 8, 4)
+			equilibrium.ratesRev = 10 ** randomState.uniform(-2, 2, 4)
+			moleculeCounts = randomState.randint(0, 3000, 10) * (randomState.rand(10) < 0.9)
+
+			rxnFluxes, moleculesNeeded = equilibrium.fluxesAndMoleculesToSS(
+				moleculeCounts, cellVolume, N_AVOGADRO)
+
+			npt.assert_array_equal(
+				rxnFluxes, fluxes_reference(equilibrium, moleculeCounts, cellVolume))
+			npt.assert_array_equal(
+				moleculesNeeded,
+				np.dot(equilibrium.Rp, np.fmax(rxnFluxes, 0)) + np.dot(equilibrium.Pp, np.fmax(-rxnFluxes, 0)))
+
+
+if __name__ == '__main__':
+	unittest.main()
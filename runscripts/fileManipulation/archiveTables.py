@@ -0,0 +1,57 @@
+"""
+Pack the TableWriter output directories under a directory (e.g. a simOut
+directory, or a whole simulation output directory) into single-file table
+archives that TableReader reads in place.
+
+Usage example:
+	python runscripts/fileManipulation/archiveTables.py out/sim_desc
+
+Set PYTHONPATH when running this.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+
+from wholecell.io import tablewriter as tw
+
+
+def findTables(directory):
+	"""
+	Yields the table directories (those with a version file) under directory.
+	"""
+
+	for dirPath, dirNames, fileNames in os.walk(directory):
+		if os.path.isfile(os.path.join(dirPath, tw.DIR_METADATA, tw.FILE_VERSION)):
+			dirNames[:] = [] # don't descend into the table
+			yield dirPath
+
+		else:
+			dirNames.sort()
+
+
+def main(directory, dryRun):
+	nTables = 0
+
+	for tablePath in findTables(directory):
+		if dryRun:
+			print('Would archive {}'.format(tablePath))
+		else:
+			print('Archived {}'.format(tw.archiveTable(tablePath)))
+
+		nTables += 1
+
+	print('{} tables {}'.format(nTables, 'found' if dryRun else 'archived'))
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(
+		description = 'Pack TableWriter output directories into single-file archives.')
+	parser.add_argument('directory', help = 'directory to search for tables')
+	parser.add_argument('--dry_run', action = 'store_true',
+		help = 'list the tables without archiving them')
+
+	args = parser.parse_args()
+
+	main(args.directory, args.dry_run)
@@ -66,6 +66,9 @@ Modeling options:
 	TRANSLATION_SUPPLY (int, "1"): if nonzero, the ribosome elongation rate is
 		limited by the condition specific rate of amino acid supply; otherwise
 		the elongation rate is set by condition
+	FLUX_SENSITIVITY_PROCESSES (int, "1"): number of processes (and CPUs per
+		simulation job) to solve the metabolism flux sensitivity scenarios in,
+		for the flux_sensitivity variant
 
 Additional variables:
 	LAUNCHPAD_FILE (str, "my_launchpad.yaml"): set launchpad config file location
@@ -128,6 +131,7 @@ MASS_DISTRIBUTION = bool(int(os.environ.get("MASS_DISTRIBUTION", DEFAULT_SIMULAT
 GROWTH_RATE_NOISE = bool(int(os.environ.get("GROWTH_RATE_NOISE", DEFAULT_SIMULATION_KWARGS["growthRateNoise"])))
 D_PERIOD_DIVISION = bool(int(os.environ.get("D_PERIOD_DIVISION", DEFAULT_SIMULATION_KWARGS["dPeriodDivision"])))
 TRANSLATION_SUPPLY = bool(int(os.environ.get("TRANSLATION_SUPPLY", DEFAULT_SIMULATION_KWARGS["translationSupply"])))
+FLUX_SENSITIVITY_PROCESSES = int(os.environ.get("FLUX_SENSITIVITY_PROCESSES", DEFAULT_SIMULATION_KWARGS["fluxSensitivityProcesses"]))
 N_INIT_SIMS = int(os.environ.get("N_INIT_SIMS", "1"))
 N_GENS = int(os.environ.get("N_GENS", "1"))
 SINGLE_DAUGHTERS = bool(int(os.environ.get("SINGLE_DAUGHTERS", "0")))
@@ -601,9 +605,10 @@ for i in VARIANTS_TO_RUN:
 							growth_rate_noise = GROWTH_RATE_NOISE,
 							d_period_division = D_PERIOD_DIVISION,
 							translation_supply = TRANSLATION_SUPPLY,
+							flux_sensitivity_processes = FLUX_SENSITIVITY_PROCESSES,
 							),
 						name = fw_name,
-						spec = {"_queueadapter": {"job_name": fw_name, "cpus_per_task": 1}, "_priority":10}
+						spec = {"_queueadapter": {"job_name": fw_name, "cpus_per_task": FLUX_SENSITIVITY_PROCESSES}, "_priority":10}
 						)
 				elif k > 0:
 					PARENT_GEN_DIRECTORY = os.path.join(SEED_DIRECTORY, "generation_%06d" % (k - 1))
@@ -625,9 +630,10 @@ for i in VARIANTS_TO_RUN:
 							growth_rate_noise = GROWTH_RATE_NOISE,
 							d_period_division = D_PERIOD_DIVISION,
 							translation_supply = TRANSLATION_SUPPLY,
+							flux_sensitivity_processes = FLUX_SENSITIVITY_PROCESSES,
 							),
 						name = fw_name,
-						spec = {"_queueadapter": {"job_name": fw_name, "cpus_per_task": 1}, "_priority":11}
+						spec = {"_queueadapter": {"job_name": fw_name, "cpus_per_task": FLUX_SENSITIVITY_PROCESSES}, "_priority":11}
 						)
 				else:
 					raise ValueError("k ({}) < 0".format(k))
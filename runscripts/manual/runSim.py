@@ -140,6 +140,10 @@ class RunSimulation(scriptBase.ScriptBase):
 			help='if False, all elongation rates are the same for each type.'
 				 'if True, elongation rates are faster for RRNA transcripts'
 				 ' elongation rate is set by condition')
+		add_option('flux_sensitivity_processes', 'fluxSensitivityProcesses', int,
+			help='number of processes to solve the metabolism flux sensitivity'
+				 ' scenarios in, for the flux_sensitivity variant'
+			)
 
 
 	def parse_args(self):
@@ -168,7 +172,8 @@ class RunSimulation(scriptBase.ScriptBase):
 			'mass_distribution',
 			'growth_rate_noise',
 			'd_period_division',
-			'translation_supply'))
+			'translation_supply',
+			'flux_sensitivity_processes'))
 
 		# Write the metadata file.
 
@@ -44,6 +44,16 @@ setup(
 	include_dirs = [np.get_include()]
 	)
 
+polymerize_module = cythonize(
+	os.path.join("wholecell", "utils", "_polymerize.pyx")
+	)
+
+setup(
+	name = "Polymerize",
+	ext_modules = polymerize_module,
+	include_dirs = [np.get_include()]
+	)
+
 fast_polymerize_sums_module = cythonize(
 	os.path.join("wholecell", "utils", "_fastsums.pyx"),
 	#compiler_directives = {'linetrace': True},
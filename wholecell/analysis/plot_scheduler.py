@@ -0,0 +1,303 @@
+"""
+Schedules analysis plots over a pool of processes for the analysis Firetasks
+when the `WC_ANALYZE_FAST` environment variable is set.
+
+Each plot's runtime, peak memory (RSS) and the tables it read are recorded in
+a JSON stats file after every run, and used by later runs to:
+	* group plots by the table they read the most, so each group runs in one
+	  process where the plots share their reads through wholecell.io.readcache
+	  (groups are split as needed to keep the pool busy),
+	* start the longest-running groups first, and
+	* start a group only while the estimated peak memory of the running groups
+	  fits the memory budget.
+
+Plots without stats run alone, first, since their cost is unknown.
+
+Environment variables:
+	WC_ANALYZE_STATS: the stats file (default: out/analysis_plot_stats.json)
+	WC_ANALYZE_MEMORY: the memory budget in GB (default: the available memory)
+
+Example:
+	failed = plot_scheduler.run_plots([(fileName, mod.Plot, args), ...])
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+from collections import defaultdict
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+import traceback
+
+import psutil
+
+from wholecell.io import readcache
+from wholecell.utils import filepath, parallelization
+
+DEFAULT_STATS_PATH = os.path.join(
+	filepath.ROOT_PATH, 'out', 'analysis_plot_stats.json')
+DEFAULT_RSS = 2 << 30  # bytes, assumed for plots without stats
+POLL_INTERVAL = 0.5  # seconds between checks for finished groups
+
+
+class PlotStats(object):
+	"""Per-plot runtime, peak RSS, and table reads from previous runs, keyed
+	by plot module name.
+
+	Each entry is a dict with 'runtime' (s), 'rss' (bytes: the estimated peak
+	RSS of a process running just this plot; see run_group()) and 'tables' (a
+	dict of bytes read per table name).
+	"""
+
+	def __init__(self, path=None):
+		if path is None:
+			path = os.environ.get('WC_ANALYZE_STATS', DEFAULT_STATS_PATH)
+		self.path = path
+		self._stats = self._load()
+		self._updated = {}
+
+	def get(self, key):
+		"""Return the stats for a plot, or None if it has none."""
+		return self._stats.get(key)
+
+	def update(self, key, runtime, rss, tables):
+		"""Record a plot's stats from this run."""
+		entry = {'runtime': runtime, 'rss': rss, 'tables': tables}
+		self._stats[key] = entry
+		self._updated[key] = entry
+
+	def save(self):
+		"""Merge this run's stats into the stats file. Other runs may write
+		the file concurrently, so it's re-read then replaced atomically.
+		"""
+		if not self._updated:
+			return
+
+		stats = self._load()
+		stats.update(self._updated)
+
+		directory = filepath.makedirs(os.path.dirname(os.path.abspath(self.path)))
+		with tempfile.NamedTemporaryFile(
+				dir=directory, suffix='.partial', delete=False) as f:
+			json.dump(stats, f, indent=4, sort_keys=True)
+		os.rename(f.name, self.path)
+
+	def _load(self):
+		try:
+			with open(self.path) as f:
+				return json.load(f)
+		except (IOError, ValueError):
+			return {}
+
+
+def schedule(keys, stats, n_workers):
+	"""Group and order plots to run.
+
+	Args:
+		keys: the plot module names
+		stats: a PlotStats
+		n_workers: the number of processes to run groups in
+
+	Returns:
+		list of lists of indexes into keys: the groups, in the order to start
+		them
+	"""
+	unknown = [[i] for i, key in enumerate(keys) if stats.get(key) is None]
+	known = [i for i, key in enumerate(keys) if stats.get(key) is not None]
+
+	def runtime(i):
+		return stats.get(keys[i])['runtime']
+
+	# Group the plots by the table they read the most
+	by_table = defaultdict(list)
+	for i in sorted(known, key=runtime, reverse=True):
+		tables = stats.get(keys[i])['tables']
+		table = max(sorted(tables), key=tables.get) if tables else keys[i]
+		by_table[table].append(i)
+
+	# Split the groups so no group takes much longer than a fair share of the
+	# total runtime, which would leave the other workers idle
+	total = sum(runtime(i) for i in known)
+	cap = max([total / max(n_workers, 1)] + [runtime(i) for i in known])
+	groups = []
+	for table in sorted(by_table):
+		group = []
+		group_runtime = 0
+		for i in by_table[table]:
+			if group and group_runtime + runtime(i) > cap:
+				groups.append(group)
+				group = []
+				group_runtime = 0
+			group.append(i)
+			group_runtime += runtime(i)
+		groups.append(group)
+
+	groups.sort(key=lambda group: sum(runtime(i) for i in group),
+		reverse=True)
+
+	return unknown + groups
+
+
+def estimate_rss(keys, stats):
+	"""Estimate the peak RSS in bytes of running a group of plots in one
+	process.
+	"""
+	return max(
+		stats.get(key)['rss'] if stats.get(key) else DEFAULT_RSS
+		for key in keys)
+
+
+def memory_budget():
+	"""The memory in bytes available for running plots."""
+	if 'WC_ANALYZE_MEMORY' in os.environ:
+		return int(float(os.environ['WC_ANALYZE_MEMORY']) * 2**30)
+	return psutil.virtual_memory().available
+
+
+def run_plots(tasks, n_workers=None, budget=None, stats=None):
+	"""Run analysis plots in a pool of processes.
+
+	Args:
+		tasks: list of (name, plot class, args to its main()) tuples
+		n_workers: the number of processes (default: parallelization.cpus())
+		budget: the memory budget in bytes (default: memory_budget())
+		stats: the PlotStats to schedule by and update (default: a PlotStats
+			for the default stats file), saved when all plots have run
+
+	Returns:
+		list of the names of plots that raised an exception
+	"""
+	if n_workers is None:
+		n_workers = parallelization.cpus()
+	if budget is None:
+		budget = memory_budget()
+	if stats is None:
+		stats = PlotStats()
+
+	keys = [plot_class.__module__ for _, plot_class, _ in tasks]
+	pending = schedule(keys, stats, n_workers)
+
+	# A fresh process per group, so its peak RSS is the group's alone and its
+	# memory is released when it finishes
+	pool = mp.Pool(processes=n_workers, maxtasksperchild=1)
+	running = []  # (group, AsyncResult, estimated RSS)
+	failed = []
+
+	try:
+		while pending or running:
+			# Start the first groups that fit the memory budget. A group
+			# always starts if none are running.
+			in_use = sum(rss for _, _, rss in running)
+			for group in list(pending):
+				if len(running) >= n_workers:
+					break
+				rss = estimate_rss([keys[i] for i in group], stats)
+				if running and in_use + rss > budget:
+					continue
+				pending.remove(group)
+				result = pool.apply_async(
+					run_group, ([tasks[i] for i in group],))
+				running.append((group, result, rss))
+				in_use += rss
+
+			running[0][1].wait(POLL_INTERVAL)
+
+			for entry in [entry for entry in running if entry[1].ready()]:
+				running.remove(entry)
+				group, result, _ = entry
+				if not result.successful():
+					failed.extend(tasks[i][0] for i in group)
+					continue
+
+				for i, (success, runtime, rss, tables) in zip(group, result.get()):
+					if success:
+						stats.update(keys[i], runtime, rss, tables)
+					else:
+						failed.append(tasks[i][0])
+	except BaseException:
+		pool.terminate()
+		raise
+
+	pool.close()
+	pool.join()
+
+	stats.save()
+
+	return failed
+
+
+def run_group(tasks):
+	"""Run a group of plots in this (worker) process, sharing the read cache.
+
+	Each plot's peak RSS is measured from the RSS when it starts, which
+	includes whatever earlier plots left behind (e.g. cached reads), so it's
+	reported as the process's RSS before the group plus the plot's own growth
+	over that: an estimate of running it alone. Where the peak can't be reset
+	(other than Linux) it's the peak of the whole group so far.
+
+	Returns:
+		list of (success, runtime (s), peak RSS (bytes), bytes read per
+		table) tuples, one per plot
+	"""
+	cache = readcache.sharedCache()
+	results = []
+	process = psutil.Process()
+	base_rss = process.memory_info().rss
+
+	for name, plot_class, args in tasks:
+		print "%s: Running %s" % (time.ctime(), name)
+		cache.tablesRead.clear()
+		start_rss = process.memory_info().rss
+		_reset_peak_rss()
+		start = time.time()
+
+		try:
+			plot_class.main(*args)
+			success = True
+		except KeyboardInterrupt:
+			sys.exit(1)
+		except Exception:
+			traceback.print_exc()
+			success = False
+
+		results.append((
+			success,
+			time.time() - start,
+			base_rss + max(_peak_rss() - start_rss, 0),
+			dict(cache.tablesRead),
+			))
+
+	return results
+
+
+def _reset_peak_rss():
+	"""Reset the peak RSS of this process to its current RSS, if the OS
+	supports it (Linux: see clear_refs in `man proc`).
+	"""
+	try:
+		with open('/proc/self/clear_refs', 'w') as f:
+			f.write('5')
+	except IOError:
+		pass
+
+
+def _peak_rss():
+	"""The peak RSS of this process since it started or since the last
+	_reset_peak_rss(), in bytes.
+	"""
+	# ru_maxrss isn't reset along with VmHWM once a thread has exited
+	try:
+		with open('/proc/self/status') as f:
+			for line in f:
+				if line.startswith('VmHWM:'):
+					return int(line.split()[1]) * 1024
+	except IOError:
+		pass
+
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return rss if sys.platform == 'darwin' else rss * 1024
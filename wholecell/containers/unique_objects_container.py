@@ -53,7 +53,7 @@ class UniqueObjectsContainer(object):
 		"_objectIndex":np.int64,
 		}
 
-	_fractionExtendEntries = 0.1 # fractional rate to increase number of entries in the structured array (collection)
+	_fractionExtendEntries = 1.0 # fractional rate to increase number of entries in the structured array (collection); doubling amortizes the copying
 
 	_queryOperations = {
 		">":np.greater,
@@ -119,59 +119,80 @@ class UniqueObjectsContainer(object):
 				]
 			)
 
+		self._buildIndexes()
+
+
+	def _buildIndexes(self):
+		# Collect the active and unoccupied entries of each collection and the
+		# unoccupied entries of the global reference array, which are then
+		# maintained as objects are added and deleted
+
+		# Sorted object indexes of the active entries of each collection, and
+		# their global indexes
+		self._activeIndexes = [
+			np.where(collection["_entryState"] == self._entryActive)[0]
+			for collection in self._collections
+			]
+		self._activeGlobalIndexes = [
+			collection["_globalIndex"][activeIndexes]
+			for collection, activeIndexes in izip(self._collections, self._activeIndexes)
+			]
+
+		self._freeIndexes = [
+			_FreeIndexes(collection["_entryState"] == self._entryInactive)
+			for collection in self._collections
+			]
+		self._freeGlobalIndexes = _FreeIndexes(
+			self._globalReference["_entryState"] == self._entryInactive
+			)
+
 
 	def _getFreeIndexes(self, collectionIndex, nObjects):
 		# Returns indexes of unoccupied entries, extending the arrays when neccesary
 
-		collection = self._collections[collectionIndex]
-
-		freeCollectionIndexes = np.where(
-			collection["_entryState"] == self._entryInactive
-			)[0]
+		self._collections[collectionIndex], freeCollectionIndexes = self._takeFreeIndexes(
+			self._collections[collectionIndex],
+			self._freeIndexes[collectionIndex],
+			nObjects
+			)
 
-		nFreeCollectionIndexes = freeCollectionIndexes.size
+		self._globalReference, freeGlobalIndexes = self._takeFreeIndexes(
+			self._globalReference,
+			self._freeGlobalIndexes,
+			nObjects
+			)
 
-		if nFreeCollectionIndexes < nObjects:
-			oldSize = collection.size
-			nNewEntries = max(
-				np.int64(oldSize * self._fractionExtendEntries),
-				nObjects - nFreeCollectionIndexes
-				)
+		return freeCollectionIndexes, freeGlobalIndexes
 
-			self._collections[collectionIndex] = np.append(
-				collection,
-				np.zeros(nNewEntries, dtype = collection.dtype)
-				)
 
-			freeCollectionIndexes = np.concatenate((
-				freeCollectionIndexes,
-				oldSize + np.arange(nNewEntries)
-				))
+	def _takeFreeIndexes(self, array, freeIndexes, nObjects):
+		# Takes nObjects free indexes of array, returning the (possibly
+		# extended) array and the indexes
 
-		freeGlobalIndexes = np.where(
-			self._globalReference["_entryState"] == self._entryInactive
-			)[0]
+		nFree = len(freeIndexes)
 
-		nFreeGlobalIndexes = freeGlobalIndexes.size
+		if nFree >= nObjects:
+			return array, freeIndexes.pop(nObjects)
 
-		if nFreeGlobalIndexes < nObjects:
-			oldSize = self._globalReference.size
-			nNewEntries = max(
-				np.int64(oldSize * self._fractionExtendEntries),
-				nObjects - nFreeGlobalIndexes
-				)
+		oldSize = array.size
+		nNewEntries = max(
+			np.int64(oldSize * self._fractionExtendEntries),
+			nObjects - nFree
+			)
 
-			self._globalReference = np.append(
-				self._globalReference,
-				np.zeros(nNewEntries, dtype = self._globalReference.dtype)
-				)
+		array = np.append(
+			array,
+			np.zeros(nNewEntries, dtype = array.dtype)
+			)
 
-			freeGlobalIndexes = np.concatenate((
-				freeGlobalIndexes,
-				oldSize + np.arange(nNewEntries)
-				))
+		newIndexes = oldSize + np.arange(nNewEntries)
+		indexes = np.concatenate((
+			freeIndexes.pop(nFree),
+			newIndexes[:nObjects - nFree]
+			))
+		freeIndexes.push(newIndexes[nObjects - nFree:])
 
-		return freeCollectionIndexes[:nObjects], freeGlobalIndexes[:nObjects]
+		return array, indexes
 
 
 	def objectsNew(self, collectionName, nObjects, **attributes):
@@ -193,6 +214,16 @@ class UniqueObjectsContainer(object):
 		self._globalReference["_collectionIndex"][globalIndexes] = collectionIndex
 		self._globalReference["_objectIndex"][globalIndexes] = objectIndexes
 
+		# Insert into the sorted active indexes
+		order = np.argsort(objectIndexes)
+		positions = np.searchsorted(
+			self._activeIndexes[collectionIndex], objectIndexes[order])
+
+		self._activeIndexes[collectionIndex] = np.insert(
+			self._activeIndexes[collectionIndex], positions, objectIndexes[order])
+		self._activeGlobalIndexes[collectionIndex] = np.insert(
+			self._activeGlobalIndexes[collectionIndex], positions, globalIndexes[order])
+
 		return _UniqueObjectSet(self, globalIndexes)
 
 
@@ -203,34 +234,61 @@ class UniqueObjectsContainer(object):
 
 
 	def objectsDel(self, objects):
-		for obj in objects:
-			self.objectDel(obj)
+		if isinstance(objects, _UniqueObjectSet):
+			globalIndexes = objects._globalIndexes
+
+		else:
+			globalIndexes = [obj._globalIndex for obj in objects]
+
+		self.objectsByGlobalIndexDel(globalIndexes)
 
 
 	def objectDel(self, obj):
-		# TODO: profile this in processes that delete lots of objects
-		collection = self._collections[obj._collectionIndex]
-		collection[obj._objectIndex].fill(0)
+		self.objectsByGlobalIndexDel([obj._globalIndex])
+
+
+	def objectsByGlobalIndexDel(self, globalIndexes):
+		# Deletes objects by their global indexes, clearing their entries and
+		# freeing them for new objects.  Deleting an inactive object does
+		# nothing.
+		globalIndexes = np.unique(np.asarray(globalIndexes, np.int64))
+		globalIndexes = globalIndexes[
+			self._globalReference["_entryState"][globalIndexes] == self._entryActive
+			]
 
-		self._globalReference[obj._globalIndex].fill(0)
+		collectionIndexes = self._globalReference["_collectionIndex"][globalIndexes]
+		objectIndexes = self._globalReference["_objectIndex"][globalIndexes]
+
+		for collectionIndex in np.unique(collectionIndexes):
+			collection = self._collections[collectionIndex]
+			objectIndexesInCollection = objectIndexes[collectionIndexes == collectionIndex]
+
+			collection[objectIndexesInCollection] = np.zeros(1, dtype = collection.dtype)
+			self._freeIndexes[collectionIndex].push(objectIndexesInCollection)
+
+			positions = np.searchsorted(
+				self._activeIndexes[collectionIndex], objectIndexesInCollection)
+
+			self._activeIndexes[collectionIndex] = np.delete(
+				self._activeIndexes[collectionIndex], positions)
+			self._activeGlobalIndexes[collectionIndex] = np.delete(
+				self._activeGlobalIndexes[collectionIndex], positions)
+
+		self._globalReference[globalIndexes] = np.zeros(1, dtype = self._globalReference.dtype)
+		self._freeGlobalIndexes.push(globalIndexes)
 
 
 	def objects(self, **operations):
 		# Return all objects, optionally evaluating a query on !!every!! molecule (generally not what you want to do)
 		if operations:
-			results = []
-
-			for collectionIndex in xrange(len(self._collections)):
-				results.append(self._queryObjects(collectionIndex, **operations))
-
 			return _UniqueObjectSet(self, np.concatenate([
-				self._collections[collectionIndex]["_globalIndex"][result]
-				for collectionIndex, result in enumerate(results)
+				self._queryObjects(collectionIndex, **operations)
+				for collectionIndex in xrange(len(self._collections))
 				]))
 
 		else:
 			return _UniqueObjectSet(self,
-				np.where(self._globalReference["_entryState"] == self._entryActive)[0]
+				np.sort(np.concatenate(self._activeGlobalIndexes))
 				)
 
 
@@ -238,44 +296,56 @@ class UniqueObjectsContainer(object):
 		# Return all objects belonging to a collection and that optionally satisfy a set of attribute queries
 		collectionIndex = self._nameToIndexMapping[collectionName]
 
-		result = self._queryObjects(collectionIndex, **operations)
-
 		return _UniqueObjectSet(self,
-			self._collections[collectionIndex]["_globalIndex"][result]
+			self._queryObjects(collectionIndex, **operations)
 			)
 
 
 	def objectsInCollections(self, collectionNames, **operations):
 		# Return all objects belonging to a set of collections that optionally satisfy a set of attribute queries
 
-		collectionIndexes = [self._nameToIndexMapping[collectionName] for collectionName in collectionNames]
-		results = []
-
-		for collectionIndex in collectionIndexes:
-			results.append(self._queryObjects(collectionIndex, **operations))
-
 		return _UniqueObjectSet(self, np.concatenate([
-			self._collections[collectionIndex]["_globalIndex"][result]
-			for collectionIndex, result in izip(collectionIndexes, results)
+			self._queryObjects(self._nameToIndexMapping[collectionName], **operations)
+			for collectionName in collectionNames
 			]))
 
 
+	def attrsInCollection(self, collectionName, *attributes):
+		# Return the values of attributes of all objects belonging to a
+		# collection, as a list of arrays in order of the objects returned by
+		# objectsInCollection.  Unlike objectsInCollection(...).attr(...), the
+		# values are read directly from the collection.
+		collectionIndex = self._nameToIndexMapping[collectionName]
+		collection = self._collections[collectionIndex]
+		activeIndexes = self._activeIndexes[collectionIndex]
+
+		return [collection[attribute][activeIndexes] for attribute in attributes]
+
+
 	def _queryObjects(self, collectionIndex, **operations):
-		# Performs a series of comparison operations on a collection, and
-		# returns a boolean-value array that is True where every comparison was True
-		operations["_entryState"] = ("==", self._entryActive)
+		# Performs a series of comparison operations on the active objects of
+		# a collection, and returns the global indexes of the objects for
+		# which every comparison was True, in order of their entries.  Only
+		# the active entries are read, so this takes time proportional to the
+		# number of objects in the collection rather than its size.
+		globalIndexes = self._activeGlobalIndexes[collectionIndex]
+
+		if not operations:
+			return globalIndexes.copy()
+
 		collection = self._collections[collectionIndex]
+		activeIndexes = self._activeIndexes[collectionIndex]
 
-		return reduce(
+		return globalIndexes[reduce(
 			np.logical_and,
 			(
 				self._queryOperations[operator](
-					collection[attrName],
+					collection[attrName][activeIndexes],
 					queryValue
 					)
 				for attrName, (operator, queryValue) in operations.viewitems()
 			)
-		)
+		)]
 
 
 	def objectsByGlobalIndex(self, globalIndexes):
@@ -287,7 +357,7 @@ class UniqueObjectsContainer(object):
 
 
 	def objectByGlobalIndexDel(self, globalIndex):
-		self.objectsByGlobalIndexDel(np.array(globalIndex))
+		self.objectsByGlobalIndexDel([globalIndex])
 
 	def objectNames(self):
 		return tuple(self._names)
@@ -331,6 +401,48 @@ class UniqueObjectsContainer(object):
 			else:
 				self._collections[self._names.index(fieldName)] = value
 
+		self._buildIndexes()
+
+
+class _FreeIndexes(object):
+	"""
+	_FreeIndexes
+
+	A stack of the unoccupied entry indexes of an array.  Indexes are taken
+	lowest first from each batch that was pushed, most recently pushed batch
+	first.
+	"""
+
+	__slots__ = ("_indexes", "_size")
+
+
+	def __init__(self, isFree):
+		self._indexes = np.where(isFree)[0][::-1].copy()
+		self._size = self._indexes.size
+
+
+	def __len__(self):
+		return self._size
+
+
+	def pop(self, n):
+		self._size -= n
+		return self._indexes[self._size:self._size + n][::-1].copy()
+
+
+	def push(self, indexes):
+		n = len(indexes)
+		end = self._size + n
+
+		if end > self._indexes.size:
+			# Grow by doubling to amortize the copying
+			grown = np.empty(max(end, 2 * self._indexes.size), np.int64)
+			grown[:self._size] = self._indexes[:self._size]
+			self._indexes = grown
+
+		self._indexes[self._size:end] = np.sort(indexes)[::-1]
+		self._size = end
+
 
 class _UniqueObject(object):
 	"""
@@ -576,27 +688,106 @@ class _UniqueObjectSet(object):
 
 
 	def delByIndexes(self, indexes):
+		self._container.objectsByGlobalIndexDel(self._globalIndexes[indexes])
 
-		globalIndexes = self._globalIndexes[indexes]
+	# TODO: set-like operations (union, intersection, etc.)
 
-		# TODO: cache these properties? should be static
-		collectionIndexes = self._container._globalReference["_collectionIndex"][globalIndexes]
-		objectIndexes = self._container._globalReference["_objectIndex"][globalIndexes]
 
-		uniqueColIndexes, inverse = np.unique(collectionIndexes, return_inverse = True)
+def _partitionCombinatorial(objectRequestsArray, requestNumberVector, requestProcessArray, randomState):
+	"""
+	Partitions molecules among requests without solving a linear program, in
+	the cases where the optimum of _partition is evident:
+
+	- the requested sets are nested or disjoint and every request can be
+	  met in full,
+	- as above, except that the largest request is the only request of its
+	  process and covers every molecule (e.g. requestAll), so it gets what
+	  the others leave, or
+	- every request is for the same set of molecules, which are granted to
+	  the processes with the smallest total requests first.
+
+	Takes the same arguments as _partition.
+
+	Returns:
+		partitionedMolecules: 2D bool array, (molecule)x(process), or None if
+		the requests don't fit any of these cases.
+	"""
 
-		for i, collectionIndex in enumerate(uniqueColIndexes):
-			globalObjIndexes = np.where(inverse == i)
-			objectIndexesInCollection = objectIndexes[globalObjIndexes]
+	nObjects, nRequests = objectRequestsArray.shape
+	nProcesses = requestProcessArray.shape[1]
+
+	requestProcesses = requestProcessArray.argmax(axis = 1)
+	processDemands = np.bincount(
+		requestProcesses, requestNumberVector, minlength = nProcesses)
 
-			self._container._collections[collectionIndex][objectIndexesInCollection] = np.zeros(1, dtype=self._container._collections[collectionIndex].dtype)
+	setSizes = objectRequestsArray.sum(axis = 0)
+	overlaps = np.dot(
+		objectRequestsArray.T.astype(np.int64),
+		objectRequestsArray.astype(np.int64)
+		)
 
-		self._container._globalReference[globalIndexes] = np.zeros(1, dtype=self._container._globalReference.dtype)
+	# Every pair of requested sets must be disjoint or nested
+	nested = (overlaps == setSizes[:, np.newaxis]) | (overlaps == setSizes)
+	if not ((overlaps == 0) | nested).all():
+		return None
 
-	# TODO: set-like operations (union, intersection, etc.)
+	partitionedMolecules = np.zeros((nObjects, nProcesses), np.bool)
+
+	# Meet the requests for the smallest sets first; any molecules picked from
+	# a set are as good as any others to the requests for the sets holding it
+	available = np.ones(nObjects, np.bool)
+	order = np.argsort(setSizes, kind = "mergesort")
+
+	for position, request in enumerate(order):
+		candidates = np.where(objectRequestsArray[:, request] & available)[0]
+		count = requestNumberVector[request]
+		process = requestProcesses[request]
+
+		if candidates.size < count:
+			isLast = position == nRequests - 1
+			coversAll = setSizes[request] == nObjects
+			isOnlyRequest = (requestProcesses == process).sum() == 1
+			isLargest = (processDemands[process] >= processDemands).all()
 
+			if not (isLast and coversAll and isOnlyRequest and isLargest):
+				break
+
+			count = candidates.size
+
+		selected = randomState.choice(candidates, count, replace = False)
+		available[selected] = False
+		partitionedMolecules[selected, process] = True
+
+	else:
+		return partitionedMolecules
+
+	if not (setSizes == nObjects).all():
+		return None
+
+	# All requests are for the same molecules: satisfy the processes in order
+	# of their total requests
+	fractions = np.zeros(nProcesses, np.float64)
+	remaining = nObjects
+	for process in np.argsort(processDemands, kind = "mergesort"):
+		if processDemands[process] == 0:
+			continue
+
+		fractions[process] = min(1, remaining / processDemands[process])
+		remaining -= fractions[process] * processDemands[process]
+
+	counts = np.floor(
+		requestNumberVector * fractions[requestProcesses]).astype(np.int64)
+	offsets = np.r_[0, np.cumsum(counts)]
+
+	partitionedMolecules[:] = False
+	shuffled = randomState.permutation(nObjects)
+	for request in xrange(nRequests):
+		partitionedMolecules[
+			shuffled[offsets[request]:offsets[request + 1]],
+			requestProcesses[request]] = True
+
+	return partitionedMolecules
 
-import wholecell.utils.linear_programming as lp
 
 def _partition(objectRequestsArray, requestNumberVector, requestProcessArray, randomState):
 	# Arguments:
@@ -641,7 +832,8 @@ def _partition(objectRequestsArray, requestNumberVector, requestProcessArray, ra
 	moleculeToRequestConnections = np.zeros((nObjectTypes + nRequests,
 		nConnections), np.int64)
 
-	upperIndices = (where0, np.arange(where1.size)[argsort])
+	# Connection k (column) is the argsort[k]-th (molecule, request) pair
+	upperIndices = (where0, np.argsort(argsort))
 	lowerIndices = (nObjectTypes + where1[argsort], np.arange(where1.size))
 	# End voodoo
 
@@ -690,6 +882,9 @@ def _partition(objectRequestsArray, requestNumberVector, requestProcessArray, ra
 
 	# Optimize
 
+	# Imported here since cvxopt is only needed when the requests conflict
+	import wholecell.utils.linear_programming as lp
+
 	solution = lp.linearProgramming(
 		"maximize", objective,
 		matrix.astype(np.float), b, # cvxopt requres floats
@@ -3,7 +3,8 @@ Run the plots for a given list of `models.ecoli.analysis.cohort` analyses, or
 by default the ACTIVE plots listed in that package's `__init__.py`.
 
 If the `WC_ANALYZE_FAST` environment variable is set, run the analyses in
-parallel in their own processes.
+parallel in their own processes, scheduled by `wholecell.analysis.plot_scheduler`
+from the runtimes and memory use of previous runs.
 
 If the `DEBUG_GC` environment variable is true, enable memory leak detection.
 """
@@ -15,8 +16,7 @@ import traceback
 from fireworks import FireTaskBase, explicit_serialize
 import models.ecoli.analysis.cohort
 import importlib
-import multiprocessing as mp
-from wholecell.utils import parallelization
+from wholecell.analysis import plot_scheduler
 
 @explicit_serialize
 class AnalysisCohortTask(FireTaskBase):
@@ -45,11 +45,7 @@ class AnalysisCohortTask(FireTaskBase):
 
 		output_filename_prefix = self.get('output_filename_prefix', '')
 
-		if "WC_ANALYZE_FAST" in os.environ:
-			pool = mp.Pool(processes=parallelization.cpus())
-			results = {}
-
-		exceptionFileList = []
+		tasks = []
 		for f in fileList:
 			mod = importlib.import_module("models.ecoli.analysis.cohort." + f[:-3])
 			args = (
@@ -60,24 +56,20 @@ class AnalysisCohortTask(FireTaskBase):
 				self['input_validation_data'],
 				self["metadata"],
 				)
+			tasks.append((f, mod.Plot, args))
 
-			if "WC_ANALYZE_FAST" in os.environ:
-				results[f] = pool.apply_async(run_plot, args=(mod.Plot, args, f))
-			else:
+		if "WC_ANALYZE_FAST" in os.environ:
+			exceptionFileList = plot_scheduler.run_plots(tasks)
+		else:
+			exceptionFileList = []
+			for f, plot_class, args in tasks:
 				print "%s: Running %s" % (time.ctime(), f)
 				try:
-					mod.Plot.main(*args)
+					plot_class.main(*args)
 				except Exception:
 					traceback.print_exc()
 					exceptionFileList += [f]
 
-		if "WC_ANALYZE_FAST" in os.environ:
-			pool.close()
-			pool.join()
-			for f, result in results.items():
-				if not result.successful():
-					exceptionFileList += [f]
-
 		timeTotal = time.time() - startTime
 
 		if exceptionFileList:
@@ -87,13 +79,3 @@ class AnalysisCohortTask(FireTaskBase):
 			raise Exception("Error in cohort analysis")
 		else:
 			print "Completed cohort analysis in %s" % (time.strftime("%H:%M:%S", time.gmtime(timeTotal)))
-
-def run_plot(plot_class, args, name):
-	try:
-		print "%s: Running %s" % (time.ctime(), name)
-		plot_class.main(*args)
-	except KeyboardInterrupt:
-		import sys; sys.exit(1)
-	except Exception as e:
-		traceback.print_exc()
-		raise Exception(e)
@@ -17,12 +17,16 @@ class SimulationDaughterTask(FireTaskBase):
 					   "timestep_update_freq",
 					   "log_to_shell",
 					   "log_to_disk_every",
+					   "log_to_disk_async",
+					   "log_to_disk_compression",
+					   "log_to_disk_archive",
 					   "mass_distribution",
 					   "growth_rate_noise",
 					   "d_period_division",
 					   "translation_supply",
 					   "variable_elongation_transcription",
-					   "variable_elongation_translation"]
+					   "variable_elongation_translation",
+					   "flux_sensitivity_processes"]
 
 	def run_task(self, fw_spec):
 
@@ -43,12 +47,16 @@ class SimulationDaughterTask(FireTaskBase):
 		options["updateTimeStepFreq"] = self.get("timestep_update_freq", DEFAULT_SIMULATION_KWARGS["updateTimeStepFreq"])
 		options["logToShell"] = self.get("log_to_shell", DEFAULT_SIMULATION_KWARGS["logToShell"])
 		options["logToDiskEvery"] = self.get("log_to_disk_every", DEFAULT_SIMULATION_KWARGS["logToDiskEvery"])
+		options["logToDiskAsync"] = self.get("log_to_disk_async", DEFAULT_SIMULATION_KWARGS["logToDiskAsync"])
+		options["logToDiskCompression"] = self.get("log_to_disk_compression", DEFAULT_SIMULATION_KWARGS["logToDiskCompression"])
+		options["logToDiskArchive"] = self.get("log_to_disk_archive", DEFAULT_SIMULATION_KWARGS["logToDiskArchive"])
 		options["massDistribution"] = self.get("mass_distribution", DEFAULT_SIMULATION_KWARGS["massDistribution"])
 		options["growthRateNoise"] = self.get("growth_rate_noise", DEFAULT_SIMULATION_KWARGS["growthRateNoise"])
 		options["dPeriodDivision"] = self.get("d_period_division", DEFAULT_SIMULATION_KWARGS["dPeriodDivision"])
 		options["translationSupply"] = self.get("translation_supply", DEFAULT_SIMULATION_KWARGS["translationSupply"])
 		options["variable_elongation_transcription"] = self.get("variable_elongation_transcription", DEFAULT_SIMULATION_KWARGS["variable_elongation_transcription"])
 		options["variable_elongation_translation"] = self.get("variable_elongation_translation", DEFAULT_SIMULATION_KWARGS["variable_elongation_translation"])
+		options["fluxSensitivityProcesses"] = self.get("flux_sensitivity_processes", DEFAULT_SIMULATION_KWARGS["fluxSensitivityProcesses"])
 
 		sim = EcoliDaughterSimulation(**options)
 
@@ -0,0 +1,66 @@
+"""
+Codecs for compressed TableWriter columns.
+
+A compressed column is written as a series of chunks, each holding the
+entries buffered since the previous chunk as a 2D (entries x items) array.
+
+Codecs:
+	zlib : the chunk bytes compressed with zlib
+	delta-zlib : the first entry of the chunk followed by the differences
+		between consecutive entries, compressed with zlib.  Counts that change
+		little between time steps give mostly-zero differences, which compress
+		far better than the counts themselves.  Only used for integer dtypes,
+		for which the differences round-trip exactly (including overflow).
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import zlib
+
+import numpy as np
+
+ZLIB = "zlib"
+DELTA_ZLIB = "delta-zlib"
+CODECS = (ZLIB, DELTA_ZLIB)
+
+ZLIB_LEVEL = 1 # favor speed; the simulation pays for compression every chunk
+
+
+def codecForDtype(codec, dtype):
+	"""
+	Returns the codec to use for a column of the given dtype, falling back
+	from delta-zlib to zlib for non-integer dtypes.
+	"""
+
+	if codec == DELTA_ZLIB and np.dtype(dtype).kind not in "iu":
+		return ZLIB
+
+	return codec
+
+
+def encode(codec, chunk):
+	"""
+	Encodes a 2D (entries x items) array as a compressed string.
+	"""
+
+	if codec == DELTA_ZLIB:
+		deltas = np.empty_like(chunk)
+		deltas[0] = chunk[0]
+		np.subtract(chunk[1:], chunk[:-1], out = deltas[1:])
+		chunk = deltas
+
+	return zlib.compress(chunk.tobytes(), ZLIB_LEVEL)
+
+
+def decode(codec, data, dtype, nItems):
+	"""
+	Decodes a string written by encode into a 2D (entries x items) array.
+	"""
+
+	chunk = np.frombuffer(zlib.decompress(data), dtype).reshape(-1, nItems)
+
+	if codec == DELTA_ZLIB:
+		chunk = np.cumsum(chunk, axis = 0, dtype = chunk.dtype)
+
+	return chunk
@@ -0,0 +1,148 @@
+"""
+Reads TableWriter output across many simulated cells, e.g. the generations
+of a seed in multigen analyses or all the cells of a cohort.
+
+Example:
+	ap = AnalysisPaths(seedOutDir, multi_gen_plot = True)
+	time, boundaries = multicell.readColumn(ap.get_cells(), "Main", "time")
+
+	# Entries of the i-th cell
+	time[boundaries[i]:boundaries[i + 1]]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from wholecell.io import tablewriter as tw
+from wholecell.io.tablereader import TableReader
+from wholecell.utils import parallelization
+
+SIM_OUT_DIR = "simOut"
+
+# TableReaders shared by all callers, keyed by table path
+_readers = {}
+_readersLock = threading.Lock()
+
+
+def tableReader(path):
+	"""
+	Returns a TableReader for the table at path, shared across callers so
+	each table's column metadata is parsed once.  A reader is replaced if
+	the table has been modified since it was created.
+
+	Parameters
+	----------
+	path : str
+		Path to the table directory (or archive).
+
+	Returns
+	-------
+	TableReader
+
+	"""
+
+	mtime = _modificationTime(path)
+
+	with _readersLock:
+		reader, readerMtime = _readers.get(path, (None, None))
+
+	if reader is None or readerMtime != mtime:
+		reader = TableReader(path)
+
+		with _readersLock:
+			_readers[path] = (reader, mtime)
+
+	return reader
+
+
+def clearReaders():
+	"""
+	Drops all of the shared TableReaders.
+	"""
+
+	with _readersLock:
+		_readers.clear()
+
+
+def readColumn(cellDirs, tableName, columnName, indices = None, nThreads = None):
+	"""
+	Reads a column from the same table of many cells and concatenates the
+	entries.
+
+	Parameters
+	----------
+	cellDirs : iterable of str
+		The cell directories (e.g. from AnalysisPaths.get_cells()), each
+		holding a simOut directory.
+	tableName : str
+		The name of the table, e.g. "BulkMolecules".
+	columnName : str
+		The name of the column, e.g. "counts".
+	indices : ndarray (int) or None
+		The indices to read from each entry; see TableReader.readColumn.
+	nThreads : int or None
+		The number of threads reading cells concurrently.  Defaults to
+		parallelization.plotter_cpus(), limited to the number of cells.
+
+	Returns
+	-------
+	data : ndarray
+		The squeezed entries of all cells, in order, along the first
+		dimension.
+	boundaries : ndarray (int)
+		The index in data of the first entry of each cell, followed by the
+		total number of entries, so the entries of cell i are
+		data[boundaries[i]:boundaries[i + 1]].
+
+	"""
+
+	paths = [
+		os.path.join(cellDir, SIM_OUT_DIR, tableName)
+		for cellDir in cellDirs
+		]
+
+	def read(path):
+		return tableReader(path).readColumn(
+			columnName, indices, squeeze = False
+			)
+
+	if nThreads is None:
+		nThreads = parallelization.plotter_cpus()
+
+	nThreads = min(nThreads, len(paths))
+
+	if nThreads > 1:
+		pool = ThreadPool(nThreads)
+		columns = pool.map(read, paths)
+		pool.close()
+		pool.join()
+
+	else:
+		columns = [read(path) for path in paths]
+
+	boundaries = np.zeros(len(columns) + 1, np.int64)
+	boundaries[1:] = np.cumsum([column.shape[0] for column in columns])
+
+	if not columns:
+		return np.zeros(0), boundaries
+
+	return np.concatenate(columns).squeeze(), boundaries
+
+
+def _modificationTime(path):
+	"""
+	Returns the modification time of a table directory or archive, or None
+	if neither exists (TableReader raises the appropriate error).
+	"""
+
+	for candidate in (path, path + tw.ARCHIVE_EXTENSION):
+		if os.path.exists(candidate):
+			return os.path.getmtime(candidate)
+
+	return None
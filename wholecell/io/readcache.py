@@ -0,0 +1,336 @@
+"""
+A cache for the columns and pickles read by analysis plots, so the plots
+run for a cell (or a seed, cohort, variant) share the reads of the large
+BulkMolecules, Mass, FBAResults, etc. columns and of the sim_data pickle.
+
+While a cache is enabled, TableReader.readColumn looks up each read by
+(data file path, modification time, column, indices) before reading the
+table.  Cached columns are kept in memory within a byte budget, dropping
+the least recently used ones first.  Given a spill directory, each column
+is also saved there as a .npy file, which later reads (including those in
+other processes, e.g. with WC_ANALYZE_FAST) load as a memory map once the
+in-memory copy has been dropped.
+
+Example:
+	with readcache.enabled():
+		# Read from disk
+		counts = TableReader(path).readColumn("counts")
+
+		# Served from the cache
+		counts = TableReader(path).readColumn("counts")
+
+AnalysisPlot.plot() enables the shared cache around every plot.  The
+environment variables 'WC_ANALYSIS_CACHE_BYTES' (int, the memory budget) and
+'WC_ANALYSIS_CACHE_DIR' (the spill directory) configure it.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+import cPickle
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 << 30 # 2 GiB
+DEFAULT_MAX_PICKLES = 4
+
+SPILL_EXTENSION = ".npy"
+
+# The cache consulted by TableReader, if any
+_active = None
+_shared = None
+
+
+class ReadCache(object):
+	"""
+	An LRU cache of column reads and loaded pickles.
+
+	Parameters
+	----------
+	maxBytes : int
+		The memory budget for cached columns, in bytes.  Columns larger than
+		the budget are not kept in memory (though they are still spilled).
+	spillDir : str or None
+		A directory to save each cached column in, or None to keep columns
+		in memory only.  The directory is created if needed.
+	maxPickles : int
+		The number of loaded pickles to keep.
+
+	Attributes
+	----------
+	hits, misses : int
+		The numbers of column reads served from and not from the cache.
+	tablesRead : Counter
+		The number of bytes of column reads per table name, whether or not
+		served from the cache.
+
+	Notes
+	-----
+	Cached arrays are shared by all readers, so they are made read-only.
+
+	"""
+
+	def __init__(self, maxBytes = DEFAULT_MAX_BYTES, spillDir = None,
+			maxPickles = DEFAULT_MAX_PICKLES):
+		self._maxBytes = maxBytes
+		self._spillDir = spillDir
+		self._maxPickles = maxPickles
+
+		self._columns = OrderedDict()
+		self._nBytes = 0
+		self._pickles = OrderedDict()
+		self._lock = threading.RLock()
+
+		self.hits = 0
+		self.misses = 0
+		self.tablesRead = Counter()
+
+		if spillDir is not None and not os.path.isdir(spillDir):
+			try:
+				os.makedirs(spillDir)
+			except OSError:
+				if not os.path.isdir(spillDir): # not made concurrently
+					raise
+
+
+	def readColumn(self, dataPath, name, indices, load, table = None):
+		"""
+		Returns a cached column read, calling load() to read it on a miss.
+
+		Parameters
+		----------
+		dataPath : str
+			The path of the file holding the column's data, whose modification
+			time invalidates cached reads.
+		name : str
+			The name of the column.
+		indices : ndarray (int) or None
+			The indices read from each entry.
+		load : callable
+			Reads the column, returning an ndarray.
+		table : str or None
+			The name of the table, to count the read in tablesRead.
+
+		Returns
+		-------
+		An ndarray: the read-only array the cache holds (in memory or
+		spilled), or, if the cache didn't keep the read, the array load()
+		returned.
+
+		"""
+
+		if indices is not None:
+			indices = np.asarray(indices)
+			indices = (indices.dtype.str, indices.shape, indices.tobytes())
+
+		key = (
+			os.path.abspath(dataPath), os.path.getmtime(dataPath), name, indices
+			)
+
+		with self._lock:
+			data = self._columns.pop(key, None)
+
+			if data is not None:
+				self._columns[key] = data # most recently used
+				self.hits += 1
+				self._count(table, data)
+				return data
+
+		data = self._loadSpilled(key)
+
+		if data is None:
+			self.misses += 1
+			data = np.asarray(load())
+			writeable = data.flags.writeable
+			data.flags.writeable = False
+			self._spill(key, data)
+
+			if not self._keep(key, data):
+				# Not shared, so the caller can have it as loaded
+				data.flags.writeable = writeable
+
+		else:
+			self.hits += 1
+			self._keep(key, data)
+
+		self._count(table, data)
+
+		return data
+
+
+	def loadPickle(self, path):
+		"""
+		Returns the object pickled in a file, unpickling it at most once
+		while the file is unchanged.
+
+		The object is shared by all callers and must not be modified.
+		"""
+
+		key = (os.path.abspath(path), os.path.getmtime(path))
+
+		with self._lock:
+			obj = self._pickles.pop(key, None)
+
+			if obj is None:
+				with open(path, "rb") as f:
+					obj = cPickle.load(f)
+
+			self._pickles[key] = obj # most recently used
+
+			while len(self._pickles) > self._maxPickles:
+				self._pickles.popitem(last = False)
+
+		return obj
+
+
+	def clear(self):
+		"""
+		Drops all cached columns and pickles from memory.  Spilled columns
+		are left in the spill directory.
+		"""
+
+		with self._lock:
+			self._columns.clear()
+			self._nBytes = 0
+			self._pickles.clear()
+
+
+	def nBytes(self):
+		"""
+		Returns the number of bytes of columns held in memory.
+		"""
+
+		return self._nBytes
+
+
+	def _count(self, table, data):
+		"""
+		Internal method for counting a column read in tablesRead.
+		"""
+
+		if table is not None:
+			with self._lock:
+				self.tablesRead[table] += data.nbytes
+
+
+	def _keep(self, key, data):
+		"""
+		Internal method for holding a column in memory, dropping the least
+		recently used columns to stay within the memory budget.  Returns
+		whether the column is held.
+		"""
+
+		if data.nbytes > self._maxBytes:
+			return False
+
+		with self._lock:
+			if key in self._columns:
+				return True
+
+			self._columns[key] = data
+			self._nBytes += data.nbytes
+
+			while self._nBytes > self._maxBytes:
+				_, dropped = self._columns.popitem(last = False)
+				self._nBytes -= dropped.nbytes
+
+		return True
+
+
+	def _spillPath(self, key):
+		"""
+		Internal method for naming a column's spill file, the same in every
+		process.
+		"""
+
+		return os.path.join(
+			self._spillDir,
+			hashlib.sha1(repr(key)).hexdigest() + SPILL_EXTENSION
+			)
+
+
+	def _loadSpilled(self, key):
+		"""
+		Internal method for memory-mapping a spilled column, returning None
+		if it hasn't been spilled.
+		"""
+
+		if self._spillDir is None:
+			return None
+
+		path = self._spillPath(key)
+
+		if not os.path.exists(path):
+			return None
+
+		return np.load(path, mmap_mode = "r")
+
+
+	def _spill(self, key, data):
+		"""
+		Internal method for saving a column to the spill directory.  The file
+		is written under a temporary name then renamed, so concurrent readers
+		never see a partial file.
+		"""
+
+		if self._spillDir is None or data.dtype.hasobject:
+			return
+
+		with tempfile.NamedTemporaryFile(
+				dir = self._spillDir, suffix = ".partial", delete = False) as f:
+			np.save(f, data)
+
+		os.rename(f.name, self._spillPath(key))
+
+
+def activeCache():
+	"""
+	Returns the enabled ReadCache, or None if no cache is enabled.
+	"""
+
+	return _active
+
+
+def sharedCache():
+	"""
+	Returns the ReadCache shared by the analysis plots run in this process,
+	configured by the 'WC_ANALYSIS_CACHE_BYTES' and 'WC_ANALYSIS_CACHE_DIR'
+	environment variables.
+	"""
+
+	global _shared
+
+	if _shared is None:
+		_shared = ReadCache(
+			int(os.environ.get('WC_ANALYSIS_CACHE_BYTES', DEFAULT_MAX_BYTES)),
+			os.environ.get('WC_ANALYSIS_CACHE_DIR') or None,
+			)
+
+	return _shared
+
+
+@contextmanager
+def enabled(cache = None):
+	"""
+	A context manager that enables a ReadCache (by default the shared cache)
+	for the `with` statement body.  Nesting restores the outer cache.
+	"""
+
+	global _active
+
+	if cache is None:
+		cache = sharedCache()
+
+	saved = _active
+	_active = cache
+
+	try:
+		yield cache
+	finally:
+		_active = saved
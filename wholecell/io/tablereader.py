@@ -4,13 +4,20 @@ from __future__ import print_function
 
 import os
 import json
+import struct
+import zipfile
 
 import numpy as np
 
+from . import compression
+from . import readcache
 from . import tablewriter as tw
 
 ZIP_FILETYPE = ".bz2"
 
+# Version of the file specification that stored offsets as text, one per line
+TEXT_OFFSETS_VERSION = "2"
+
 __all__ = [
 	"TableReader",
 	]
@@ -52,6 +59,14 @@ class VariableWidthError(TableReaderError):
 	pass
 
 
+class CompressedArchiveError(TableReaderError):
+	"""
+	An error raised when a table archive has compressed members, which can't
+	be read in place.
+	"""
+	pass
+
+
 class TableReader(object):
 	"""
 	Reads output generated by TableWriter.
@@ -59,7 +74,9 @@ class TableReader(object):
 	Parameters
 	----------
 	path : str
-		Path to the input location (a directory).
+		Path to the input location; a directory, or an archive written by
+		wholecell.io.tablewriter.archiveTable.  The archive extension may be
+		left off.
 
 	See also
 	--------
@@ -67,39 +84,54 @@ class TableReader(object):
 
 	Notes
 	-----
-	TODO (John): Consider a method for loading an indexed portion of a column.
+	Archive members are read in place, using their offsets within the
+	archive file.
 
 	TODO (John): Consider removing unused methods (see below).
 
-	TODO (John): Unit tests.
-
 	"""
 
 	def __init__(self, path):
+		self._path = path
+		self._archivePath = None
+		self._archiveMembers = None
+
+		if not os.path.isdir(path):
+			if os.path.isfile(path + tw.ARCHIVE_EXTENSION):
+				self._loadArchive(path + tw.ARCHIVE_EXTENSION)
+
+			elif zipfile.is_zipfile(path):
+				self._loadArchive(path)
+
 		# Open version file for table
 		versionFilePath = os.path.join(path, tw.DIR_METADATA, tw.FILE_VERSION)
 		try:
-			with open(versionFilePath) as f:
+			with self._openFile(tw.DIR_METADATA, tw.FILE_VERSION) as f:
 				version = f.read()
 
-		except IOError as e:
+		except (IOError, KeyError) as e:
 			# Check if a zipped version file exists. Print appropriate error prompts.
-			if os.path.exists(versionFilePath + ZIP_FILETYPE):
+			if os.path.exists(versionFilePath + ZIP_FILETYPE) or os.path.exists(
+					path + tw.ARCHIVE_EXTENSION + ZIP_FILETYPE):
 				raise NotUnzippedError("The version file for a table ({}) was found zipped. Unzip all table files before reading table.".format(path), e)
 			else:
 				raise VersionError("Could not open the version file for a table ({})".format(path), e)
 
-		# Check if the table version matches the latest version
-		if version != tw.VERSION:
+		# Check if the table version matches the latest or a readable version
+		if version not in (tw.VERSION, TEXT_OFFSETS_VERSION):
 			raise VersionError("Expected version {} but found version {}".format(tw.VERSION, version))
 
+		self._version = version
+
 		# Read attribute names for table
-		self._dirAttributes = os.path.join(path, tw.DIR_ATTRIBUTES)
-		self._attributeNames = os.listdir(self._dirAttributes)
+		self._attributeNames = self._listFiles(tw.DIR_ATTRIBUTES)
 
 		# Read column names for table
-		self._dirColumns = os.path.join(path, tw.DIR_COLUMNS)
-		self._columnNames = os.listdir(self._dirColumns)
+		self._columnNames = self._listFiles(tw.DIR_COLUMNS)
+
+		# Parsed offsets and dtypes, loaded lazily and cached per column
+		self._columnInfo = {}
+		self._columnChunks = {}
 
 
 	def readAttribute(self, name):
@@ -120,12 +152,11 @@ class TableReader(object):
 		if name not in self._attributeNames:
 			raise DoesNotExistError("No such attribute: {}".format(name))
 
-		return json.loads(
-			open(os.path.join(self._dirAttributes, name)).read()
-			)
+		with self._openFile(tw.DIR_ATTRIBUTES, name) as attributeFile:
+			return json.loads(attributeFile.read())
 
 
-	def readColumn(self, name, indices=None, block_read=True):
+	def readColumn(self, name, indices=None, block_read=True, mmap=False, squeeze=True):
 		"""
 		Load a full column (all entries).
 
@@ -139,9 +170,17 @@ class TableReader(object):
 				which should typically be the case.
 			block_read (bool): If True, will only read one block per time point,
 				otherwise will seek between contiguous data. Only applies if
-				indices are given.
+				indices are given and mmap is False.
 				NOTE: If False and indices are spread out, reading can be orders
 				of magnitude slower.
+			mmap (bool): If True, the data file is memory-mapped instead of
+				read.  Without indices, the returned array is a read-only
+				view backed by an np.memmap so no data is loaded until it is
+				operated on.  With indices, only the requested elements are
+				copied out of the memory map.  Ignored for compressed
+				columns.
+			squeeze (bool): If False, the output is always 2D (entries x
+				items) instead of being squeezed.
 
 		Returns:
 			ndarray: data read with entries along the first dimension
@@ -149,41 +188,87 @@ class TableReader(object):
 		Notes:
 		If entry sizes varies, this method cannot be used.
 
-		Output will be squeezed; e.g. scalars or scalar-likes written with
-		TableWriter will be returned as vectors.
+		Output will be squeezed by default; e.g. scalars or scalar-likes
+		written with TableWriter will be returned as vectors.
+
+		Memory-mapped views keep the data file open until they are
+		dereferenced.  Copy the array (e.g. np.array(data)) if it needs to
+		outlive the file or be modified.
+
+		Compressed columns are decompressed one chunk at a time, keeping
+		only the requested indices of each chunk.
 
-		TODO (John): Consider using np.memmap to defer loading of the data
-			until it is operated on.  Early work (see issue #221) suggests that
-			this may lead to cryptic performance issues.
+		While a wholecell.io.readcache cache is enabled, reads are served
+		from it when possible.  With mmap, the cached (read-only) array is
+		returned instead of a copy.  Without mmap, a copy is made only of
+		arrays the cache holds.
 
 		TODO (John): This method should probably use np.frombuffer rather than
 			np.fromstring.  It seems that using np.fromstring here will become
 			deprecated in later versions of NumPy.
 
-		TODO (John): Open in binary mode.
-
 		TODO: Select criteria to automatically select between two methods for indices
 		"""
 
 		if name not in self._columnNames:
 			raise DoesNotExistError("No such column: {}".format(name))
 
+		cache = readcache.activeCache()
+
+		if cache is None or (mmap and indices is None):
+			data = self._readColumn(name, indices, block_read, mmap)
+
+		else:
+			dataPath = self._fileLocation(tw.DIR_COLUMNS, name, tw.FILE_DATA)[0]
+			data = cache.readColumn(dataPath, name, indices,
+				lambda: self._readColumn(name, indices, block_read, mmap),
+				self._tableName())
+
+			if not mmap and not data.flags.writeable:
+				data = np.array(data) # callers may modify their copy
+
+		return data.squeeze() if squeeze else data
+
+
+	def _readColumn(self, name, indices, block_read, mmap):
+		"""
+		Internal method for loading a full column; see readColumn.
+
+		Returns
+		-------
+		NumPy ndarray, 2D (entries x items).
+
+		"""
+
+		chunks = self._loadChunks(name)
+
+		if chunks is not None:
+			return self._readCompressed(name, chunks, indices)
+
 		offsets, dtype = self._loadOffsets(name)
 
 		sizes = np.diff(offsets)
 
-		if len(set(sizes)) > 1:
+		if sizes.size and np.any(sizes != sizes[0]):
 			raise VariableWidthError("Cannot load full column; data size varies")
 
 		nEntries = sizes.size
 
-		with open(os.path.join(self._dirColumns, name, tw.FILE_DATA)) as dataFile:
+		if mmap:
+			data = self._memmapColumn(name, offsets, dtype)
+
+			if indices is None:
+				return data
+			else:
+				return np.asarray(data[:, indices])
+
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_DATA) as dataFile:
 			if indices is None:
 				dataFile.seek(offsets[0])
 
 				return np.fromstring(
 					dataFile.read(), dtype
-					).reshape(nEntries, -1).squeeze()
+					).reshape(nEntries, -1)
 			else:
 				type_size = np.dtype(dtype).itemsize
 				n_items = int(sizes[0] / type_size)
@@ -237,7 +322,7 @@ class TableReader(object):
 								)
 						dataFile.seek(last_seek, 1)
 
-				return data.squeeze()
+				return data
 
 
 	def iterColumn(self, name):
@@ -263,11 +348,20 @@ class TableReader(object):
 		if name not in self._columnNames:
 			raise DoesNotExistError("No such column: {}".format(name))
 
+		chunks = self._loadChunks(name)
+
+		if chunks is not None:
+			for chunk in self._iterChunks(name, chunks):
+				for entry in chunk:
+					yield entry
+
+			return
+
 		offsets, dtype = self._loadOffsets(name)
 
 		sizes = np.diff(offsets)
 
-		with open(os.path.join(self._dirColumns, name, tw.FILE_DATA)) as dataFile:
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_DATA) as dataFile:
 			dataFile.seek(offsets[0])
 
 			for size in sizes:
@@ -319,11 +413,23 @@ class TableReader(object):
 
 		"""
 
+		chunks = self._loadChunks(name)
+
+		if chunks is not None:
+			offsets = chunks[0]
+			chunkIndex = np.searchsorted(offsets[:, 1], index, "right") - 1
+
+			chunk = next(self._iterChunks(
+				name, (offsets[chunkIndex:chunkIndex+2],) + chunks[1:]
+				))
+
+			return chunk[index - offsets[chunkIndex, 1]]
+
 		offsets, dtype = self._loadOffsets(name)
 
 		size = offsets[index+1] - offsets[index]
 
-		with open(os.path.join(self._dirColumns, name, tw.FILE_DATA)) as dataFile:
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_DATA) as dataFile:
 			dataFile.seek(offsets[index])
 
 			return np.fromstring(
@@ -331,6 +437,159 @@ class TableReader(object):
 				)
 
 
+	def _readCompressed(self, name, chunks, indices):
+		"""
+		Internal method for loading a compressed column.
+
+		Parameters
+		----------
+		name : str
+			The name of the column.
+		chunks : tuple
+			The chunk information, as returned by _loadChunks.
+		indices : ndarray (int) or None
+			The indices to keep from each entry, or None to keep all.
+
+		Returns
+		-------
+		NumPy ndarray, 2D (entries x items).
+
+		"""
+
+		offsets, dtype, codec, nItems = chunks
+		nEntries = offsets[-1, 1]
+
+		data = np.empty(
+			(nEntries, nItems if indices is None else len(indices)), dtype
+			)
+
+		for (start, end), chunk in zip(
+				zip(offsets[:-1, 1], offsets[1:, 1]),
+				self._iterChunks(name, chunks)):
+			data[start:end] = chunk if indices is None else chunk[:, indices]
+
+		return data
+
+
+	def _iterChunks(self, name, chunks):
+		"""
+		Internal method for iterating over the decompressed chunks of a
+		compressed column.
+
+		Parameters
+		----------
+		name : str
+			The name of the column.
+		chunks : tuple
+			The chunk information, as returned by _loadChunks, or with the
+			offsets limited to a range of chunks.
+
+		Yields
+		------
+		2D NumPy ndarrays (entries x items).
+
+		"""
+
+		offsets, dtype, codec, nItems = chunks
+
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_DATA) as dataFile:
+			dataFile.seek(offsets[0, 0])
+
+			for size in np.diff(offsets[:, 0]):
+				yield compression.decode(codec, dataFile.read(size), dtype, nItems)
+
+
+	def _loadChunks(self, name):
+		"""
+		Internal method for loading data needed to interpret a compressed
+		column.
+
+		Parameters
+		----------
+		name : str
+			The name of the column.
+
+		Returns
+		-------
+		None if the column is not compressed, otherwise a tuple of
+		offsets : ndarray (int)
+			An (nChunks + 1) x 2 integer array of the byte offset and first
+			entry index of each chunk, followed by the end of the data.
+		dtype : str or list-of-tuples-of-strings
+			The data type, as for _loadOffsets.
+		codec : str
+			The name of the codec (see wholecell.io.compression).
+		nItems : int
+			The number of items in each entry.
+
+		"""
+
+		if name in self._columnChunks:
+			return self._columnChunks[name]
+
+		if self._version == TEXT_OFFSETS_VERSION or not self._fileExists(
+				tw.DIR_COLUMNS, name, tw.FILE_CODEC):
+			chunks = None
+
+		else:
+			with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_CODEC) as codecFile:
+				codec = json.loads(codecFile.read())
+
+			with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_OFFSETS) as offsetsFile:
+				offsets = np.frombuffer(
+					offsetsFile.read(), tw.OFFSET_DTYPE
+					).astype(np.int64)
+			offsets = offsets[:offsets.size // 2 * 2].reshape(-1, 2)
+
+			chunks = (
+				offsets,
+				self._loadDtype(name, offsets[0, 0]),
+				str(codec["codec"]),
+				codec["items"],
+				)
+
+		self._columnChunks[name] = chunks
+
+		return chunks
+
+
+	def _memmapColumn(self, name, offsets, dtype):
+		"""
+		Internal method for memory-mapping a fixed-width column.
+
+		Parameters
+		----------
+		name : str
+			The name of the column.
+		offsets : ndarray (int)
+			The byte offsets for each entry, as returned by _loadOffsets.
+		dtype : str or list-of-tuples-of-strings
+			The data type, as returned by _loadOffsets.
+
+		Returns
+		-------
+		A read-only 2D np.memmap with entries along the first dimension.
+
+		"""
+
+		nEntries = offsets.size - 1
+		nItems = (offsets[1] - offsets[0]) // np.dtype(dtype).itemsize if nEntries else 0
+
+		if nEntries == 0 or nItems == 0:
+			# np.memmap cannot map zero bytes
+			return np.zeros((nEntries, nItems), dtype)
+
+		path, start, size = self._fileLocation(tw.DIR_COLUMNS, name, tw.FILE_DATA)
+
+		return np.memmap(
+			path,
+			dtype = dtype,
+			mode = "r",
+			offset = start + offsets[0],
+			shape = (nEntries, nItems),
+			)
+
+
 	def _loadOffsets(self, name):
 		"""
 		Internal method for loading data needed to interpret a column.
@@ -348,26 +607,192 @@ class TableReader(object):
 		dtype : list-of-tuples-of-strings
 			A data type specific for instantiating a NumPy ndarray.
 
-		"""
+		Notes
+		-----
+		The result is cached per column, so the offsets file is only parsed
+		once per TableReader instance.
 
-		with open(os.path.join(self._dirColumns, name, tw.FILE_OFFSETS)) as offsetsFile:
-			offsets = np.array([int(i.strip()) for i in offsetsFile])
+		"""
 
-		with open(os.path.join(self._dirColumns, name, tw.FILE_DATA)) as dataFile:
-			rawDtype = json.loads(dataFile.read(offsets[0]))
+		if name in self._columnInfo:
+			return self._columnInfo[name]
 
-			if isinstance(rawDtype, basestring):
-				dtype = str(rawDtype)
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_OFFSETS) as offsetsFile:
+			if self._version == TEXT_OFFSETS_VERSION:
+				offsets = np.array([int(i.strip()) for i in offsetsFile.read().splitlines()])
 
 			else:
-				dtype = [ # numpy requires list-of-tuples-of-strings
-					(str(n), str(t))
-					for n, t in rawDtype
-					]
+				offsets = np.frombuffer(
+					offsetsFile.read(), tw.OFFSET_DTYPE
+					).astype(np.int64)
+
+		if self._version != TEXT_OFFSETS_VERSION:
+			if offsets.size == 2 and offsets[1] > offsets[0]:
+				# Fixed-width column; only the first entry's offsets are stored
+				entrySize = offsets[1] - offsets[0]
+				dataSize = self._fileLocation(tw.DIR_COLUMNS, name, tw.FILE_DATA)[2]
+				nEntries = (dataSize - offsets[0]) // entrySize
+				offsets = offsets[0] + entrySize * np.arange(nEntries + 1)
+
+		dtype = self._loadDtype(name, offsets[0])
+
+		self._columnInfo[name] = (offsets, dtype)
 
 		return offsets, dtype
 
 
+	def _loadDtype(self, name, headerSize):
+		"""
+		Internal method for loading the data type of a column.
+
+		Parameters
+		----------
+		name : str
+			The name of the column.
+		headerSize : int
+			The size of the JSON-serialized data type at the start of the
+			column's data file.
+
+		Returns
+		-------
+		dtype : str or list-of-tuples-of-strings
+			A data type specific for instantiating a NumPy ndarray.
+
+		"""
+
+		with self._openFile(tw.DIR_COLUMNS, name, tw.FILE_DATA) as dataFile:
+			rawDtype = json.loads(dataFile.read(headerSize))
+
+		if isinstance(rawDtype, basestring):
+			return str(rawDtype)
+
+		else:
+			return [ # numpy requires list-of-tuples-of-strings
+				(str(n), str(t))
+				for n, t in rawDtype
+				]
+
+
+	def _loadArchive(self, path):
+		"""
+		Internal method for indexing the members of a table archive.
+
+		Parameters
+		----------
+		path : str
+			Path to the archive.
+
+		Notes
+		-----
+		The location of a member's data follows its local file header, whose
+		length depends on the member's name and extra field.
+
+		"""
+
+		with zipfile.ZipFile(path) as archive:
+			infos = archive.infolist()
+
+		self._archivePath = path
+		self._archiveMembers = {}
+
+		with open(path, "rb") as archiveFile:
+			for info in infos:
+				if info.compress_type != zipfile.ZIP_STORED:
+					raise CompressedArchiveError(
+						"Member {} of table archive {} is compressed".format(
+							info.filename, path
+							)
+						)
+
+				archiveFile.seek(info.header_offset + 26)
+				nameLength, extraLength = struct.unpack("<HH", archiveFile.read(4))
+
+				self._archiveMembers[info.filename] = (
+					info.header_offset + 30 + nameLength + extraLength,
+					info.file_size
+					)
+
+
+	def _fileLocation(self, *names):
+		"""
+		Internal method for locating the contents of a table file.
+
+		Parameters
+		----------
+		*names : strs
+			The path components of the file, relative to the table.
+
+		Returns
+		-------
+		path : str
+			The path to the file or to the archive containing it.
+		start : int
+			The byte offset of the file's contents in path.
+		size : int
+			The size of the file's contents, in bytes.
+
+		"""
+
+		if self._archiveMembers is None:
+			path = os.path.join(self._path, *names)
+
+			return path, 0, os.path.getsize(path)
+
+		start, size = self._archiveMembers["/".join(names)]
+
+		return self._archivePath, start, size
+
+
+	def _tableName(self):
+		"""
+		Internal method for naming the table, e.g. "BulkMolecules".
+		"""
+
+		name = os.path.basename(os.path.normpath(self._path))
+
+		if name.endswith(tw.ARCHIVE_EXTENSION):
+			name = name[:-len(tw.ARCHIVE_EXTENSION)]
+
+		return name
+
+
+	def _openFile(self, *names):
+		"""
+		Internal method for opening a table file for reading in binary mode.
+		"""
+
+		if self._archiveMembers is None:
+			return open(os.path.join(self._path, *names), "rb")
+
+		return _ArchiveMember(*self._fileLocation(*names))
+
+
+	def _fileExists(self, *names):
+		"""
+		Internal method for checking whether a table file exists.
+		"""
+
+		if self._archiveMembers is None:
+			return os.path.exists(os.path.join(self._path, *names))
+
+		return "/".join(names) in self._archiveMembers
+
+
+	def _listFiles(self, directory):
+		"""
+		Internal method for listing the entries of a table sub-directory.
+		"""
+
+		if self._archiveMembers is None:
+			return os.listdir(os.path.join(self._path, directory))
+
+		return sorted({
+			member.split("/")[1]
+			for member in self._archiveMembers
+			if member.split("/")[0] == directory
+			})
+
+
 	def attributeNames(self):
 		"""
 		Returns the names of all attributes.
@@ -396,3 +821,63 @@ class TableReader(object):
 
 		"""
 		pass
+
+
+class _ArchiveMember(object):
+	"""
+	A read-only, file-like view of a member stored uncompressed in a table
+	archive.  Positions are relative to the start of the member.
+
+	Parameters
+	----------
+	path : str
+		Path to the archive.
+	start : int
+		The byte offset of the member's contents in the archive.
+	size : int
+		The size of the member's contents, in bytes.
+
+	"""
+
+	def __init__(self, path, start, size):
+		self._file = open(path, "rb")
+		self._start = start
+		self._size = size
+
+		self._file.seek(start)
+
+
+	def read(self, size = -1):
+		remaining = self._size - self.tell()
+
+		if size < 0 or size > remaining:
+			size = remaining
+
+		return self._file.read(max(size, 0))
+
+
+	def seek(self, offset, whence = 0):
+		if whence == 0:
+			self._file.seek(self._start + offset)
+
+		elif whence == 1:
+			self._file.seek(offset, 1)
+
+		else:
+			self._file.seek(self._start + self._size + offset)
+
+
+	def tell(self):
+		return self._file.tell() - self._start
+
+
+	def close(self):
+		self._file.close()
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *exc_info):
+		self.close()
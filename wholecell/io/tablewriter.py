@@ -4,15 +4,17 @@ from __future__ import division
 
 import os
 import json
+import shutil
+import zipfile
 
 import numpy as np
 
+from wholecell.io import compression
 from wholecell.utils import filepath
 
-# TODO: tests
-
 __all__ = [
 	"TableWriter",
+	"archiveTable",
 	# "TableWriterError",
 	# "FilesClosedError",
 	# "MissingFieldError",
@@ -21,7 +23,7 @@ __all__ = [
 	# "AttributeTypeError"
 	]
 
-VERSION = "2" # should update this any time there is a spec-breaking change
+VERSION = "3" # should update this any time there is a spec-breaking change
 
 DIR_METADATA = "metadata"
 DIR_ATTRIBUTES = "attributes"
@@ -29,6 +31,13 @@ DIR_COLUMNS = "columns"
 FILE_VERSION = "version"
 FILE_DATA = "data"
 FILE_OFFSETS = "offsets"
+FILE_CODEC = "codec"
+
+ARCHIVE_EXTENSION = ".zip"
+
+OFFSET_DTYPE = np.dtype("<i8") # binary format of the entries in FILE_OFFSETS
+
+CHUNK_ROWS = 64 # minimum number of entries per chunk of a compressed column
 
 
 class TableWriterError(Exception):
@@ -65,6 +74,19 @@ class AttributeTypeError(TableWriterError):
 	"""
 	pass
 
+class UnrecognizedCodecError(TableWriterError):
+	"""
+	An error raised when TableWriter is asked to compress a column with an
+	unknown codec.
+	"""
+	pass
+
+class CompressedVariableWidthError(TableWriterError):
+	"""
+	An error raised when the entry size of a compressed column changes.
+	"""
+	pass
+
 
 class _Column(object):
 	"""
@@ -78,6 +100,13 @@ class _Column(object):
 	----------
 	path : str
 		The path to the sub-directory associated with this particular column.
+	bufferRows : int
+		The number of fixed-size entries to accumulate in memory before
+		writing them to the data file in one operation.
+	codec : str or None
+		If given, the name of a codec from wholecell.io.compression used to
+		compress the column in chunks of at least CHUNK_ROWS entries.  Every
+		entry of a compressed column must have the same size.
 
 	Notes
 	-----
@@ -90,13 +119,25 @@ class _Column(object):
 
 	"""
 
-	def __init__(self, path):
+	def __init__(self, path, bufferRows = 1, codec = None):
+		if codec is not None and codec not in compression.CODECS:
+			raise UnrecognizedCodecError("Unrecognized codec: {}".format(codec))
+
 		filepath.makedirs(path)
 
-		self._data = open(os.path.join(path, FILE_DATA), "w")
-		self._offsets = open(os.path.join(path, FILE_OFFSETS), "w")
+		self._path = path
+		self._data = open(os.path.join(path, FILE_DATA), "wb")
+		self._offsets = None
 
 		self._dtype = None
+		self._entrySize = None
+		self._nEntries = 0
+
+		self._bufferRows = bufferRows
+		self._buffer = None
+		self._nBuffered = 0
+
+		self._codec = codec
 
 
 	def append(self, value):
@@ -112,6 +153,17 @@ class _Column(object):
 			A NumPy ndarray or anything that can be cast to an array via
 			np.asarray, including scalars (i.e. 0D arrays).
 
+		Notes
+		-----
+		While every entry has the same size, only the offsets of the first
+		entry are written.  The first entry with a different size switches
+		the column to writing one binary offset per entry, starting with the
+		offsets implied for the preceding fixed-size entries.
+
+		Fixed-size entries are copied into a preallocated buffer and written
+		once bufferRows entries have accumulated.  Variable-size entries are
+		written immediately.
+
 		"""
 
 		value = np.asarray(value, self._dtype)
@@ -124,20 +176,145 @@ class _Column(object):
 				descr = descr[0][1]
 
 			self._data.write(json.dumps(descr) + "\n")
-			self._offsets.write(str(self._data.tell()) + "\n")
 
-		self._data.write(value.tobytes())
-		self._offsets.write(str(self._data.tell()) + "\n")
+			start = self._data.tell()
+			self._entrySize = value.nbytes
+
+			if self._codec is not None and self._entrySize > 0:
+				self._compressed(start, value)
+
+			else:
+				self._codec = None
+
+				with open(os.path.join(self._path, FILE_OFFSETS), "wb") as offsets:
+					offsets.write(
+						np.array([start, start + value.nbytes], OFFSET_DTYPE).tobytes()
+						)
+
+				if self._entrySize == 0:
+					# Zero-size entries can't be counted from the data file size
+					self._variableWidth()
+
+				elif self._bufferRows > 1:
+					self._buffer = np.empty((self._bufferRows, value.size), self._dtype)
+
+		elif self._codec is not None:
+			if value.nbytes != self._entrySize:
+				raise CompressedVariableWidthError(
+					"Entry size of compressed column {} changed from {} to {} bytes".format(
+						self._path, self._entrySize, value.nbytes
+						)
+					)
+
+		else:
+			if self._offsets is None and value.nbytes != self._entrySize:
+				self._variableWidth()
+
+			if self._offsets is not None:
+				self._offsets.write(
+					np.array([self._data.tell() + value.nbytes], OFFSET_DTYPE).tobytes()
+					)
+
+		self._nEntries += 1
+
+		if self._buffer is not None:
+			self._buffer[self._nBuffered] = value.reshape(-1)
+			self._nBuffered += 1
+
+			if self._nBuffered == self._bufferRows:
+				self._writeBuffer()
+
+		else:
+			self._data.write(value.tobytes())
+
+
+	def _writeBuffer(self):
+		"""
+		Write any buffered entries to the data file.
+		"""
+
+		if self._nBuffered:
+			if self._codec is not None:
+				self._data.write(compression.encode(
+					self._codec, self._buffer[:self._nBuffered]
+					))
+				self._offsets.write(
+					np.array([self._data.tell(), self._nEntries], OFFSET_DTYPE).tobytes()
+					)
+
+			else:
+				self._data.write(self._buffer[:self._nBuffered].tobytes())
+
+			self._nBuffered = 0
+
+
+	def flush(self):
+		"""
+		Write any buffered entries and flush the files to disk.
+		"""
+
+		self._writeBuffer()
+		self._data.flush()
+
+		if self._offsets is not None:
+			self._offsets.flush()
+
+
+	def _compressed(self, start, value):
+		"""
+		Set up a compressed column on the first append.
+
+		The codec file records the codec and the number of items per entry.
+		The offsets file holds (byte offset, entry index) pairs, one for the
+		start of the data and one for the end of each chunk.
+
+		"""
+
+		self._codec = compression.codecForDtype(self._codec, self._dtype)
+
+		with open(os.path.join(self._path, FILE_CODEC), "w") as codecFile:
+			codecFile.write(json.dumps({"codec": self._codec, "items": value.size}))
+
+		self._offsets = open(os.path.join(self._path, FILE_OFFSETS), "wb")
+		self._offsets.write(np.array([start, 0], OFFSET_DTYPE).tobytes())
+
+		self._buffer = np.empty(
+			(max(self._bufferRows, CHUNK_ROWS), value.size), self._dtype
+			)
+
+
+	def _variableWidth(self):
+		"""
+		Switch to writing an explicit offset for every entry.
+
+		The offsets file written by the first append already holds the
+		offsets for the first entry.  The offsets for any subsequent
+		fixed-size entries are filled in here.  Buffering stops, since the
+		offsets follow the position in the data file.
+
+		"""
+
+		self._writeBuffer()
+		self._buffer = None
+
+		self._offsets = open(os.path.join(self._path, FILE_OFFSETS), "ab")
+
+		if self._nEntries > 1:
+			start = self._data.tell() - self._nEntries * self._entrySize
+			self._offsets.write(
+				(start + self._entrySize * np.arange(2, self._nEntries + 1)
+					).astype(OFFSET_DTYPE).tobytes()
+				)
 
 
 	def close(self):
 		"""
 		Close the files associated with the column.
 
-		While running, each column keeps two files open; one associated with
-		the data itself (as well as the dtype information), and one associated
-		with the offsets between entries.  This method explicitly closes those
-		files.
+		While running, each column keeps its data file open (which also
+		holds the dtype information).  Columns with entries of varying size
+		also keep the file with the offsets between entries open.  This
+		method writes any buffered entries and explicitly closes those files.
 
 		Notes
 		-----
@@ -145,8 +322,13 @@ class _Column(object):
 
 		"""
 
+		if not self._data.closed:
+			self._writeBuffer()
+
 		self._data.close()
-		self._offsets.close()
+
+		if self._offsets is not None:
+			self._offsets.close()
 
 
 	def __del__(self):
@@ -187,8 +369,16 @@ class TableWriter(object):
 				data : Contains the JSON-serialized format specification for
 					the Numpy array dtype and appended binary data from NumPy
 					ndarrays.
-				offsets : A list of integers (one per line) corresponding to
-					the associated byte offset for each entry in the column.
+				offsets : Little-endian int64 byte offsets into the data
+					file.  If every entry has the same size, only the start
+					and end offsets of the first entry are written, and the
+					number of entries follows from the size of the data file.
+					Otherwise there is one offset per entry boundary.
+				codec : Only for compressed columns; JSON with the codec
+					name and the number of items per entry.  The data file
+					then holds compressed chunks of entries, and the offsets
+					file holds (byte offset, entry index) pairs for the start
+					of the data and the end of each chunk.
 		/metadata : Directory for saving any critical internals for TableWriter
 				and TableReader.
 			version : An integer representing the "version number" of the data
@@ -200,6 +390,16 @@ class TableWriter(object):
 		Path to the directory that will be created.  All data will be saved
 		under this directory.  If the directory already exists, no error will
 		occur.
+	bufferRows : int
+		The number of entries each fixed-width column holds in memory before
+		writing them out together.  The default of 1 writes every entry as
+		it is appended.  Buffered entries are written by flush and close.
+	compression : dict of {string: string} pairs, or None
+		Column names and the codec (see wholecell.io.compression) used to
+		compress each of them.  Compressed columns must be fixed-width.
+	archive : bool
+		If True, the directory is packed into a single archive file (see
+		archiveTable) when the writer is closed.
 
 	See also
 	--------
@@ -245,12 +445,6 @@ class TableWriter(object):
 	TODO (John): Move the _Column class into the TableWriter namespace.
 		There's no reason for it to be available at the module level.
 
-	TODO (John): Instead of saving many files and sub-directories under one
-		directory, save everything to an uncompressed archive.  Built-in module
-		zipfile seems like a good option; np.savez uses it.
-
-	TODO (John): Unit tests.
-
 	TODO (John): Test portability across machines (particularly, different
 	operating systems).
 
@@ -260,7 +454,9 @@ class TableWriter(object):
 
 	"""
 
-	def __init__(self, path):
+	def __init__(self, path, bufferRows = 1, compression = None, archive = False):
+
+		self._path = path
 
 		dirMetadata = filepath.makedirs(path, DIR_METADATA)
 
@@ -272,6 +468,12 @@ class TableWriter(object):
 		self._dirColumns = filepath.makedirs(path, DIR_COLUMNS)
 		self._columns = None
 
+		self._bufferRows = bufferRows
+		self._compression = compression if compression is not None else {}
+
+		self._archive = archive
+		self._closed = False
+
 
 	def append(self, **namesAndValues):
 		"""
@@ -295,7 +497,11 @@ class TableWriter(object):
 
 		if self._columns is None:
 			self._columns = {
-				name:_Column(os.path.join(self._dirColumns, name))
+				name:_Column(
+					os.path.join(self._dirColumns, name),
+					self._bufferRows,
+					self._compression.get(name)
+					)
 				for name in namesAndValues.viewkeys()
 				}
 
@@ -364,9 +570,19 @@ class TableWriter(object):
 			self._attributeNames.append(name)
 
 
+	def flush(self):
+		"""
+		Write any buffered entries of all columns and flush them to disk.
+		"""
+
+		if self._columns is not None:
+			for column in self._columns.viewvalues():
+				column.flush()
+
+
 	def close(self):
 		"""
-		Close the output files (columns).
+		Close the output files (columns), and archive the table if requested.
 
 		Notes
 		-----
@@ -374,10 +590,18 @@ class TableWriter(object):
 
 		"""
 
+		if self._closed:
+			return
+
 		if self._columns is not None:
 			for column in self._columns.viewvalues():
 				column.close()
 
+		self._closed = True
+
+		if self._archive:
+			archiveTable(self._path)
+
 
 	def __del__(self):
 		"""
@@ -391,3 +615,42 @@ class TableWriter(object):
 
 		"""
 		self.close()
+
+
+def archiveTable(path):
+	"""
+	Packs a table directory written by TableWriter into a single archive.
+
+	The archive is a zip file named after the directory (with the
+	ARCHIVE_EXTENSION suffix) whose members are stored uncompressed, so
+	TableReader can read or memory-map them directly by their offset in the
+	archive.  This replaces dozens of files per table with one, which is
+	much kinder to file systems with slow metadata operations or inode
+	quotas.  The directory is removed once the archive is complete.
+
+	Parameters
+	----------
+	path : str
+		Path to the table directory.
+
+	Returns
+	-------
+	str, the path to the archive.
+
+	"""
+
+	archivePath = path + ARCHIVE_EXTENSION
+	partialPath = archivePath + ".partial"
+
+	with zipfile.ZipFile(partialPath, "w", zipfile.ZIP_STORED, allowZip64 = True) as archive:
+		for dirPath, dirNames, fileNames in os.walk(path):
+			dirNames.sort()
+
+			for fileName in sorted(fileNames):
+				filePath = os.path.join(dirPath, fileName)
+				archive.write(filePath, os.path.relpath(filePath, path))
+
+	os.rename(partialPath, archivePath)
+	shutil.rmtree(path)
+
+	return archivePath
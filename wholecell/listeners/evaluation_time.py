@@ -15,6 +15,7 @@ from __future__ import division
 import numpy as np
 
 import wholecell.listeners.listener
+from wholecell.states.unique_molecules import PARTITION_PATHS
 
 class EvaluationTime(wholecell.listeners.listener.Listener):
 	""" EvaluationTime """
@@ -36,6 +37,8 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 		self.nStates = len(sim.internal_states)
 		self.nProcesses = len(sim.processes)
 
+		self.uniqueMolecules = sim.internal_states.get("UniqueMolecules")
+
 		# State evaluation times
 		self.updateQueries_times = None
 		self.partition_times = None
@@ -52,6 +55,13 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 		self.calculateRequest_total = None
 		self.evolveState_total = None
 
+		# Unique molecule partitions, counted by the way molecules were
+		# allocated (see PARTITION_PATHS)
+		self.uniquePartitionPaths = None
+
+		# The longest timestep each process allowed when last checked
+		self.timeStepLimits = None
+
 
 	# Allocate memory
 	def allocate(self):
@@ -73,6 +83,10 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 		self.calculateRequest_total = 0
 		self.evolveState_total = 0
 
+		self.uniquePartitionPaths = np.zeros(len(PARTITION_PATHS), np.int64)
+
+		self.timeStepLimits = np.full(self.nProcesses, np.nan, np.float64)
+
 
 	def update(self):
 		self.updateQueries_total = self.updateQueries_times.sum()
@@ -82,6 +96,9 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 		self.calculateRequest_total = self.calculateRequest_times.sum()
 		self.evolveState_total = self.evolveState_times.sum()
 
+		if self.uniqueMolecules is not None:
+			self.uniquePartitionPaths[:] = self.uniqueMolecules.partitionPathCounts
+
 
 	def tableCreate(self, tableWriter):
 		# Handle the edge case of a simulation with no processes
@@ -90,7 +107,8 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 
 		tableWriter.writeAttributes(
 			stateNames = self.stateNames,
-			processNames = self.processNames
+			processNames = self.processNames,
+			uniquePartitionPathNames = list(PARTITION_PATHS),
 			)
 
 
@@ -112,4 +130,6 @@ class EvaluationTime(wholecell.listeners.listener.Listener):
 			merge_total = self.merge_total,
 			calculateRequest_total = self.calculateRequest_total,
 			evolveState_total = self.evolveState_total,
+			uniquePartitionPaths = self.uniquePartitionPaths,
+			timeStepLimits = self.timeStepLimits,
 			)
@@ -15,8 +15,14 @@ Logs whole-cell simulations and metadata to disk.
 from __future__ import division
 
 import os
+import sys
 import time
+import copy
 import itertools
+import threading
+import Queue
+
+import numpy as np
 
 import wholecell.loggers.logger
 from wholecell.io.tablewriter import TableWriter
@@ -24,15 +30,28 @@ from wholecell.io.tablewriter import TableWriter
 # TODO: let loaded simulation resume logging in a copied file
 
 DEFAULT_LOG_FREQUENCY = 1
+DEFAULT_BUFFER_ROWS = 1
+DEFAULT_QUEUE_SIZE = 8 # logged steps
 
 class Disk(wholecell.loggers.logger.Logger):
-	""" Disk """
+	"""
+	Disk
+
+	compression optionally maps table names to the compression argument of
+	their TableWriter, e.g. {"BulkMolecules": {"counts": "delta-zlib"}}.
+	If archive is True, each table is packed into a single archive file when
+	the simulation finishes.
+	"""
 
-	def __init__(self, outDir = None, allowOverwrite = False, logEvery = None):
+	def __init__(self, outDir = None, allowOverwrite = False, logEvery = None,
+			bufferRows = None, compression = None, archive = False):
 		self.outDir = outDir
 
 		self.allowOverwrite = allowOverwrite
 		self.logEvery = logEvery if logEvery is not None else DEFAULT_LOG_FREQUENCY
+		self.bufferRows = bufferRows if bufferRows is not None else DEFAULT_BUFFER_ROWS
+		self.compression = compression if compression is not None else {}
+		self.archive = archive
 
 		self.saveFiles = {}
 		self.mainFile = None
@@ -40,7 +59,7 @@ class Disk(wholecell.loggers.logger.Logger):
 
 
 	def initialize(self, sim):
-		self.mainFile = TableWriter(os.path.join(self.outDir, "Main"))
+		self.mainFile = self._tableWriter("Main")
 
 		# Metadata
 		self.mainFile.writeAttributes(
@@ -62,7 +81,7 @@ class Disk(wholecell.loggers.logger.Logger):
 
 		# TODO: separate checkpointing and logging
 		for name, obj in itertools.chain(sim.internal_states.viewitems(), sim.external_states.viewitems(), sim.listeners.viewitems()):
-			saveFile = TableWriter(os.path.join(self.outDir, name))
+			saveFile = self._tableWriter(name)
 
 			obj.tableCreate(saveFile)
 
@@ -90,6 +109,13 @@ class Disk(wholecell.loggers.logger.Logger):
 			saveFile.close()
 
 
+	def flush(self, sim):
+		self.mainFile.flush()
+
+		for saveFile in self.saveFiles.viewvalues():
+			saveFile.flush()
+
+
 	def copyData(self, sim):
 		sim.tableAppend(self.mainFile)
 
@@ -97,5 +123,154 @@ class Disk(wholecell.loggers.logger.Logger):
 			obj.tableAppend(saveFile)
 
 
+	def _tableWriter(self, name):
+		return TableWriter(
+			os.path.join(self.outDir, name),
+			self.bufferRows,
+			self.compression.get(name),
+			self.archive
+			)
+
+
+class AsyncDisk(Disk):
+	"""
+	Logs to disk like Disk, but writes the output on a background thread.
+
+	The values each object passes to its table are copied and queued once
+	per logged step, and a dedicated thread writes them while the simulation
+	continues.  If the queue holds queueSize steps, logging blocks until the
+	writer catches up.  finalize waits for all queued output to be written.
+	"""
+
+	def __init__(self, outDir = None, allowOverwrite = False, logEvery = None,
+			bufferRows = None, compression = None, archive = False, queueSize = None):
+		super(AsyncDisk, self).__init__(
+			outDir, allowOverwrite, logEvery, bufferRows, compression, archive)
+
+		self.queueSize = queueSize if queueSize is not None else DEFAULT_QUEUE_SIZE
+
+		self._queue = Queue.Queue(self.queueSize)
+		self._pending = []
+		self._error = None
+
+		self._thread = threading.Thread(target = self._write, name = "AsyncDisk")
+		self._thread.daemon = True
+
+
+	def initialize(self, sim):
+		self._thread.start()
+
+		super(AsyncDisk, self).initialize(sim)
+
+
+	def finalize(self, sim):
+		super(AsyncDisk, self).finalize(sim)
+		self._submit()
+
+		self._queue.put(None)
+		self._thread.join()
+
+		self._raiseWriteError()
+
+
+	def flush(self, sim):
+		super(AsyncDisk, self).flush(sim)
+
+		if self._thread.is_alive():
+			self._queue.put(self._pending[:])
+			del self._pending[:]
+			self._queue.join()
+
+
+	def copyData(self, sim):
+		super(AsyncDisk, self).copyData(sim)
+		self._submit()
+
+
+	def _tableWriter(self, name):
+		return _QueuedTableWriter(
+			super(AsyncDisk, self)._tableWriter(name), self._pending
+			)
+
+
+	def _submit(self):
+		"""
+		Queue the calls collected since the last submission, blocking while
+		the queue is full.
+		"""
+
+		self._raiseWriteError()
+
+		if self._pending:
+			self._queue.put(self._pending[:])
+			del self._pending[:]
+
+
+	def _write(self):
+		"""
+		Writer thread; makes the queued calls until it receives None.
+
+		After a failure the remaining calls are discarded so the simulation
+		never blocks on a full queue, and the error is raised in the
+		simulation thread at the next submission.
+		"""
+
+		while True:
+			calls = self._queue.get()
+
+			try:
+				if calls is None:
+					break
+
+				if self._error is None:
+					for method, kwargs in calls:
+						method(**kwargs)
+
+			except Exception:
+				self._error = sys.exc_info()
+
+			finally:
+				self._queue.task_done()
+
+
+	def _raiseWriteError(self):
+		if self._error is not None:
+			raise self._error[0], self._error[1], self._error[2]
+
+
+class _QueuedTableWriter(object):
+	"""
+	Stands in for a TableWriter, collecting calls for AsyncDisk to make on
+	its writer thread.  Appended values are copied, since objects reuse
+	their arrays between steps.
+	"""
+
+	def __init__(self, tableWriter, pending):
+		self._tableWriter = tableWriter
+		self._pending = pending
+
+
+	def append(self, **namesAndValues):
+		self._pending.append((
+			self._tableWriter.append,
+			{name: np.array(value) for name, value in namesAndValues.viewitems()}
+			))
+
+
+	def writeAttributes(self, **namesAndValues):
+		self._pending.append((
+			self._tableWriter.writeAttributes,
+			copy.deepcopy(namesAndValues)
+			))
+
+
+	def flush(self):
+		self._pending.append((self._tableWriter.flush, {}))
+
+
+	def close(self):
+		self._pending.append((self._tableWriter.close, {}))
+
+
 def currentTimeAsString():
 	return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -32,4 +32,8 @@ class Logger(object):
 	@abc.abstractmethod
 	def finalize(self, sim):
 		""" finalize -- called at end of simulation """
+		return
+
+	def flush(self, sim):
+		""" flush -- called if the simulation fails, to save any pending output """
 		return
\ No newline at end of file
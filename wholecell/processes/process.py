@@ -66,6 +66,17 @@ class Process(object):
 	def isTimeStepShortEnough(self, *args):
 		return True
 
+	def maxTimeStep(self, timeStepSafetyFraction):
+		"""
+		Returns the longest time step that isTimeStepShortEnough() accepts,
+		or None if it isn't known, in which case the simulation searches for
+		it with isTimeStepShortEnough().
+		"""
+		if type(self).isTimeStepShortEnough.__func__ is Process.isTimeStepShortEnough.__func__:
+			return np.inf
+
+		return None
+
 	def wasTimeStepShortEnough(self, *args):
 		return True
 
@@ -162,6 +173,17 @@ class Process(object):
 		pass
 
 
+	# Clean up once the simulation has finished, e.g. stop worker processes
+	def finalize(self):
+		# Implemented by subclass
+		pass
+
+
+	# Clean up right away after the simulation failed
+	def terminate(self):
+		self.finalize()
+
+
 	# Basic accessors
 
 	def time(self):
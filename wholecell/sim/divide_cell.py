@@ -110,6 +110,15 @@ def divide_cell(sim):
 	with open(os.path.join(sim._outputDir, "Daughter2", "elng_rate_factor.cPickle"), 'wb') as f:
 		cPickle.dump(daughter_elng_rates["d2_elng_rate_factor"], f)
 
+	# Save the FBA basis so the daughters' metabolism warm starts from it
+	fba_basis = None
+	if "Metabolism" in sim.processes:
+		fba_basis = sim.processes["Metabolism"].fba.getBasis()
+	with open(os.path.join(sim._outputDir, "Daughter1", "FBABasis.cPickle"), 'wb') as f:
+		cPickle.dump(fba_basis, f, cPickle.HIGHEST_PROTOCOL)
+	with open(os.path.join(sim._outputDir, "Daughter2", "FBABasis.cPickle"), 'wb') as f:
+		cPickle.dump(fba_basis, f, cPickle.HIGHEST_PROTOCOL)
+
 	# Save daughter cell initial time steps
 	saveTime(sim.time(), os.path.join(sim._outputDir, "Daughter1", "Time"),
 		sim.timeStepSec())
@@ -447,6 +456,7 @@ def saveContainer(container, path):
 	table_writer = TableWriter(path)
 	container.tableCreate(table_writer)
 	container.tableAppend(table_writer)
+	table_writer.close()
 
 
 def saveTime(finalTime, path, timeStepSec):
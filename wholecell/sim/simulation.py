@@ -11,7 +11,9 @@ from __future__ import division
 
 import collections
 import cPickle
+import sys
 import time
+import traceback
 
 import numpy as np
 
@@ -31,6 +33,7 @@ DEFAULT_SIMULATION_KWARGS = dict(
 	translationSupply = True,
 	variable_elongation_translation = False,
 	variable_elongation_transcription = False,
+	fluxSensitivityProcesses = 1,
 	timeStepSafetyFraction = 1.3,
 	maxTimeStep = 0.9,#2.0, # TODO: Reset to 2 once we update PopypeptideElongation
 	updateTimeStepFreq = 5,
@@ -39,6 +42,10 @@ DEFAULT_SIMULATION_KWARGS = dict(
 	outputDir = None,
 	overwriteExistingFiles = False,
 	logToDiskEvery = 1,
+	logToDiskBufferRows = 16,
+	logToDiskAsync = False,
+	logToDiskCompression = None, # e.g. {"BulkMolecules": {"counts": "delta-zlib"}}
+	logToDiskArchive = False,
 	simDataLocation = None,
 	inheritedStatePath = None,
 	)
@@ -189,10 +196,18 @@ class Simulation(object):
 				)
 
 		if self._logToDisk:
-			self.loggers["Disk"] = wholecell.loggers.disk.Disk(
+			if self._logToDiskAsync:
+				diskLogger = wholecell.loggers.disk.AsyncDisk
+			else:
+				diskLogger = wholecell.loggers.disk.Disk
+
+			self.loggers["Disk"] = diskLogger(
 				self._outputDir,
 				self._overwriteExistingFiles,
-				self._logToDiskEvery
+				self._logToDiskEvery,
+				self._logToDiskBufferRows,
+				self._logToDiskCompression,
+				self._logToDiskArchive
 				)
 
 	# Run simulation
@@ -214,39 +229,75 @@ class Simulation(object):
 		"""
 
 		# Simulate
-		while self.time() < run_until and not self._isDead:
-			if self._cellCycleComplete:
-				self.finalize()
-				break
+		try:
+			while self.time() < run_until and not self._isDead:
+				if self._cellCycleComplete:
+					self.finalize()
+					break
 
-			self._simulationStep += 1
+				self._simulationStep += 1
 
-			self._timeTotal += self._timeStepSec
+				self._timeTotal += self._timeStepSec
 
-			self._evolveState()
+				self._evolveState()
+
+		except:
+			excInfo = sys.exc_info()
+
+			# Save buffered output so the failed simulation can be inspected.
+			# That can fail too, e.g. if a logger's finalize() raised, but
+			# mustn't hide the original error.
+			for logger in self.loggers.itervalues():
+				try:
+					logger.flush(self)
+				except Exception:
+					print "Warning: couldn't save {}'s buffered output:".format(
+						type(logger).__name__)
+					traceback.print_exc()
+			self._terminateProcesses()
+
+			# A bare raise would re-raise the last error handled above
+			raise excInfo[0], excInfo[1], excInfo[2]
 
 	def finalize(self):
 		"""
 		Clean up any details once the simulation has finished.
 		Specifically, this calls `finalize` in all hooks,
-		invokes the simulation's `_divideCellFunction` and then
-		shuts down all loggers
+		invokes the simulation's `_divideCellFunction`, calls `finalize`
+		in all processes and then shuts down all loggers
 		"""
 
 		if not self._finalized:
-			# Run post-simulation hooks
-			for hook in self.hooks.itervalues():
-				hook.finalize(self)
+			try:
+				# Run post-simulation hooks
+				for hook in self.hooks.itervalues():
+					hook.finalize(self)
 
-			# Divide mother into daughter cells
-			self._divideCellFunction()
+				# Divide mother into daughter cells
+				self._divideCellFunction()
 
-			# Finish logging
-			for logger in self.loggers.itervalues():
-				logger.finalize(self)
+				# Stop any processes' workers
+				for process in self.processes.itervalues():
+					process.finalize()
+
+				# Finish logging
+				for logger in self.loggers.itervalues():
+					logger.finalize(self)
+			except:
+				self._terminateProcesses()
+				raise
 
 			self._finalized = True
 
+	def _terminateProcesses(self):
+		"""
+		Clean up the processes right away after an error, e.g. stopping
+		their workers without waiting for their tasks.
+		"""
+
+		for process in self.processes.itervalues():
+			process.terminate()
+
 	# Calculate temporal evolution
 	def _evolveState(self):
 
@@ -384,11 +435,24 @@ class Simulation(object):
 		resetTimeStep = False
 		for i, process in enumerate(self.processes.itervalues()):
 			if not process.isTimeStepShortEnough(self._timeStepSec, self._timeStepSafetyFraction) or self.simulationStep() % self._updateTimeStepFreq == 0:
-				validTimeSteps[i] = self._findTimeStep(0., self._maxTimeStep, process.isTimeStepShortEnough)
+				validTimeSteps[i] = self._processMaxTimeStep(process)
+				self._evalTime.timeStepLimits[i] = validTimeSteps[i]
 				resetTimeStep = True
 		if resetTimeStep:
 			self._timeStepSec = validTimeSteps.min()
 
+	def _processMaxTimeStep(self, process):
+		# The longest timestep (up to maxTimeStep) a process allows, from the
+		# process if it knows it, otherwise by searching
+		maxTimeStep = process.maxTimeStep(self._timeStepSafetyFraction)
+		if maxTimeStep is None:
+			return self._findTimeStep(0., self._maxTimeStep, process.isTimeStepShortEnough)
+
+		if not maxTimeStep > 0:
+			raise Exception, "Process %s allows no timestep" % (process.name(),)
+
+		return min(maxTimeStep, self._maxTimeStep)
+
 	def _findTimeStep(self, minTimeStep, maxTimeStep, checkerFunction):
 		N = 10000
 		for i in xrange(N):
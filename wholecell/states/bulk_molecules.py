@@ -39,6 +39,7 @@ class BulkMolecules(wholecell.states.internal_state.InternalState):
 		self._countsAllocatedInitial = None
 		self._countsAllocatedFinal = None
 		self._countsUnallocated = None
+		self._nViewsIndexed = None
 
 		super(BulkMolecules, self).__init__(*args, **kwargs)
 
@@ -86,19 +87,92 @@ class BulkMolecules(wholecell.states.internal_state.InternalState):
 		self._countsAllocatedFinal = np.zeros((nMolecules, self._nProcesses), dtype)
 		self._countsUnallocated = np.zeros(nMolecules, dtype)
 
+		# Buffers reused every partition
+		self._countsAllocatedTotal = np.zeros(nMolecules, dtype)
+		self._unallocatedBuffer = np.zeros(nMolecules, dtype)
+
+		self._indexViews()
+
+
+	def _indexViews(self):
+		"""
+		Precomputes the (molecule, process) entries covered by the views, so
+		partition() gathers requests with one scatter and only arbitrates
+		between processes on the molecules that more than one process can
+		request.  Requests and allocations are zero everywhere else.
+		"""
+
+		nMolecules = self.container._counts.size
+		dtype = self.container._counts.dtype
+		nProcesses = max(self._nProcesses, 1)
+
+		molecules = np.concatenate(
+			[np.zeros(0, np.int64)]
+			+ [np.asarray(view._containerIndexes, np.int64) for view in self._views]
+			)
+		processes = np.concatenate(
+			[np.zeros(0, np.int64)]
+			+ [np.full(np.size(view._containerIndexes), view._processIndex, np.int64)
+				for view in self._views]
+			)
+
+		# Flat indexes into the (molecules x processes) arrays, in view order
+		self._viewEntries = molecules * nProcesses + processes
+		self._viewRequests = np.zeros(self._viewEntries.size, dtype)
+
+		entries, inverse = np.unique(self._viewEntries, return_inverse = True)
+
+		# Views of the same molecule in one process sum their requests
+		self._entries = entries
+		self._entriesInverse = inverse if entries.size < self._viewEntries.size else None
+
+		entryMolecules = entries // nProcesses
+		requestedMolecules, nRequesters = np.unique(entryMolecules, return_counts = True)
+
+		isContested = np.zeros(nMolecules, np.bool)
+		isContested[requestedMolecules[nRequesters > 1]] = True
+		entryIsContested = isContested[entryMolecules]
+
+		# Molecules requested by one process get min(request, count)
+		self._uncontestedEntries = entries[~entryIsContested]
+		self._uncontestedMolecules = entryMolecules[~entryIsContested]
+		self._uncontestedAllocated = np.zeros(self._uncontestedEntries.size, dtype)
+		self._uncontestedCounts = np.zeros(self._uncontestedEntries.size, dtype)
+
+		# Molecules requested by several processes go through calculatePartition
+		self._contestedMolecules = np.where(isContested)[0]
+		nContested = self._contestedMolecules.size
+		self._contestedRequested = np.zeros((nContested, self._nProcesses), dtype)
+		self._contestedAllocated = np.zeros((nContested, self._nProcesses), dtype)
+		self._contestedCounts = np.zeros(nContested, dtype)
+
+		self._nViewsIndexed = len(self._views)
+
 
 	def partition(self):
 		if self._nProcesses == 0:
 			self._countsUnallocated = self.container._counts
 			return
 
+		if len(self._views) != self._nViewsIndexed:
+			self._indexViews()
+
+		counts = self.container._counts
+
 		# Calculate and store requests
-		self._countsRequested[:] = 0
+		requests = self._viewRequests
+		countsRequested = self._countsRequested.reshape(-1)
+
+		if self._views:
+			np.concatenate([view._request() for view in self._views], out = requests)
 
-		for view in self._views:
-			self._countsRequested[view._containerIndexes, view._processIndex] += view._request()
+		if self._entriesInverse is None:
+			countsRequested[self._viewEntries] = requests
+		else:
+			countsRequested[self._entries] = np.bincount(
+				self._entriesInverse, requests, self._entries.size)
 
-		if ASSERT_POSITIVE_COUNTS and not (self._countsRequested >= 0).all():
+		if ASSERT_POSITIVE_COUNTS and (requests < 0).any():
 			raise NegativeCountsError(
 				"Negative value(s) in self._countsRequested:\n"
 				+ "\n".join(
@@ -112,10 +186,24 @@ class BulkMolecules(wholecell.states.internal_state.InternalState):
 				)
 
 		# Calculate partition
+		countsAllocated = self._countsAllocatedInitial.reshape(-1)
+
+		allocated = self._uncontestedAllocated
+		np.take(countsRequested, self._uncontestedEntries, out = allocated)
+		np.take(counts, self._uncontestedMolecules, out = self._uncontestedCounts)
+		np.minimum(allocated, self._uncontestedCounts, out = allocated)
+		countsAllocated[self._uncontestedEntries] = allocated
+
+		if self._contestedMolecules.size:
+			np.take(self._countsRequested, self._contestedMolecules, axis = 0,
+				out = self._contestedRequested)
+			np.take(counts, self._contestedMolecules, out = self._contestedCounts)
+
+			calculatePartition(self._processPriorities, self._contestedRequested, self._contestedCounts, self._contestedAllocated)
 
-		calculatePartition(self._processPriorities, self._countsRequested, self.container._counts, self._countsAllocatedInitial)
+			self._countsAllocatedInitial[self._contestedMolecules] = self._contestedAllocated
 
-		if ASSERT_POSITIVE_COUNTS and not (self._countsAllocatedInitial >= 0).all():
+		if ASSERT_POSITIVE_COUNTS and ((allocated < 0).any() or (self._contestedAllocated < 0).any()):
 			raise NegativeCountsError(
 					"Negative value(s) in self._countsAllocatedInitial:\n"
 					+ "\n".join(
@@ -128,8 +216,11 @@ class BulkMolecules(wholecell.states.internal_state.InternalState):
 					)
 				)
 
-		# Record unpartitioned counts for later merging
-		self._countsUnallocated = self.container._counts - np.sum(self._countsAllocatedInitial, axis = -1)
+		# Record unpartitioned counts for later merging.  (Written to a buffer
+		# since _countsUnallocated can alias the container's counts.)
+		np.sum(self._countsAllocatedInitial, axis = -1, out = self._countsAllocatedTotal)
+		np.subtract(counts, self._countsAllocatedTotal, out = self._unallocatedBuffer)
+		self._countsUnallocated = self._unallocatedBuffer
 
 		if ASSERT_POSITIVE_COUNTS and not (self._countsUnallocated >= 0).all():
 			raise NegativeCountsError(
@@ -143,7 +234,7 @@ class BulkMolecules(wholecell.states.internal_state.InternalState):
 					)
 				)
 
-		self._countsAllocatedFinal[:] = self._countsAllocatedInitial
+		np.copyto(self._countsAllocatedFinal, self._countsAllocatedInitial)
 
 	def calculatePreEvolveStateMass(self):
 		# Compute masses of partitioned molecules
@@ -19,13 +19,18 @@ import numpy as np
 
 import wholecell.states.internal_state
 import wholecell.views.view
-from wholecell.containers.unique_objects_container import UniqueObjectsContainer, _partition
+from wholecell.containers.unique_objects_container import (
+	UniqueObjectsContainer, _partition, _partitionCombinatorial)
 from wholecell.utils import units
 
 DEFAULT_ATTRIBUTES = {
 	"_partitionedProcess":np.int64
 	}
 
+# The ways partition() can allocate molecules: no requests overlapped, the
+# overlapping requests were allocated directly, or by linear programming
+PARTITION_PATHS = ("disjoint", "combinatorial", "linear_programming")
+
 class UniqueMolecules(wholecell.states.internal_state.InternalState):
 	"""
 	UniqueMolecules
@@ -41,6 +46,9 @@ class UniqueMolecules(wholecell.states.internal_state.InternalState):
 
 		self._submassNameToProperty = collections.OrderedDict()
 
+		# The number of partition() calls that took each of PARTITION_PATHS
+		self.partitionPathCounts = np.zeros(len(PARTITION_PATHS), np.int64)
+
 		super(UniqueMolecules, self).__init__(*args, **kwargs)
 
 
@@ -80,6 +88,8 @@ class UniqueMolecules(wholecell.states.internal_state.InternalState):
 			sim_data.internal_state.uniqueMolecules.uniqueMoleculeMasses["mass"] / sim_data.constants.nAvogadro
 			).asNumber(units.fg)
 
+		self._submassDiffNames = self._submassNameToProperty.values()
+
 		self._unassignedPartitionedValue = self._nProcesses
 
 
@@ -90,57 +100,95 @@ class UniqueMolecules(wholecell.states.internal_state.InternalState):
 			objects.attrIs(_partitionedProcess = self._unassignedPartitionedValue)
 
 		# Gather requests
-		nMolecules = self.container._globalReference.size
 		nViews = len(self._views)
 
-		objectRequestsArray = np.zeros((nMolecules, nViews), np.bool)
 		requestNumberVector = np.zeros(nViews, np.int64)
 		requestProcessArray = np.zeros((nViews, self._nProcesses), np.bool)
 
 		for viewIndex, view in enumerate(self._views):
-			objectRequestsArray[view._queryResult._globalIndexes, viewIndex] = True
-
 			requestNumberVector[viewIndex] = view._request()
 
 			requestProcessArray[viewIndex, view._processIndex] = True
 
 		# TODO: move this logic to the _partition function
 		if requestNumberVector.sum() == 0:
+			self.partitionPathCounts[PARTITION_PATHS.index("disjoint")] += 1
 			return
 
 		# Don't calculate on non-requesting views
-		doCalculatePartition = (requestNumberVector > 0)
+		requestingViews = np.where(requestNumberVector > 0)[0]
+		requestedIndexes = [
+			self._views[viewIndex]._queryResult._globalIndexes
+			for viewIndex in requestingViews
+			]
+
+		# Find the requests that overlap another request, from the molecules
+		# requested more than once
+		allRequestedIndexes = np.concatenate(requestedIndexes)
+		uniqueIndexes, counts = np.unique(allRequestedIndexes, return_counts = True)
+		contestedIndexes = uniqueIndexes[counts > 1]
 
-		objectRequestsArray[:, ~doCalculatePartition] = False
+		# TODO: ignore overlapping requests with a process
 
-		partitionedMolecules = np.zeros((nMolecules, self._nProcesses), np.bool)
+		# Global indexes of the molecules partitioned to each process
+		partitionedIndexes = [[] for _ in xrange(self._nProcesses)]
 
 		# Grant non-overlapping requests all of the relevant molecules
-		overlappingRequests = np.dot(objectRequestsArray.T, objectRequestsArray)
-
-		overlappingRequests[np.identity(nViews, np.bool)] = False
-
-		# TODO: ignore overlapping requests with a process
+		overlapping = []
+		for viewIndex, globalIndexes in izip(requestingViews, requestedIndexes):
+			if np.in1d(globalIndexes, contestedIndexes, assume_unique = True).any():
+				overlapping.append(viewIndex)
+
+			else:
+				partitionedIndexes[self._views[viewIndex]._processIndex].append(
+					globalIndexes)
+
+		if overlapping:
+			# Build the (molecule)x(request) matrix over just the molecules
+			# requested by the overlapping views
+			overlappingIndexes = [
+				self._views[viewIndex]._queryResult._globalIndexes
+				for viewIndex in overlapping
+				]
+			molecules = np.unique(np.concatenate(overlappingIndexes))
+
+			objectRequestsArray = np.zeros((molecules.size, len(overlapping)), np.bool)
+			for column, globalIndexes in enumerate(overlappingIndexes):
+				objectRequestsArray[np.searchsorted(molecules, globalIndexes), column] = True
+
+			partitionedMolecules = _partitionCombinatorial(
+				objectRequestsArray,
+				requestNumberVector[overlapping],
+				requestProcessArray[overlapping, :],
+				self.randomState
+				)
+			path = "combinatorial"
 
-		noOverlap = ~overlappingRequests.any(0)
+			if partitionedMolecules is None:
+				partitionedMolecules = _partition(
+					objectRequestsArray,
+					requestNumberVector[overlapping],
+					requestProcessArray[overlapping, :],
+					self.randomState
+					)
+				path = "linear_programming"
 
-		for viewIndex in np.where(noOverlap)[0]:
-			# NOTE: there may be a way to vectorize this
-			partitionedMolecules[:,self._views[viewIndex]._processIndex] |= objectRequestsArray[:, viewIndex]
+			for processIndex in xrange(self._nProcesses):
+				partitionedIndexes[processIndex].append(
+					molecules[partitionedMolecules[:, processIndex]])
 
-		doCalculatePartition[noOverlap] = False
+		else:
+			path = "disjoint"
 
-		if doCalculatePartition.any():
-			partitionedMolecules |= _partition(
-				objectRequestsArray[:, doCalculatePartition],
-				requestNumberVector[doCalculatePartition],
-				requestProcessArray[doCalculatePartition, :],
-				self.randomState
-				)
+		self.partitionPathCounts[PARTITION_PATHS.index(path)] += 1
 
 		for view in self._views:
+			globalIndexes = partitionedIndexes[view._processIndex]
+			if not globalIndexes:
+				continue
+
 			molecules = self.container.objectsByGlobalIndex(
-				np.where(partitionedMolecules[:, view._processIndex])[0]
+				np.unique(np.concatenate(globalIndexes))
 				)
 
 			if len(molecules):
@@ -175,26 +223,37 @@ class UniqueMolecules(wholecell.states.internal_state.InternalState):
 
 
 	def _calculateMass(self):
-		masses = np.zeros(self._masses.shape[1:], np.float64)
+		# Masses by process (including the unassigned "process") and submass
+		nProcesses = self._nProcesses + 1
 
-		submassDiffNames = self._submassNameToProperty.values() # TODO: cache
+		# Count each molecule type by process, and gather the process indexes
+		# and submass differences of all molecules
+		counts = np.zeros((len(self._moleculeIds), nProcesses), np.float64)
+		processIndexes = []
+		massDiffs = [[] for _ in self._submassDiffNames]
 
-		for moleculeId, moleculeMasses in izip(self._moleculeIds, self._moleculeMasses):
-			molecules = self.container.objectsInCollection(moleculeId)
+		for moleculeIndex, moleculeId in enumerate(self._moleculeIds):
+			values = self.container.attrsInCollection(
+				moleculeId, "_partitionedProcess", *self._submassDiffNames)
 
-			if len(molecules) == 0:
+			if values[0].size == 0:
 				continue
 
-			processIndexes = molecules.attr("_partitionedProcess")
+			counts[moleculeIndex, :] = np.bincount(values[0], minlength = nProcesses)
+			processIndexes.append(values[0])
 
-			countPerProcess = np.bincount(processIndexes, minlength = self._nProcesses + 1)
+			for submassDiffs, diffs in izip(massDiffs, values[1:]):
+				submassDiffs.append(diffs)
 
-			masses += np.outer(countPerProcess, moleculeMasses)
+		masses = np.dot(counts.T, self._moleculeMasses)
 
-			massDiffs = molecules.attrsAsStructArray(*submassDiffNames).view((np.float64, len(submassDiffNames)))
+		if processIndexes:
+			processIndexes = np.concatenate(processIndexes)
 
-			for processIndex in np.arange(self._nProcesses + 1):
-				masses[processIndex, :] += massDiffs[processIndex == processIndexes, :].sum(axis = 0)
+			for submassIndex, submassDiffs in enumerate(massDiffs):
+				masses[:, submassIndex] += np.bincount(
+					processIndexes, np.concatenate(submassDiffs),
+					minlength = nProcesses)
 
 		return masses
 
@@ -0,0 +1,112 @@
+"""
+Test the analysis plot scheduler.
+
+	cd wcEcoli
+	nosetests wholecell/tests/analysis/test_plot_scheduler.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+
+from wholecell.analysis import plot_scheduler
+
+
+class FakePlot(object):
+	"""Stands in for an AnalysisPlot; must be picklable by reference."""
+
+	@classmethod
+	def main(cls, outFile, fail=False):
+		if fail:
+			raise ValueError('plot failed')
+		with open(outFile, 'w') as f:
+			f.write('plotted')
+
+
+class MemoryPlot(object):
+	"""Stands in for an AnalysisPlot that temporarily uses n_bytes."""
+
+	@classmethod
+	def main(cls, n_bytes):
+		np.ones(n_bytes, np.int8)
+
+
+class Test_plot_scheduler(unittest.TestCase):
+
+	def setUp(self):
+		self.test_dir = tempfile.mkdtemp()
+		self.stats = plot_scheduler.PlotStats(
+			os.path.join(self.test_dir, 'stats.json'))
+
+	def tearDown(self):
+		shutil.rmtree(self.test_dir)
+
+	@noseAttrib.attr('smalltest', 'analysis')
+	def test_schedule(self):
+		self.stats.update('a', 10., 1, {'BulkMolecules': 100, 'Mass': 1})
+		self.stats.update('b', 1., 1, {'BulkMolecules': 50})
+		self.stats.update('c', 4., 1, {'Mass': 8})
+		self.stats.update('d', 3., 1, {})
+
+		keys = ['a', 'b', 'c', 'd', 'new']
+
+		# Unknown plots first, then groups by their main table, longest first
+		groups = plot_scheduler.schedule(keys, self.stats, 1)
+		self.assertEqual(groups, [[4], [0, 1], [2], [3]])
+
+		# Groups are split to keep the workers busy
+		groups = plot_scheduler.schedule(keys[:4], self.stats, 4)
+		self.assertEqual(groups, [[0], [2], [3], [1]])
+
+	@noseAttrib.attr('smalltest', 'analysis')
+	def test_estimate_rss(self):
+		self.stats.update('a', 1., 100, {})
+		self.stats.update('b', 1., 300, {})
+
+		self.assertEqual(plot_scheduler.estimate_rss(['a', 'b'], self.stats), 300)
+		self.assertEqual(plot_scheduler.estimate_rss(['a', 'new'], self.stats),
+			plot_scheduler.DEFAULT_RSS)
+
+	@noseAttrib.attr('smalltest', 'analysis')
+	def test_run_group_rss(self):
+		"""Test that a plot's peak RSS doesn't include an earlier plot's."""
+		n_bytes = 100 << 20
+		results = plot_scheduler.run_group([
+			('big.py', MemoryPlot, (n_bytes,)),
+			('small.py', MemoryPlot, (1,)),
+			])
+
+		(_, _, big_rss, _), (_, _, small_rss, _) = results
+		self.assertGreater(big_rss - small_rss, n_bytes // 2)
+
+	@noseAttrib.attr('smalltest', 'analysis')
+	def test_run_plots(self):
+		outFiles = [os.path.join(self.test_dir, 'plot%d' % i) for i in xrange(3)]
+		tasks = [
+			('ok.py', FakePlot, (outFiles[0],)),
+			('fail.py', FakePlot, (outFiles[1], True)),
+			]
+
+		failed = plot_scheduler.run_plots(
+			tasks, n_workers=2, budget=1, stats=self.stats)
+
+		self.assertEqual(failed, ['fail.py'])
+		self.assertTrue(os.path.exists(outFiles[0]))
+
+		# Stats of successful plots are saved for the next run
+		stats = plot_scheduler.PlotStats(self.stats.path)
+		entry = stats.get(FakePlot.__module__)
+		self.assertIsNotNone(entry)
+		self.assertGreater(entry['rss'], 0)
+		self.assertEqual(entry['tables'], {})
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -294,6 +294,85 @@ class Test_UniqueObjectsContainer(unittest.TestCase):
 		self.assertEqual(globalEntry, deletedEntry)
 
 
+	@noseAttrib.attr('smalltest', 'uniqueObjects', 'containerObject')
+	def test_free_index_reuse(self):
+		container = UniqueObjectsContainer(TEST_KB)
+		molecules = container.objectsNew('RNA polymerase', 10)
+		collectionIndex = container._nameToIndexMapping['RNA polymerase']
+		nEntries = container._collections[collectionIndex].size
+		nGlobalEntries = container._globalReference.size
+
+		# Deleted entries are reused before the arrays are extended
+		deletedIndexes = molecules._globalIndexes[[7, 2, 5]]
+		molecules.delByIndexes(np.array([7, 2, 5]))
+		self.assertEqual(len(container.objectsInCollection('RNA polymerase')), 7)
+
+		# Deleting again does not free the entries twice
+		container.objectsByGlobalIndexDel(deletedIndexes)
+
+		newMolecules = container.objectsNew('RNA polymerase', 3, chromosomeLocation = 4)
+		np.testing.assert_array_equal(
+			newMolecules._globalIndexes, np.sort(deletedIndexes))
+		self.assertEqual(container._collections[collectionIndex].size, nEntries)
+		self.assertEqual(container._globalReference.size, nGlobalEntries)
+
+		# Extending the arrays at least doubles them
+		container.objectsNew('RNA polymerase', 1)
+		self.assertGreaterEqual(container._collections[collectionIndex].size, 2 * nEntries)
+		self.assertGreaterEqual(container._globalReference.size, 2 * nGlobalEntries)
+
+		objects = container.objectsInCollection('RNA polymerase')
+		self.assertEqual(len(objects), 11)
+		self.assertEqual(len(set(objects._globalIndexes)), 11)
+		self.assertEqual((objects.attr('chromosomeLocation') == 4).sum(), 3)
+
+		# Objects and object sets delete in bulk
+		container.objectsDel(list(objects)[:4])
+		container.objectsDel(container.objectsInCollection('RNA polymerase'))
+		self.assertEqual(len(container.objects()), 0)
+		self.assertEqual(
+			len(container._freeGlobalIndexes), container._globalReference.size)
+
+	@noseAttrib.attr('smalltest', 'uniqueObjects', 'containerObject')
+	def test_active_indexes(self):
+		# Queries read the maintained active indexes; compare them to scans of
+		# the whole collections after random additions and deletions
+		randomState = np.random.RandomState(0)
+		container = self.container
+
+		for _ in xrange(20):
+			name = randomState.choice(['RNA polymerase', 'DNA polymerase'])
+			container.objectsNew(name, randomState.randint(10),
+				chromosomeLocation = randomState.randint(3))
+
+			objects = container.objects()
+			objects.delByIndexes(randomState.choice(
+				len(objects), randomState.randint(len(objects) // 2 + 1),
+				replace = False))
+
+			for name in ('RNA polymerase', 'DNA polymerase'):
+				collection = container._collections[container._nameToIndexMapping[name]]
+				active = collection['_entryState'] == container._entryActive
+
+				np.testing.assert_array_equal(
+					container.objectsInCollection(name)._globalIndexes,
+					collection['_globalIndex'][active])
+				np.testing.assert_array_equal(
+					container.objectsInCollection(
+						name, chromosomeLocation = ('>', 0))._globalIndexes,
+					collection['_globalIndex'][active & (collection['chromosomeLocation'] > 0)])
+
+				locations, bound = container.attrsInCollection(
+					name, 'chromosomeLocation', 'boundToChromosome')
+				np.testing.assert_array_equal(
+					locations, collection['chromosomeLocation'][active])
+				np.testing.assert_array_equal(
+					bound, collection['boundToChromosome'][active])
+
+			np.testing.assert_array_equal(
+				container.objects()._globalIndexes,
+				np.where(container._globalReference['_entryState'] == container._entryActive)[0])
+
 	@noseAttrib.attr('smalltest', 'uniqueObjects', 'containerObject')
 	def test_eq_method(self):
 		# Test against self
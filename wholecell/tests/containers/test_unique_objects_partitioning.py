@@ -13,7 +13,8 @@ import unittest
 import numpy as np
 import nose.plugins.attrib as noseAttrib
 
-from wholecell.containers.unique_objects_container import UniqueObjectsContainer, _partition
+from wholecell.containers.unique_objects_container import (
+	UniqueObjectsContainer, _partition, _partitionCombinatorial)
 
 TEST_KB = {
 	'A':{
@@ -134,6 +135,54 @@ class Test_UniqueMoleculesContainer(unittest.TestCase):
 				)
 			)
 
+
+	@noseAttrib.attr('smalltest', 'uniqueObjects', 'partitioning')
+	def test_partitioning_combinatorial(self):
+		# (molecules requested, requestNumberVector, requestProcesses,
+		# expected counts by request)
+		cases = [
+			# Nested requests that can all be met
+			([range(10), range(4), range(4, 6)], [5, 3, 2], [0, 1, 2], [5, 3, 2]),
+			# requestAll by one process, which gets what the others leave
+			([range(10), range(4), range(4, 6)], [10, 3, 2], [0, 1, 2], [5, 3, 2]),
+			# Requests for the same molecules, smallest processes first
+			([range(10)] * 3, [8, 3, 4], [0, 1, 2], [3, 3, 4]),
+			([range(10)] * 3, [8, 6, 6], [0, 1, 1], [8, 1, 1]),
+			]
+
+		for requested, requestNumbers, requestProcesses, expected in cases:
+			objectRequestsArray = np.zeros((10, len(requested)), np.bool)
+			for request, indexes in enumerate(requested):
+				objectRequestsArray[indexes, request] = True
+
+			requestNumberVector = np.array(requestNumbers)
+			requestProcessArray = np.zeros((len(requested), 3), np.bool)
+			requestProcessArray[np.arange(len(requested)), requestProcesses] = True
+
+			combinatorial = _partitionCombinatorial(objectRequestsArray,
+				requestNumberVector, requestProcessArray, self.randomState)
+			lp = _partition(objectRequestsArray,
+				requestNumberVector, requestProcessArray, self.randomState)
+
+			for partitionedMolecules in (combinatorial, lp):
+				self.assertTrue((partitionedMolecules.sum(axis = 1) <= 1).all())
+				self.assertFalse(
+					(partitionedMolecules & ~np.dot(objectRequestsArray, requestProcessArray)).any())
+
+			np.testing.assert_array_equal(
+				combinatorial.sum(axis = 0), lp.sum(axis = 0))
+			np.testing.assert_array_equal(
+				combinatorial.sum(axis = 0),
+				np.bincount(requestProcesses, expected, minlength = 3))
+
+		# Requests for overlapping sets that aren't nested need the LP
+		objectRequestsArray = np.zeros((10, 2), np.bool)
+		objectRequestsArray[:6, 0] = True
+		objectRequestsArray[4:, 1] = True
+
+		self.assertIsNone(_partitionCombinatorial(objectRequestsArray,
+			np.array([3, 3]), np.identity(2, np.bool), self.randomState))
+
 	
 	# def test_partitioning_worst_case_scenario(self):
 	# 	nMoleculeTypes = 100
@@ -0,0 +1,83 @@
+"""
+Test reading columns across cells.
+
+	cd wcEcoli
+	nosetests wholecell/tests/io/test_multicell.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.io import multicell
+from wholecell.io.tablewriter import TableWriter
+
+N_ITEMS = 4
+
+
+class Test_multicell(unittest.TestCase):
+
+	def setUp(self):
+		self.test_dir = tempfile.mkdtemp()
+		multicell.clearReaders()
+
+		# Cells of varying length, including one with a single entry
+		self.lengths = [5, 1, 3]
+		self.cell_dirs = []
+		self.counts = []
+		for gen, length in enumerate(self.lengths):
+			cell_dir = os.path.join(self.test_dir, "generation_{:06d}".format(gen))
+			counts = np.arange(length * N_ITEMS).reshape(length, N_ITEMS) + 100 * gen
+
+			writer = TableWriter(os.path.join(cell_dir, multicell.SIM_OUT_DIR, "Table"))
+			for entry in counts:
+				writer.append(counts = entry, time = entry[0])
+			writer.close()
+
+			self.cell_dirs.append(cell_dir)
+			self.counts.append(counts)
+
+	def tearDown(self):
+		shutil.rmtree(self.test_dir)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_column(self):
+		expected = np.vstack(self.counts)
+
+		for n_threads in (1, 3):
+			counts, boundaries = multicell.readColumn(
+				self.cell_dirs, "Table", "counts", nThreads = n_threads)
+
+			npt.assert_array_equal(counts, expected)
+			npt.assert_array_equal(boundaries, [0, 5, 6, 9])
+
+		time, boundaries = multicell.readColumn(self.cell_dirs, "Table", "time")
+		npt.assert_array_equal(time, expected[:, 0])
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_indices(self):
+		indices = np.array([3, 1])
+		counts, boundaries = multicell.readColumn(
+			self.cell_dirs, "Table", "counts", indices)
+
+		npt.assert_array_equal(counts, np.vstack(self.counts)[:, indices])
+		for i, cell_counts in enumerate(self.counts):
+			npt.assert_array_equal(
+				counts[boundaries[i]:boundaries[i + 1]], cell_counts[:, indices])
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_shared_readers(self):
+		path = os.path.join(self.cell_dirs[0], multicell.SIM_OUT_DIR, "Table")
+		self.assertIs(multicell.tableReader(path), multicell.tableReader(path))
+
+
+if __name__ == '__main__':
+	unittest.main()
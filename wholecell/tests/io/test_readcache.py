@@ -0,0 +1,152 @@
+"""
+Test the analysis read cache.
+
+	cd wcEcoli
+	nosetests wholecell/tests/io/test_readcache.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import cPickle
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.io import readcache
+from wholecell.io.tablereader import TableReader
+from wholecell.io.tablewriter import TableWriter
+
+
+class Test_readcache(unittest.TestCase):
+
+	def setUp(self):
+		self.test_dir = tempfile.mkdtemp()
+		self.path = os.path.join(self.test_dir, "Table")
+		self.counts = np.arange(20).reshape(5, 4)
+
+		writer = TableWriter(self.path)
+		for entry in self.counts:
+			writer.append(counts = entry)
+		writer.close()
+
+	def tearDown(self):
+		shutil.rmtree(self.test_dir)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_column_hits(self):
+		cache = readcache.ReadCache()
+
+		with readcache.enabled(cache):
+			for _ in xrange(3):
+				counts = TableReader(self.path).readColumn("counts")
+				npt.assert_array_equal(counts, self.counts)
+
+				# Each caller gets its own copy
+				counts[:] = 0
+
+			indices = np.array([2, 0])
+			counts = TableReader(self.path).readColumn("counts", indices)
+			npt.assert_array_equal(counts, self.counts[:, indices])
+
+		self.assertEqual(cache.misses, 2)
+		self.assertEqual(cache.hits, 2)
+		self.assertIsNone(readcache.activeCache())
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_lru_budget(self):
+		nbytes = self.counts.nbytes
+		cache = readcache.ReadCache(maxBytes = 2 * nbytes)
+
+		def load(value):
+			return lambda: np.full_like(self.counts, value)
+
+		dataPath = os.path.join(self.path, "columns", "counts", "data")
+		for i in xrange(3):
+			cache.readColumn(dataPath, "counts", np.array([i]), load(i))
+		self.assertEqual(cache.nBytes(), 2 * nbytes)
+
+		# The least recently used read (index 0) was dropped
+		cache.readColumn(dataPath, "counts", np.array([1]), load(-1))
+		cache.readColumn(dataPath, "counts", np.array([0]), load(-1))
+		self.assertEqual(cache.misses, 4)
+		self.assertEqual(cache.hits, 1)
+
+		data = cache.readColumn(dataPath, "counts", np.array([1]), load(-1))
+		npt.assert_array_equal(data, 1)
+		self.assertFalse(data.flags.writeable)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_over_budget(self):
+		# Columns the cache doesn't keep are returned without a copy
+		cache = readcache.ReadCache(maxBytes = self.counts.nbytes - 1)
+		loaded = []
+
+		def load():
+			loaded.append(np.array(self.counts))
+			return loaded[-1]
+
+		dataPath = os.path.join(self.path, "columns", "counts", "data")
+		data = cache.readColumn(dataPath, "counts", None, load)
+		self.assertIs(data, loaded[0])
+		self.assertTrue(data.flags.writeable)
+		self.assertEqual(cache.nBytes(), 0)
+
+		with readcache.enabled(cache):
+			counts = TableReader(self.path).readColumn("counts")
+		npt.assert_array_equal(counts, self.counts)
+		self.assertTrue(counts.flags.writeable)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_spill(self):
+		spillDir = os.path.join(self.test_dir, "cache")
+
+		# Another process's cache of the same spill directory
+		with readcache.enabled(readcache.ReadCache(spillDir = spillDir)):
+			TableReader(self.path).readColumn("counts")
+
+		cache = readcache.ReadCache(maxBytes = 0, spillDir = spillDir)
+		with readcache.enabled(cache):
+			counts = TableReader(self.path).readColumn("counts")
+
+		npt.assert_array_equal(counts, self.counts)
+		self.assertEqual(cache.misses, 0)
+		self.assertEqual(cache.hits, 1)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_modified_table(self):
+		cache = readcache.ReadCache()
+
+		with readcache.enabled(cache):
+			TableReader(self.path).readColumn("counts")
+
+			writer = TableWriter(self.path)
+			writer.append(counts = np.ones(4, np.int64))
+			writer.close()
+			dataPath = os.path.join(self.path, "columns", "counts", "data")
+			mtime = os.path.getmtime(dataPath)
+			os.utime(dataPath, (mtime + 10, mtime + 10))
+
+			counts = TableReader(self.path).readColumn("counts")
+
+		npt.assert_array_equal(counts, 1)
+		self.assertEqual(cache.misses, 2)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_load_pickle(self):
+		path = os.path.join(self.test_dir, "sim_data.cPickle")
+		with open(path, "wb") as f:
+			cPickle.dump({"counts": self.counts}, f)
+
+		cache = readcache.ReadCache()
+		self.assertIs(cache.loadPickle(path), cache.loadPickle(path))
+		npt.assert_array_equal(cache.loadPickle(path)["counts"], self.counts)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,267 @@
+"""
+Test TableWriter and TableReader.
+
+	cd wcEcoli
+	nosetests wholecell/tests/io/test_table_io.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import nose.tools
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.io import tablewriter as tw
+from wholecell.io.tablereader import TableReader, VariableWidthError
+from wholecell.io.tablewriter import (TableWriter, archiveTable,
+	CompressedVariableWidthError, UnrecognizedCodecError)
+
+N_ENTRIES = 7
+N_ITEMS = 11
+
+
+class Test_TableIO(unittest.TestCase):
+
+	def setUp(self):
+		self.test_dir = tempfile.mkdtemp()
+		self.path = os.path.join(self.test_dir, "Table")
+
+		self.counts = np.arange(N_ENTRIES * N_ITEMS, dtype=np.int64).reshape(
+			N_ENTRIES, N_ITEMS)
+		self.time = np.linspace(0., 1., N_ENTRIES)
+
+	def tearDown(self):
+		shutil.rmtree(self.test_dir)
+
+	def write_table(self, **kwargs):
+		writer = TableWriter(self.path, **kwargs)
+		writer.writeAttributes(names = ["a", "b"])
+		for counts, time in zip(self.counts, self.time):
+			writer.append(counts = counts, time = time)
+		writer.close()
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_column(self):
+		self.write_table()
+		reader = TableReader(self.path)
+
+		self.assertEqual(reader.readAttribute("names"), ["a", "b"])
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+		npt.assert_array_equal(reader.readColumn("time"), self.time)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_indices(self):
+		self.write_table()
+		reader = TableReader(self.path)
+		indices = np.array([9, 0, 4, 5])
+
+		expected = self.counts[:, indices]
+		npt.assert_array_equal(reader.readColumn("counts", indices), expected)
+		npt.assert_array_equal(
+			reader.readColumn("counts", indices, block_read=False), expected)
+		npt.assert_array_equal(
+			reader.readColumn("counts", indices, mmap=True), expected)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_mmap(self):
+		self.write_table()
+		reader = TableReader(self.path)
+
+		counts = reader.readColumn("counts", mmap=True)
+		self.assertIsInstance(counts, np.memmap)
+		npt.assert_array_equal(counts, self.counts)
+		npt.assert_array_equal(reader.readColumn("time", mmap=True), self.time)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_variable_width(self):
+		writer = TableWriter(self.path)
+		for i in xrange(N_ENTRIES):
+			writer.append(values = np.arange(i))
+		writer.close()
+		reader = TableReader(self.path)
+
+		with nose.tools.assert_raises(VariableWidthError):
+			reader.readColumn("values")
+
+		for i, values in enumerate(reader.iterColumn("values")):
+			npt.assert_array_equal(values, np.arange(i))
+		npt.assert_array_equal(reader.readRow(3)["values"], np.arange(3))
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_fixed_width_offsets(self):
+		self.write_table()
+
+		offsets_path = os.path.join(
+			self.path, tw.DIR_COLUMNS, "counts", tw.FILE_OFFSETS)
+		self.assertEqual(os.path.getsize(offsets_path), 2 * tw.OFFSET_DTYPE.itemsize)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_becomes_variable_width(self):
+		lengths = [3, 3, 3, 5, 0, 5, 5]
+		writer = TableWriter(self.path)
+		for length in lengths:
+			writer.append(values = np.arange(length))
+		writer.close()
+		reader = TableReader(self.path)
+
+		for length, values in zip(lengths, reader.iterColumn("values")):
+			npt.assert_array_equal(values, np.arange(length))
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_zero_size_entries(self):
+		writer = TableWriter(self.path)
+		for i in xrange(N_ENTRIES):
+			writer.append(values = np.zeros(0))
+		writer.close()
+		reader = TableReader(self.path)
+
+		self.assertEqual(len(list(reader.iterColumn("values"))), N_ENTRIES)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_buffered_writes(self):
+		self.write_table(bufferRows = 3)
+		reader = TableReader(self.path)
+
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+		npt.assert_array_equal(reader.readColumn("time"), self.time)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_buffered_flush(self):
+		writer = TableWriter(self.path, bufferRows = 100)
+		for counts in self.counts:
+			writer.append(counts = counts)
+		writer.flush()
+
+		reader = TableReader(self.path)
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+		writer.close()
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_buffered_becomes_variable_width(self):
+		lengths = [3, 3, 3, 5, 3, 3]
+		writer = TableWriter(self.path, bufferRows = 2)
+		for length in lengths:
+			writer.append(values = np.arange(length))
+		writer.close()
+		reader = TableReader(self.path)
+
+		for length, values in zip(lengths, reader.iterColumn("values")):
+			npt.assert_array_equal(values, np.arange(length))
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_compressed(self):
+		n_entries = 2 * tw.CHUNK_ROWS + 3
+		counts = np.random.RandomState(0).randint(
+			-5, 5, size = (n_entries, N_ITEMS)).cumsum(axis = 0)
+		mass = np.random.RandomState(1).rand(n_entries)
+
+		for codec in ("zlib", "delta-zlib"):
+			writer = TableWriter(self.path, compression = {"counts": codec, "mass": codec})
+			for c, m, t in zip(counts, mass, xrange(n_entries)):
+				writer.append(counts = c, mass = m, step = t)
+			writer.close()
+			reader = TableReader(self.path)
+
+			self.assertTrue(os.path.exists(os.path.join(
+				self.path, tw.DIR_COLUMNS, "counts", tw.FILE_CODEC)))
+			npt.assert_array_equal(reader.readColumn("counts"), counts)
+			npt.assert_array_equal(reader.readColumn("mass"), mass)
+			npt.assert_array_equal(reader.readColumn("step"), np.arange(n_entries))
+
+			indices = np.array([10, 2, 3])
+			npt.assert_array_equal(
+				reader.readColumn("counts", indices), counts[:, indices])
+
+			for expected, entry in zip(counts, reader.iterColumn("counts")):
+				npt.assert_array_equal(entry, expected)
+			index = tw.CHUNK_ROWS + 1
+			npt.assert_array_equal(reader.readRow(index)["counts"], counts[index])
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_compressed_flush(self):
+		writer = TableWriter(self.path, compression = {"counts": "delta-zlib"})
+		for counts in self.counts[:3]:
+			writer.append(counts = counts)
+		writer.flush()
+		for counts in self.counts[3:]:
+			writer.append(counts = counts)
+		writer.close()
+		reader = TableReader(self.path)
+
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_compressed_errors(self):
+		writer = TableWriter(self.path, compression = {"values": "bz2"})
+		with nose.tools.assert_raises(UnrecognizedCodecError):
+			writer.append(values = np.arange(3))
+
+		writer = TableWriter(self.path, compression = {"values": "zlib"})
+		writer.append(values = np.arange(3))
+		with nose.tools.assert_raises(CompressedVariableWidthError):
+			writer.append(values = np.arange(4))
+		writer.close()
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_archive(self):
+		self.write_table(archive = True)
+		self.assertFalse(os.path.exists(self.path))
+		self.assertTrue(os.path.isfile(self.path + tw.ARCHIVE_EXTENSION))
+
+		for path in (self.path, self.path + tw.ARCHIVE_EXTENSION):
+			reader = TableReader(path)
+
+			self.assertEqual(sorted(reader.columnNames()), ["counts", "time"])
+			self.assertEqual(reader.readAttribute("names"), ["a", "b"])
+			npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+			npt.assert_array_equal(reader.readColumn("counts", mmap=True), self.counts)
+			npt.assert_array_equal(
+				reader.readColumn("counts", np.array([3, 1])), self.counts[:, [3, 1]])
+			npt.assert_array_equal(reader.readColumn("time"), self.time)
+			npt.assert_array_equal(reader.readRow(2)["counts"], self.counts[2])
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_archive_existing(self):
+		lengths = [3, 3, 5, 0]
+		writer = TableWriter(self.path, compression = {"counts": "delta-zlib"})
+		for counts, length in zip(self.counts, lengths):
+			writer.append(counts = counts, values = np.arange(length))
+		writer.close()
+		archiveTable(self.path)
+		reader = TableReader(self.path)
+
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts[:len(lengths)])
+		for length, values in zip(lengths, reader.iterColumn("values")):
+			npt.assert_array_equal(values, np.arange(length))
+
+	@noseAttrib.attr('smalltest', 'tableio')
+	def test_read_version_2(self):
+		column_dir = os.path.join(self.path, tw.DIR_COLUMNS, "counts")
+		os.makedirs(column_dir)
+		os.makedirs(os.path.join(self.path, tw.DIR_ATTRIBUTES))
+		os.makedirs(os.path.join(self.path, tw.DIR_METADATA))
+		with open(os.path.join(self.path, tw.DIR_METADATA, tw.FILE_VERSION), "w") as f:
+			f.write("2")
+
+		with open(os.path.join(column_dir, tw.FILE_DATA), "w") as data, \
+				open(os.path.join(column_dir, tw.FILE_OFFSETS), "w") as offsets:
+			data.write('"<i8"\n')
+			offsets.write("{}\n".format(data.tell()))
+			for counts in self.counts:
+				data.write(counts.tobytes())
+				offsets.write("{}\n".format(data.tell()))
+
+		reader = TableReader(self.path)
+		npt.assert_array_equal(reader.readColumn("counts"), self.counts)
+		npt.assert_array_equal(reader.readColumn("counts", mmap=True), self.counts)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,119 @@
+"""
+Test the Disk and AsyncDisk loggers.
+
+	cd wcEcoli
+	nosetests wholecell/tests/loggers/test_disk.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.io.tablereader import TableReader
+from wholecell.loggers.disk import AsyncDisk, Disk
+
+N_STEPS = 20
+N_COUNTS = 5
+
+
+class CountsListener(object):
+	"""Reuses one counts array between steps, as listeners do."""
+
+	def __init__(self):
+		self.counts = np.zeros(N_COUNTS, np.int64)
+
+	def tableCreate(self, tableWriter):
+		tableWriter.writeAttributes(names = ["mol{}".format(i) for i in xrange(N_COUNTS)])
+
+	def tableAppend(self, tableWriter):
+		tableWriter.append(counts = self.counts)
+
+
+class FakeSimulation(object):
+
+	def __init__(self):
+		self.internal_states = {}
+		self.external_states = {}
+		self.listeners = {"Counts": CountsListener()}
+		self._time = 0.
+
+	def initialTime(self):
+		return 0.
+
+	def time(self):
+		return self._time
+
+	def tableCreate(self, tableWriter):
+		pass
+
+	def tableAppend(self, tableWriter):
+		tableWriter.append(time = self._time)
+
+	def step(self):
+		self._time += 1.
+		self.listeners["Counts"].counts += 1
+
+
+class Test_disk(unittest.TestCase):
+
+	def setUp(self):
+		self.test_dir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.test_dir)
+
+	def run_logger(self, logger):
+		sim = FakeSimulation()
+		logger.initialize(sim)
+		for step in xrange(N_STEPS):
+			sim.step()
+			logger.append(sim)
+		logger.finalize(sim)
+
+	def check_output(self):
+		main = TableReader(os.path.join(self.test_dir, "Main"))
+		npt.assert_array_equal(main.readColumn("time"), np.arange(N_STEPS + 1))
+		self.assertEqual(main.readAttribute("lengthSec"), N_STEPS)
+
+		counts = TableReader(os.path.join(self.test_dir, "Counts"))
+		npt.assert_array_equal(
+			counts.readColumn("counts"),
+			np.arange(N_STEPS + 1)[:, None].repeat(N_COUNTS, 1)
+			)
+		self.assertEqual(len(counts.readAttribute("names")), N_COUNTS)
+
+	@noseAttrib.attr('smalltest', 'loggers')
+	def test_disk(self):
+		self.run_logger(Disk(self.test_dir, bufferRows = 3))
+		self.check_output()
+
+	@noseAttrib.attr('smalltest', 'loggers')
+	def test_async_disk(self):
+		self.run_logger(AsyncDisk(self.test_dir, bufferRows = 3, queueSize = 2))
+		self.check_output()
+
+	@noseAttrib.attr('smalltest', 'loggers')
+	def test_async_disk_flush(self):
+		logger = AsyncDisk(self.test_dir, bufferRows = 100)
+		sim = FakeSimulation()
+		logger.initialize(sim)
+		sim.step()
+		logger.append(sim)
+		logger.flush(sim)
+
+		main = TableReader(os.path.join(self.test_dir, "Main"))
+		npt.assert_array_equal(main.readColumn("time"), [0., 1.])
+
+		logger.finalize(sim)
+
+
+if __name__ == '__main__':
+	unittest.main()
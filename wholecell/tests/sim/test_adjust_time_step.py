@@ -0,0 +1,111 @@
+"""
+Test the simulation's timestep adjustment.
+
+	cd wcEcoli
+	nosetests wholecell/tests/sim/test_adjust_time_step.py
+"""
+
+from __future__ import division
+
+import collections
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.processes.process import Process
+from wholecell.sim.simulation import Simulation
+
+
+class Unlimited(Process):
+	_name = "Unlimited"
+
+
+class Bounded(Process):
+	"""Reports its bound through maxTimeStep()."""
+	_name = "Bounded"
+
+	def __init__(self, bound):
+		super(Bounded, self).__init__()
+		self.bound = bound
+
+	def isTimeStepShortEnough(self, inputTimeStep, timeStepSafetyFraction):
+		return inputTimeStep <= self.maxTimeStep(timeStepSafetyFraction)
+
+	def maxTimeStep(self, timeStepSafetyFraction):
+		return self.bound * timeStepSafetyFraction
+
+
+class Checked(Process):
+	"""Only checks timesteps, so the simulation has to search."""
+	_name = "Checked"
+
+	def __init__(self, bound):
+		super(Checked, self).__init__()
+		self.bound = bound
+
+	def isTimeStepShortEnough(self, inputTimeStep, timeStepSafetyFraction):
+		return inputTimeStep * timeStepSafetyFraction**-1 <= self.bound
+
+
+class FakeEvaluationTime(object):
+	def __init__(self, nProcesses):
+		self.timeStepLimits = np.full(nProcesses, np.nan)
+
+
+class Test_adjustTimeStep(unittest.TestCase):
+
+	def simulation(self, *processes):
+		sim = Simulation.__new__(Simulation)
+		sim.processes = collections.OrderedDict(
+			(str(i), process) for i, process in enumerate(processes))
+		sim._maxTimeStep = 2.
+		sim._timeStepSafetyFraction = 0.5
+		sim._updateTimeStepFreq = 5
+		sim._simulationStep = 0
+		sim._timeStepSec = 0.1
+		sim._evalTime = FakeEvaluationTime(len(processes))
+		return sim
+
+	@noseAttrib.attr('smalltest')
+	def test_bounded(self):
+		sim = self.simulation(Unlimited(), Bounded(3.), Bounded(1.))
+		sim._adjustTimeStep()
+
+		self.assertEqual(sim._timeStepSec, 0.5)
+		npt.assert_array_equal(sim._evalTime.timeStepLimits, [2., 1.5, 0.5])
+
+	@noseAttrib.attr('smalltest')
+	def test_search(self):
+		# Processes without maxTimeStep() fall back to the bisection
+		sim = self.simulation(Unlimited(), Checked(1.))
+		sim._adjustTimeStep()
+
+		self.assertLessEqual(sim._timeStepSec, 0.5)
+		self.assertAlmostEqual(sim._timeStepSec, 0.5, delta = 0.5 * 1e-2)
+		self.assertEqual(sim._evalTime.timeStepLimits[0], 2.)
+
+	@noseAttrib.attr('smalltest')
+	def test_update_frequency(self):
+		# Between updates the timestep is only rechecked
+		bounded = Bounded(1.)
+		sim = self.simulation(bounded)
+		sim._simulationStep = 1
+		sim._adjustTimeStep()
+		self.assertEqual(sim._timeStepSec, 0.1)
+
+		bounded.bound = 0.1 # no longer short enough
+		sim._adjustTimeStep()
+		self.assertEqual(sim._timeStepSec, 0.05)
+
+	@noseAttrib.attr('smalltest')
+	def test_no_time_step(self):
+		sim = self.simulation(Bounded(0.))
+
+		with self.assertRaises(Exception):
+			sim._adjustTimeStep()
+
+
+if __name__ == '__main__':
+	unittest.main()
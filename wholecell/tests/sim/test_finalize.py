@@ -0,0 +1,119 @@
+"""
+Test the simulation's clean up when it finishes or fails.
+
+	cd wcEcoli
+	nosetests wholecell/tests/sim/test_finalize.py
+"""
+
+from __future__ import division
+
+import collections
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+
+from wholecell.processes.process import Process
+from wholecell.sim.simulation import Simulation
+
+
+class Recorded(Process):
+	"""Records how it was cleaned up."""
+	_name = "Recorded"
+
+	def __init__(self):
+		super(Recorded, self).__init__()
+		self.calls = []
+
+	def finalize(self):
+		self.calls.append('finalize')
+
+	def terminate(self):
+		self.calls.append('terminate')
+
+
+class Failing(object):
+	"""A hook or logger that fails in finalize() after closing its files."""
+
+	def __init__(self):
+		self.flushed = 0
+		self.closed = False
+
+	def finalize(self, sim):
+		self.closed = True
+		raise RuntimeError('finalize failed')
+
+	def flush(self, sim):
+		if self.closed:
+			raise ValueError('I/O operation on closed file')
+		self.flushed += 1
+
+
+class Test_finalize(unittest.TestCase):
+
+	def simulation(self, hooks=(), loggers=()):
+		sim = Simulation.__new__(Simulation)
+		sim.processes = collections.OrderedDict(
+			(str(i), Recorded()) for i in xrange(2))
+		sim.hooks = collections.OrderedDict(
+			(str(i), hook) for i, hook in enumerate(hooks))
+		sim.loggers = collections.OrderedDict(
+			(str(i), logger) for i, logger in enumerate(loggers))
+		sim._divideCellFunction = lambda: None
+		sim._finalized = False
+		return sim
+
+	def calls(self, sim):
+		return [process.calls for process in sim.processes.itervalues()]
+
+	@noseAttrib.attr('smalltest')
+	def test_finalize(self):
+		sim = self.simulation()
+		sim.finalize()
+		sim.finalize()
+
+		self.assertEqual(self.calls(sim), [['finalize'], ['finalize']])
+
+	@noseAttrib.attr('smalltest')
+	def test_finalize_error(self):
+		sim = self.simulation(hooks=[Failing()])
+		with self.assertRaises(RuntimeError):
+			sim.finalize()
+
+		self.assertEqual(self.calls(sim), [['terminate'], ['terminate']])
+		self.assertFalse(sim._finalized)
+
+	@noseAttrib.attr('smalltest')
+	def test_run_error(self):
+		logger = Failing()
+		sim = self.simulation(loggers=[logger])
+		sim.time = lambda: 0.
+		sim._isDead = False
+		sim._cellCycleComplete = False
+		sim._simulationStep = 0
+		sim._timeTotal = 0.
+		sim._timeStepSec = 1.
+		def evolveState():
+			raise ValueError('step failed')
+		sim._evolveState = evolveState
+
+		with self.assertRaises(ValueError):
+			sim.run_incremental(10.)
+
+		self.assertEqual(logger.flushed, 1)
+		self.assertEqual(self.calls(sim), [['terminate'], ['terminate']])
+
+	@noseAttrib.attr('smalltest')
+	def test_logger_finalize_error(self):
+		"""Test that a failed flush doesn't hide the logger's error."""
+		logger = Failing()
+		sim = self.simulation(loggers=[logger])
+		sim.time = lambda: 0.
+		sim._isDead = False
+		sim._cellCycleComplete = True
+
+		with self.assertRaisesRegexp(RuntimeError, 'finalize failed'):
+			sim.run_incremental(10.)
+
+		self.assertEqual(logger.flushed, 0)
+		self.assertEqual(self.calls(sim),
+			[['finalize', 'terminate', 'terminate']] * 2)
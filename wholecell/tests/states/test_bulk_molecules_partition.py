@@ -16,7 +16,22 @@ import cPickle
 import os
 
 import numpy as np
+import numpy.testing as npt
 import wholecell.states.bulk_molecules as wcBulkMolecules
+from wholecell.containers.bulk_objects_container import BulkObjectsContainer
+
+
+class FakeView(object):
+	"""Stands in for a BulkMoleculesView with a fixed request."""
+
+	def __init__(self, state, containerIndexes, processIndex):
+		self._containerIndexes = np.array(containerIndexes)
+		self._processIndex = processIndex
+		self._requestedCount = np.zeros(len(containerIndexes), np.int64)
+		state.viewAdd(self)
+
+	def _request(self):
+		return self._requestedCount
 
 class Test_BulkMolecules_partition(unittest.TestCase):
 
@@ -103,3 +118,48 @@ class Test_BulkMolecules_partition(unittest.TestCase):
 		countsBulkPartitioned_test[...,2] = np.array([8., 0., 3., 1., 2., 0., 2.]).T
 
 		self.assertEqual(countsBulkPartitioned.tolist(), countsBulkPartitioned_test.tolist())
+
+	@noseAttrib.attr('smalltest')
+	def test_partition_matches_dense(self):
+		'''
+		Tests that BulkMolecules.partition, which only arbitrates contested
+		molecules, matches calculatePartition over all molecules.
+		'''
+		randomState = np.random.RandomState(0)
+		nMolecules = 50
+		nProcesses = 4
+
+		state = wcBulkMolecules.BulkMolecules()
+		state._nProcesses = nProcesses
+		state.container = BulkObjectsContainer(
+			['molecule{}'.format(i) for i in xrange(nMolecules)])
+		state._processPriorities = np.array([0, 10, 0, 0])
+
+		views = [
+			FakeView(state, randomState.choice(nMolecules, 10, replace = False), processIndex)
+			for processIndex in xrange(nProcesses)
+			]
+		# A second view of overlapping molecules in the same process
+		views.append(FakeView(state, views[0]._containerIndexes[:5], 0))
+
+		state.allocate()
+
+		for step in xrange(3):
+			state.container.countsIs(randomState.randint(0, 20, nMolecules))
+			for view in views:
+				view._requestedCount[:] = randomState.randint(0, 10, view._requestedCount.size)
+
+			state.partition()
+
+			countsRequested = np.zeros((nMolecules, nProcesses), np.int64)
+			for view in views:
+				countsRequested[view._containerIndexes, view._processIndex] += view._request()
+			countsPartitioned = np.zeros_like(countsRequested)
+			wcBulkMolecules.calculatePartition(state._processPriorities,
+				countsRequested, state.container._counts, countsPartitioned)
+
+			npt.assert_array_equal(state._countsRequested, countsRequested)
+			npt.assert_array_equal(state._countsAllocatedInitial, countsPartitioned)
+			npt.assert_array_equal(state._countsAllocatedFinal, countsPartitioned)
+			npt.assert_array_equal(state._countsUnallocated,
+				state.container._counts - countsPartitioned.sum(axis = 1))
@@ -0,0 +1,79 @@
+"""
+Test calculating the masses of unique molecules by process.
+
+	cd wcEcoli
+	nosetests wholecell/tests/states/test_unique_molecules_mass.py
+"""
+
+from __future__ import division
+
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+import wholecell.states.unique_molecules as wcUniqueMolecules
+from wholecell.containers.unique_objects_container import UniqueObjectsContainer
+
+SUBMASS_DIFF_NAMES = ['massDiff_protein', 'massDiff_RNA']
+MOLECULE_IDS = ['A', 'B', 'C']
+
+
+class Test_UniqueMolecules_mass(unittest.TestCase):
+
+	def setUp(self):
+		attributes = wcUniqueMolecules.DEFAULT_ATTRIBUTES.copy()
+		attributes.update({name: np.float64 for name in SUBMASS_DIFF_NAMES})
+
+		self.state = wcUniqueMolecules.UniqueMolecules()
+		self.state._nProcesses = 3
+		self.state._moleculeIds = MOLECULE_IDS
+		self.state._moleculeMasses = np.array([[1., 2.], [10., 0.], [0., 5.]])
+		self.state._submassDiffNames = SUBMASS_DIFF_NAMES
+		self.state.container = UniqueObjectsContainer({
+			name: attributes.copy() for name in MOLECULE_IDS})
+
+	def reference_mass(self):
+		"""The masses summed molecule by molecule."""
+		masses = np.zeros((self.state._nProcesses + 1, len(SUBMASS_DIFF_NAMES)))
+
+		for moleculeMasses, moleculeId in zip(self.state._moleculeMasses, MOLECULE_IDS):
+			molecules = self.state.container.objectsInCollection(moleculeId)
+			if len(molecules) == 0:
+				continue
+
+			processIndexes = molecules.attr('_partitionedProcess')
+			for i, processIndex in enumerate(processIndexes):
+				masses[processIndex, :] += moleculeMasses
+				for j, name in enumerate(SUBMASS_DIFF_NAMES):
+					masses[processIndex, j] += molecules.attr(name)[i]
+
+		return masses
+
+	@noseAttrib.attr('smalltest')
+	def test_mass(self):
+		random = np.random.RandomState(0)
+		container = self.state.container
+
+		container.objectsNew('A', 20,
+			_partitionedProcess = random.randint(4, size = 20),
+			massDiff_protein = random.rand(20),
+			massDiff_RNA = random.rand(20))
+		container.objectsNew('C', 7,
+			_partitionedProcess = random.randint(4, size = 7),
+			massDiff_RNA = random.rand(7))
+		container.objectsDel(list(container.objectsInCollection('A'))[::3])
+
+		masses = self.state._calculateMass()
+
+		self.assertEqual(masses.shape, (4, 2))
+		npt.assert_allclose(masses, self.reference_mass())
+
+	@noseAttrib.attr('smalltest')
+	def test_no_molecules(self):
+		npt.assert_array_equal(self.state._calculateMass(), np.zeros((4, 2)))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test partitioning unique molecules among processes.
+
+	cd wcEcoli
+	nosetests wholecell/tests/states/test_unique_molecules_partition.py
+"""
+
+from __future__ import division
+
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+import wholecell.states.unique_molecules as wcUniqueMolecules
+from wholecell.containers.unique_objects_container import UniqueObjectsContainer
+
+
+class FakeView(object):
+	"""Stands in for a UniqueMoleculesView with a fixed query and request."""
+
+	def __init__(self, state, collectionName, processIndex, request, indexes = None):
+		self._queryResult = state.container.objectsInCollection(collectionName)
+		if indexes is not None:
+			self._queryResult = state.container.objectsByGlobalIndex(
+				self._queryResult._globalIndexes[indexes])
+		self._processIndex = processIndex
+		self._requestedCount = np.array([request], np.int64)
+		state.viewAdd(self)
+
+	def _request(self):
+		return self._requestedCount
+
+
+class Test_UniqueMolecules_partition(unittest.TestCase):
+
+	def setUp(self):
+		self.state = wcUniqueMolecules.UniqueMolecules()
+		self.state._nProcesses = 3
+		self.state._unassignedPartitionedValue = 3
+		self.state.randomState = np.random.RandomState(0)
+		self.state.container = UniqueObjectsContainer({
+			name: wcUniqueMolecules.DEFAULT_ATTRIBUTES.copy()
+			for name in ('A', 'B', 'C')
+			})
+
+		self.state.container.objectsNew('A', 6)
+		self.state.container.objectsNew('B', 5)
+		self.state.container.objectsNew('C', 4)
+
+	def processes(self, collectionName):
+		return self.state.container.objectsInCollection(
+			collectionName).attr('_partitionedProcess')
+
+	@noseAttrib.attr('smalltest')
+	def test_non_overlapping(self):
+		FakeView(self.state, 'A', 0, 6)
+		FakeView(self.state, 'B', 1, 5)
+		FakeView(self.state, 'C', 2, 0) # not requesting
+
+		self.state.partition()
+
+		npt.assert_array_equal(self.processes('A'), 0)
+		npt.assert_array_equal(self.processes('B'), 1)
+		npt.assert_array_equal(self.processes('C'), 3)
+		npt.assert_array_equal(self.state.partitionPathCounts, [1, 0, 0])
+
+	@noseAttrib.attr('smalltest')
+	def test_overlapping(self):
+		FakeView(self.state, 'A', 0, 6)
+		FakeView(self.state, 'B', 1, 3)
+		FakeView(self.state, 'B', 2, 2)
+
+		self.state.partition()
+
+		npt.assert_array_equal(self.processes('A'), 0)
+		npt.assert_array_equal(
+			np.bincount(self.processes('B'), minlength = 4), [0, 3, 2, 0])
+		npt.assert_array_equal(self.processes('C'), 3)
+		npt.assert_array_equal(self.state.partitionPathCounts, [0, 1, 0])
+
+	@noseAttrib.attr('smalltest')
+	def test_crossing(self):
+		# Requests for overlapping but not nested sets fall back to the LP
+		FakeView(self.state, 'A', 0, 2, np.arange(0, 4))
+		FakeView(self.state, 'A', 1, 2, np.arange(2, 6))
+
+		self.state.partition()
+
+		processes = self.processes('A')
+		npt.assert_array_equal(np.bincount(processes, minlength = 4), [2, 2, 0, 2])
+		self.assertTrue((processes[4:] != 0).all())
+		self.assertTrue((processes[:2] != 1).all())
+		npt.assert_array_equal(self.state.partitionPathCounts, [0, 0, 1])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -37,7 +37,7 @@ import numpy as np
 # when run via kernprof.
 sys.path[0] = os.getcwd()  # Put cwd on the python path so imports will work
 
-from wholecell.utils.polymerize import polymerize
+from wholecell.utils.polymerize import polymerize_reference_implementation as polymerize
 
 PAD_VALUE = polymerize.PAD_VALUE
 
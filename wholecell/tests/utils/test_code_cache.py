@@ -0,0 +1,95 @@
+"""
+Test code_cache.py
+
+	cd wcEcoli
+	nosetests wholecell/tests/utils/test_code_cache.py
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import cPickle
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+
+from wholecell.utils import code_cache
+
+SOURCE = "def double(x):\n\treturn 2 * x\n"
+
+
+def load_double(directory):
+	"""Load SOURCE in a worker process, returning its module's file."""
+	return code_cache.loadSource(SOURCE, directory).__file__
+
+
+class Test_code_cache(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.environ = os.environ.get('WC_CODE_CACHE_DIR')
+		os.environ['WC_CODE_CACHE_DIR'] = self.directory
+
+	def tearDown(self):
+		if self.environ is None:
+			del os.environ['WC_CODE_CACHE_DIR']
+		else:
+			os.environ['WC_CODE_CACHE_DIR'] = self.environ
+
+		for name in sys.modules.keys():
+			if name.startswith(code_cache.MODULE_PREFIX):
+				del sys.modules[name]
+
+		shutil.rmtree(self.directory)
+
+	def cached_files(self):
+		return sorted(name for name in os.listdir(self.directory)
+			if name.endswith('.py'))
+
+	@noseAttrib.attr('smalltest')
+	def test_load(self):
+		module = code_cache.loadSource(SOURCE)
+		self.assertEqual(module.double(3), 6)
+		self.assertEqual(code_cache.loadSource(SOURCE), module)
+
+		other = code_cache.loadSource(SOURCE.replace('2 *', '3 *'))
+		self.assertEqual(other.double(3), 9)
+		self.assertEqual(len(self.cached_files()), 2)
+
+	@noseAttrib.attr('smalltest')
+	def test_pickle(self):
+		double = code_cache.CachedFunction(SOURCE, 'double')
+		pickled = cPickle.dumps(double, cPickle.HIGHEST_PROTOCOL)
+
+		# Unpickling reloads the module, writing it again if it's gone
+		for name in self.cached_files():
+			os.remove(os.path.join(self.directory, name))
+		for name in sys.modules.keys():
+			if name.startswith(code_cache.MODULE_PREFIX):
+				del sys.modules[name]
+
+		self.assertEqual(cPickle.loads(pickled)(4), 8)
+		self.assertEqual(len(self.cached_files()), 1)
+
+	@noseAttrib.attr('smalltest')
+	def test_concurrent(self):
+		pool = multiprocessing.Pool(4)
+		try:
+			files = pool.map(load_double, [self.directory] * 16)
+		finally:
+			pool.close()
+			pool.join()
+
+		self.assertEqual(len(set(files)), 1)
+		self.assertEqual(len(self.cached_files()), 1)
+		self.assertFalse([name for name in os.listdir(self.directory)
+			if name.endswith('.partial')])
+
+
+if __name__ == '__main__':
+	unittest.main()
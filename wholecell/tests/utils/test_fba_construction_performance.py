@@ -0,0 +1,170 @@
+"""
+Time constructing an E. coli sized FBA problem, loading the stoichiometry one
+coefficient at a time (the way NetworkFlowGLPK used to and does now) vs. from
+a sparse matrix.
+
+Running it this way prints the timing measurements:
+	python -m wholecell.tests.utils.test_fba_construction_performance
+
+Running it these ways prints them only for failed tests:
+	nosetests wholecell/tests/utils/test_fba_construction_performance.py
+	nosetests -a performance
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+from collections import defaultdict
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+from scipy.sparse import coo_matrix
+import swiglpk as glp
+
+from wholecell.tests.utils.test_library_performance import time_it
+from wholecell.utils._netflow.nf_glpk import (NetworkFlowGLPK,
+	_toDoubleArray, _toIndexArray)
+from wholecell.utils.modular_fba import FluxBalanceAnalysis, S_GLPK
+
+N_REACTIONS = 4000
+N_MOLECULES = 1500
+COEFFS_PER_REACTION = 4
+
+
+def random_network(seed=0):
+	"""A random reaction network about the size of the E. coli model's, as
+	a reactionStoich dict."""
+	random = np.random.RandomState(seed)
+	reactionStoich = {}
+	for i in xrange(N_REACTIONS):
+		molecules = random.choice(N_MOLECULES, COEFFS_PER_REACTION, replace=False)
+		coeffs = random.randint(1, 4, COEFFS_PER_REACTION) * np.array([-1, -1, 1, 1])
+		reactionStoich['R{:05d}'.format(i)] = {
+			'M{:05d}'.format(molecule): float(coeff)
+			for molecule, coeff in zip(molecules, coeffs)}
+	return reactionStoich
+
+
+class BaselineMaterialCoeffs(object):
+	"""A frozen copy of how NetworkFlowGLPK built the stoichiometry before
+	the shared sparse storage, to time against: (coefficient, flow index)
+	pairs collected per material, with a GLPK column added per new flow, then
+	loaded into GLPK through a dense matrix."""
+
+	def __init__(self):
+		self._lp = glp.glp_create_prob()
+		self._flows = {}
+		self._materialCoeffs = defaultdict(list)
+
+	def __del__(self):
+		glp.glp_delete_prob(self._lp)
+
+	def setFlowMaterialCoeff(self, flow, material, coefficient):
+		if flow in self._flows:
+			idx = self._flows[flow]
+		else:
+			glp.glp_add_cols(self._lp, 1)
+			idx = len(self._flows)
+			glp.glp_set_col_bnds(self._lp, 1 + idx, glp.GLP_LO, 0., np.inf)
+			self._flows[flow] = idx
+
+		self._materialCoeffs[material].append((coefficient, idx))
+
+	def buildEqConst(self):
+		"""Load the coefficients into GLPK, returning them as a dense
+		materials x flows matrix."""
+		n_coeffs = len(self._materialCoeffs)
+		n_flows = len(self._flows)
+
+		glp.glp_add_rows(self._lp, n_coeffs)
+		A = np.zeros((n_coeffs, n_flows))
+		for materialIdx, (material, pairs) in enumerate(sorted(self._materialCoeffs.viewitems())):
+			for pair in pairs:
+				A[materialIdx, pair[1]] = pair[0]
+
+		A_coo = coo_matrix(A)
+		rowIdxs = _toIndexArray(A_coo.row)
+		colIdxs = _toIndexArray(A_coo.col)
+		data = _toDoubleArray(A_coo.data)
+		n_elems = len(A_coo.row)
+
+		for row in xrange(1, n_coeffs + 1):
+			glp.glp_set_row_bnds(self._lp, row, glp.GLP_FX, 0.0, 0.0)
+		glp.glp_load_matrix(self._lp, n_elems, rowIdxs, colIdxs, data)
+
+		return A
+
+
+class Test_fba_construction_performance(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.reactionStoich = random_network()
+
+	@noseAttrib.attr('performance')
+	def test_material_coeffs(self):
+		reactionIDs = sorted(self.reactionStoich)
+		moleculeIDs = sorted({
+			moleculeID
+			for stoich in self.reactionStoich.itervalues()
+			for moleculeID in stoich})
+		moleculeIndexes = {m: i for i, m in enumerate(moleculeIDs)}
+		entries = [
+			(moleculeIndexes[moleculeID], j, coeff)
+			for j, reactionID in enumerate(reactionIDs)
+			for moleculeID, coeff in self.reactionStoich[reactionID].iteritems()]
+		rows, cols, coeffs = zip(*entries)
+		S = coo_matrix((coeffs, (rows, cols)),
+			shape=(len(moleculeIDs), len(reactionIDs)))
+
+		problems = {}
+
+		def baseline():
+			builder = BaselineMaterialCoeffs()
+			for reactionID in reactionIDs:
+				for moleculeID, coeff in self.reactionStoich[reactionID].iteritems():
+					builder.setFlowMaterialCoeff(reactionID, moleculeID, coeff)
+			problems['baseline'] = builder.buildEqConst()
+
+		def per_coefficient():
+			nf = NetworkFlowGLPK()
+			for reactionID in reactionIDs:
+				for moleculeID, coeff in self.reactionStoich[reactionID].iteritems():
+					nf.setFlowMaterialCoeff(reactionID, moleculeID, coeff)
+			nf.buildEqConst()
+			problems['per_coefficient'] = nf
+
+		def matrix():
+			nf = NetworkFlowGLPK()
+			nf.setMaterialCoeffsMatrix(reactionIDs, moleculeIDs, S)
+			nf.buildEqConst()
+			problems['matrix'] = nf
+
+		time_it(baseline, 'Baseline per-coefficient construction')
+		time_it(per_coefficient, 'Per-coefficient construction')
+		time_it(matrix, 'Sparse matrix construction')
+
+		self.assertEqual(
+			problems['per_coefficient'].getMaterialNames(),
+			problems['matrix'].getMaterialNames())
+		np.testing.assert_array_equal(
+			problems['per_coefficient'].getSMatrix(),
+			problems['matrix'].getSMatrix())
+		np.testing.assert_array_equal(
+			problems['baseline'], problems['matrix'].getSMatrix())
+
+	@noseAttrib.attr('performance')
+	def test_fba(self):
+		exchangeIDs = ['M{:05d}'.format(i) for i in xrange(0, N_MOLECULES, 10)]
+		objective = {'M{:05d}'.format(i): 1 for i in xrange(5, N_MOLECULES, 50)}
+
+		def construct():
+			FluxBalanceAnalysis(
+				self.reactionStoich, exchangeIDs, objective, solver=S_GLPK)
+
+		time_it(construct, 'FluxBalanceAnalysis construction')
+
+
+if __name__ == '__main__':
+	unittest.main()
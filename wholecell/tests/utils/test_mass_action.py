@@ -0,0 +1,156 @@
+"""
+Test the vectorized mass-action ODEs written by writeMassActionOdeFile against
+the sympy-generated ODE files they replace, and time the two.
+
+Running it this way prints the timing measurements:
+	python -m wholecell.tests.utils.test_mass_action
+
+Running it these ways prints them only for failed tests:
+	nosetests wholecell/tests/utils/test_mass_action.py
+	nosetests -a performance
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import imp
+import os
+import shutil
+import tempfile
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+import scipy.integrate
+import sympy as sp
+
+from wholecell.tests.utils.test_library_performance import time_it
+from wholecell.utils.write_ode_file import writeOdeFile, writeMassActionOdeFile
+
+
+def random_network(nMolecules, nReactions, seed=0):
+	"""A random reaction network with binding and phosphotransfer-like
+	reactions, some with coefficients of 2, and its rate constants."""
+	random = np.random.RandomState(seed)
+	S = np.zeros((nMolecules, nReactions))
+	for reaction in xrange(nReactions):
+		molecules = random.choice(nMolecules, 4, replace=False)
+		S[molecules, reaction] = [-1, -random.randint(1, 3), 1, random.randint(1, 3)]
+
+	ratesFwd = 10 ** random.uniform(-1, 2, nReactions)
+	ratesRev = 10 ** random.uniform(-1, 2, nReactions)
+
+	return S, ratesFwd, ratesRev
+
+
+def sympy_odes(S, ratesFwd, ratesRev, constantIdxs=()):
+	"""The symbolic derivatives and Jacobian, built like the two-component
+	system's ODEs were."""
+	y = sp.symbols(["y[%d]" % x for x in xrange(S.shape[0])])
+	dy = [sp.symbol.S.Zero] * S.shape[0]
+
+	for colIdx in xrange(S.shape[1]):
+		negIdxs = np.where(S[:, colIdx] < 0)[0]
+		posIdxs = np.where(S[:, colIdx] > 0)[0]
+
+		reactantFlux = ratesFwd[colIdx]
+		for negIdx in negIdxs:
+			reactantFlux *= (y[negIdx] ** (-1 * S[negIdx, colIdx]))
+
+		productFlux = ratesRev[colIdx]
+		for posIdx in posIdxs:
+			productFlux *= (y[posIdx] ** (1 * S[posIdx, colIdx]))
+
+		for thisIdx in negIdxs:
+			dy[thisIdx] += (-1. * reactantFlux) + (1. * productFlux)
+		for thisIdx in posIdxs:
+			dy[thisIdx] += (1. * reactantFlux) - (1. * productFlux)
+
+	for moleculeIdx in constantIdxs:
+		dy[moleculeIdx] = sp.symbol.S.Zero
+
+	dy = sp.Matrix(dy)
+	return dy, dy.jacobian(y)
+
+
+class Test_mass_action(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def load(self, name, write):
+		path = os.path.join(self.directory, name + '.py')
+		write(path)
+		return imp.load_source('test_mass_action_' + name, path)
+
+	def both(self, S, ratesFwd, ratesRev, constantIdxs=()):
+		dy, J = sympy_odes(S, ratesFwd, ratesRev, constantIdxs)
+		generated = self.load('sympy',
+			lambda path: writeOdeFile(path, dy, J))
+		vectorized = self.load('vectorized',
+			lambda path: writeMassActionOdeFile(
+				path, S, ratesFwd, ratesRev, constantIdxs))
+		return generated, vectorized
+
+	@noseAttrib.attr('smalltest')
+	def test_matches_sympy(self):
+		S, ratesFwd, ratesRev = random_network(12, 8)
+		generated, vectorized = self.both(S, ratesFwd, ratesRev, [3])
+
+		random = np.random.RandomState(1)
+		for i in xrange(10):
+			y = random.rand(12)
+			if i == 0:
+				y[:4] = 0
+
+			npt.assert_allclose(
+				vectorized.derivatives(y, 0), generated.derivatives(y, 0),
+				rtol=1e-12, atol=1e-12)
+			npt.assert_allclose(
+				vectorized.derivativesJacobian(y, 0),
+				generated.derivativesJacobian(y, 0),
+				rtol=1e-12, atol=1e-12)
+
+	@noseAttrib.attr('smalltest')
+	def test_rates_as_arguments(self):
+		S, ratesFwd, ratesRev = random_network(6, 3)
+		withRates = self.load('with_rates',
+			lambda path: writeMassActionOdeFile(path, S, ratesFwd, ratesRev))
+		withoutRates = self.load('without_rates',
+			lambda path: writeMassActionOdeFile(path, S))
+
+		y = np.random.RandomState(2).rand(6)
+		npt.assert_array_equal(
+			withoutRates.derivatives(y, 0, ratesFwd, ratesRev),
+			withRates.derivatives(y, 0))
+		npt.assert_array_equal(
+			withoutRates.derivativesJacobian(y, 0, ratesFwd, ratesRev),
+			withRates.derivativesJacobian(y, 0))
+
+	@noseAttrib.attr('performance')
+	def test_performance(self):
+		# About the size of the two-component system network
+		S, ratesFwd, ratesRev = random_network(100, 70)
+		generated, vectorized = self.both(S, ratesFwd, ratesRev)
+		y0 = np.random.RandomState(3).rand(100)
+
+		for name, odes in (('sympy', generated), ('vectorized', vectorized)):
+			def evaluate():
+				for _ in xrange(1000):
+					odes.derivatives(y0, 0)
+					odes.derivativesJacobian(y0, 0)
+
+			def integrate():
+				scipy.integrate.odeint(odes.derivatives, y0, t=[0, 1e3],
+					Dfun=odes.derivativesJacobian, mxstep=10000)
+
+			time_it(evaluate, '1000 evaluations, {}'.format(name))
+			time_it(integrate, 'odeint, {}'.format(name))
+
+
+if __name__ == '__main__':
+	unittest.main()
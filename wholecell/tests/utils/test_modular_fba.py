@@ -8,6 +8,7 @@
 
 from __future__ import division
 
+import multiprocessing
 import unittest
 import warnings
 
@@ -322,6 +323,78 @@ class Test_FluxBalanceAnalysis(unittest.TestCase):
 			elif moleculeID == "E":
 				self.assertAlmostEqual(0, change)
 
+	@noseAttrib.attr("smalltest", "fba")
+	def test_solveScenarios(self):
+		fba = FluxBalanceAnalysis(**_testStandard)
+		fba.setExternalMoleculeLevels([50, 20])
+
+		levels = [[50, 20], [10, 20], [50, 0], [0, 0]]
+		scenarios = [
+			[("setExternalMoleculeLevels", (moleculeLevels,))]
+			for moleculeLevels in levels
+			]
+
+		expected = []
+		for moleculeLevels in levels:
+			fresh = FluxBalanceAnalysis(**_testStandard)
+			fresh.setExternalMoleculeLevels(moleculeLevels)
+			expected.append(fresh.getReactionFluxes())
+
+		for processes in (1, 2):
+			fluxes = fba.solveScenarios(scenarios, processes=processes)
+			npt.assert_allclose(fluxes, expected)
+
+		# A pool can be reused after the problem changes
+		pool = multiprocessing.Pool(2)
+		try:
+			fluxes = fba.solveScenarios(scenarios, processes=2, pool=pool)
+			npt.assert_allclose(fluxes, expected)
+
+			fba.setExternalMoleculeLevels([10, 20])
+			fluxes = fba.solveScenarios([[], []], processes=2, pool=pool)
+			npt.assert_allclose(fluxes, [expected[1]] * 2)
+		finally:
+			pool.terminate()
+		fba.setExternalMoleculeLevels([50, 20])
+
+		fluxes = fba.solveScenarios(scenarios, ["A to B"])
+		index = list(fba.getReactionIDs()).index("A to B")
+		npt.assert_allclose(fluxes, np.array(expected)[:, index:index + 1])
+
+		# The scenarios don't change the original problem
+		self.assertEqual(fba.getBiomassReactionFlux(), 1.0)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_setKineticTarget(self):
+		def kinetic(targets):
+			fba = FluxBalanceAnalysis(
+				objectiveType="kinetic_only",
+				objectiveParameters={
+					"kineticObjectiveWeight": 1.,
+					"reactionRateTargets": targets,
+					"oneSidedReactionTargets": [],
+					},
+				internalExchangedMolecules=["B", "C", "E"],
+				**_testStandard)
+			fba.setExternalMoleculeLevels([50, 20])
+			return fba
+
+		fba = kinetic({"A to B": 1., "A + D to E": 1.})
+		fluxes = lambda problem: problem.getReactionFluxes(["A to B", "A + D to E"])
+		npt.assert_allclose(fluxes(fba), [1, 1])
+
+		# Changing targets matches starting with them
+		fba.setKineticTarget(["A to B", "A + D to E"], [5., 2.])
+		npt.assert_allclose(fluxes(fba), [5, 2])
+		npt.assert_allclose(fluxes(fba),
+			fluxes(kinetic({"A to B": 5., "A + D to E": 2.})))
+
+		# A 0 target disables the target until it's set again
+		fba.setKineticTarget(["A to B", "A + D to E"], [0., 3.])
+		npt.assert_allclose(fluxes(fba), [1, 3])
+		fba.setKineticTarget("A to B", 4.)
+		npt.assert_allclose(fluxes(fba), [4, 3])
+
 # TODO: tests for enzymes
 # TODO: tests for mass accumulation
 # TODO: tests for flexible FBA
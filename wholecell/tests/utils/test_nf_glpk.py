@@ -3,9 +3,13 @@
 from __future__ import absolute_import
 from __future__ import division
 
+import cPickle
 import unittest
 import nose.plugins.attrib as noseAttrib
 
+import numpy as np
+from scipy.sparse import csr_matrix
+
 import swiglpk as glp
 
 from wholecell.utils._netflow.nf_glpk import (MessageLevel, NetworkFlowGLPK,
@@ -94,3 +98,224 @@ class Test_NetworkFlowGLPK(unittest.TestCase):
 		self.assertIn('UNDEF', nf.status_string)
 
 		# TODO: How to use the NetworkFlowGLPK interface?
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_batch_bounds(self):
+		"""Test setting flow bounds and objective coefficients by index."""
+		nf = NetworkFlowGLPK()
+		flows = ['a', 'b', 'c']
+		indexes = nf.getFlowIndexes(flows)
+		np.testing.assert_array_equal(indexes, [0, 1, 2])
+		np.testing.assert_array_equal(nf.getFlowIndexes(['c', 'a']), [2, 0])
+
+		nf.setFlowBoundsArray(indexes, [0, -1, 2], [1, 1, 2])
+		nf.setFlowBounds('a', upperBound=5)
+		self.assertEqual(nf.getLowerBounds(), {'a': 0, 'b': -1, 'c': 2})
+		self.assertEqual(nf.getUpperBounds(), {'a': 5, 'b': 1, 'c': 2})
+
+		# NaN and None leave bounds unchanged
+		nf.setFlowBoundsArray(indexes, [np.nan, 0, np.nan])
+		nf.setFlowBoundsArray(indexes[:1], upperBounds=np.inf)
+		self.assertEqual(nf.getLowerBounds(), {'a': 0, 'b': 0, 'c': 2})
+		self.assertEqual(nf.getUpperBounds(), {'a': np.inf, 'b': 1, 'c': 2})
+
+		with self.assertRaises(ValueError):
+			nf.setFlowBoundsArray(indexes, upperBounds=-1)
+
+		nf.setFlowObjectiveCoeffsArray(indexes[1:], 3)
+		nf.setFlowObjectiveCoeff('a', 1)
+		self.assertEqual(nf.getObjective(), {'a': 1, 'b': 3, 'c': 3})
+		self.assertEqual(nf.getFlowObjectiveCoeff('b'), 3)
+
+		# The solver sees the bounds set in batches
+		nf.setFlowMaterialCoeff('a', 'x', 1)
+		nf.setFlowMaterialCoeff('b', 'x', -1)
+		nf.setFlowBoundsArray(indexes[:1], upperBounds=4)
+		nf.buildEqConst()
+		nf.setFlowBoundsArray(indexes[1:2], upperBounds=[0.5])
+		np.testing.assert_allclose(nf.getFlowRates(flows), [0.5, 0.5, 2])
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_material_coeffs_matrix(self):
+		"""Test setting material coefficients from a sparse matrix."""
+		flows = ['a', 'b', 'c']
+		materials = ['y', 'x']
+		S = csr_matrix(np.array([[0, 2., -1], [1, -1, 0]]))
+
+		nf1 = NetworkFlowGLPK()
+		nf1.setMaterialCoeffsMatrix(flows, materials, S)
+		nf1.setFlowMaterialCoeff('c', 'y', -2)  # overrides the matrix entry
+
+		nf2 = NetworkFlowGLPK()
+		nf2.getFlowIndexes(flows)  # same column order as nf1
+		for flow, material, coefficient in [
+				('b', 'y', 2), ('c', 'y', -1), ('a', 'x', 1), ('b', 'x', -1),
+				('c', 'y', -2)]:
+			nf2.setFlowMaterialCoeff(flow, material, coefficient)
+
+		for nf in (nf1, nf2):
+			nf.setFlowBounds('a', upperBound=4)
+			nf.setFlowObjectiveCoeff('c', 1)
+			nf.buildEqConst()
+
+			self.assertEqual(nf.getMaterialNames(), ['x', 'y'])
+			np.testing.assert_array_equal(
+				nf.getSMatrix(), [[1, -1, 0], [0, 2, -2]])
+			np.testing.assert_allclose(nf.getFlowRates(flows), [4, 4, 4])
+
+			nf.setFlowMaterialCoeff('c', 'y', -4)
+			np.testing.assert_allclose(nf.getFlowRates(flows), [4, 4, 2])
+
+			with self.assertRaises(ValueError):
+				nf.setFlowMaterialCoeff('a', 'y', 1)
+
+		with self.assertRaises(ValueError):
+			NetworkFlowGLPK().setMaterialCoeffsMatrix(flows, materials, S.T)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_material_coeffs_array(self):
+		"""Test changing many material coefficients in one call."""
+		nf, flows = self._chain(5)
+		positions = nf.getMaterialCoeffPositions(flows[1:3], ['m0', 'm1'])
+
+		nf.setMaterialCoeffsArray(positions, [-2, -0.5])
+		np.testing.assert_allclose(nf.getFlowRates(flows[-1:]), [10])
+		self.assertEqual(nf.getSMatrix()[0, 1], -2)
+		self.assertEqual(nf.getSMatrix()[1, 2], -0.5)
+
+		# Unchanged coefficients don't need a new solve
+		solveCount = nf.solve_count
+		nf.setMaterialCoeffsArray(positions, [-2, -0.5])
+		nf.getFlowRates(flows)
+		self.assertEqual(nf.solve_count, solveCount)
+
+		nf.setMaterialCoeffsArray(positions[:1], -4)
+		np.testing.assert_allclose(nf.getFlowRates(flows[-1:]), [5])
+
+		with self.assertRaises(ValueError):
+			nf.getMaterialCoeffPositions(['f3'], ['m0'])
+
+	def _chain(self, n):
+		"""A chain of n flows through materials m0..m(n-2), maximizing the
+		last flow."""
+		nf = NetworkFlowGLPK()
+		flows = ['f{}'.format(i) for i in xrange(n)]
+		for i in xrange(n - 1):
+			nf.setFlowMaterialCoeff(flows[i], 'm{}'.format(i), 1)
+			nf.setFlowMaterialCoeff(flows[i + 1], 'm{}'.format(i), -1)
+		nf.setFlowBounds(flows[0], upperBound=10)
+		nf.setFlowObjectiveCoeff(flows[-1], 1)
+		nf.buildEqConst()
+		return nf, flows
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_skipped_solves(self):
+		"""Test that solves are skipped while nothing changes."""
+		nf, flows = self._chain(5)
+		nf.change_tolerance = 1e-6
+
+		np.testing.assert_allclose(nf.getFlowRates(flows[-1:]), [10])
+		self.assertEqual(nf.solve_count, 1)
+		iterations = nf.iteration_count
+		self.assertGreater(iterations, 0)
+
+		# Unchanged or within the tolerance
+		nf.setFlowBounds(flows[0], upperBound=10 * (1 + 1e-8))
+		nf.setFlowObjectiveCoeff(flows[-1], 1)
+		nf.setFlowMaterialCoeff(flows[1], 'm0', -1)
+		nf.getFlowRates(flows)
+		self.assertEqual(nf.solve_count, 1)
+		self.assertEqual(nf.iteration_count, iterations)
+
+		nf.setFlowBounds(flows[0], upperBound=20)
+		np.testing.assert_allclose(nf.getFlowRates(flows[-1:]), [20])
+		self.assertEqual(nf.solve_count, 2)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_basis(self):
+		"""Test warm starting from the basis of another problem."""
+		nf, flows = self._chain(20)
+		self.assertIsNone(nf.getBasis())
+		nf.getFlowRates(flows)
+		basis = nf.getBasis()
+		self.assertEqual(set(basis['flows']), set(flows))
+		self.assertEqual(len(basis['materials']), 19)
+
+		# The optimal basis needs no iterations
+		warm, _ = self._chain(20)
+		warm.setBasis(basis)
+		np.testing.assert_allclose(warm.getFlowRates(flows[-1:]), [10])
+		self.assertEqual(warm.iteration_count, 0)
+		self.assertEqual(warm.getBasis(), basis)
+
+		# A basis for a different problem matches flows by name
+		other, otherFlows = self._chain(5)
+		other.setBasis(basis)
+		np.testing.assert_allclose(other.getFlowRates(otherFlows[-1:]), [10])
+
+		# An invalid basis (too many basic variables) falls back to a new one
+		other.setBasis({'flows': {flow: glp.GLP_BS for flow in otherFlows},
+			'materials': {}})
+		np.testing.assert_allclose(other.getFlowRates(otherFlows[-1:]), [10])
+		self.assertEqual(other.solve_count, 2)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_basis_read_lazily(self):
+		"""Test that the basis is read out of GLPK at most once per optimal
+		solution: before the next solve or when it's needed."""
+		nf, flows = self._chain(5)
+		reads = []
+		getStats = nf._getStats
+		def countingGetStats():
+			reads.append(True)
+			return getStats()
+		nf._getStats = countingGetStats
+
+		for upperBound in (10, 20, 30):
+			nf.setFlowBounds(flows[0], upperBound=upperBound)
+			np.testing.assert_allclose(nf.getFlowRates(flows[-1:]), [upperBound])
+		self.assertEqual(len(reads), 2)
+
+		basis = nf.getBasis()
+		self.assertEqual(len(basis['flows']), 5)
+		self.assertEqual(len(reads), 3)
+		self.assertEqual(nf.getBasis(), basis)
+		self.assertEqual(len(reads), 3)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_failed_solve_keeps_basis(self):
+		"""Test that a failed solve goes back to the last optimal basis
+		whether or not it was read before."""
+		nf, flows = self._chain(30)
+		nf.getFlowRates(flows)
+
+		reference, _ = self._chain(30)
+		reference.getFlowRates(flows)
+		basis = reference.getBasis()
+
+		nf.simplex_iteration_limit = 1
+		nf.setFlowBounds(flows[15], lowerBound=20)
+		with self.assertRaises(RuntimeError):
+			nf.getFlowRates(flows)
+		self.assertEqual(nf.getBasis(), basis)
+
+	@noseAttrib.attr("smalltest", "fba")
+	def test_pickle(self):
+		"""Test that an unpickled problem has the same solution and warm
+		starts from the basis of the original."""
+		nf, flows = self._chain(20)
+		nf.setFlowBounds(flows[0], upperBound=20)
+		nf.setFlowMaterialCoeff(flows[1], 'm0', -2)
+		nf.simplex_iteration_limit = 5000
+		rates = nf.getFlowRates(flows)
+
+		other = cPickle.loads(cPickle.dumps(nf, cPickle.HIGHEST_PROTOCOL))
+		np.testing.assert_allclose(other.getFlowRates(flows), rates)
+		self.assertEqual(other.iteration_count, 0)
+		self.assertEqual(other.getBasis(), nf.getBasis())
+		self.assertEqual(other.simplex_iteration_limit, 5000)
+
+		# The problems are independent
+		other.setFlowBounds(flows[0], upperBound=30)
+		np.testing.assert_allclose(other.getFlowRates(flows[-1:]), [15])
+		np.testing.assert_allclose(nf.getFlowRates(flows), rates)
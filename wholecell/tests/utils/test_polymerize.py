@@ -9,8 +9,10 @@ Test polymerize.py
 @date: Created 1/22/2013
 """
 
-from wholecell.utils.polymerize import (buildSequences, polymerize,
-	computeMassIncrease, sum_monomers, sum_monomers_reference_implementation)
+from wholecell.utils.polymerize import (buildSequences,
+	buildSequencesAndCounts, polymerize, polymerize_reference_implementation,
+	computeMassIncrease, SequenceCache, sum_monomers,
+	sum_monomers_reference_implementation)
 
 import numpy as np
 from numpy.testing import assert_equal
@@ -214,6 +216,59 @@ class Test_polymerize(unittest.TestCase):
 		assert_equal(result.sequenceElongation, np.array([8, 6, 4, 2]))
 
 
+	@noseAttrib.attr('polymerizeNew')
+	@noseAttrib.attr('smalltest')
+	def test_polymerize_matchesReference(self):
+		"""
+		Compare polymerize() to the reference implementation on random
+		inputs: monomer, energy, and unlimited cases with flat and variable
+		elongation, seeding both random sources the same way.
+		"""
+		inputs = np.random.RandomState(0)
+
+		for trial in xrange(300):
+			nSequences = inputs.randint(1, 40)
+			length = inputs.randint(1, 20)
+			nMonomers = inputs.randint(1, 6)
+
+			sequences = inputs.randint(nMonomers, size = (nSequences, length))
+			sequenceLengths = inputs.randint(length + 1, size = nSequences)
+			sequences[np.arange(length) >= sequenceLengths[:, np.newaxis]] = P
+			sequences = sequences.astype(np.int8)
+
+			maxReactions = max((sequences != P).sum(), 1)
+			monomerLimits = inputs.randint(
+				2 * maxReactions // nMonomers + 2, size = nMonomers)
+			reactionLimit = inputs.choice([
+				inputs.randint(maxReactions + 1), monomerLimits.sum(), 10000000])
+			rates = inputs.randint(1, 5, size = nSequences)
+			variable = bool(trial % 2)
+
+			results = []
+			for implementation in (polymerize, polymerize_reference_implementation):
+				np.random.seed(trial)
+				try:
+					results.append(implementation(
+						sequences,
+						monomerLimits,
+						reactionLimit,
+						np.random.RandomState(trial),
+						rates,
+						variable_elongation = variable))
+				except ValueError as e:
+					# Some energy-limited cases over-sample when culling;
+					# both implementations must fail alike
+					results.append(str(e))
+
+			result, reference = results
+			if isinstance(reference, str):
+				self.assertEqual(result, reference)
+				continue
+
+			assert_equal(result.sequenceElongation, reference.sequenceElongation)
+			assert_equal(result.monomerUsages, reference.monomerUsages)
+			self.assertEqual(result.nReactions, reference.nReactions)
+
 	@noseAttrib.attr('polymerizeNew')
 	@noseAttrib.attr('smalltest')
 	def test_buildSequences(self):
@@ -255,6 +310,62 @@ class Test_polymerize(unittest.TestCase):
 			buildSequences, allSequences, sequenceIndexes, polymerizedLengths, elongationRate
 			)
 
+	@noseAttrib.attr('polymerizeNew')
+	@noseAttrib.attr('smalltest')
+	def test_buildSequencesAndCounts(self):
+		padding = np.full((20, 10), P)
+		allSequences = np.hstack(
+			(np.random.randint(3, size = (20, 10)), padding)
+			).astype(np.int8)
+		sequenceIndexes = np.array([0, 5, 8, 5])
+		polymerizedLengths = np.array([0, 4, 9, 7])
+		rates = np.full(allSequences.shape[0], 5, np.int64)
+
+		sequences, counts = buildSequencesAndCounts(
+			allSequences, sequenceIndexes, polymerizedLengths, rates, 4)
+
+		expected = buildSequences(
+			allSequences, sequenceIndexes, polymerizedLengths, rates)
+		assert_equal(sequences, expected)
+		assert_equal(counts, np.bincount(expected[expected != P], minlength = 4))
+
+		# Monomers beyond the counted types
+		self.assertRaises(
+			ValueError,
+			buildSequencesAndCounts, allSequences, sequenceIndexes,
+			polymerizedLengths, rates, 2
+			)
+
+	@noseAttrib.attr('polymerizeNew')
+	@noseAttrib.attr('smalltest')
+	def test_SequenceCache(self):
+		allSequences = np.hstack(
+			(np.random.randint(3, size = (5, 10)), np.full((5, 4), P))
+			).astype(np.int8)
+		indexes = np.array([0, 3])
+		positions = np.array([2, 8])
+		rates = np.full(5, 4, np.int64)
+		cache = SequenceCache(allSequences, 3)
+
+		sequences, counts = cache.build(indexes, positions, rates)
+		assert_equal(sequences, buildSequences(
+			allSequences, indexes, positions, rates))
+
+		# Equal (not necessarily identical) arguments reuse the build
+		self.assertIs(cache.build(indexes.copy(), positions.copy(), rates)[0],
+			sequences)
+
+		# Changes to the arguments, even in place, rebuild the sequences
+		positions += 1
+		sequences2, counts2 = cache.build(indexes, positions, rates)
+		self.assertIsNot(sequences2, sequences)
+		assert_equal(sequences2, buildSequences(
+			allSequences, indexes, positions, rates))
+		assert_equal(counts2, np.bincount(sequences2[sequences2 != P], minlength = 3))
+
+		cache.clear()
+		self.assertIsNot(cache.build(indexes, positions, rates)[0], sequences2)
+
 	@noseAttrib.attr('polymerizeNew')
 	@noseAttrib.attr('smalltest')
 	def test_computeMassIncrease(self):
@@ -0,0 +1,63 @@
+"""
+Test random.py
+
+	cd wcEcoli
+	nosetests wholecell/tests/utils/test_random.py
+"""
+
+from __future__ import division
+
+import unittest
+
+import nose.plugins.attrib as noseAttrib
+import numpy as np
+import numpy.testing as npt
+
+from wholecell.utils.random import multinomialCapped
+
+
+class Test_random(unittest.TestCase):
+
+	def setUp(self):
+		self.randomState = np.random.RandomState(0)
+
+	@noseAttrib.attr('smalltest')
+	def test_multinomialCapped(self):
+		weights = np.array([0.5, 0.3, 0.2, 0., 0.1])
+		caps = np.array([2, 100, 0, 5, 100])
+
+		for n in (0, 1, 10, 150):
+			counts = multinomialCapped(self.randomState, n, weights, caps)
+
+			self.assertEqual(counts.dtype, np.int64)
+			self.assertEqual(counts.sum(), n)
+			self.assertTrue((counts <= caps).all())
+			self.assertEqual(counts[2], 0) # no capacity
+			self.assertEqual(counts[3], 0) # no weight
+
+	@noseAttrib.attr('smalltest')
+	def test_multinomialCapped_exhausted(self):
+		# Asking for more than is available takes all of it
+		weights = np.array([1., 2., 0.])
+		caps = np.array([3, 4, 5])
+
+		npt.assert_array_equal(
+			multinomialCapped(self.randomState, 20, weights, caps), [3, 4, 0])
+		npt.assert_array_equal(
+			multinomialCapped(self.randomState, 5, weights, np.zeros(3)), 0)
+
+	@noseAttrib.attr('smalltest')
+	def test_multinomialCapped_uncapped(self):
+		# Caps that aren't reached leave a plain multinomial
+		weights = np.array([0.25, 0.75])
+		caps = np.array([1000, 1000])
+
+		counts = np.array([
+			multinomialCapped(self.randomState, 100, weights, caps)
+			for i in xrange(200)])
+
+		npt.assert_allclose(counts.mean(axis = 0), [25, 75], rtol = 0.05)
+
+
+if __name__ == '__main__':
+	unittest.main()
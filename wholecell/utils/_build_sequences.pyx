@@ -47,6 +47,49 @@ cpdef np.ndarray[np.int8_t, ndim=2] buildSequences(
 
 	return out
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef tuple buildSequencesAndCounts(
+		np.ndarray[np.int8_t, ndim=2] base_sequences,
+		np.ndarray[np.int64_t, ndim=1] indexes,
+		np.ndarray[np.int64_t, ndim=1] positions,
+		np.ndarray[np.int64_t, ndim=1] elongation_rates,
+		int n_monomers):
+	"""
+	Like buildSequences(), also counting each monomer (ignoring padding) in
+	the same pass over the sequences.
+
+	Returns the sequences and an int64 array of n_monomers monomer counts.
+	"""
+
+	cdef int elongation_max = elongation_rates.max()
+	if np.any(positions + elongation_max > base_sequences.shape[1]):
+		raise Exception('Elongation proceeds past end of sequence!')
+
+	cdef int out_rows = positions.shape[0]
+
+	cdef np.ndarray[np.int8_t, ndim=2] out = np.empty((out_rows, elongation_max), np.int8)
+	cdef np.ndarray[np.int64_t, ndim=1] counts = np.zeros(n_monomers, np.int64)
+
+	cdef int i, index, position, j
+	cdef np.int8_t monomer
+
+	for i in range(out_rows):
+		index = indexes[i]
+		position = positions[i]
+
+		for j in range(elongation_max):
+			monomer = base_sequences[index, position+j]
+			out[i, j] = monomer
+
+			if monomer >= 0:
+				if monomer >= n_monomers:
+					raise ValueError('Monomer index out of range!')
+				counts[monomer] += 1
+
+	return out, counts
+
 # TODO: move this to a new file?
 
 @cython.boundscheck(False)
@@ -6,20 +6,130 @@ All functions required for implementation with modular_fba.py are listed.
 from __future__ import absolute_import
 from __future__ import division
 
+from itertools import izip
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+
+def _grow(array, size):
+	"""Return array, or a copy extended to at least size elements, doubling
+	its length to amortize the cost of adding flows one at a time."""
+	if size <= array.size:
+		return array
+	grown = np.zeros(max(size, 2 * array.size), array.dtype)
+	grown[:array.size] = array
+	return grown
+
+
+def _changed(new, current, tolerance):
+	"""Return a mask of the values in new that differ from current by more
+	than the relative tolerance. Infinite values only match themselves."""
+	changed = new != current
+	if tolerance:
+		with np.errstate(invalid='ignore'):
+			close = np.abs(new - current) <= tolerance * np.abs(current)
+		changed &= ~(close & np.isfinite(new) & np.isfinite(current))
+	return changed
+
+
+def _changedBounds(indexes, lb, ub, lowerBounds, upperBounds, tolerance=0.0):
+	"""Resolve a batch bounds update against the current bound arrays.
+
+	Returns the indexes, lower bounds and upper bounds of the flows whose
+	bounds change by more than the relative tolerance. None or NaN bounds
+	leave the current bound.
+	"""
+	indexes = np.asarray(indexes, np.int64).reshape(-1)
+	lower = lb[indexes]
+	upper = ub[indexes]
+
+	newLower = lower.copy()
+	if lowerBounds is not None:
+		newLower[:] = lowerBounds
+		unset = np.isnan(newLower)
+		newLower[unset] = lower[unset]
+
+	newUpper = upper.copy()
+	if upperBounds is not None:
+		newUpper[:] = upperBounds
+		unset = np.isnan(newUpper)
+		newUpper[unset] = upper[unset]
+
+	changed = (_changed(newLower, lower, tolerance)
+		| _changed(newUpper, upper, tolerance))
+	return indexes[changed], newLower[changed], newUpper[changed]
+
+
+def _changedCoeffs(indexes, objective, coefficients, tolerance=0.0):
+	"""Resolve a batch objective update against the current objective array,
+	returning the indexes and coefficients of the flows that change by more
+	than the relative tolerance."""
+	indexes = np.asarray(indexes, np.int64).reshape(-1)
+	current = objective[indexes]
+	new = current.copy()
+	new[:] = coefficients
+	changed = _changed(new, current, tolerance)
+	return indexes[changed], new[changed]
+
 
 class NetworkFlowProblemBase(object):
 	_maximize = True
 	quadratic_objective = False
 
+	# Relative change below which a new bound, objective coefficient or
+	# material coefficient is ignored, so that the problem isn't re-solved
+	# for changes that can't matter
+	change_tolerance = 0.0
+
 	def setFlowMaterialCoeff(self, flow, material, coefficient):
 		raise NotImplementedError()
 
-	def setFlowBounds(selfs, flow, ub=None, lb=None):
+	def setMaterialCoeffsMatrix(self, flows, materials, coefficients):
+		"""Set the coefficients of many flows in many materials at once,
+		before buildEqConst(). coefficients is a (sparse or dense) matrix of
+		materials x flows; the entries stored in a sparse matrix (or the
+		nonzero entries of a dense one) are set. Later calls, like
+		later setFlowMaterialCoeff() calls, override earlier coefficients.
+		"""
+		raise NotImplementedError()
+
+	def getMaterialCoeffPositions(self, flows, materials):
+		"""Return an int array of the positions of existing coefficients, one
+		per flow and material pair, after buildEqConst(), for the method
+		below."""
+		return np.array([
+			self._materialCoeffPosition(flow, material)[1]
+			for flow, material in izip(flows, materials)], np.int64)
+
+	def setMaterialCoeffsArray(self, positions, coefficients):
+		"""Set the existing coefficients at an array of positions in one call
+		after buildEqConst(). Only changed coefficients reach the solver."""
+		raise NotImplementedError()
+
+	def setFlowBounds(self, flow, lowerBound=None, upperBound=None):
 		raise NotImplementedError()
 
 	def setFlowObjectiveCoeff(self, flow, coefficient):
 		raise NotImplementedError()
 
+	def getFlowIndexes(self, flows):
+		"""Return an int array of the indexes of the given flows (adding any
+		new flows), for the array methods below."""
+		raise NotImplementedError()
+
+	def setFlowBoundsArray(self, indexes, lowerBounds=None, upperBounds=None):
+		"""Set the bounds of the flows at an array of indexes in one call.
+		lowerBounds and upperBounds are scalars or arrays; None or NaN
+		entries leave bounds unchanged. Only changed flows reach the solver.
+		"""
+		raise NotImplementedError()
+
+	def setFlowObjectiveCoeffsArray(self, indexes, coefficients):
+		"""Set the objective coefficients of the flows at an array of indexes
+		in one call. Only changed flows reach the solver."""
+		raise NotImplementedError()
+
 	def getFlowObjectiveCoeff(self, flow):
 		raise NotImplementedError()
 
@@ -56,5 +166,129 @@ class NetworkFlowProblemBase(object):
 	def buildEqConst(self):
 		raise NotImplementedError()
 
+	def copy(self):
+		"""Return an independent copy of this problem, including its bounds,
+		objective, constraints and basis."""
+		raise NotImplementedError()
+
+	def getBasis(self):
+		"""Return the basis of the last optimal solution as a dict with a
+		'flows' dict of flow name: status and a 'materials' dict of material
+		name: status, in the solver's own status codes."""
+		raise NotImplementedError()
+
+	def setBasis(self, basis):
+		"""Warm start the next solve from a basis from getBasis(), possibly
+		of another problem. Flows and materials that aren't in the basis keep
+		their current status, and the solver falls back to a fresh basis if
+		the result isn't a valid one."""
+		raise NotImplementedError()
+
+	@property
+	def iteration_count(self):
+		"""The total number of simplex iterations of all solves so far."""
+		raise NotImplementedError()
+
+	@property
+	def solve_count(self):
+		"""The number of solves so far, not counting skipped ones (when
+		nothing changed since the last solve)."""
+		raise NotImplementedError()
+
+	# Storage of the stoichiometry (material x flow coefficient) matrix shared
+	# by the solver interfaces. Before buildEqConst() the coefficients are
+	# collected as (material name, flow index, coefficient) entries; then
+	# they're converted to a CSR matrix with a row per material in sorted
+	# name order.
+
+	def _initMaterialCoeffs(self):
+		self._coeffMaterials = []
+		self._coeffFlows = []
+		self._coeffValues = []
+		self._materialIdxLookup = {}
+		self._materialNames = []
+		self._A = None
+
+	def _addMaterialCoeff(self, flowIdx, material, coefficient):
+		self._coeffMaterials.append(material)
+		self._coeffFlows.append(flowIdx)
+		self._coeffValues.append(coefficient)
+
+	def _addMaterialCoeffsMatrix(self, flowIdxs, materials, coefficients):
+		coefficients = coo_matrix(coefficients)
+		if coefficients.shape != (len(materials), len(flowIdxs)):
+			raise ValueError("The coefficients matrix must be materials x flows")
+
+		# Stored entries are kept even if zero, like setFlowMaterialCoeff(),
+		# so they can be changed after buildEqConst()
+		materials = np.asarray(materials, dtype=object)
+
+		self._coeffMaterials.extend(materials[coefficients.row].tolist())
+		self._coeffFlows.extend(np.asarray(flowIdxs)[coefficients.col].tolist())
+		self._coeffValues.extend(coefficients.data.tolist())
+
+	def _buildMaterialCoeffs(self, nFlows):
+		"""Convert the collected coefficients to the CSR matrix self._A, with
+		later entries for the same material and flow overriding earlier ones,
+		and return it."""
+		materialNames, rows = np.unique(
+			np.array(self._coeffMaterials, dtype=object), return_inverse=True)
+		cols = np.array(self._coeffFlows, np.int64)
+		data = np.array(self._coeffValues, np.float64)
+
+		# Keep the last entry of each (row, col)
+		keys = rows * nFlows + cols
+		_, lastReversed = np.unique(keys[::-1], return_index=True)
+		keep = keys.size - 1 - lastReversed
+
+		self._materialNames = materialNames.tolist()
+		self._materialIdxLookup = {
+			material: idx for idx, material in enumerate(self._materialNames)}
+		self._A = csr_matrix(
+			(data[keep], (rows[keep], cols[keep])),
+			shape=(len(self._materialNames), nFlows))
+		self._coeffMaterials = self._coeffFlows = self._coeffValues = None
+
+		return self._A
+
+	def _materialCoeffPosition(self, flow, material):
+		"""Return the material's row index and the flow's position in self._A.data
+		of an existing coefficient, after buildEqConst()."""
+		materialIdx = self._materialIdxLookup.get(material)
+		if materialIdx is None:
+			raise Exception("Invalid material")
+		flowIdx = self._flows.get(flow)
+		if flowIdx is None:
+			raise Exception("Invalid flow")
+
+		start = self._A.indptr[materialIdx]
+		end = self._A.indptr[materialIdx + 1]
+		positions = np.flatnonzero(self._A.indices[start:end] == flowIdx)
+		if not positions.size:
+			raise ValueError("Flow {} has no coefficient for material {}".format(
+				flow, material))
+
+		return materialIdx, start + positions[0]
+
+	def _changedMaterialCoeffs(self, positions, coefficients):
+		"""Store a batch update of the coefficients at positions in self._A,
+		returning the material (row) indexes, flow indexes and coefficients
+		of those that change by more than the relative tolerance."""
+		positions, coefficients = _changedCoeffs(
+			positions, self._A.data, coefficients, self.change_tolerance)
+		self._A.data[positions] = coefficients
+
+		materialIdxs = np.searchsorted(self._A.indptr, positions, 'right') - 1
+		return materialIdxs, self._A.indices[positions], coefficients
+
+	def _copyMaterialCoeffs(self, other):
+		"""Give other its own copy of the stoichiometry storage."""
+		if self._A is None:
+			other._coeffMaterials = list(self._coeffMaterials)
+			other._coeffFlows = list(self._coeffFlows)
+			other._coeffValues = list(self._coeffValues)
+		else:
+			other._A = self._A.copy()
+
 	def maximizeObjective(self, doMax):
 		self._maximize = doMax
@@ -9,13 +9,14 @@ linear and quadratic objectives.
 from __future__ import absolute_import
 from __future__ import division
 
-from collections import defaultdict
+import copy
+from itertools import izip
 
 import cplex
 import numpy as np
-from scipy.sparse import coo_matrix
 
-from ._base import NetworkFlowProblemBase
+from ._base import (NetworkFlowProblemBase, _changed, _changedBounds,
+	_changedCoeffs, _grow)
 
 
 class NetworkFlowCPLEX(NetworkFlowProblemBase):
@@ -28,15 +29,21 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 		self._model.set_results_stream(None)
 
 		self._flows = {}
-		self._lb = {}
-		self._ub = {}
-		self._objective = {}
-		self._materialCoeffs = defaultdict(list)
+		self._flowNames = []
+		# Per-flow bounds and objective coefficients, indexed by flow index
+		self._lb = np.zeros(0)
+		self._ub = np.zeros(0)
+		self._objective = np.zeros(0)
+		self._initMaterialCoeffs()
 
 		self.quadratic_objective = quadratic_objective
 
 		self._eqConstBuilt = False
 		self._solved = False
+		self._solveCount = 0
+		self._iterationCount = 0
+		# Column and row statuses of the last optimal solution
+		self._basis = None
 
 		self.inf = cplex.infinity
 
@@ -47,39 +54,68 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 		if flow in self._flows:
 			idx = self._flows[flow]
 		else:
-			self._model.variables.add(obj=[0])
-			idx = len(self._flows)
-			self._lb[flow] = self._lowerBoundDefault
-			self._ub[flow] = self._upperBoundDefault
-			self._model.variables.set_lower_bounds(idx, self._lb[flow])
-			self._model.variables.set_upper_bounds(idx, self._ub[flow])
-			self._flows[flow] = idx
+			idx = self._addFlows([flow])[0]
 
 		return idx
 
+	def _addFlows(self, flows):
+		"""Add variables for new flows with the default bounds, returning
+		their indexes."""
+		start = len(self._flows)
+		end = start + len(flows)
+		indexes = np.arange(start, end)
+
+		self._model.variables.add(
+			obj=[0.] * len(flows),
+			lb=[float(self._lowerBoundDefault)] * len(flows),
+			ub=[float(self._upperBoundDefault)] * len(flows),
+			)
+		self._lb = _grow(self._lb, end)
+		self._ub = _grow(self._ub, end)
+		self._objective = _grow(self._objective, end)
+		self._lb[start:end] = self._lowerBoundDefault
+		self._ub[start:end] = self._upperBoundDefault
+		self._objective[start:end] = 0
+
+		self._flows.update(izip(flows, indexes.tolist()))
+		self._flowNames.extend(flows)
+
+		return indexes
+
 	def setFlowMaterialCoeff(self, flow, material, coefficient):
 		if self._eqConstBuilt:
-			materialIdx = self._materialIdxLookup.get(material, None)
-			if materialIdx is None:
-				raise Exception("Invalid material")
-
-			flowIdx = self._flows.get(flow, None)
-			if flowIdx is None:
-				raise Exception("Invalid flow")
-
-			coeffs, flowIdxs = zip(*self._materialCoeffs[material])
-			coeffs = list(coeffs)
-			flowLoc = flowIdxs.index(flowIdx)
-			coeffs[flowLoc] = coefficient
-			self._materialCoeffs[material] = zip(coeffs, flowIdxs)
+			materialIdx, position = self._materialCoeffPosition(flow, material)
+			if not _changed(np.array(coefficient, np.float64),
+					self._A.data[position], self.change_tolerance):
+				return
+			self._A.data[position] = coefficient
 
+			flowIdx = self._flows[flow]
 			self._model.linear_constraints.set_coefficients(zip([materialIdx], [flowIdx], [coefficient]))
 		else:
 			idx = self._getVar(flow)
-			self._materialCoeffs[material].append((coefficient, idx))
+			self._addMaterialCoeff(idx, material, coefficient)
+
+		self._solved = False
+
+	def setMaterialCoeffsArray(self, positions, coefficients):
+		materialIdxs, flowIdxs, coefficients = self._changedMaterialCoeffs(
+			positions, coefficients)
+		if not materialIdxs.size:
+			return
+
+		self._model.linear_constraints.set_coefficients(zip(
+			materialIdxs.tolist(), flowIdxs.tolist(), coefficients.tolist()))
 
 		self._solved = False
 
+	def setMaterialCoeffsMatrix(self, flows, materials, coefficients):
+		if self._eqConstBuilt:
+			raise Exception("Equality constraints already built.")
+
+		self._addMaterialCoeffsMatrix(
+			self.getFlowIndexes(flows), materials, coefficients)
+
 	def setFlowBounds(self, flow, lowerBound=None, upperBound=None):
 		"""
 		Set the lower and upper bounds for a given flow
@@ -89,37 +125,57 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 			upperBound (float) - upper bound for flow (None if unchanged)
 		"""
 
-		idx = self._getVar(flow)
-		if lowerBound is not None:
-			self._lb[flow] = lowerBound
-		if upperBound is not None:
-			self._ub[flow] = upperBound
+		self.setFlowBoundsArray([self._getVar(flow)], lowerBound, upperBound)
+
+	def setFlowObjectiveCoeff(self, flow, coefficient):
+		self.setFlowObjectiveCoeffsArray([self._getVar(flow)], coefficient)
+
+	def getFlowIndexes(self, flows):
+		newFlows = []
+		seen = set()
+		for flow in flows:
+			if flow not in self._flows and flow not in seen:
+				newFlows.append(flow)
+				seen.add(flow)
+		if newFlows:
+			self._addFlows(newFlows)
+
+		return np.array([self._flows[flow] for flow in flows], np.int64)
+
+	def setFlowBoundsArray(self, indexes, lowerBounds=None, upperBounds=None):
+		indexes, lower, upper = _changedBounds(
+			indexes, self._lb, self._ub, lowerBounds, upperBounds,
+			self.change_tolerance)
+		if not indexes.size:
+			return
 
-		self._model.variables.set_lower_bounds(idx, self._lb[flow])
-		self._model.variables.set_upper_bounds(idx, self._ub[flow])
+		indexList = indexes.tolist()
+		self._model.variables.set_lower_bounds(zip(indexList, lower.tolist()))
+		self._model.variables.set_upper_bounds(zip(indexList, upper.tolist()))
+		self._lb[indexes] = lower
+		self._ub[indexes] = upper
 
 		self._solved = False
 
-	def setFlowObjectiveCoeff(self, flow, coefficient):
-		idx = self._getVar(flow)
-		self._objective[flow] = coefficient
+	def setFlowObjectiveCoeffsArray(self, indexes, coefficients):
+		indexes, coefficients = _changedCoeffs(
+			indexes, self._objective, coefficients, self.change_tolerance)
+		if not indexes.size:
+			return
 
+		indexList = indexes.tolist()
 		if self.quadratic_objective:
 			self._model.objective.set_quadratic_coefficients(
-				idx,
-				idx,
-				coefficient
-				)
+				zip(indexList, indexList, coefficients.tolist()))
 		else:
 			self._model.objective.set_linear(
-				idx,
-				coefficient
-				)
+				zip(indexList, coefficients.tolist()))
+		self._objective[indexes] = coefficients
 
 		self._solved = False
 
 	def getFlowObjectiveCoeff(self, flow):
-		return self._objective[flow]
+		return self._objective[self._flows[flow]]
 
 	def getFlowRates(self, flows):
 		if isinstance(flows, basestring):
@@ -156,13 +212,7 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 	def getSMatrix(self):
 		if not self._eqConstBuilt:
 			raise Exception("Equality constraints not yet built. Finish construction of the problem before accessing S matrix.")
-		A = np.zeros((len(self._materialCoeffs), len(self._flows)))
-		self._materialIdxLookup = {}
-		for materialIdx, (material, pairs) in enumerate(sorted(self._materialCoeffs.viewitems())):
-			self._materialIdxLookup[material] = materialIdx
-			for pair in pairs:
-				A[materialIdx, pair[1]] = pair[0]
-		return A
+		return self._A.toarray()
 
 	def getFlowNames(self):
 		if not self._eqConstBuilt:
@@ -172,35 +222,27 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 	def getMaterialNames(self):
 		if not self._eqConstBuilt:
 			raise Exception("Equality constraints not yet built. Finish construction of the problem before accessing material names.")
-		return sorted(self._materialIdxLookup, key=self._materialIdxLookup.__getitem__)
+		return list(self._materialNames)
 
 	def getUpperBounds(self):
-		return self._ub.copy()
+		return dict(izip(self._flowNames, self._ub.tolist()))
 
 	def getLowerBounds(self):
-		return self._lb.copy()
+		return dict(izip(self._flowNames, self._lb.tolist()))
 
 	def getObjective(self):
-		return self._objective.copy()
+		return dict(izip(self._flowNames, self._objective.tolist()))
 
 	def buildEqConst(self):
 		if self._eqConstBuilt:
 			raise Exception("Equality constraints already built.")
 
-		nMaterials = len(self._materialCoeffs)
-		nFlows = len(self._flows)
-		A = np.zeros((nMaterials, nFlows))
-
-		# avoid creating duplicate constraints
-		self._materialIdxLookup = {}
-		for materialIdx, (material, pairs) in enumerate(sorted(self._materialCoeffs.viewitems())):
-			self._materialIdxLookup[material] = materialIdx
-			for pair in pairs:
-				A[materialIdx, pair[1]] = pair[0]
-		A_coo = coo_matrix(A)
-		row = A_coo.row.astype(np.int32).astype(np.int32)
-		col = A_coo.col.astype(np.int32).astype(np.int32)
-		data = A_coo.data.astype(np.float64).astype(np.float64)
+		A_coo = self._buildMaterialCoeffs(len(self._flows)).tocoo()
+		nMaterials = A_coo.shape[0]
+		nonzero = A_coo.data != 0
+		row = A_coo.row[nonzero].astype(np.int32)
+		col = A_coo.col[nonzero].astype(np.int32)
+		data = A_coo.data[nonzero].astype(np.float64)
 
 		# set solver constraints
 		self._model.linear_constraints.add(rhs=np.zeros(nMaterials), senses='E'*nMaterials)
@@ -208,10 +250,74 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 
 		self._eqConstBuilt = True
 
+	def copy(self):
+		other = copy.copy(self)
+
+		other._model = cplex.Cplex(self._model)
+		other._model.set_log_stream(None)
+		other._model.set_error_stream(None)
+		other._model.set_warning_stream(None)
+		other._model.set_results_stream(None)
+		if self._basis is not None:
+			other._model.start.set_start(self._basis[0], self._basis[1], [], [], [], [])
+		# The copy has no solution until solved
+		other._solved = False
+
+		other._flows = dict(self._flows)
+		other._flowNames = list(self._flowNames)
+		other._lb = self._lb.copy()
+		other._ub = self._ub.copy()
+		other._objective = self._objective.copy()
+		self._copyMaterialCoeffs(other)
+		other._solveCount = 0
+		other._iterationCount = 0
+
+		return other
+
+	def getBasis(self):
+		if self._basis is None:
+			return None
+
+		colStats, rowStats = self._basis
+		return {
+			'flows': dict(izip(self._flowNames, colStats)),
+			'materials': dict(izip(self._materialNames, rowStats)),
+			}
+
+	def setBasis(self, basis):
+		if not self._eqConstBuilt:
+			raise Exception("Equality constraints not yet built. Finish construction of the problem before setting a basis.")
+
+		if self._basis is None:
+			colStats = [self._model.start.status.at_lower_bound] * len(self._flows)
+			rowStats = [self._model.start.status.at_lower_bound] * len(self._materialNames)
+		else:
+			colStats, rowStats = (list(stats) for stats in self._basis)
+
+		for flow, stat in basis['flows'].iteritems():
+			if flow in self._flows:
+				colStats[self._flows[flow]] = stat
+		for material, stat in basis['materials'].iteritems():
+			if material in self._materialIdxLookup:
+				rowStats[self._materialIdxLookup[material]] = stat
+
+		self._model.start.set_start(colStats, rowStats, [], [], [], [])
+		self._solved = False
+
+	@property
+	def iteration_count(self):
+		return self._iterationCount
+
+	@property
+	def solve_count(self):
+		return self._solveCount
+
 	def _solve(self):
 		if self._solved:
 			return
 
+		self._solveCount += 1
+
 		if self._maximize:
 			self._model.objective.set_sense(self._model.objective.sense.maximize)
 		else:
@@ -219,4 +325,15 @@ class NetworkFlowCPLEX(NetworkFlowProblemBase):
 
 		self._model.solve()
 
+		solution = self._model.solution
+		self._iterationCount += solution.progress.get_num_iterations()
+		if solution.get_status() == solution.status.optimal:
+			try:
+				self._basis = tuple(solution.basis.get_basis())
+			except cplex.exceptions.CplexError:
+				pass  # no basis, e.g. from the barrier optimizer
+		elif self._basis is not None:
+			# Warm start the next solve from the last optimal basis
+			self._model.start.set_start(self._basis[0], self._basis[1], [], [], [], [])
+
 		self._solved = True
@@ -29,13 +29,15 @@ environment, losing state info.
 from __future__ import absolute_import
 from __future__ import division
 
-from collections import defaultdict
+import copy
 from enum import Enum
+from itertools import izip
+
 import numpy as np
-from scipy.sparse import coo_matrix
 import swiglpk as glp
 
-from ._base import NetworkFlowProblemBase
+from ._base import (NetworkFlowProblemBase, _changed, _changedBounds,
+	_changedCoeffs, _grow)
 
 class MessageLevel(Enum):
 	OFF = glp.GLP_MSG_OFF  # no output
@@ -61,6 +63,18 @@ SOLUTION_STATUS_TO_STRING = {
 _MAXED_OUT = ("GLP_EOBJ{}L: Dual simplex: The objective function being"
 			  + " maximized reached its {} limit and continues {}")
 
+# Simplex return codes for an unusable starting basis
+_BAD_BASIS_RETURN_CODES = (glp.GLP_EBADB, glp.GLP_ESING, glp.GLP_ECOND)
+
+# Simplex control parameters copied by NetworkFlowGLPK.copy()
+_SMCP_FIELDS = ('msg_lev', 'meth', 'pricing', 'r_test', 'tol_bnd', 'tol_dj',
+	'tol_piv', 'obj_ll', 'obj_ul', 'it_lim', 'tm_lim', 'out_frq', 'out_dly',
+	'presolve')
+
+# Row and column statuses in a basis
+_BASIS_STATUSES = frozenset(
+	(glp.GLP_BS, glp.GLP_NL, glp.GLP_NU, glp.GLP_NF, glp.GLP_NS))
+
 SIMPLEX_RETURN_CODE_TO_STRING = {
 	0: '',  # successfully solved; not necessarily an optimal solution
 	glp.GLP_EBADB:  "GLP_EBADB: Basis is invalid, number of basic variables != number of rows",
@@ -80,34 +94,22 @@ def _toIndexArray(array):
 	"""Convert an array to a GLPK IntArray of indexes: Convert the indexes to
 	int, add 1 to each, and prepend a dummy value.
 	"""
-	# TODO(Jerry): IF this is a performance issue, try caching the array, or
-	# calling glp.as_intArray(list) to quickly convert a list of int (it
-	# prepends 1 uninitialized element but we still need to add 1 to each
-	# element), or making an ndarray(dtype=int32) and using NumPy to add 1 to
-	# each element and then calling glp.intArray_frompointer(ndarray.data).
-	ia = glp.intArray(len(array) + 1)
-	ia[0] = -1
-	for (i, value) in enumerate(array):
-		ia[i + 1] = int(value) + 1
+	# glp.as_intArray() converts a list of int in C, prepending 1
+	# uninitialized element. It mallocs the array without giving SWIG
+	# ownership, so take ownership to free it.
+	ia = glp.as_intArray((np.asarray(array, np.int64) + 1).tolist())
+	ia.thisown = True
 	return ia
 
 def _toDoubleArray(array):
 	"""Convert an array to a GLPK DoubleArray of indexes: Convert the values to
 	double and prepend a dummy value.
 	"""
-	# TODO(Jerry): IF this is a performance issue, try caching the array, or
-	# calling glp.as_doubleArray(list) to quickly convert a list of float (it
-	# prepends 1 uninitialized element), or making an ndarray(dtype=float64)
-	# and then calling glp.doubleArray_frompointer(array.data).
-	#
-	# glp.as_doubleArray() is promising but it'll raise a TypeError if the
-	# argument isn't a list, and it'll return NULL (which comes through as
-	# None?) if any element is not a float. See
+	# glp.as_doubleArray() is like glp.as_intArray() but it'll raise a
+	# TypeError if any element is not a float. See
 	# https://github.com/biosustain/swiglpk/blob/master/swiglpk/glpk.i
-	da = glp.doubleArray(len(array) + 1)
-	da[0] = np.nan
-	for (i, value) in enumerate(array):
-		da[i + 1] = float(value)
+	da = glp.as_doubleArray(np.asarray(array, np.float64).tolist())
+	da.thisown = True
 	return da
 
 
@@ -125,14 +127,21 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 		self._n_eq_constraints = 0
 
 		self._flows = {}
-		self._lb = {}
-		self._ub = {}
-		self._objective = {}
-		self._materialCoeffs = defaultdict(list)
-		self._materialIdxLookup = {}
+		self._flowNames = []
+		# Per-flow bounds and objective coefficients, indexed by flow index
+		self._lb = np.zeros(0)
+		self._ub = np.zeros(0)
+		self._objective = np.zeros(0)
+		self._initMaterialCoeffs()
 
 		self._eqConstBuilt = False
 		self._solved = False
+		self._solveCount = 0
+		# Row and column statuses of the last optimal solution. GLPK keeps
+		# the basis in the problem, so they're read out (see _saveBasis) only
+		# when needed or before the next solve changes it.
+		self._basis = None
+		self._optimalBasisInLp = False
 
 		self.inf = np.inf
 
@@ -238,6 +247,12 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 		"""Set the type and bounds of index-th (j-th) column (structural
 		variable). Use -np.inf or np.inf to specify no lower or upper bound.
 		"""
+		glp.glp_set_col_bnds(
+			self._lp, index, self._col_type(lower, upper), lower, upper)
+
+	def _col_type(self, lower, upper):
+		"""The GLPK type of a column (structural variable) with the given
+		bounds."""
 		if np.isinf(lower) and np.isinf(upper):
 			variable_type = glp.GLP_FR  # free (unbounded) variable
 		elif lower == upper:
@@ -251,55 +266,117 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 		else:
 			variable_type = glp.GLP_UP  # variable with upper bound
 
-		glp.glp_set_col_bnds(self._lp, index, variable_type, lower, upper)
+		return variable_type
+
+	def _set_cols_bounds(self, indexes, lower, upper):
+		"""Set the types and bounds of the columns at an array of (0-based)
+		flow indexes, classifying the variable types with array operations.
+		GLPK has no batch call, so this still calls glp_set_col_bnds per
+		column but does no other per-column Python work.
+		"""
+		lowerInf = np.isinf(lower)
+		upperInf = np.isinf(upper)
+		free = lowerInf & upperInf
+
+		if np.any((lower > upper) & ~free):
+			raise ValueError("The lower bound must be <= upper bound")
+
+		variable_types = np.full(indexes.size, glp.GLP_DB, np.int64)
+		variable_types[~lowerInf & upperInf] = glp.GLP_LO
+		variable_types[lowerInf & ~upperInf] = glp.GLP_UP
+		variable_types[lower == upper] = glp.GLP_FX
+		variable_types[free] = glp.GLP_FR
+
+		lp = self._lp
+		set_col_bnds = glp.glp_set_col_bnds
+		for index, variable_type, lb, ub in izip(
+				(indexes + 1).tolist(),  # GLPK does 1-indexing
+				variable_types.tolist(), lower.tolist(), upper.tolist()):
+			set_col_bnds(lp, index, variable_type, lb, ub)
 
 	def _getVar(self, flow):
 		if flow in self._flows:
 			idx = self._flows[flow]
 		else:
-			self._add_cols(1)
-			idx = len(self._flows)
-			self._lb[flow] = self._lowerBoundDefault
-			self._ub[flow] = self._upperBoundDefault
-			self._set_col_bounds(
-				1 + idx,			# GLPK does 1-indexing
-				self._lb[flow],
-				self._ub[flow],
-				)
-
-			self._flows[flow] = idx
+			idx = self._addFlows([flow])[0]
 
 		return idx
 
+	def _addFlows(self, flows):
+		"""Add columns for new flows with the default bounds, returning their
+		indexes."""
+		start = len(self._flows)
+		end = start + len(flows)
+
+		self._add_cols(len(flows))
+		self._lb = _grow(self._lb, end)
+		self._ub = _grow(self._ub, end)
+		self._objective = _grow(self._objective, end)
+		self._lb[start:end] = self._lowerBoundDefault
+		self._ub[start:end] = self._upperBoundDefault
+		self._objective[start:end] = 0
+
+		# The columns all get the same bounds, so skip _set_cols_bounds()'s
+		# array work, which dominates adding a single flow
+		lower = self._lowerBoundDefault
+		upper = self._upperBoundDefault
+		variable_type = self._col_type(lower, upper)
+		lp = self._lp
+		set_col_bnds = glp.glp_set_col_bnds
+		for index in xrange(start + 1, end + 1):  # GLPK does 1-indexing
+			set_col_bnds(lp, index, variable_type, lower, upper)
+
+		self._flows.update(izip(flows, xrange(start, end)))
+		self._flowNames.extend(flows)
+
+		return np.arange(start, end)
+
 
 	def setFlowMaterialCoeff(self, flow, material, coefficient):
 		if self._eqConstBuilt:
-			if material not in self._materialIdxLookup:
-				raise Exception("Invalid material")
-			if flow not in self._flows:
-				raise Exception("Invalid flow")
-			materialIdx = self._materialIdxLookup[material]
-			flowIdx = self._flows[flow]
-			coeffs, flowIdxs = zip(*self._materialCoeffs[material])
-			coeffs = list(coeffs)
-			flowLoc = flowIdxs.index(flowIdx)
-			coeffs[flowLoc] = coefficient
-			self._materialCoeffs[material] = zip(coeffs, flowIdxs)
-
-			rowIdx = int(materialIdx + 1)
-			length = len(flowIdxs)
-			if length != len(coeffs):
-				raise ValueError("Array sizes must match")
-
-			colIdxs = _toIndexArray(flowIdxs)
-			data = _toDoubleArray(coeffs)
-			glp.glp_set_mat_row(self._lp, rowIdx, length, colIdxs, data)
+			materialIdx, position = self._materialCoeffPosition(flow, material)
+			if not _changed(np.array(coefficient, np.float64),
+					self._A.data[position], self.change_tolerance):
+				return
+			self._A.data[position] = coefficient
+			self._setMatRow(materialIdx)
 		else:
 			idx = self._getVar(flow)
-			self._materialCoeffs[material].append((coefficient, idx))
+			self._addMaterialCoeff(idx, material, coefficient)
 
 		self._solved = False
 
+	def setMaterialCoeffsArray(self, positions, coefficients):
+		materialIdxs, _, _ = self._changedMaterialCoeffs(
+			positions, coefficients)
+		if not materialIdxs.size:
+			return
+
+		# GLPK replaces whole rows, so set each changed row once
+		for materialIdx in np.unique(materialIdxs).tolist():
+			self._setMatRow(materialIdx)
+
+		self._solved = False
+
+	def _setMatRow(self, materialIdx):
+		"""Load a material's row of coefficients from self._A into GLPK."""
+		start = self._A.indptr[materialIdx]
+		end = self._A.indptr[materialIdx + 1]
+		glp.glp_set_mat_row(
+			self._lp,
+			materialIdx + 1,  # GLPK does 1-indexing
+			int(end - start),
+			_toIndexArray(self._A.indices[start:end]),
+			_toDoubleArray(self._A.data[start:end]),
+			)
+
+	def setMaterialCoeffsMatrix(self, flows, materials, coefficients):
+		if self._eqConstBuilt:
+			raise Exception("Equality constraints already built.")
+
+		self._addMaterialCoeffsMatrix(
+			self.getFlowIndexes(flows), materials, coefficients)
+
 	def setFlowBounds(self, flow, lowerBound=None, upperBound=None):
 		"""
 		Set the lower and upper bounds for a given flow
@@ -309,33 +386,54 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 			upperBound (float) - upper bound for flow (None if unchanged)
 		"""
 
-		idx = self._getVar(flow)
-		if lowerBound is not None:
-			self._lb[flow] = lowerBound
-		if upperBound is not None:
-			self._ub[flow] = upperBound
+		self.setFlowBoundsArray([self._getVar(flow)], lowerBound, upperBound)
 
-		self._set_col_bounds(
-			1 + idx,				# GLPK does 1 indexing
-			self._lb[flow],
-			self._ub[flow],
-			)
+	def setFlowObjectiveCoeff(self, flow, coefficient):
+		self.setFlowObjectiveCoeffsArray([self._getVar(flow)], coefficient)
+
+	def getFlowIndexes(self, flows):
+		newFlows = []
+		seen = set()
+		for flow in flows:
+			if flow not in self._flows and flow not in seen:
+				newFlows.append(flow)
+				seen.add(flow)
+		if newFlows:
+			self._addFlows(newFlows)
+
+		return np.array([self._flows[flow] for flow in flows], np.int64)
+
+	def setFlowBoundsArray(self, indexes, lowerBounds=None, upperBounds=None):
+		indexes, lower, upper = _changedBounds(
+			indexes, self._lb, self._ub, lowerBounds, upperBounds,
+			self.change_tolerance)
+		if not indexes.size:
+			return
+
+		self._set_cols_bounds(indexes, lower, upper)
+		self._lb[indexes] = lower
+		self._ub[indexes] = upper
 
 		self._solved = False
 
-	def setFlowObjectiveCoeff(self, flow, coefficient):
-		idx = self._getVar(flow)
-		self._objective[flow] = coefficient
-		glp.glp_set_obj_coef(
-			self._lp,
-			1 + idx,				# GLPK does 1 indexing
-			coefficient
-			)
+	def setFlowObjectiveCoeffsArray(self, indexes, coefficients):
+		indexes, coefficients = _changedCoeffs(
+			indexes, self._objective, coefficients, self.change_tolerance)
+		if not indexes.size:
+			return
+
+		lp = self._lp
+		set_obj_coef = glp.glp_set_obj_coef
+		for index, coefficient in izip(
+				(indexes + 1).tolist(),  # GLPK does 1 indexing
+				coefficients.tolist()):
+			set_obj_coef(lp, index, coefficient)
+		self._objective[indexes] = coefficients
 
 		self._solved = False
 
 	def getFlowObjectiveCoeff(self, flow):
-		return self._objective[flow]
+		return self._objective[self._flows[flow]]
 
 	def getFlowRates(self, flows):
 		if isinstance(flows, basestring):
@@ -380,13 +478,7 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 	def getSMatrix(self):
 		if not self._eqConstBuilt:
 			raise Exception("Equality constraints not yet built. Finish construction of the problem before accessing S matrix.")
-		A = np.zeros((len(self._materialCoeffs), len(self._flows)))
-		self._materialIdxLookup = {}
-		for materialIdx, (material, pairs) in enumerate(sorted(self._materialCoeffs.viewitems())):
-			self._materialIdxLookup[material] = materialIdx
-			for pair in pairs:
-				A[materialIdx, pair[1]] = pair[0]
-		return A
+		return self._A.toarray()
 
 	def getFlowNames(self):
 		if not self._eqConstBuilt:
@@ -396,56 +488,192 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 	def getMaterialNames(self):
 		if not self._eqConstBuilt:
 			raise Exception("Equality constraints not yet built. Finish construction of the problem before accessing material names.")
-		return sorted(self._materialIdxLookup, key=self._materialIdxLookup.__getitem__)
+		return list(self._materialNames)
 
 	def getUpperBounds(self):
-		return self._ub.copy()
+		return dict(izip(self._flowNames, self._ub.tolist()))
 
 	def getLowerBounds(self):
-		return self._lb.copy()
+		return dict(izip(self._flowNames, self._lb.tolist()))
 
 	def getObjective(self):
-		return self._objective.copy()
+		return dict(izip(self._flowNames, self._objective.tolist()))
 
 	def buildEqConst(self):
 		if self._eqConstBuilt:
 			raise Exception("Equality constraints already built.")
-		n_coeffs = len(self._materialCoeffs)
-		n_flows = len(self._flows)
-
-		self._add_rows(n_coeffs)
-		A = np.zeros((n_coeffs, n_flows))
-		# avoid creating duplicate constraints
-		self._materialIdxLookup = {}
-		for materialIdx, (material, pairs) in enumerate(sorted(self._materialCoeffs.viewitems())):
-			self._materialIdxLookup[material] = materialIdx
-			for pair in pairs:
-				A[materialIdx, pair[1]] = pair[0]
-
-		A_coo = coo_matrix(A)
-		rowIdxs = _toIndexArray(A_coo.row)
-		colIdxs = _toIndexArray(A_coo.col)
-		data = _toDoubleArray(A_coo.data)
-		n_elems = len(A_coo.row)
 
+		self._buildMaterialCoeffs(len(self._flows))
+		self._loadEqConst()
+
+		self._eqConstBuilt = True
+
+	def _loadEqConst(self):
+		"""Add a row per material to the problem, constrained to 0, with its
+		coefficients from self._A."""
+		A_coo = self._A.tocoo()
+		nonzero = A_coo.data != 0
+		rowIdxs = _toIndexArray(A_coo.row[nonzero])
+		colIdxs = _toIndexArray(A_coo.col[nonzero])
+		data = _toDoubleArray(A_coo.data[nonzero])
+		n_elems = np.count_nonzero(nonzero)
+
+		self._add_rows(A_coo.shape[0])
 		for row in xrange(1, self._n_eq_constraints + 1):
 			glp.glp_set_row_bnds(self._lp, row, glp.GLP_FX, 0.0, 0.0)
 		glp.glp_load_matrix(self._lp, n_elems, rowIdxs, colIdxs, data)
 
-		self._eqConstBuilt = True
 
+	def copy(self):
+		other = copy.copy(self)
+
+		other._lp = glp.glp_create_prob()
+		glp.glp_copy_prob(other._lp, self._lp, glp.GLP_OFF)
+		other._smcp = glp.glp_smcp()
+		glp.glp_init_smcp(other._smcp)
+		for field in _SMCP_FIELDS:
+			setattr(other._smcp, field, getattr(self._smcp, field))
+
+		other._flows = dict(self._flows)
+		other._flowNames = list(self._flowNames)
+		other._lb = self._lb.copy()
+		other._ub = self._ub.copy()
+		other._objective = self._objective.copy()
+		self._copyMaterialCoeffs(other)
+		other._solveCount = 0
+
+		return other
+
+	def __getstate__(self):
+		"""Pickle the problem without GLPK's objects, e.g. to solve it in
+		another process. Unpickling rebuilds them with the same bounds,
+		objective, coefficients, settings and the last optimal basis."""
+		if not self._eqConstBuilt:
+			raise Exception("Equality constraints not yet built. Finish construction of the problem before pickling it.")
+
+		self._saveBasis()
+		state = dict(self.__dict__)
+		del state['_lp']
+		state['_smcp'] = {
+			field: getattr(self._smcp, field) for field in _SMCP_FIELDS}
+		return state
+
+	def __setstate__(self, state):
+		smcp = state.pop('_smcp')
+		n_vars = state.pop('_n_vars')
+		self.__dict__.update(state)
+
+		self._lp = glp.glp_create_prob()
+		self._smcp = glp.glp_smcp()
+		glp.glp_init_smcp(self._smcp)
+		for field, value in smcp.iteritems():
+			setattr(self._smcp, field, value)
+
+		self._n_vars = 0
+		self._n_eq_constraints = 0
+		self._add_cols(n_vars)
+		indexes = np.arange(n_vars)
+		self._set_cols_bounds(
+			indexes, self._lb[:n_vars], self._ub[:n_vars])
+		for index, coefficient in izip(
+				(indexes + 1).tolist(),  # GLPK does 1 indexing
+				self._objective[:n_vars].tolist()):
+			glp.glp_set_obj_coef(self._lp, index, coefficient)
+		self._loadEqConst()
+
+		if self._basis is not None:
+			self._setStats(*self._basis)
+		self._solved = False
+		self._solveCount = 0
+
+	def getBasis(self):
+		self._saveBasis()
+
+		if self._basis is None:
+			return None
+
+		rowStats, colStats = self._basis
+		return {
+			'flows': dict(izip(self._flowNames, colStats.tolist())),
+			'materials': dict(izip(self._materialNames, rowStats.tolist())),
+			}
+
+	def setBasis(self, basis):
+		if not self._eqConstBuilt:
+			raise Exception("Equality constraints not yet built. Finish construction of the problem before setting a basis.")
+
+		self._saveBasis()
+		rowStats, colStats = self._getStats()
+
+		for flow, stat in basis['flows'].iteritems():
+			if flow in self._flows and stat in _BASIS_STATUSES:
+				colStats[self._flows[flow]] = stat
+		for material, stat in basis['materials'].iteritems():
+			if material in self._materialIdxLookup and stat in _BASIS_STATUSES:
+				rowStats[self._materialIdxLookup[material]] = stat
+
+		self._setStats(rowStats, colStats)
+		self._solved = False
+
+	@property
+	def iteration_count(self):
+		return glp.glp_get_it_cnt(self._lp)
+
+	@property
+	def solve_count(self):
+		return self._solveCount
+
+	def _saveBasis(self):
+		"""Read out the basis in the problem if it's that of the last optimal
+		solution and hasn't been read since."""
+		if self._optimalBasisInLp:
+			self._basis = self._getStats()
+			self._optimalBasisInLp = False
+
+	def _getStats(self):
+		"""Return arrays of the current row and column statuses."""
+		lp = self._lp
+		get_row_stat = glp.glp_get_row_stat
+		get_col_stat = glp.glp_get_col_stat
+		rowStats = np.array([get_row_stat(lp, i)
+			for i in xrange(1, self._n_eq_constraints + 1)], np.int8)
+		colStats = np.array([get_col_stat(lp, j)
+			for j in xrange(1, self._n_vars + 1)], np.int8)
+		return rowStats, colStats
+
+	def _setStats(self, rowStats, colStats):
+		"""Set the row and column statuses. GLPK replaces non-basic statuses
+		that don't fit a variable's bounds type with ones that do."""
+		lp = self._lp
+		set_row_stat = glp.glp_set_row_stat
+		set_col_stat = glp.glp_set_col_stat
+		for i, stat in enumerate(rowStats.tolist(), 1):
+			set_row_stat(lp, i, stat)
+		for j, stat in enumerate(colStats.tolist(), 1):
+			set_col_stat(lp, j, stat)
 
 	def _solve(self):
 		if self._solved:
 			return
 
+		self._solveCount += 1
+
 		if self._maximize:
 			glp.glp_set_obj_dir(self._lp, glp.GLP_MAX)
 		else:
 			glp.glp_set_obj_dir(self._lp, glp.GLP_MIN)
 
+		## Keep the last optimal basis to go back to if this solve fails
+		self._saveBasis()
+
 		result = glp.glp_simplex(self._lp, self._smcp)
 
+		## If the starting basis is unusable (e.g. set from another problem),
+		## start over from an advanced initial basis
+		if result in _BAD_BASIS_RETURN_CODES:
+			glp.glp_adv_basis(self._lp, 0)
+			result = glp.glp_simplex(self._lp, self._smcp)
+
 		# Adjust solver options for robustness
 		## If no solution within iteration limit, switch to dual method to find solution
 		if result == glp.GLP_EITLIM:
@@ -463,9 +691,19 @@ class NetworkFlowGLPK(NetworkFlowProblemBase):
 				self._smcp.presolve = glp.GLP_OFF
 
 		if result != 0:
-			raise RuntimeError(SIMPLEX_RETURN_CODE_TO_STRING.get(
-				result, "GLP_?: UNKNOWN SOLVER RETURN VALUE"))
-		if self.status_code != glp.GLP_OPT:
-			raise RuntimeError(self.status_string)
+			error = SIMPLEX_RETURN_CODE_TO_STRING.get(
+				result, "GLP_?: UNKNOWN SOLVER RETURN VALUE")
+		elif self.status_code != glp.GLP_OPT:
+			error = self.status_string
+		else:
+			error = None
+
+		if error is not None:
+			## Go back to the last optimal basis (the fallbacks above leave a
+			## useless one) so the next solve warm starts from it
+			if self._basis is not None:
+				self._setStats(*self._basis)
+			raise RuntimeError(error)
 
+		self._optimalBasisInLp = True
 		self._solved = True
@@ -0,0 +1,296 @@
+"""
+_polymerize.pyx
+
+Compiled implementation of the polymerize algorithm. It follows
+polymerize_reference_implementation in polymerize.py step for step,
+including its random draws, but runs without the GIL except to draw random
+numbers.
+
+@organization: Covert Lab, Department of Bioengineering, Stanford University
+"""
+
+from __future__ import division
+
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport floor
+
+np.import_array()
+
+ctypedef Py_ssize_t Index # array index type
+ctypedef np.int64_t Int64
+
+cdef np.int8_t PAD_VALUE = -1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def polymerize_kernel(
+		np.int8_t[:, ::1] sequences not None,
+		Int64[::1] monomerLimits not None,
+		Int64 reactionLimit,
+		randomState,
+		np.float64_t[::1] elongationRates not None,
+		bint variableElongation):
+	"""
+	Polymerize the sequences as far as possible within the limits. See
+	polymerize() for the arguments; elongationRates must already be
+	normalized to a maximum of 1. monomerLimits is used up in place.
+
+	Returns:
+		sequenceElongation: ndarray of int64, shape (num_sequences,)
+		monomerUsages: ndarray of int64, shape (num_monomers,)
+		nReactions: the total number of reactions
+	"""
+
+	cdef Index nSequences = sequences.shape[0]
+	cdef Index sequenceLength = sequences.shape[1]
+	cdef Index nMonomers = monomerLimits.shape[0]
+
+	sequenceElongationArray = np.zeros(nSequences, np.int64)
+	monomerUsagesArray = np.zeros(nMonomers, np.int64)
+
+	cdef Int64[::1] sequenceElongation = sequenceElongationArray
+	cdef Int64[::1] monomerUsages = monomerUsagesArray
+	cdef Int64 nReactions = 0
+
+	if nSequences == 0 or sequenceLength == 0:
+		return sequenceElongationArray, monomerUsagesArray, nReactions
+
+	# Running values
+	cdef Int64[::1] active = np.empty(nSequences, np.int64)
+	cdef Int64[::1] stepActive = np.empty(nSequences, np.int64)
+	cdef Int64[::1] candidates = np.empty(nSequences, np.int64)
+	cdef Int64[::1] progress = np.zeros(nSequences, np.int64)
+	cdef Int64[::1] advancement = np.zeros(nSequences, np.int64)
+	cdef Int64[::1] projection = np.zeros(nMonomers, np.int64)
+	cdef Int64[::1] monomerStep = np.zeros(nMonomers, np.int64)
+	cdef np.uint8_t[::1] monomerIsLimiting = np.zeros(nMonomers, np.uint8)
+	cdef np.uint8_t[::1] toCull = np.zeros(nSequences, np.uint8)
+	cdef Int64[::1] drawn
+
+	cdef Index nActive = 0, nStepActive, nCandidates, nKept
+	cdef Index currentStep = 0, maxElongation, projectionIndex
+	cdef Index i, j, seq, position
+	cdef Int64 total, excess, nToCull, monomer
+	cdef double level
+	cdef bint notLimited, anyLimiting, reactionIsLimiting = False
+	cdef bint fullyElongated, resourcesRemain
+
+	with nogil:
+		for seq in range(nSequences):
+			if sequences[seq, 0] != PAD_VALUE:
+				active[nActive] = seq
+				nActive += 1
+
+		maxElongation = sequenceLength
+
+		while True:
+			# Elongate as far as possible without hitting any resource
+			# limitations
+			projectionIndex = 0
+			notLimited = True
+			advancement[:] = 0
+			projection[:] = 0
+
+			while notLimited and projectionIndex < maxElongation:
+				nStepActive = 0
+				for i in range(nActive):
+					seq = active[i]
+					if variableElongation:
+						level = elongationRates[seq] * (
+							currentStep + projectionIndex + 1)
+						if not elongationRates[seq] > level - floor(level):
+							continue
+					stepActive[nStepActive] = seq
+					nStepActive += 1
+
+				_sum_step(sequences, progress, advancement, stepActive,
+					nStepActive, monomerStep)
+				total = _project(projection, monomerStep, monomerLimits,
+					monomerIsLimiting, &anyLimiting)
+
+				if anyLimiting:
+					notLimited = False
+				else:
+					if total > reactionLimit:
+						reactionIsLimiting = True
+						notLimited = False
+						excess = total - reactionLimit
+
+						# Keep a random subset as polymerize.choices() does.
+						# Like choices(), this picks positions in the list of
+						# active sequences.
+						with gil:
+							drawn = np.arange(nStepActive, dtype=np.int64)
+							np.random.shuffle(drawn)
+						nStepActive = nStepActive - excess
+						for i in range(nStepActive):
+							stepActive[i] = drawn[i]
+
+						_sum_step(sequences, progress, advancement, stepActive,
+							nStepActive, monomerStep)
+						_project(projection, monomerStep, monomerLimits,
+							monomerIsLimiting, &anyLimiting)
+
+					for j in range(nMonomers):
+						projection[j] += monomerStep[j]
+					projectionIndex += 1
+					for i in range(nStepActive):
+						advancement[stepActive[i]] += 1
+
+			currentStep += projectionIndex
+
+			# Use resources
+			if projectionIndex > 0:
+				for j in range(nMonomers):
+					monomerLimits[j] -= projection[j]
+					reactionLimit -= projection[j]
+					monomerUsages[j] += projection[j]
+					nReactions += projection[j]
+
+				for i in range(nActive):
+					progress[active[i]] += advancement[active[i]]
+
+			for i in range(nActive):
+				sequenceElongation[active[i]] += advancement[active[i]]
+
+			fullyElongated = projectionIndex == maxElongation
+
+			# Quit if finished or out of resources
+			resourcesRemain = False
+			for j in range(nMonomers):
+				if monomerLimits[j] != 0:
+					resourcesRemain = True
+			if fullyElongated or not resourcesRemain or reactionLimit == 0:
+				break
+
+			# Cull sequences that finished or, at random, that can't get the
+			# limiting resources for the next step
+			for i in range(nActive):
+				toCull[i] = sequences[active[i], _position(
+					sequenceElongation, active[i], currentStep,
+					variableElongation)] == PAD_VALUE
+
+			for monomer in range(nMonomers):
+				if not monomerIsLimiting[monomer]:
+					continue
+
+				nCandidates = 0
+				for i in range(nActive):
+					if sequences[active[i], _position(
+							sequenceElongation, active[i], currentStep,
+							variableElongation)] == monomer:
+						candidates[nCandidates] = i
+						nCandidates += 1
+
+				nToCull = nCandidates - monomerLimits[monomer]
+				if nToCull > 0:
+					with gil:
+						drawn = randomState.choice(
+							np.asarray(candidates[:nCandidates]), nToCull,
+							replace=False).astype(np.int64)
+					for i in range(nToCull):
+						toCull[drawn[i]] = True
+
+			if reactionIsLimiting:
+				nCandidates = 0
+				for i in range(nActive):
+					if not toCull[i]:
+						candidates[nCandidates] = i
+						nCandidates += 1
+
+				nToCull = nCandidates - reactionLimit
+				if nToCull > 0:
+					with gil:
+						drawn = randomState.choice(
+							np.asarray(candidates[:nCandidates]), nToCull,
+							replace=False).astype(np.int64)
+					for i in range(nToCull):
+						toCull[drawn[i]] = True
+
+			nKept = 0
+			for i in range(nActive):
+				if not toCull[i]:
+					active[nKept] = active[i]
+					nKept += 1
+			nActive = nKept
+
+			# Quit if there are no more sequences
+			if nActive == 0:
+				break
+
+			maxElongation = sequenceLength - currentStep
+
+		# Restrict each elongation to the sequence's (unpadded) length
+		for seq in range(nSequences):
+			position = 0
+			for j in range(sequenceLength):
+				if sequences[seq, j] != PAD_VALUE:
+					position += 1
+			if sequenceElongation[seq] > position:
+				sequenceElongation[seq] = position
+
+	return sequenceElongationArray, monomerUsagesArray, nReactions
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _sum_step(
+		np.int8_t[:, ::1] sequences,
+		Int64[::1] progress,
+		Int64[::1] advancement,
+		Int64[::1] stepActive,
+		Index nStepActive,
+		Int64[::1] monomerStep) nogil:
+	"""Count the monomers the sequences in stepActive use in their next
+	step."""
+	cdef Index i, seq
+	cdef np.int8_t monomer
+	cdef Index nMonomers = monomerStep.shape[0]
+
+	monomerStep[:] = 0
+	for i in range(nStepActive):
+		seq = stepActive[i]
+		monomer = sequences[seq, progress[seq] + advancement[seq]]
+		if 0 <= monomer < nMonomers:
+			monomerStep[monomer] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline Int64 _project(
+		Int64[::1] projection,
+		Int64[::1] monomerStep,
+		Int64[::1] monomerLimits,
+		np.uint8_t[::1] monomerIsLimiting,
+		bint *anyLimiting) nogil:
+	"""Flag the monomers whose projected use exceeds their limits, returning
+	the total projected use."""
+	cdef Index j
+	cdef Int64 projected, total = 0
+
+	anyLimiting[0] = False
+	for j in range(projection.shape[0]):
+		projected = projection[j] + monomerStep[j]
+		monomerIsLimiting[j] = projected > monomerLimits[j]
+		if monomerIsLimiting[j]:
+			anyLimiting[0] = True
+		total += projected
+
+	return total
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline Index _position(
+		Int64[::1] sequenceElongation,
+		Index seq,
+		Index currentStep,
+		bint variableElongation) nogil:
+	"""The step of a sequence that the culling considers."""
+	if variableElongation:
+		return sequenceElongation[seq]
+	return currentStep
@@ -0,0 +1,104 @@
+"""
+code_cache.py
+
+A cache of generated Python modules (e.g. the ODEs written by write_ode_file),
+keyed by a hash of their source code and kept outside the source tree, so
+concurrent parca runs sharing a checkout each load the one copy of a module
+and never write into the package.
+
+Each module is written once, under a file lock, to a temporary file that is
+then renamed into place, so readers never see a partial file.
+
+Environment variables:
+	WC_CODE_CACHE_DIR: the cache directory (default:
+		$XDG_CACHE_HOME/wcEcoli/code, with XDG_CACHE_HOME defaulting to
+		~/.cache)
+
+Example:
+	derivatives = CachedFunction(source, "derivatives")
+	dy = derivatives(y, t)
+
+@organization: Covert Lab, Department of Bioengineering, Stanford University
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import fcntl
+import hashlib
+import imp
+import os
+import sys
+import tempfile
+
+from wholecell.utils import filepath
+
+MODULE_PREFIX = "wc_cached_"
+
+
+def cacheDir():
+	"""The directory of the code cache, created if needed."""
+	directory = os.environ.get("WC_CODE_CACHE_DIR")
+	if not directory:
+		directory = os.path.join(
+			os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache"),
+			"wcEcoli", "code")
+
+	return filepath.makedirs(os.path.expanduser(directory))
+
+
+def loadSource(source, directory = None):
+	"""
+	Returns the module with the given source code, writing it to the cache
+	(by default cacheDir()) if needed.
+	"""
+	if directory is None:
+		directory = cacheDir()
+
+	name = MODULE_PREFIX + hashlib.sha1(source).hexdigest()
+	path = os.path.join(directory, name + ".py")
+
+	module = sys.modules.get(name)
+	if module is not None and os.path.dirname(module.__file__) == directory:
+		return module
+
+	if not os.path.exists(path):
+		with open(os.path.join(directory, name + ".lock"), "w") as lock:
+			fcntl.flock(lock, fcntl.LOCK_EX)
+
+			try:
+				# Written while waiting for the lock?
+				if not os.path.exists(path):
+					with tempfile.NamedTemporaryFile(
+							dir = directory, suffix = ".partial", delete = False) as f:
+						f.write(source)
+					os.rename(f.name, path)
+
+			finally:
+				fcntl.flock(lock, fcntl.LOCK_UN)
+
+	return imp.load_source(name, path)
+
+
+class CachedFunction(object):
+	"""
+	A function of a module in the code cache.
+
+	Unlike a function of a module loaded from the cache, it pickles (e.g.
+	within sim_data) as the module's source code and the function's name,
+	and reloads the module from the cache when unpickled.
+	"""
+
+	def __init__(self, source, name):
+		self._source = source
+		self._name = name
+		self._function = getattr(loadSource(source), name)
+
+	def __call__(self, *args):
+		return self._function(*args)
+
+	def __getstate__(self):
+		return {"source": self._source, "name": self._name}
+
+	def __setstate__(self, state):
+		self.__init__(state["source"], state["name"])
@@ -0,0 +1,109 @@
+"""
+mass_action.py
+
+Vectorized derivatives and Jacobians of mass-action reaction networks, the
+ODEs of the equilibrium and two-component system processes.
+
+Each reaction runs forward at kf * prod(reactants ** orders) and in reverse
+at kr * prod(products ** orders), the orders being the magnitudes of the
+stoichiometric coefficients. Like the sympy expressions these replace, the
+net flux of a reaction changes each of its molecules by +/-1 times the flux,
+whatever the molecule's coefficient.
+
+@organization: Covert Lab, Department of Bioengineering, Stanford University
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import numpy as np
+
+
+class MassActionOdes(object):
+	"""
+	The ODEs of a mass-action reaction network.
+
+	Args:
+		stoichMatrix: 2D array, (molecule)x(reaction)
+		constantIdxs: indexes of molecules held constant (their derivatives
+			are zero)
+	"""
+
+	def __init__(self, stoichMatrix, constantIdxs = ()):
+		stoichMatrix = np.asarray(stoichMatrix, np.float64)
+		self.nMolecules, self.nReactions = stoichMatrix.shape
+
+		self._reactants, self._reactantOrders = self._padded(-stoichMatrix)
+		self._products, self._productOrders = self._padded(stoichMatrix)
+
+		self._directions = np.sign(stoichMatrix)
+		self._directions[list(constantIdxs), :] = 0
+
+
+	def _padded(self, stoichMatrix):
+		# Molecule indexes and orders of each reaction's positive entries,
+		# padded with index nMolecules (which holds 1) and order 0
+		counts = (stoichMatrix > 0).sum(axis = 0)
+		width = max(counts.max() if counts.size else 0, 1)
+
+		molecules = np.full((self.nReactions, width), self.nMolecules, np.int64)
+		orders = np.zeros((self.nReactions, width), np.float64)
+
+		for reaction in xrange(self.nReactions):
+			idxs = np.where(stoichMatrix[:, reaction] > 0)[0]
+			molecules[reaction, :idxs.size] = idxs
+			orders[reaction, :idxs.size] = stoichMatrix[idxs, reaction]
+
+		return molecules, orders
+
+
+	def _powers(self, y):
+		yPadded = np.append(y, 1.)
+		return (
+			yPadded,
+			yPadded[self._reactants] ** self._reactantOrders,
+			yPadded[self._products] ** self._productOrders,
+			)
+
+
+	def derivatives(self, y, kf, kr):
+		"""
+		Returns dy/dt at concentrations y, given the forward and reverse rate
+		constants of the reactions.
+		"""
+		_, reactantPowers, productPowers = self._powers(y)
+
+		fluxes = (
+			kf * reactantPowers.prod(axis = 1)
+			- kr * productPowers.prod(axis = 1)
+			)
+
+		return np.dot(self._directions, fluxes)
+
+
+	def jacobian(self, y, kf, kr):
+		"""
+		Returns the Jacobian of dy/dt, (molecule)x(molecule), at
+		concentrations y.
+		"""
+		yPadded, reactantPowers, productPowers = self._powers(y)
+
+		# Derivatives of the net fluxes by molecule, (reaction)x(molecule);
+		# the padding column collects the zero derivatives of padded entries
+		fluxJacobian = np.zeros((self.nReactions, self.nMolecules + 1))
+		reactions = np.arange(self.nReactions)
+
+		for molecules, orders, powers, rates in (
+				(self._reactants, self._reactantOrders, reactantPowers, kf),
+				(self._products, self._productOrders, productPowers, -kr)):
+			for slot in xrange(molecules.shape[1]):
+				others = np.delete(powers, slot, axis = 1).prod(axis = 1)
+				order = orders[:, slot]
+				with np.errstate(divide = "ignore"):
+					slope = np.where(
+						order > 0,
+						order * yPadded[molecules[:, slot]] ** (order - 1),
+						0)
+				fluxJacobian[reactions, molecules[:, slot]] += rates * slope * others
+
+		return np.dot(self._directions, fluxJacobian[:, :-1])
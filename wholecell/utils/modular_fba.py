@@ -7,10 +7,13 @@
 from __future__ import absolute_import
 from __future__ import division
 
+import copy
 from itertools import izip
+import multiprocessing
 import warnings
 
 import numpy as np
+from scipy.sparse import coo_matrix
 
 NUMERICAL_ZERO = 1e-20
 
@@ -110,6 +113,10 @@ class FluxBalanceAnalysis(object):
 	- moleculeMasses, a dict of floats (moleculeID:mass)
 		Used in computing the net mass into the system.  Only needed and used
 		for moleculeIDs in externalExchangedMolecules.
+	- changeTolerance, a float (default 0)
+		Relative changes to bounds, objective weights and kinetic targets
+		within this tolerance are ignored, so that the problem is not re-solved
+		(the last solution is reused) if nothing changed beyond it.
 	Caveats:
 	There is no strict type checking, despite what the above may imply.
 	During initialization, an exception will be raised if a reference is made
@@ -182,7 +189,7 @@ class FluxBalanceAnalysis(object):
 			secretionPenaltyCoeff = None,
 			moleculeMasses = None, maintenanceCostGAM = None,
 			maintenanceReaction = None,
-			solver = DEFAULT_SOLVER):
+			solver = DEFAULT_SOLVER, changeTolerance = 0.0):
 
 		if solver not in SOLVERS:
 			raise SolverUnavailableError(
@@ -211,6 +218,7 @@ class FluxBalanceAnalysis(object):
 
 		# Set solver
 		self._solver = SOLVERS[solver](QUADRATIC[solver])
+		self._solver.change_tolerance = changeTolerance
 
 		self._forceInternalExchange = False
 
@@ -224,6 +232,7 @@ class FluxBalanceAnalysis(object):
 		self._specialFluxIDsSet = set()
 		self._kineticTargetFluxes = set()
 		self._oneSidedReactions = set()
+		self._currentKineticTargets = {}
 
 		# Keep track of homeostatic targets, empty if not used
 		self._homeostaticTargetMolecules = set()
@@ -297,6 +306,15 @@ class FluxBalanceAnalysis(object):
 
 		self._initMaintenance(maintenanceCostGAM, maintenanceReaction)
 
+		# Flow indexes of the bounds that change between runs
+		self._externalExchangeIndexes = self._solver.getFlowIndexes(
+			self._externalExchangeIDs)
+		self._internalExchangeIndexes = self._solver.getFlowIndexes([
+			self._generatedID_internalExchange.format(moleculeID)
+			for moleculeID in self._internalMoleculeIDs
+			])
+		self._kineticObjectiveIndexes = {}
+
 		# Set up values that will change between runs
 
 		self.setExternalMoleculeLevels(0)
@@ -304,25 +322,57 @@ class FluxBalanceAnalysis(object):
 
 		self._buildEqConst()
 
+		# Positions of the kinetic target coefficients, which change between
+		# runs
+		kineticTargets = sorted(self._kineticTargetFluxes)
+		self._kineticTargetCoeffPositions = dict(izip(
+			kineticTargets,
+			self._solver.getMaterialCoeffPositions(
+				[self._generatedID_conversionFlux.format(reactionID)
+					for reactionID in kineticTargets],
+				[self._generatedID_reactionFluxEquivalents.format(reactionID)
+					for reactionID in kineticTargets],
+				).tolist()))
+
 	def _initReactionNetwork(self, reactionStoich):
 		""" Create the reaction network, initializing molecules and biochemical
 		reactions. """
 
-		reactionIDs = []
-
-		for reactionID in sorted(reactionStoich):
-			stoichiometry = reactionStoich[reactionID]
-			for moleculeID, stoichCoeff in stoichiometry.viewitems():
-				self._solver.setFlowMaterialCoeff(
-					reactionID,
-					moleculeID,
-					stoichCoeff
-					)
-
-			reactionIDs.append(reactionID)
+		reactionIDs = sorted(reactionStoich)
+
+		# Load the stoichiometry as one sparse matrix rather than one
+		# coefficient at a time
+		moleculeIDs = sorted({
+			moleculeID
+			for stoichiometry in reactionStoich.viewvalues()
+			for moleculeID in stoichiometry
+			})
+		moleculeIndexes = {
+			moleculeID: i for i, moleculeID in enumerate(moleculeIDs)
+			}
+
+		rows = []
+		cols = []
+		coeffs = []
+		for reactionIndex, reactionID in enumerate(reactionIDs):
+			for moleculeID, stoichCoeff in reactionStoich[reactionID].viewitems():
+				rows.append(moleculeIndexes[moleculeID])
+				cols.append(reactionIndex)
+				coeffs.append(stoichCoeff)
+
+		stoichMatrix = coo_matrix(
+			(np.array(coeffs, np.float64), (rows, cols)),
+			shape=(len(moleculeIDs), len(reactionIDs))
+			)
+		self._solver.setMaterialCoeffsMatrix(
+			reactionIDs, moleculeIDs, stoichMatrix)
 
 		self._reactionIDs = tuple(reactionIDs)
 		self._reactionIDsSet = set(reactionIDs)
+		self._reversibleReactionIDs = {
+			reactionID for reactionID in reactionIDs
+			if self._generatedID_reverseReaction.format(reactionID) in self._reactionIDsSet
+			}
 
 
 	def _initExternalExchange(self, externalExchangedMolecules):
@@ -952,21 +1002,20 @@ class FluxBalanceAnalysis(object):
 		levels_array = np.empty(len(self._externalMoleculeIDs))
 		levels_array[:] = levels
 
-		for moleculeID, level in izip(self._externalMoleculeIDs, levels_array):
-			flowID = self._generatedID_externalExchange.format(moleculeID)
+		negative = levels_array < 0
 
-			if level < 0:
-				print "Setting a negative external molecule level - be sure this is intended behavior."
+		if negative.any():
+			print "Setting a negative external molecule level - be sure this is intended behavior."
 
-				self._solver.setFlowBounds(
-					flowID,
-					upperBound=-level,
-					)
-			else:
-				self._solver.setFlowBounds(
-					flowID,
-					lowerBound=-level,
-					)
+			self._solver.setFlowBoundsArray(
+				self._externalExchangeIndexes[negative],
+				upperBounds=-levels_array[negative],
+				)
+
+		self._solver.setFlowBoundsArray(
+			self._externalExchangeIndexes[~negative],
+			lowerBounds=-levels_array[~negative],
+			)
 
 
 	def getInternalMoleculeIDs(self):
@@ -980,20 +1029,11 @@ class FluxBalanceAnalysis(object):
 		if (levels_array < 0).any():
 			raise InvalidBoundaryError("Negative molecule levels not allowed")
 
-		for moleculeID, level in izip(self._internalMoleculeIDs, levels_array):
-			flowID = self._generatedID_internalExchange.format(moleculeID)
-
-			if self._forceInternalExchange:
-				self._solver.setFlowBounds(
-					flowID,
-					lowerBound=-level,
-					upperBound=-level,
-					)
-			else:
-				self._solver.setFlowBounds(
-					flowID,
-					lowerBound=-level,
-					)
+		self._solver.setFlowBoundsArray(
+			self._internalExchangeIndexes,
+			lowerBounds=-levels_array,
+			upperBounds=-levels_array if self._forceInternalExchange else None,
+			)
 
 
 	def getReactionIDs(self):
@@ -1019,28 +1059,32 @@ class FluxBalanceAnalysis(object):
 			lowerBounds = [lowerBounds]
 			upperBounds = [upperBounds]
 
+		# None bounds (or None entries, which become NaN) are left as is
 		nReactions = len(reactionIDs)
-		if lowerBounds is None:
-			lowerBounds = [None] * nReactions
-		if upperBounds is None:
-			upperBounds = [None] * nReactions
+		if lowerBounds is not None:
+			lowerBounds = np.array(lowerBounds, np.float64)
+		if upperBounds is not None:
+			upperBounds = np.array(upperBounds, np.float64)
 
-		if nReactions != len(lowerBounds) or nReactions != len(upperBounds):
+		if any(bounds is not None and bounds.size != nReactions
+				for bounds in (lowerBounds, upperBounds)):
 			raise Exception("There must be equal numbers of reactionIDs and bounds to set limits.")
 
-		# Set reaction flux bounds for each reaction
-		for reactionID, lb, ub in zip(reactionIDs, lowerBounds, upperBounds):
-			if reactionID not in self._reactionIDsSet and reactionID not in self._specialFluxIDsSet:
-				raise InvalidBoundaryError("Unable to set reaction flux: reaction '%s' not recognized." % (reactionID,))
-
-			if lb is not None and lb < 0:
-				raise InvalidBoundaryError("Minimum reaction flux must be non-negative")
-			if ub is not None and ub < 0:
-				raise InvalidBoundaryError("Maximum reaction flux must be non-negative")
-
-			reverseReactionID = self._generatedID_reverseReaction.format(reactionID)
-
-			if raiseForReversible and reverseReactionID in self._reactionIDsSet:
+		unrecognized = set(reactionIDs) - self._reactionIDsSet - self._specialFluxIDsSet
+		if unrecognized:
+			reactionID = next(r for r in reactionIDs if r in unrecognized)
+			raise InvalidBoundaryError("Unable to set reaction flux: reaction '%s' not recognized." % (reactionID,))
+
+		if lowerBounds is not None and (lowerBounds < 0).any():
+			raise InvalidBoundaryError("Minimum reaction flux must be non-negative")
+		if upperBounds is not None and (upperBounds < 0).any():
+			raise InvalidBoundaryError("Maximum reaction flux must be non-negative")
+
+		if raiseForReversible:
+			reversible = self._reversibleReactionIDs.intersection(reactionIDs)
+			if reversible:
+				reactionID = next(r for r in reactionIDs if r in reversible)
+				reverseReactionID = self._generatedID_reverseReaction.format(reactionID)
 				raise FBAError((
 					"Setting the reaction flux is ambiguous since "
 					+ "reaction {} has both a forward [{}] and reverse [{}] "
@@ -1048,11 +1092,12 @@ class FluxBalanceAnalysis(object):
 					+ "raiseForReversible = False if this is intended behavior."
 					).format(reactionID, reactionID, reverseReactionID))
 
-			self._solver.setFlowBounds(
-				reactionID,
-				upperBound=ub,
-				lowerBound=lb,
-				)
+		# Set reaction flux bounds for all of the reactions at once
+		self._solver.setFlowBoundsArray(
+			self._solver.getFlowIndexes(reactionIDs),
+			lowerBounds=lowerBounds,
+			upperBounds=upperBounds,
+			)
 
 	def setMoleculeSetpoint(self, moleculeID, coeff):
 		if moleculeID not in self._outputMoleculeIDs:
@@ -1228,33 +1273,69 @@ class FluxBalanceAnalysis(object):
 		if (np.array(reactionTargets) < 0).any():
 			raise FBAError("Rate targets cannot be negative. {} were provided with targets of {}".format(np.array(reactionIDs)[np.array(reactionTargets) < 0], np.array(reactionTargets)[np.array(reactionTargets) < 0]))
 
+		toEnable = []
+		toDisable = []
+		positions = []
+		coefficients = []
+
 		# Change the objective normalization
 		for reactionID, reactionTarget in izip(reactionIDs,reactionTargets):
 			if reactionID not in self._kineticTargetFluxes:
 				raise FBAError("Kinetic targets can only be set for reactions initialized to be kinetic targets. {} is not set up for it.".format(reactionID))
 
-			conversionFlux = self._generatedID_conversionFlux.format(reactionID)
-			reactionFluxEquivalent = self._generatedID_reactionFluxEquivalents.format(reactionID)
 			if reactionTarget == 0:
 				# can't have coeff = 0, target is disabled so -1 is arbitrary value that won't matter
-				self._solver.setFlowMaterialCoeff(
-					conversionFlux,
-					reactionFluxEquivalent,
-					-1
-					)
-				self.disableKineticTargets(reactionID)
+				toDisable.append(reactionID)
 			else:
 				if self._currentKineticTargets[reactionID] == 0:
-					self.enableKineticTargets(reactionID)
-				self._solver.setFlowMaterialCoeff(
-					conversionFlux,
-					reactionFluxEquivalent,
-					-reactionTarget
-					)
+					toEnable.append(reactionID)
+
+				positions.append(self._kineticTargetCoeffPositions[reactionID])
+				coefficients.append(-reactionTarget)
 
 			# Record the change
 			self._currentKineticTargets[reactionID] = reactionTarget
 
+		self._solver.setMaterialCoeffsArray(positions, coefficients)
+		if toDisable:
+			self.disableKineticTargets(toDisable)
+		if toEnable:
+			self.enableKineticTargets(toEnable)
+
+	def _getKineticObjectiveIndexes(self, reactionIDs, enable):
+		"""
+		Returns the flow indexes of the relaxation fluxes that weight the
+		kinetic targets of reactionIDs in the objective.  When enabling, the
+		under-target fluxes of one-sided reactions are left out.
+		"""
+
+		key = (tuple(reactionIDs), enable)
+		indexes = self._kineticObjectiveIndexes.get(key)
+
+		if indexes is None:
+			if self._solver.quadratic_objective:
+				flows = [
+					self._generatedID_quadFluxRelax.format(reactionID)
+					for reactionID in reactionIDs
+					]
+			else:
+				flows = [
+					self._generatedID_amountOver.format(reactionID)
+					for reactionID in reactionIDs
+					] + [
+					self._generatedID_amountUnder.format(reactionID)
+					for reactionID in reactionIDs
+					if not (enable and reactionID in self._oneSidedReactions)
+					]
+
+			indexes = self._solver.getFlowIndexes(flows)
+
+			# Only remember lookups of all reactions, which recur every step
+			if len(reactionIDs) == len(self._kineticTargetFluxes):
+				self._kineticObjectiveIndexes[key] = indexes
+
+		return indexes
+
 	def enableKineticTargets(self, reactionIDs=None):
 		# If a single value is passed in, make a list of length 1 from it
 		if isinstance(reactionIDs, basestring):
@@ -1265,28 +1346,11 @@ class FluxBalanceAnalysis(object):
 			print "enabled kinetic rates"
 			reactionIDs = self.getKineticTargetFluxNames()
 
-		for reactionID in reactionIDs:
-			# Add objective weighting to these reaction's relaxation fluxes
-			if self._solver.quadratic_objective:
-				quadTargetFlux = self._generatedID_quadFluxRelax.format(reactionID)
-				self._solver.setFlowObjectiveCoeff(
-					quadTargetFlux,
-					self.kineticObjectiveWeight,
-					)
-			else:
-				# Above
-				overTargetFlux = self._generatedID_amountOver.format(reactionID)
-				self._solver.setFlowObjectiveCoeff(
-					overTargetFlux,
-					self.kineticObjectiveWeight,
-					)
-				# Below
-				underTargetFlux = self._generatedID_amountUnder.format(reactionID)
-				if reactionID not in self._oneSidedReactions:
-					self._solver.setFlowObjectiveCoeff(
-						underTargetFlux,
-						self.kineticObjectiveWeight,
-						)
+		# Add objective weighting to these reaction's relaxation fluxes
+		self._solver.setFlowObjectiveCoeffsArray(
+			self._getKineticObjectiveIndexes(reactionIDs, True),
+			self.kineticObjectiveWeight,
+			)
 
 	def disableKineticTargets(self, reactionIDs=None):
 		# If a single value is passed in, make a list of length 1 from it
@@ -1298,37 +1362,18 @@ class FluxBalanceAnalysis(object):
 			print "disabled kinetic rates"
 			reactionIDs = self.getKineticTargetFluxNames()
 
-		for reactionID in reactionIDs:
-			# Add objective weighting to these reaction's relaxation fluxes
-
-			if self._solver.quadratic_objective:
-				quadTargetFlux = self._generatedID_quadFluxRelax.format(reactionID)
-				self._solver.setFlowObjectiveCoeff(
-					quadTargetFlux,
-					0,
-					)
-			else:
-				#Above
-				overTargetFlux = self._generatedID_amountOver.format(reactionID)
-				self._solver.setFlowObjectiveCoeff(
-					overTargetFlux,
-					0,
-					)
-				# Below
-				underTargetFlux = self._generatedID_amountUnder.format(reactionID)
-				self._solver.setFlowObjectiveCoeff(
-					underTargetFlux,
-					0,
-					)
+		# Remove objective weighting from these reaction's relaxation fluxes
+		self._solver.setFlowObjectiveCoeffsArray(
+			self._getKineticObjectiveIndexes(reactionIDs, False),
+			0,
+			)
 
-			# Reset flux target - leaving low values can cause issues when objective for reaction is disabled
-			conversionFlux = self._generatedID_conversionFlux.format(reactionID)
-			reactionFluxEquivalent = self._generatedID_reactionFluxEquivalents.format(reactionID)
-			self._solver.setFlowMaterialCoeff(
-				conversionFlux,
-				reactionFluxEquivalent,
-				-1,
-				)
+		# Reset flux target - leaving low values can cause issues when objective for reaction is disabled
+		self._solver.setMaterialCoeffsArray(
+			[self._kineticTargetCoeffPositions[reactionID]
+				for reactionID in reactionIDs],
+			-1,
+			)
 
 	def getArrayBasedModel(self):
 		return {
@@ -1343,6 +1388,101 @@ class FluxBalanceAnalysis(object):
 	def getMassAccumulated(self):
 		return self._solver.getFlowRates(self._massExchangeOutName)
 
+	def getBasis(self):
+		'''
+		Returns the basis of the last optimal solution, or None if there is
+		none yet.  It can be pickled, e.g. to warm start a daughter cell.
+		'''
+		return self._solver.getBasis()
+
+	def setBasis(self, basis):
+		'''
+		Warm starts the next solve from a basis from getBasis() of this or
+		another FluxBalanceAnalysis instance using the same solver.  Flows
+		and molecules are matched by name, so the problems can differ.
+		'''
+		self._solver.setBasis(basis)
+
+	def getIterationCount(self):
+		'''
+		Returns the total number of simplex iterations of all solves so far.
+		'''
+		return self._solver.iteration_count
+
+	def getSolveCount(self):
+		'''
+		Returns the number of solves so far.  Solves are skipped while nothing
+		changes beyond changeTolerance.
+		'''
+		return self._solver.solve_count
+
+	def copy(self):
+		'''
+		Returns an independent copy of this problem with its current bounds,
+		objective, kinetic targets and basis.
+		'''
+		other = copy.copy(self)
+		other._solver = self._solver.copy()
+		other._outputMoleculeCoeffs = [
+			dict(coeffs) for coeffs in self._outputMoleculeCoeffs
+			]
+		other._currentKineticTargets = dict(self._currentKineticTargets)
+		return other
+
+	def solveScenarios(self, scenarios, reactionIDs=None, processes=1, pool=None):
+		'''
+		Solves variations (scenarios) of this problem, each made by calling
+		FluxBalanceAnalysis methods on a copy of it, e.g. to find the effect
+		of disabling each kinetic target in turn.  The problem is solved
+		first so every scenario warm starts from its optimal basis.  To use
+		more than 1 process, the problem is pickled to each process along
+		with its share of the scenarios, so its solver must support pickling.
+		inputs:
+			scenarios (list) - for each scenario, a list of (method name,
+				args tuple) pairs to call, e.g.
+				[("disableKineticTargets", (reactionID,))]
+			reactionIDs (list of str) - reactions to return the fluxes of
+				(default: all reactions)
+			processes (int) - number of processes to solve the scenarios in
+			pool (multiprocessing.Pool) - pool of at least that many processes
+				to reuse over calls (default: start one for this call)
+		returns:
+			ndarray (scenarios x reactions) of the reaction fluxes
+		'''
+		if reactionIDs is None:
+			reactionIDs = self.getReactionIDs()
+		reactionIDs = list(reactionIDs)
+
+		if not scenarios:
+			return np.zeros((0, len(reactionIDs)))
+
+		self._solver._solve()
+
+		processes = max(1, min(processes, len(scenarios)))
+		if processes == 1:
+			return _solveScenarios((self, scenarios, reactionIDs))
+
+		bounds = np.linspace(0, len(scenarios), processes + 1).astype(int)
+		batches = [
+			(self, scenarios[start:end], reactionIDs)
+			for start, end in zip(bounds[:-1], bounds[1:])
+			]
+
+		if pool is not None:
+			return np.vstack(pool.map(_solveScenarios, batches))
+
+		pool = multiprocessing.Pool(processes)
+		try:
+			fluxes = pool.map(_solveScenarios, batches)
+		except BaseException:
+			pool.terminate()
+			raise
+
+		pool.close()
+		pool.join()
+
+		return np.vstack(fluxes)
+
 	def solve(self, iterations):
 		if iterations == 0:
 			self._solver._solve()
@@ -1352,3 +1492,18 @@ class FluxBalanceAnalysis(object):
 			except Exception as inst:
 				print "Warning: {} error while solving FBA - repeating FBA solve".format(inst)
 				self.solve(iterations - 1)
+
+
+def _solveScenarios(args):
+	"""Solve a batch of scenarios, each on a copy of fba, returning an array
+	of their reaction fluxes."""
+	fba, scenarios, reactionIDs = args
+
+	fluxes = np.zeros((len(scenarios), len(reactionIDs)))
+	for i, scenario in enumerate(scenarios):
+		problem = fba.copy()
+		for method, methodArgs in scenario:
+			getattr(problem, method)(*methodArgs)
+		fluxes[i] = problem.getReactionFluxes(reactionIDs)
+
+	return fluxes
@@ -4,7 +4,7 @@ polymerize.py
 Polymerizes sequences based on monomer and energy limitations.
 
 Run `kernprof -lv wholecell/tests/utils/profile_polymerize.py` to get a line
-profile. It @profile-decorates polymerize().
+profile. It @profile-decorates polymerize_reference_implementation().
 
 TODO:
 - document algorithm/corner cases (should already exist somewhere...)
@@ -19,12 +19,60 @@ from __future__ import division
 
 import numpy as np
 
-from ._build_sequences import buildSequences, computeMassIncrease
+from ._build_sequences import (buildSequences, buildSequencesAndCounts,
+	computeMassIncrease)
 from ._fastsums import sum_monomers, sum_monomers_reference_implementation
+from ._polymerize import polymerize_kernel
 
 # Reexport _build_sequences functions. (Declaring this avoids
 # "unused import statement" warnings.)
-__all__ = ['polymerize', 'buildSequences', 'computeMassIncrease']
+__all__ = ['polymerize', 'polymerize_reference_implementation',
+	'buildSequences', 'buildSequencesAndCounts',
+	'computeMassIncrease', 'SequenceCache']
+
+class SequenceCache(object):
+	"""
+	Builds the sequences to polymerize and their monomer counts with
+	buildSequencesAndCounts(), reusing the last build when called again with
+	the same polymer indexes, positions, and elongation rates. Elongation
+	processes build the sequences of their active polymerases in both
+	calculateRequest() and evolveState() of a time step, and the polymerases
+	are usually unchanged in between.
+
+	Parameters:
+		baseSequences: ndarray of int8, shape (num_polymers, max_length),
+			the full sequences padded with polymerize.PAD_VALUE.
+		nMonomers: the number of monomer types to count.
+
+	The returned arrays are shared between calls, so callers must not
+	modify them.
+	"""
+
+	def __init__(self, baseSequences, nMonomers):
+		self._baseSequences = baseSequences
+		self._nMonomers = nMonomers
+		self._key = None
+		self._result = None
+
+	def build(self, indexes, positions, elongationRates):
+		"""
+		Returns (sequences, monomerCounts) as from buildSequencesAndCounts().
+		"""
+		key = (indexes, positions, elongationRates)
+
+		if self._key is None or not all(
+				np.array_equal(new, old) for new, old in zip(key, self._key)):
+			self._result = buildSequencesAndCounts(
+				self._baseSequences, indexes, positions, elongationRates,
+				self._nMonomers)
+			self._key = tuple(np.array(array, copy=True) for array in key)
+
+		return self._result
+
+	def clear(self):
+		"""Drops the cached sequences."""
+		self._key = None
+		self._result = None
 
 def sample_array(array):
 	samples = np.random.random(array.shape)
@@ -40,6 +88,10 @@ class polymerize(object): # Class name is lowercase because interface is functio
 	Polymerize the given DNA/RNA/protein sequences as far as possible within
 	the given limits.
 
+	This runs the compiled implementation in _polymerize.pyx, which releases
+	the GIL except to draw random numbers. It gives the same results as
+	polymerize_reference_implementation given the same random states.
+
 	Parameters:
 		sequences: ndarray of integer, shape (num_sequences, num_steps),
 			the sequences of needed monomer types, containing PAD_VALUE for all
@@ -49,6 +101,10 @@ class polymerize(object): # Class name is lowercase because interface is functio
 		reactionLimit: max number of reactions (monomers to use); the energy
 			limit.
 		randomState: random number generator to pick winners in shortages.
+		elongation_rates: ndarray of number, shape (num_sequences,), the
+			relative elongation rates of the sequences.
+		variable_elongation: whether sequences elongate at their own
+			elongation_rates rather than all at the maximum rate.
 
 	Returns:
 		sequenceElongation: ndarray of integer, shape (num_sequences,)
@@ -60,6 +116,33 @@ class polymerize(object): # Class name is lowercase because interface is functio
 
 	PAD_VALUE = -1
 
+	def __init__(
+			self,
+			sequences,
+			monomerLimits,
+			reactionLimit,
+			randomState,
+			elongation_rates,
+			variable_elongation=False):
+
+		elongation_rates = elongation_rates / np.max(elongation_rates)
+
+		(self.sequenceElongation, self.monomerUsages,
+			self.nReactions) = polymerize_kernel(
+				np.ascontiguousarray(sequences, np.int8),
+				np.array(monomerLimits, np.int64),
+				np.int64(reactionLimit),
+				randomState,
+				np.ascontiguousarray(elongation_rates, np.float64),
+				variable_elongation)
+
+class polymerize_reference_implementation(object):
+	"""
+	The Python reference implementation of polymerize().
+	"""
+
+	PAD_VALUE = polymerize.PAD_VALUE
+
 	def __init__(
 			self,
 			sequences,
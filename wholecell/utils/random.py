@@ -60,6 +60,34 @@ def stochasticRound(randomState, value):
 	else:
 		return valueRavel
 
+def multinomialCapped(randomState, n, weights, caps):
+	"""
+	Draws n counts over categories in proportion to their weights, giving no
+	category more than its cap. Counts drawn beyond a cap are redrawn over the
+	categories that are still below theirs; each redraw follows one that
+	filled a category, so there are at most as many draws as categories.
+
+	Only categories with positive weights and caps receive counts, so at most
+	the sum of their caps is drawn.
+
+	Returns an int64 array of counts the shape of caps.
+	"""
+	caps = np.asarray(caps, np.int64)
+	weights = np.where(caps > 0, weights, 0.).astype(np.float64)
+	counts = np.zeros_like(caps)
+
+	remaining = int(min(n, caps[weights > 0].sum()))
+
+	while remaining > 0:
+		openWeights = np.where(counts < caps, weights, 0.)
+		counts += randomState.multinomial(remaining, openWeights / openWeights.sum())
+
+		excess = np.fmax(counts - caps, 0)
+		counts -= excess
+		remaining = excess.sum()
+
+	return counts
+
 def make_elongation_rates_flat(
 		size,
 		base,
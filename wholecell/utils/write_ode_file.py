@@ -20,4 +20,52 @@ def writeOdeFileWithRates(fileName, derivativesWithRatesAsVariables, derivatives
 	h.write("\n")
 	h.write("def derivativesJacobian(y, t, kf, kr):\n")
 	h.write("\treturn np.array(" + str(derivativesJacobianWithRatesAsVariables)[7:-1] + ")\n")
-	h.close()
\ No newline at end of file
+	h.close()
+
+def massActionOdeSource(stoichMatrix, ratesFwd = None, ratesRev = None, constantIdxs = ()):
+	# Returns the source of a module with derivatives(y, t) and
+	# derivativesJacobian(y, t) of the mass-action ODEs of a reaction
+	# network, evaluated by wholecell.utils.mass_action from the network's
+	# sparse stoichiometry. Without rates, the functions take them as
+	# arguments: derivatives(y, t, kf, kr).
+	stoichMatrix = np.asarray(stoichMatrix, np.float64)
+	rowIdxs, colIdxs = np.nonzero(stoichMatrix)
+
+	lines = [
+		"import numpy as np",
+		"from wholecell.utils.mass_action import MassActionOdes",
+		"",
+		"_stoichMatrix = np.zeros(%r)" % (stoichMatrix.shape,),
+		"_stoichMatrix[%r, %r] = %r" % (
+			rowIdxs.tolist(), colIdxs.tolist(), stoichMatrix[rowIdxs, colIdxs].tolist()),
+		"_odes = MassActionOdes(_stoichMatrix, %r)" % (list(constantIdxs),),
+		"",
+		]
+
+	if ratesFwd is None:
+		lines += [
+			"def derivatives(y, t, kf, kr):",
+			"\treturn _odes.derivatives(y, kf, kr)",
+			"",
+			"def derivativesJacobian(y, t, kf, kr):",
+			"\treturn _odes.jacobian(y, kf, kr)",
+			]
+
+	else:
+		lines += [
+			"_ratesFwd = np.array(%r)" % (np.asarray(ratesFwd, np.float64).tolist(),),
+			"_ratesRev = np.array(%r)" % (np.asarray(ratesRev, np.float64).tolist(),),
+			"",
+			"def derivatives(y, t):",
+			"\treturn _odes.derivatives(y, _ratesFwd, _ratesRev)",
+			"",
+			"def derivativesJacobian(y, t):",
+			"\treturn _odes.jacobian(y, _ratesFwd, _ratesRev)",
+			]
+
+	return "\n".join(lines) + "\n"
+
+def writeMassActionOdeFile(fileName, stoichMatrix, ratesFwd = None, ratesRev = None, constantIdxs = ()):
+	h = open(fileName, "w")
+	h.write(massActionOdeSource(stoichMatrix, ratesFwd, ratesRev, constantIdxs))
+	h.close()